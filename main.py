@@ -2,6 +2,7 @@
 Main Entry Point for Risk Management System
 """
 
+import multiprocessing
 import sys
 import os
 import time
@@ -44,7 +45,11 @@ def main():
         user_config, admin_config = config_manager.load_configs()
         
         # Initialize logging
-        initialize_logger(log_level=user_config.log_level)
+        initialize_logger(
+            log_level=user_config.log_level,
+            queue_size=user_config.log_queue_size,
+            queue_policy=user_config.log_queue_policy
+        )
         logger = get_logger("app")
         logger.info("=" * 60)
         logger.info("Risk Management System Starting...")
@@ -210,5 +215,8 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # Backtest workers are spawned processes: in a frozen (PyInstaller) build they must
+    # not re-run the application entry point
+    multiprocessing.freeze_support()
     main()
 
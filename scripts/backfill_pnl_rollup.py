@@ -0,0 +1,36 @@
+"""
+Rebuild the daily_pnl_rollup table from the trades table
+
+The rollup is kept up to date by TradeRepository (trade creation, deletion
+and the Day-1 purge) and filled once by the schema migration; run this after
+editing trades by hand or to repair a rollup that drifted.
+
+Usage:
+    python scripts/backfill_pnl_rollup.py [--db data/risk_management.db] [--broker-id AB1234]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database.models import DatabaseManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild daily_pnl_rollup from the trades table")
+    parser.add_argument("--db", default="data/risk_management.db", help="SQLite database path")
+    parser.add_argument("--broker-id", default=None, help="Only rebuild this broker's rows")
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(args.db)
+    days = db_manager.rebuild_pnl_rollup(args.broker_id)
+    scope = f"broker {args.broker_id}" if args.broker_id else "all brokers"
+    print(f"Rebuilt daily_pnl_rollup for {scope}: {days} broker-days")
+
+
+if __name__ == "__main__":
+    main()
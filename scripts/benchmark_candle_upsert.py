@@ -0,0 +1,133 @@
+"""
+Benchmark: CandleRepository.save_candles_batch bulk upsert vs per-row ORM path
+
+Saves N 5-minute candles into a temporary SQLite database twice (first pass
+inserts, second pass updates every row) with the previous implementation
+(SELECT per candle + ORM insert / update) and with the single-statement
+INSERT ... ON CONFLICT DO UPDATE path, and checks the stored rows match.
+
+Usage:
+    python scripts/benchmark_candle_upsert.py [candles]
+"""
+
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import and_
+
+from src.database.models import Candle, DatabaseManager
+from src.database.repository import CandleRepository
+
+
+def legacy_save_candles_batch(db_manager: DatabaseManager, candles_data) -> int:
+    """Previous save_candles_batch: one SELECT per candle, then an ORM update or insert"""
+    session = db_manager.get_session()
+    saved_count = 0
+    try:
+        for candle_data in candles_data:
+            existing = session.query(Candle).filter(
+                and_(
+                    Candle.segment == candle_data['segment'].upper(),
+                    Candle.timestamp == candle_data['timestamp'],
+                    Candle.interval == candle_data['interval']
+                )
+            ).first()
+            if existing:
+                existing.open = candle_data['open']
+                existing.high = candle_data['high']
+                existing.low = candle_data['low']
+                existing.close = candle_data['close']
+                existing.volume = candle_data.get('volume', 0.0)
+                existing.is_synthetic = candle_data.get('is_synthetic', False)
+                existing.updated_at = datetime.utcnow()
+            else:
+                session.add(Candle(
+                    segment=candle_data['segment'].upper(),
+                    timestamp=candle_data['timestamp'],
+                    interval=candle_data['interval'],
+                    open=candle_data['open'],
+                    high=candle_data['high'],
+                    low=candle_data['low'],
+                    close=candle_data['close'],
+                    volume=candle_data.get('volume', 0.0),
+                    is_synthetic=candle_data.get('is_synthetic', False)
+                ))
+            saved_count += 1
+        session.commit()
+        return saved_count
+    finally:
+        session.close()
+
+
+def make_candles(count: int, offset: float = 0.0):
+    start = datetime(2024, 1, 1, 9, 15)
+    candles = []
+    for i in range(count):
+        price = 24000.0 + (i % 500) + offset
+        candles.append({
+            'segment': 'NIFTY',
+            'timestamp': start + timedelta(minutes=5 * i),
+            'interval': '5minute',
+            'open': price,
+            'high': price + 5,
+            'low': price - 5,
+            'close': price + 1,
+            'volume': 0.0,
+            'is_synthetic': False
+        })
+    return candles
+
+
+def stored_rows(db_manager: DatabaseManager):
+    session = db_manager.get_session()
+    try:
+        return [
+            (c.segment, c.timestamp, c.interval, c.open, c.high, c.low, c.close, c.is_synthetic)
+            for c in session.query(Candle).order_by(Candle.timestamp)
+        ]
+    finally:
+        session.close()
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    inserts = make_candles(count)
+    updates = make_candles(count, offset=10.0)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        legacy_db = DatabaseManager(str(Path(tmp_dir) / "legacy.db"))
+        bulk_db = DatabaseManager(str(Path(tmp_dir) / "bulk.db"))
+        repo = CandleRepository(bulk_db)
+
+        legacy_insert = timed(lambda: legacy_save_candles_batch(legacy_db, inserts))
+        legacy_update = timed(lambda: legacy_save_candles_batch(legacy_db, updates))
+        bulk_insert = timed(lambda: repo.save_candles_batch(inserts))
+        bulk_update = timed(lambda: repo.save_candles_batch(updates))
+
+        same_rows = stored_rows(legacy_db) == stored_rows(bulk_db)
+        legacy_db.engine.dispose()
+        bulk_db.engine.dispose()
+
+    print(f"save_candles_batch on {count:,} candles")
+    print(f"                 {'insert':>10} {'update':>10}")
+    print(f"  per-row ORM  : {legacy_insert * 1000:8.1f}ms {legacy_update * 1000:8.1f}ms")
+    print(f"  bulk upsert  : {bulk_insert * 1000:8.1f}ms {bulk_update * 1000:8.1f}ms")
+    print(f"  speedup      : {legacy_insert / bulk_insert:9.1f}x {legacy_update / bulk_update:9.1f}x")
+    print(f"  same rows    : {same_rows}")
+
+
+if __name__ == "__main__":
+    main()
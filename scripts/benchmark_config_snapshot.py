@@ -0,0 +1,78 @@
+"""
+Benchmark: config.json read per call vs cached ConfigSnapshot
+
+Times N calls of get_market_hours and of the expiry-config lookup with the
+previous implementation (ConfigManager + open + json.load on every call) and
+with the process-wide ConfigSnapshot, and checks both return the same values.
+
+Usage:
+    python scripts/benchmark_config_snapshot.py [calls]
+"""
+
+import json
+import sys
+import time
+from datetime import time as dt_time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config.config_manager import ConfigManager
+from src.config.config_snapshot import get_config_snapshot
+from src.utils.date_utils import get_market_hours
+
+
+def legacy_get_market_hours():
+    """Previous get_market_hours: parse config.json on every call"""
+    config_path = ConfigManager().config_dir / "config.json"
+    if config_path.exists():
+        with open(config_path, 'r') as f:
+            market_hours = json.load(f).get("market_hours", {})
+            open_hour, open_minute = map(int, market_hours.get("open_time", "09:30").split(":"))
+            close_hour, close_minute = map(int, market_hours.get("close_time", "15:30").split(":"))
+            return dt_time(open_hour, open_minute), dt_time(close_hour, close_minute)
+    return dt_time(9, 30), dt_time(15, 30)
+
+
+def legacy_expiry_config():
+    """Previous expiry-config lookup of OrderExecutor._find_option_instrument"""
+    config_path = Path(project_root) / "config" / "config.json"
+    if config_path.exists():
+        with open(config_path, 'r') as f:
+            return json.load(f).get("expiry_config", {})
+    return None
+
+
+def snapshot_expiry_config():
+    snapshot = get_config_snapshot()
+    return snapshot.to_dict("expiry_config") if snapshot.exists else None
+
+
+def timed(fn, calls: int):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return time.perf_counter() - start
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+
+    rows = [
+        ("market hours", legacy_get_market_hours, get_market_hours),
+        ("expiry config", legacy_expiry_config, snapshot_expiry_config),
+    ]
+    print(f"{calls:,} calls each (config.json exists: {get_config_snapshot().exists})")
+    print(f"                  {'per call':>10} {'snapshot':>10} {'speedup':>9}  same")
+    for name, legacy, cached in rows:
+        legacy_time = timed(legacy, calls)
+        cached_time = timed(cached, calls)
+        same = legacy() == cached()
+        print(f"  {name:<14}: {legacy_time * 1000:8.1f}ms {cached_time * 1000:8.1f}ms "
+              f"{legacy_time / cached_time:8.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import numpy as np
 import pandas as pd
+from src.trading.indicators import weighted_moving_average
 
 def rsi(series, length=9):
     delta = series.diff()
@@ -17,8 +18,7 @@ def ema(series, length=3):
     return series.ewm(span=length, adjust=False).mean()
 
 def wma(series, length=6):
-    weights = np.arange(1, length + 1)
-    return series.rolling(length).apply(lambda x: np.dot(x, weights) / weights.sum(), raw=True)
+    return pd.Series(weighted_moving_average(series.to_numpy(dtype=float), length), index=series.index)
 
 def compute_pvs(df, rsi_len=9, ema_len=3, wma_len=6):
     """
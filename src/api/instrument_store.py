@@ -0,0 +1,225 @@
+"""
+Process-wide Instrument Master Cache
+Loads each exchange's kite.instruments() dump once per trading day, persists it to
+disk for fast restarts and indexes it for O(1) lookups
+"""
+
+import pickle
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.utils.date_utils import get_current_ist_time
+from src.utils.logger import get_logger
+
+logger = get_logger("api")
+
+# Use file-based path (relative to project root), same as the other data directories
+INSTRUMENTS_DIR = Path(__file__).parent.parent.parent / "data" / "instruments"
+
+
+def as_expiry_date(expiry_obj) -> Optional[date]:
+    """Normalize an instrument expiry (date, datetime or YYYY-MM-DD string) to a date"""
+    if expiry_obj is None or expiry_obj == '':
+        return None
+    if isinstance(expiry_obj, datetime):
+        return expiry_obj.date()
+    if isinstance(expiry_obj, date):
+        return expiry_obj
+    if isinstance(expiry_obj, str):
+        try:
+            return datetime.strptime(expiry_obj, "%Y-%m-%d").date()
+        except ValueError:
+            return None
+    if hasattr(expiry_obj, 'date') and callable(expiry_obj.date):
+        try:
+            return expiry_obj.date()
+        except Exception:
+            return None
+    return None
+
+
+class InstrumentIndex:
+    """Indexed instrument dump of one exchange for one trading day"""
+
+    def __init__(self, exchange: str, trading_day: date, instruments: List[Dict[str, Any]]):
+        self.exchange = exchange
+        self.trading_day = trading_day
+        self.instruments = instruments
+
+        self._by_symbol: Dict[str, Dict[str, Any]] = {}
+        self._by_token: Dict[int, Dict[str, Any]] = {}
+        self._by_contract: Dict[Tuple[str, Optional[date], float, str], Dict[str, Any]] = {}
+        self._by_name: Dict[str, List[Dict[str, Any]]] = {}
+        self._chains: Dict[Tuple[str, Optional[date], str], List[Dict[str, Any]]] = {}
+
+        for inst in instruments:
+            tradingsymbol = inst.get('tradingsymbol')
+            if tradingsymbol:
+                self._by_symbol.setdefault(tradingsymbol, inst)
+            token = inst.get('instrument_token')
+            if token is not None:
+                self._by_token.setdefault(token, inst)
+            name = inst.get('name')
+            if name:
+                self._by_name.setdefault(name, []).append(inst)
+                instrument_type = inst.get('instrument_type')
+                strike = inst.get('strike')
+                if instrument_type in ('CE', 'PE') and strike is not None:
+                    expiry_date = as_expiry_date(inst.get('expiry'))
+                    self._by_contract.setdefault((name, expiry_date, float(strike), instrument_type), inst)
+                    self._chains.setdefault((name, expiry_date, instrument_type), []).append(inst)
+
+        for chain in self._chains.values():
+            chain.sort(key=lambda inst: float(inst['strike']))
+
+    def __len__(self) -> int:
+        return len(self.instruments)
+
+    def by_tradingsymbol(self, tradingsymbol: str) -> Optional[Dict[str, Any]]:
+        return self._by_symbol.get(tradingsymbol)
+
+    def by_token(self, instrument_token: int) -> Optional[Dict[str, Any]]:
+        return self._by_token.get(instrument_token)
+
+    def by_name(self, name: str) -> List[Dict[str, Any]]:
+        """All instruments (futures and options) with this underlying name"""
+        return self._by_name.get(name, [])
+
+    def find_option(self, name: str, expiry, strike: float, option_type: str) -> Optional[Dict[str, Any]]:
+        """Option contract by (name, expiry, strike, CE/PE)"""
+        return self._by_contract.get((name, as_expiry_date(expiry), float(strike), option_type.upper()))
+
+    def options(self, name: str, expiry=None, option_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Options of an underlying, optionally for one expiry and / or type, sorted by strike"""
+        expiry_date = as_expiry_date(expiry) if expiry is not None else None
+        if expiry_date is not None and option_type:
+            return list(self._chains.get((name, expiry_date, option_type.upper()), []))
+        types = (option_type.upper(),) if option_type else ('CE', 'PE')
+        result = [
+            inst for inst in self.by_name(name)
+            if inst.get('instrument_type') in types and
+            (expiry_date is None or as_expiry_date(inst.get('expiry')) == expiry_date)
+        ]
+        result.sort(key=lambda inst: float(inst.get('strike') or 0))
+        return result
+
+    def expiries(self, name: str, option_types: Iterable[str] = ('CE', 'PE'), from_date: Optional[date] = None) -> List[date]:
+        """Sorted unique expiry dates of an underlying's options (optionally on or after from_date)"""
+        types = tuple(option_types)
+        dates = set()
+        for inst in self.by_name(name):
+            if inst.get('instrument_type') not in types:
+                continue
+            expiry_date = as_expiry_date(inst.get('expiry'))
+            if expiry_date is not None and (from_date is None or expiry_date >= from_date):
+                dates.add(expiry_date)
+        return sorted(dates)
+
+
+class InstrumentStore:
+    """
+    Shared cache of kite.instruments() dumps, one InstrumentIndex per exchange.
+
+    A dump is downloaded at most once per trading day (IST) per exchange; it is
+    written to data/instruments/ so a restart on the same day loads it from disk.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else INSTRUMENTS_DIR
+        self._indexes: Dict[str, InstrumentIndex] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock_for(self, exchange: str) -> threading.Lock:
+        with self._locks_guard:
+            if exchange not in self._locks:
+                self._locks[exchange] = threading.Lock()
+            return self._locks[exchange]
+
+    def _cache_path(self, exchange: str, trading_day: date) -> Path:
+        return self.cache_dir / f"{exchange}_{trading_day.isoformat()}.pkl"
+
+    def _load_from_disk(self, exchange: str, trading_day: date) -> Optional[List[Dict[str, Any]]]:
+        path = self._cache_path(exchange, trading_day)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Could not read instrument cache {path}: {e}")
+            return None
+
+    def _save_to_disk(self, exchange: str, trading_day: date, instruments: List[Dict[str, Any]]):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._cache_path(exchange, trading_day)
+            tmp_path = path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(instruments, f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp_path.replace(path)
+            # Keep only the current day's dump per exchange
+            for old in self.cache_dir.glob(f"{exchange}_*.pkl"):
+                if old != path:
+                    old.unlink(missing_ok=True)
+        except Exception as e:
+            logger.warning(f"Could not write instrument cache for {exchange}: {e}")
+
+    def get_index(self, kite_client, exchange: str) -> InstrumentIndex:
+        """
+        Indexed instruments of an exchange for today.
+
+        Args:
+            kite_client: KiteClient used to download the dump when no cached copy exists
+            exchange: NFO, BFO, NSE, ...
+        """
+        trading_day = get_current_ist_time().date()
+        index = self._indexes.get(exchange)
+        if index is not None and index.trading_day == trading_day:
+            return index
+
+        with self._lock_for(exchange):
+            # Another thread may have loaded it while we waited
+            index = self._indexes.get(exchange)
+            if index is not None and index.trading_day == trading_day:
+                return index
+
+            instruments = self._load_from_disk(exchange, trading_day)
+            if instruments is not None:
+                logger.info(f"Loaded {len(instruments)} {exchange} instruments from disk cache")
+            else:
+                instruments = kite_client.kite.instruments(exchange)
+                logger.info(f"Downloaded {len(instruments)} {exchange} instruments")
+                self._save_to_disk(exchange, trading_day, instruments)
+
+            index = InstrumentIndex(exchange, trading_day, instruments)
+            self._indexes[exchange] = index
+            return index
+
+    def instruments(self, kite_client, exchange: str) -> List[Dict[str, Any]]:
+        """Full instrument list of an exchange (same rows as kite.instruments(exchange))"""
+        return self.get_index(kite_client, exchange).instruments
+
+    def invalidate(self, exchange: Optional[str] = None):
+        """Drop in-memory indexes (all exchanges or one); the next lookup reloads"""
+        if exchange is None:
+            self._indexes.clear()
+        else:
+            self._indexes.pop(exchange, None)
+
+
+# Global store instance
+_store_instance: Optional[InstrumentStore] = None
+_store_lock = threading.Lock()
+
+
+def get_instrument_store() -> InstrumentStore:
+    """Get the process-wide InstrumentStore"""
+    global _store_instance
+    if _store_instance is None:
+        with _store_lock:
+            if _store_instance is None:
+                _store_instance = InstrumentStore()
+    return _store_instance
@@ -13,6 +13,7 @@ from src.utils.exceptions import (
     APIError, AuthenticationError, OrderExecutionError
 )
 from src.config.config_manager import ConfigManager
+from src.api.instrument_store import get_instrument_store
 
 logger = get_logger("api")
 
@@ -355,11 +356,9 @@ class KiteClient:
             # Get tick size from instrument (default 0.05 for NFO options)
             tick_size = 0.05  # Default for NFO options
             try:
-                instruments = self.kite.instruments(exchange)
-                for inst in instruments:
-                    if inst.get('tradingsymbol') == tradingsymbol:
-                        tick_size = inst.get('tick_size', 0.05)
-                        break
+                inst = get_instrument_store().get_index(self, exchange).by_tradingsymbol(tradingsymbol)
+                if inst:
+                    tick_size = inst.get('tick_size', 0.05)
             except Exception as e:
                 logger.debug(f"Could not fetch tick size for {tradingsymbol}, using default 0.05: {e}")
             
@@ -699,41 +698,20 @@ class KiteClient:
             raise AuthenticationError("Not authenticated. Please authenticate first.")
         
         try:
-            # Get all instruments for the exchange
-            instruments = self.kite.instruments(exchange)
-            
-            # Filter instruments for the segment, option type, and expiry
-            # Expiry format in Kite: YYMMDD (e.g., 251230 for 2025-12-30)
-            expiry_parts = expiry.split('-')
-            if len(expiry_parts) != 3:
+            try:
+                expiry_date = datetime.strptime(expiry, "%Y-%m-%d").date()
+            except ValueError:
                 raise ValueError(f"Invalid expiry format: {expiry}. Expected YYYY-MM-DD")
             
-            year_short = expiry_parts[0][-2:]  # Last 2 digits of year
-            month = expiry_parts[1]
-            day = expiry_parts[2]
-            expiry_kite = f"{year_short}{month}{day}"  # YYMMDD
-            
             segment_upper = segment.upper()
             option_type_upper = option_type.upper()
             
-            # Filter instruments
-            matching_instruments = []
-            for inst in instruments:
-                name = inst.get('name', '')
-                instrument_type = inst.get('instrument_type', '')
-                exp = inst.get('expiry', '')
-                
-                # Check if it matches segment, option type, and expiry
-                if (segment_upper in name and 
-                    instrument_type == option_type_upper and 
-                    exp == expiry_kite):
-                    matching_instruments.append(inst)
+            # Options of this underlying, type and expiry from the shared instrument index
+            index = get_instrument_store().get_index(self, exchange)
+            matching_instruments = index.options(segment_upper, expiry_date, option_type_upper)
             
             if not matching_instruments:
-                logger.warning(
-                    f"No instruments found for {segment} {option_type} expiry {expiry} "
-                    f"(Kite format: {expiry_kite})"
-                )
+                logger.warning(f"No instruments found for {segment} {option_type} expiry {expiry}")
                 return []
             
             # Build list of tradingsymbols for quote request
@@ -0,0 +1,393 @@
+"""
+Shared Market Data Hub
+One hub per index segment fetches quotes and candles once and shares them with
+every subscribed Live Trader agent (PAPER and LIVE), with request coalescing and
+per-endpoint rate-limit budgets
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from src.api import live_data
+from src.utils.date_utils import get_current_ist_time, is_market_open
+from src.utils.logger import get_logger
+
+logger = get_logger("api")
+
+# Kite Connect request limits per API key (requests / second)
+ENDPOINT_RATE_LIMITS: Dict[str, float] = {
+    "quote": 1.0,
+    "historical": 3.0,
+}
+
+
+class RateLimitBudget:
+    """
+    Token bucket for one Kite endpoint, shared by every caller in the process.
+
+    acquire() blocks until a request may be sent (or the timeout expires).
+    """
+
+    def __init__(self, rate: float, burst: int = 1, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+        self.granted = 0
+        self.waited_seconds = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Take one request from the budget; False if it was not available within timeout"""
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    self.granted += 1
+                    return True
+                wait = (1.0 - self._tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            self.waited_seconds += wait
+            self._sleep(wait)
+
+
+_budgets: Dict[str, RateLimitBudget] = {}
+_budgets_lock = threading.Lock()
+
+
+def get_rate_budget(endpoint: str) -> RateLimitBudget:
+    """Process-wide budget of a Kite endpoint ('quote', 'historical')"""
+    with _budgets_lock:
+        budget = _budgets.get(endpoint)
+        if budget is None:
+            budget = RateLimitBudget(ENDPOINT_RATE_LIMITS[endpoint])
+            _budgets[endpoint] = budget
+        return budget
+
+
+class _InFlight:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class RequestCoalescer:
+    """
+    Single-flight execution: concurrent calls with the same key share one request.
+
+    The first caller runs the function; callers arriving while it is in flight
+    wait for and receive the same result (or exception).
+    """
+
+    def __init__(self):
+        self._calls: Dict[Any, _InFlight] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _InFlight()
+                self._calls[key] = call
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+
+@dataclass
+class MarketSnapshot:
+    """LTP of a segment as fetched by its hub"""
+    segment: str
+    ltp: Optional[float]
+    fetched_at: datetime  # IST (naive)
+    market_open: bool = True
+    error: Optional[str] = None
+
+
+class MarketDataHub:
+    """
+    Market data gateway for one index segment.
+
+    While agents are subscribed, a single thread fetches the LTP once per the
+    shortest subscribed interval and hands the same MarketSnapshot to every
+    subscriber. Candle requests are coalesced per (interval, lookback) and served
+    from a short-lived cache, so agents ticking together share one Kite call;
+    every Kite request draws from the process-wide endpoint budget.
+
+    When a websocket feed streams the index (see IndexTickFeed), its prices
+    replace the quote poll via push_ltp(), and publish() hands bar-close
+    snapshots to subscribers as soon as a bar is complete.
+    """
+
+    def __init__(self, kite_client, segment: str, candle_ttl_seconds: float = 10.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.kite_client = kite_client
+        self.segment = segment.upper()
+        self.candle_ttl_seconds = candle_ttl_seconds
+        self._clock = clock
+        self._coalescer = RequestCoalescer()
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Tuple[Callable[[MarketSnapshot], None], float]] = {}
+        self._snapshot: Optional[MarketSnapshot] = None
+        self._snapshot_at: Optional[float] = None
+        self._streamed: Optional[MarketSnapshot] = None
+        self._streamed_at: Optional[float] = None
+        self.stream_max_age = 5.0
+        self._candle_cache: Dict[Tuple[str, int], Tuple[float, pd.DataFrame]] = {}
+        self._last_day_cache: Dict[str, Tuple[Any, pd.DataFrame]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._wakeup = threading.Event()
+        self.requests: Dict[str, int] = {"quote": 0, "historical": 0}
+        self.cache_hits = 0
+        self.streamed_snapshots = 0
+
+    # --- subscriptions / snapshot thread ---
+
+    def subscribe(self, name: str, callback: Callable[[MarketSnapshot], None], interval_seconds: float) -> None:
+        """Receive a snapshot every interval_seconds (the hub polls at the shortest subscribed interval)"""
+        with self._lock:
+            shortest = min((interval for _, interval in self._subscribers.values()), default=None)
+            self._subscribers[name] = (callback, float(interval_seconds))
+            # A running thread that the last unsubscribe asked to stop keeps going
+            self._stop_event.clear()
+            started = self._thread is None
+            if started:
+                self._thread = threading.Thread(target=self._run, daemon=True, name=f"MarketDataHub-{self.segment}")
+                self._thread.start()
+            snapshot = self._snapshot
+        if not started:
+            if shortest is not None and interval_seconds < shortest:
+                # Poll faster from now on
+                self._wakeup.set()
+            elif snapshot is not None:
+                # Catch up with the current snapshot instead of waiting for the next poll
+                callback(snapshot)
+        logger.info(f"MarketDataHub[{self.segment}]: {name} subscribed ({len(self._subscribers)} subscriber(s))")
+
+    def unsubscribe(self, name: str) -> None:
+        with self._lock:
+            self._subscribers.pop(name, None)
+            if not self._subscribers:
+                self._stop_event.set()
+        self._wakeup.set()
+
+    @property
+    def subscribers(self) -> List[str]:
+        return list(self._subscribers)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if self._stop_event.is_set() or not self._subscribers:
+                    # Cleared under the lock so a later subscribe starts a new thread
+                    self._thread = None
+                    break
+                interval = min(interval for _, interval in self._subscribers.values())
+            self._wakeup.clear()
+            self._notify(self.refresh())
+            # Sleep until the next poll; subscribing with a shorter interval wakes the thread early
+            self._wakeup.wait(interval)
+        logger.info(f"MarketDataHub[{self.segment}] stopped")
+
+    def _notify(self, snapshot: MarketSnapshot) -> None:
+        with self._lock:
+            callbacks = [callback for callback, _ in self._subscribers.values()]
+        for callback in callbacks:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logger.warning(f"MarketDataHub[{self.segment}] subscriber callback failed: {e}")
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Stop the snapshot thread (subscribers stay registered until unsubscribed)"""
+        self._stop_event.set()
+        self._wakeup.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    # --- quotes ---
+
+    def _fetch_snapshot(self) -> MarketSnapshot:
+        with self._lock:
+            streamed, streamed_at = self._streamed, self._streamed_at
+        if streamed is not None and self._clock() - streamed_at <= self.stream_max_age:
+            # The websocket feed is live: no quote request needed
+            self.streamed_snapshots += 1
+            return MarketSnapshot(self.segment, streamed.ltp, streamed.fetched_at)
+        if not is_market_open():
+            # Agents skip the price outside market hours; do not spend quote budget on it
+            return MarketSnapshot(self.segment, None, get_current_ist_time().replace(tzinfo=None), market_open=False)
+        get_rate_budget("quote").acquire()
+        self.requests["quote"] += 1
+        try:
+            ltp = live_data.fetch_live_index_ltp(self.kite_client, self.segment)
+            return MarketSnapshot(self.segment, ltp, get_current_ist_time().replace(tzinfo=None))
+        except Exception as e:
+            logger.warning(f"MarketDataHub[{self.segment}]: LTP fetch failed: {e}")
+            return MarketSnapshot(self.segment, None, get_current_ist_time().replace(tzinfo=None), error=str(e))
+
+    def refresh(self) -> MarketSnapshot:
+        """Fetch a new snapshot now (coalesced with concurrent refreshes)"""
+        def fetch():
+            snapshot = self._fetch_snapshot()
+            with self._lock:
+                self._snapshot = snapshot
+                self._snapshot_at = self._clock()
+            return snapshot
+        return self._coalescer.do(("quote",), fetch)
+
+    def push_ltp(self, ltp: float, timestamp: datetime) -> None:
+        """Latest streamed price (naive IST timestamp); used instead of quote polls while fresh"""
+        snapshot = MarketSnapshot(self.segment, ltp, timestamp)
+        with self._lock:
+            now = self._clock()
+            self._streamed, self._streamed_at = snapshot, now
+            self._snapshot, self._snapshot_at = snapshot, now
+
+    def publish(self, snapshot: MarketSnapshot) -> None:
+        """Hand a snapshot to every subscriber now (e.g. on close of a streamed bar)"""
+        with self._lock:
+            self._snapshot, self._snapshot_at = snapshot, self._clock()
+        self._notify(snapshot)
+
+    @property
+    def snapshot(self) -> Optional[MarketSnapshot]:
+        return self._snapshot
+
+    def ltp(self, max_age: float = 5.0) -> Optional[float]:
+        """LTP from the latest snapshot if younger than max_age seconds, else freshly fetched"""
+        with self._lock:
+            snapshot, snapshot_at = self._snapshot, self._snapshot_at
+        if snapshot is not None and snapshot.ltp is not None and self._clock() - snapshot_at <= max_age:
+            self.cache_hits += 1
+            return snapshot.ltp
+        return self.refresh().ltp
+
+    # --- candles ---
+
+    def _historical(self, fetch: Callable[[], Any]) -> Any:
+        get_rate_budget("historical").acquire()
+        self.requests["historical"] += 1
+        return fetch()
+
+    def recent_candles(self, interval: str = "5minute", lookback_minutes: int = 60) -> pd.DataFrame:
+        """
+        Same result as live_data.fetch_recent_index_candles, shared between agents.
+
+        Returns a copy callers may modify.
+        """
+        key = (interval, int(lookback_minutes))
+        with self._lock:
+            cached = self._candle_cache.get(key)
+        if cached is not None and self._clock() - cached[0] <= self.candle_ttl_seconds:
+            self.cache_hits += 1
+            return cached[1].copy()
+
+        def fetch():
+            df = self._historical(
+                lambda: live_data.fetch_recent_index_candles(
+                    self.kite_client, self.segment, interval, lookback_minutes=lookback_minutes
+                )
+            )
+            if df is not None and not df.empty:
+                with self._lock:
+                    self._candle_cache[key] = (self._clock(), df)
+            return df
+
+        df = self._coalescer.do(("candles",) + key, fetch)
+        return df.copy() if df is not None else df
+
+    def last_trading_day_candles(self, interval: str = "5minute") -> pd.DataFrame:
+        """live_data.fetch_last_trading_day_candles, fetched once per IST day and interval"""
+        today = get_current_ist_time().date()
+        with self._lock:
+            cached = self._last_day_cache.get(interval)
+        if cached is not None and cached[0] == today:
+            self.cache_hits += 1
+            return cached[1].copy()
+
+        def fetch():
+            df = self._historical(
+                lambda: live_data.fetch_last_trading_day_candles(self.kite_client, self.segment, interval)
+            )
+            if df is not None and not df.empty:
+                with self._lock:
+                    self._last_day_cache[interval] = (today, df)
+            return df
+
+        df = self._coalescer.do(("last_day", interval, today), fetch)
+        return df.copy() if df is not None else df
+
+    def historical_data(self, instrument_token: int, from_date: datetime, to_date: datetime, interval: str) -> List[Dict]:
+        """kite.historical_data for a date range, budgeted and coalesced (no caching)"""
+        key = ("range", instrument_token, from_date, to_date, interval)
+        return self._coalescer.do(key, lambda: self._historical(
+            lambda: self.kite_client.kite.historical_data(
+                instrument_token, from_date, to_date, interval, continuous=False, oi=False
+            )
+        ))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "segment": self.segment,
+            "subscribers": self.subscribers,
+            "requests": dict(self.requests),
+            "cache_hits": self.cache_hits,
+            "coalesced": self._coalescer.coalesced,
+            "streamed_snapshots": self.streamed_snapshots,
+        }
+
+
+# Global hub instances, one per segment
+_hubs: Dict[str, MarketDataHub] = {}
+_hubs_lock = threading.Lock()
+
+
+def get_market_data_hub(kite_client, segment: str) -> MarketDataHub:
+    """Get the process-wide MarketDataHub of a segment (uses the latest kite_client)"""
+    key = segment.upper()
+    with _hubs_lock:
+        hub = _hubs.get(key)
+        if hub is None:
+            hub = MarketDataHub(kite_client, key)
+            _hubs[key] = hub
+        elif kite_client is not None and hub.kite_client is not kite_client:
+            hub.kite_client = kite_client
+        return hub
@@ -0,0 +1,204 @@
+"""
+Option Chain Greeks Service
+Quotes only the strikes around ATM in one request and computes implied
+volatility and delta locally, so delta-based strike selection does not quote
+the whole chain on every entry
+"""
+
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.api.instrument_store import get_instrument_store
+from src.api.live_data import INDEX_SYMBOL_MAP
+from src.api.market_data_hub import RequestCoalescer, get_market_data_hub, get_rate_budget
+from src.trading.option_pricing import black_scholes_delta, implied_volatility, pricing_params, years_to_expiry
+from src.utils.date_utils import get_current_ist_time
+from src.utils.logger import get_logger
+from src.utils.premium_fetcher import get_exchange_for_segment
+
+logger = get_logger("api")
+
+# Strikes quoted on each side of ATM (the whole window fits one quote request)
+CHAIN_STRIKES_AROUND_ATM = 10
+# How long a quoted chain is reused (seconds)
+CHAIN_TTL_SECONDS = 5.0
+
+
+class OptionChainService:
+    """
+    Short-lived cache of option chains with locally computed Greeks.
+
+    get_chain() quotes the underlying and the strikes_around_atm strikes on
+    each side of the spot in a single kite.quote() call, solves implied
+    volatility from the LTPs and computes delta for all of them with the
+    vectorized Black-Scholes model. A chain is reused for ttl_seconds as long
+    as the ATM strike has not moved, and concurrent requests for the same
+    chain share one quote.
+    """
+
+    def __init__(
+        self,
+        strikes_around_atm: int = CHAIN_STRIKES_AROUND_ATM,
+        ttl_seconds: float = CHAIN_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.strikes_around_atm = strikes_around_atm
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        # (segment, option_type, expiry) -> (quoted at, first strike, last strike, chain)
+        self._chains: Dict[Tuple[str, str, date], Tuple[float, float, float, List[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+        self._coalescer = RequestCoalescer()
+        self.quote_calls = 0
+        self.cache_hits = 0
+
+    def get_chain(
+        self,
+        kite_client,
+        segment: str,
+        option_type: str,
+        expiry: str,
+        spot_price: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Options around ATM with their delta, same rows as KiteClient.get_option_chain_with_delta
+
+        Args:
+            kite_client: Authenticated KiteClient instance
+            segment: Trading segment (NIFTY, BANKNIFTY, SENSEX)
+            option_type: CE or PE
+            expiry: Expiry date in YYYY-MM-DD format
+            spot_price: Underlying price used to centre the window (the segment's LTP if omitted)
+
+        Returns:
+            List of dicts with keys: strike, tradingsymbol, delta, premium, instrument_token,
+            greeks (delta, iv), etc. Sorted by strike price.
+        """
+        try:
+            expiry_date = datetime.strptime(expiry, "%Y-%m-%d").date()
+        except ValueError:
+            raise ValueError(f"Invalid expiry format: {expiry}. Expected YYYY-MM-DD")
+        segment_upper = segment.upper()
+        option_type_upper = option_type.upper()
+        exchange = get_exchange_for_segment(segment_upper)
+
+        contracts = get_instrument_store().get_index(kite_client, exchange).options(segment_upper, expiry_date, option_type_upper)
+        if not contracts:
+            logger.warning(f"No instruments found for {segment_upper} {option_type_upper} expiry {expiry}")
+            return []
+        if spot_price is None:
+            spot_price = get_market_data_hub(kite_client, segment_upper).ltp()
+            if spot_price is None:
+                logger.warning(f"No {segment_upper} spot price to centre the option chain on")
+                return []
+
+        strikes = np.array([float(inst.get('strike') or 0) for inst in contracts])
+        atm = int(np.argmin(np.abs(strikes - spot_price)))
+        window = contracts[max(0, atm - self.strikes_around_atm):atm + self.strikes_around_atm + 1]
+        first_strike, last_strike = float(window[0].get('strike') or 0), float(window[-1].get('strike') or 0)
+
+        key = (segment_upper, option_type_upper, expiry_date)
+        with self._lock:
+            cached = self._chains.get(key)
+            if (cached is not None and self._clock() - cached[0] <= self.ttl_seconds
+                    and (cached[1], cached[2]) == (first_strike, last_strike)):
+                self.cache_hits += 1
+                return list(cached[3])
+
+        def fetch():
+            chain = self._quote_chain(kite_client, segment_upper, option_type_upper, expiry, exchange, window, spot_price)
+            with self._lock:
+                self._chains[key] = (self._clock(), first_strike, last_strike, chain)
+            return chain
+        return list(self._coalescer.do((key, first_strike, last_strike), fetch))
+
+    def _quote_chain(
+        self,
+        kite_client,
+        segment: str,
+        option_type: str,
+        expiry: str,
+        exchange: str,
+        contracts: List[Dict[str, Any]],
+        spot_price: float
+    ) -> List[Dict[str, Any]]:
+        """One quote for the underlying and the contracts, then IV and delta for all of them"""
+        underlying = INDEX_SYMBOL_MAP.get(segment)
+        symbols = [f"{exchange}:{inst.get('tradingsymbol')}" for inst in contracts]
+        get_rate_budget("quote").acquire()
+        with self._lock:
+            self.quote_calls += 1
+        quotes = kite_client.kite.quote(([underlying] if underlying else []) + symbols)
+        spot = (quotes.get(underlying) or {}).get('last_price') or spot_price
+
+        quoted = []
+        for kite_symbol, inst in zip(symbols, contracts):
+            quote_data = quotes.get(kite_symbol) or {}
+            premium = quote_data.get('last_price') or (quote_data.get('ohlc') or {}).get('close')
+            if premium:
+                quoted.append((inst, quote_data, float(premium)))
+        if not quoted:
+            return []
+
+        premiums = np.array([premium for _, _, premium in quoted])
+        strikes = np.array([float(inst.get('strike') or 0) for inst, _, _ in quoted])
+        years = years_to_expiry(get_current_ist_time(), expiry)
+        default_iv, rate = pricing_params(segment)
+        ivs = implied_volatility(premiums, spot, strikes, years, option_type, rate)
+        # Quotes no volatility explains (stale LTP below intrinsic): delta at the segment's default IV
+        deltas = black_scholes_delta(spot, strikes, years, np.where(np.isnan(ivs), default_iv, ivs), option_type, rate)
+
+        result = []
+        for (inst, quote_data, premium), iv, delta in zip(quoted, ivs, deltas):
+            greeks = {'delta': float(delta), 'iv': None if np.isnan(iv) else float(iv)}
+            result.append({
+                'strike': int(inst.get('strike') or 0),
+                'tradingsymbol': inst.get('tradingsymbol', ''),
+                'delta': greeks['delta'],
+                'premium': premium,
+                'instrument_token': inst.get('instrument_token', 0),
+                'exchange': exchange,
+                'instrument_type': option_type,
+                'expiry': expiry,
+                'volume': quote_data.get('volume', 0),
+                'oi': quote_data.get('oi', 0),
+                'greeks': greeks
+            })
+
+        logger.debug(
+            f"Quoted {len(result)} {segment} {option_type} options around ATM for expiry {expiry} "
+            f"(spot {spot:.2f}, delta {result[0]['delta']:.3f} to {result[-1]['delta']:.3f})"
+        )
+        return result
+
+    def invalidate(self):
+        """Drop cached chains; the next get_chain() quotes again"""
+        with self._lock:
+            self._chains.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "quote_calls": self.quote_calls,
+                "cache_hits": self.cache_hits,
+                "chains": len(self._chains),
+            }
+
+
+# Global service instance
+_service_instance: Optional[OptionChainService] = None
+_service_lock = threading.Lock()
+
+
+def get_option_chain_service() -> OptionChainService:
+    """Get the process-wide OptionChainService"""
+    global _service_instance
+    if _service_instance is None:
+        with _service_lock:
+            if _service_instance is None:
+                _service_instance = OptionChainService()
+    return _service_instance
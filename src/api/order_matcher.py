@@ -0,0 +1,274 @@
+"""
+Order Matcher
+Incremental FIFO matching of filled orderbook orders into closed trades,
+shared by the dashboard's /api/trades and OrderSync
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
+from src.utils.logger import get_logger
+from src.utils.date_utils import IST
+
+logger = get_logger("api")
+
+# Orders in these states have no (final) fills to match
+UNFILLED_STATUSES = frozenset({'CANCELLED', 'PENDING', 'OPEN', 'TRIGGER PENDING'})
+TIMESTAMP_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M:%S.%f', '%d-%m-%Y %H:%M:%S')
+# Days of matched trades kept, counted back from the newest order seen
+RETAIN_DAYS = 5
+
+
+def parse_order_timestamp(timestamp_value: Any) -> Optional[datetime]:
+    """
+    Parse a Kite order timestamp (string or datetime) into an IST-aware datetime.
+
+    Kite timestamps are timezone-naive but already in IST, so they are localized
+    to IST (not converted from UTC). Returns None if the value cannot be parsed.
+    """
+    if not timestamp_value:
+        return None
+    if isinstance(timestamp_value, datetime):
+        order_time = timestamp_value
+    else:
+        order_time = None
+        for fmt in TIMESTAMP_FORMATS:
+            try:
+                order_time = datetime.strptime(str(timestamp_value), fmt)
+                break
+            except ValueError:
+                continue
+        if order_time is None:
+            return None
+    if order_time.tzinfo is None:
+        return IST.localize(order_time)
+    return order_time.astimezone(IST)
+
+
+@dataclass(frozen=True)
+class MatchedTrade:
+    """A closed trade: part of an entry order matched FIFO against an exit order"""
+    trade_id: str
+    trading_symbol: str
+    exchange: str
+    instrument_token: str
+    entry_order_id: str
+    exit_order_id: str
+    entry_time: datetime
+    exit_time: datetime
+    entry_price: float
+    exit_price: float
+    quantity: int  # Positive for BUY (long), negative for SELL (short)
+
+    @property
+    def transaction_type(self) -> str:
+        return 'BUY' if self.quantity > 0 else 'SELL'
+
+    @property
+    def realized_pnl(self) -> float:
+        return (self.exit_price - self.entry_price) * self.quantity
+
+
+@dataclass(frozen=True)
+class _Fill:
+    """The fields of a filled order used for matching (parsed once)"""
+    order_id: str
+    trading_symbol: str
+    exchange: str
+    instrument_token: str
+    side: str
+    quantity: int
+    price: float
+    time: datetime
+    seq: int  # Arrival order, breaks timestamp ties
+
+
+class _SymbolBook:
+    """Fills, open lots and matched trades of one symbol on one day"""
+
+    def __init__(self):
+        self.fills: List[_Fill] = []
+        self.open_lots: Dict[str, Deque[List[Any]]] = {'BUY': deque(), 'SELL': deque()}
+        self.trades: List[MatchedTrade] = []
+
+    def apply(self, fill: _Fill):
+        """Match a fill (the newest for this symbol) against the opposite side's open lots"""
+        self.fills.append(fill)
+        opposite = self.open_lots['SELL' if fill.side == 'BUY' else 'BUY']
+        remaining = fill.quantity
+        while remaining > 0 and opposite:
+            lot = opposite[0]
+            entry, entry_remaining = lot
+            match_qty = min(remaining, entry_remaining)
+            self.trades.append(MatchedTrade(
+                trade_id=f"trade_{entry.order_id}_{fill.order_id}",
+                trading_symbol=fill.trading_symbol,
+                exchange=fill.exchange,
+                instrument_token=entry.instrument_token,
+                entry_order_id=entry.order_id,
+                exit_order_id=fill.order_id,
+                entry_time=entry.time,
+                exit_time=fill.time,
+                entry_price=entry.price,
+                exit_price=fill.price,
+                quantity=match_qty if entry.side == 'BUY' else -match_qty
+            ))
+            remaining -= match_qty
+            if match_qty == entry_remaining:
+                opposite.popleft()
+            else:
+                lot[1] = entry_remaining - match_qty
+        if remaining > 0:
+            self.open_lots[fill.side].append([fill, remaining])
+
+    def rebuild(self, fills: Iterable[_Fill]):
+        """Re-run matching from scratch (a fill arrived out of order or changed)"""
+        self.fills = []
+        self.open_lots = {'BUY': deque(), 'SELL': deque()}
+        self.trades = []
+        for fill in sorted(fills, key=lambda f: (f.time, f.seq)):
+            self.apply(fill)
+
+
+class OrderMatcher:
+    """
+    FIFO BUY/SELL matching of an account's orderbook, kept across calls.
+
+    update() takes the whole orderbook as returned by Kite and only applies
+    orders it has not seen (or whose filled quantity changed): each new fill is
+    matched against the symbol's open lots in O(new orders). A fill older than
+    the symbol's latest, or a changed fill, re-matches that one symbol. Fills
+    are grouped per IST day and trading symbol, and both /api/trades and
+    OrderSync read the resulting trades.
+    """
+
+    def __init__(self, retain_days: int = RETAIN_DAYS):
+        self.retain_days = retain_days
+        self._books: Dict[Tuple[date, str], _SymbolBook] = {}
+        self._seen: Dict[str, Tuple[int, Tuple[date, str]]] = {}  # order_id -> (filled qty, book key)
+        self._recorded: Set[str] = set()
+        self._seq = 0
+        self._lock = threading.Lock()
+        self.orders_applied = 0
+        self.rebuilds = 0
+
+    def _to_fill(self, order: Dict[str, Any]) -> Optional[_Fill]:
+        status = str(order.get('status', '')).upper()
+        filled_qty = int(order.get('filled_quantity') or 0)
+        side = str(order.get('transaction_type', '')).upper()
+        if status in UNFILLED_STATUSES or filled_qty <= 0 or side not in ('BUY', 'SELL'):
+            return None
+        order_time = parse_order_timestamp(order.get('order_timestamp'))
+        if order_time is None:
+            logger.warning(f"Order {order.get('order_id')} has no parsable timestamp, not matched")
+            return None
+        self._seq += 1
+        return _Fill(
+            order_id=str(order.get('order_id', '')),
+            trading_symbol=order.get('tradingsymbol', ''),
+            exchange=order.get('exchange', ''),
+            instrument_token=str(order.get('instrument_token', '')),
+            side=side,
+            quantity=filled_qty,
+            price=float(order.get('average_price') or 0),
+            time=order_time,
+            seq=self._seq
+        )
+
+    def update(self, orders: Iterable[Dict[str, Any]]) -> int:
+        """Apply new or changed orders from the orderbook; returns the number of fills applied"""
+        applied = 0
+        with self._lock:
+            to_rebuild: Set[Tuple[date, str]] = set()
+            for order in orders:
+                order_id = order.get('order_id')
+                if not order_id:
+                    continue
+                order_id = str(order_id)
+                filled_qty = int(order.get('filled_quantity') or 0)
+                seen = self._seen.get(order_id)
+                if seen is not None and seen[0] == filled_qty:
+                    continue
+                fill = self._to_fill(order)
+                if fill is None:
+                    continue
+                key = (fill.time.date(), fill.trading_symbol)
+                book = self._books.setdefault(key, _SymbolBook())
+                if seen is not None:
+                    # More fills on a known order: replace it and re-match its symbol
+                    old_book = self._books.get(seen[1])
+                    if old_book is not None:
+                        old_book.fills = [f for f in old_book.fills if f.order_id != order_id]
+                        to_rebuild.add(seen[1])
+                    book.fills.append(fill)
+                    to_rebuild.add(key)
+                elif key in to_rebuild or (book.fills and fill.time < book.fills[-1].time):
+                    book.fills.append(fill)
+                    to_rebuild.add(key)
+                else:
+                    book.apply(fill)
+                self._seen[order_id] = (filled_qty, key)
+                applied += 1
+            for key in to_rebuild:
+                self._books[key].rebuild(self._books[key].fills)
+            self.rebuilds += len(to_rebuild)
+            self.orders_applied += applied
+            if applied:
+                self._prune()
+        return applied
+
+    def _prune(self):
+        newest = max(day for day, _ in self._books)
+        cutoff = newest - timedelta(days=self.retain_days)
+        for key in [key for key in self._books if key[0] < cutoff]:
+            book = self._books.pop(key)
+            for fill in book.fills:
+                self._seen.pop(fill.order_id, None)
+            for trade in book.trades:
+                self._recorded.discard(trade.trade_id)
+
+    def trades(self, trade_date: Optional[date] = None) -> List[MatchedTrade]:
+        """Matched trades of one IST day (or every retained day), per symbol in match order"""
+        with self._lock:
+            return [
+                trade
+                for (day, _), book in self._books.items()
+                if trade_date is None or day == trade_date
+                for trade in book.trades
+            ]
+
+    def unrecorded_trades(self, trade_date: Optional[date] = None) -> List[MatchedTrade]:
+        """Matched trades not yet passed to mark_recorded()"""
+        trades = self.trades(trade_date)
+        with self._lock:
+            return [trade for trade in trades if trade.trade_id not in self._recorded]
+
+    def mark_recorded(self, trade_ids: Iterable[str]):
+        """Remember trades stored as Trade rows so later syncs skip them"""
+        with self._lock:
+            self._recorded.update(trade_ids)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "books": len(self._books),
+                "orders": len(self._seen),
+                "trades": sum(len(book.trades) for book in self._books.values()),
+                "orders_applied": self.orders_applied,
+                "rebuilds": self.rebuilds,
+            }
+
+
+_matchers: Dict[Optional[str], OrderMatcher] = {}
+_matchers_lock = threading.Lock()
+
+
+def get_order_matcher(broker_id: Optional[str]) -> OrderMatcher:
+    """Process-wide matcher of one broker account"""
+    with _matchers_lock:
+        matcher = _matchers.get(broker_id)
+        if matcher is None:
+            matcher = _matchers[broker_id] = OrderMatcher()
+        return matcher
@@ -0,0 +1,186 @@
+"""
+Position Book
+In-memory prices and P&L of the active positions, updated from WebSocket ticks
+and written back to the positions table in batches
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+from src.utils.logger import get_logger
+from src.database.repository import PositionRepository
+from src.database.models import Position
+from src.utils.position_utils import calculate_position_pnl
+from src.utils.broker_context import BrokerContext
+
+logger = get_logger("api")
+
+# Write dirty prices at least this often (seconds)
+FLUSH_INTERVAL_SECONDS = 2.0
+# Write right away when a position's P&L moved this much (Rs.) since its last write
+MATERIAL_PNL_CHANGE = 500.0
+
+
+@dataclass
+class BookEntry:
+    """Price state of one active position"""
+    position_id: int
+    instrument_token: int
+    entry_price: float
+    quantity: int
+    lot_size: int
+    current_price: Optional[float]
+    unrealized_pnl: float
+    flushed_pnl: float
+    dirty: bool = False
+
+
+class PositionBook:
+    """
+    Active positions keyed by instrument token.
+
+    A tick updates its position's price and P&L in memory (O(1) per tick).
+    Changed positions are written to the database in one transaction by
+    flush(), which runs when a position's P&L moved by MATERIAL_PNL_CHANGE
+    or FLUSH_INTERVAL_SECONDS after the previous write (flush_if_due).
+    The book is (re)loaded from the database after every position sync.
+    """
+
+    def __init__(
+        self,
+        position_repo: PositionRepository,
+        flush_interval: float = FLUSH_INTERVAL_SECONDS,
+        material_pnl_change: float = MATERIAL_PNL_CHANGE
+    ):
+        self.position_repo = position_repo
+        self.flush_interval = flush_interval
+        self.material_pnl_change = material_pnl_change
+        self._entries: Dict[int, BookEntry] = {}
+        self._broker_id: Optional[str] = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._material = False
+        self.loaded = False
+        self.ticks_applied = 0
+        self.flushes = 0
+        self.rows_written = 0
+
+    def load(self, positions: Iterable[Position], broker_id: Optional[str] = None):
+        """Replace the book with the given active positions (pending prices are dropped)"""
+        entries = {}
+        for position in positions:
+            try:
+                token = int(position.instrument_token)
+            except (TypeError, ValueError):
+                continue
+            entries[token] = BookEntry(
+                position_id=position.id,
+                instrument_token=token,
+                entry_price=position.entry_price,
+                quantity=position.quantity,
+                lot_size=position.lot_size or 1,
+                current_price=position.current_price,
+                unrealized_pnl=position.unrealized_pnl or 0.0,
+                flushed_pnl=position.unrealized_pnl or 0.0
+            )
+        with self._lock:
+            self._entries = entries
+            self._broker_id = broker_id or BrokerContext.get_broker_id()
+            self._material = False
+            self.loaded = True
+
+    def reload(self):
+        """Load the active positions from the database (needs this thread's BrokerID)"""
+        self.load(self.position_repo.get_active_positions())
+
+    def apply_ticks(self, price_updates: Dict[int, float]) -> int:
+        """Apply last prices by instrument token; returns the number of positions updated"""
+        updated = 0
+        with self._lock:
+            for instrument_token, current_price in price_updates.items():
+                entry = self._entries.get(instrument_token)
+                if entry is None or current_price == entry.current_price:
+                    continue
+                entry.current_price = current_price
+                entry.unrealized_pnl = calculate_position_pnl(
+                    entry.entry_price, current_price, entry.quantity, entry.lot_size
+                )
+                entry.dirty = True
+                if abs(entry.unrealized_pnl - entry.flushed_pnl) >= self.material_pnl_change:
+                    self._material = True
+                updated += 1
+            self.ticks_applied += updated
+        return updated
+
+    def flush_if_due(self) -> int:
+        """Flush on a material P&L change or once the flush interval has passed"""
+        if self._material or time.monotonic() - self._last_flush >= self.flush_interval:
+            return self.flush()
+        return 0
+
+    def flush(self) -> int:
+        """Write every dirty position in one transaction; returns the number of rows written"""
+        with self._flush_lock:
+            with self._lock:
+                dirty = [entry for entry in self._entries.values() if entry.dirty]
+                updates = [
+                    {
+                        "position_id": entry.position_id,
+                        "current_price": entry.current_price,
+                        "unrealized_pnl": entry.unrealized_pnl
+                    }
+                    for entry in dirty
+                ]
+                for entry in dirty:
+                    entry.dirty = False
+                    entry.flushed_pnl = entry.unrealized_pnl
+                self._material = False
+                self._last_flush = time.monotonic()
+                broker_id = self._broker_id
+            if not updates:
+                return 0
+            try:
+                written = self.position_repo.update_position_prices_batch(updates, broker_id=broker_id)
+            except Exception:
+                # Keep the prices pending for the next flush
+                with self._lock:
+                    for entry in dirty:
+                        if self._entries.get(entry.instrument_token) is entry:
+                            entry.dirty = True
+                raise
+            self.flushes += 1
+            self.rows_written += written
+            return written
+
+    def entry(self, instrument_token: int) -> Optional[BookEntry]:
+        with self._lock:
+            return self._entries.get(instrument_token)
+
+    def total_unrealized_pnl(self) -> float:
+        with self._lock:
+            return sum(entry.unrealized_pnl for entry in self._entries.values())
+
+    def apply_to(self, positions: List[Position]) -> List[Position]:
+        """Overwrite price and P&L of positions read from the database with the book's newer values"""
+        with self._lock:
+            for position in positions:
+                try:
+                    entry = self._entries.get(int(position.instrument_token))
+                except (TypeError, ValueError):
+                    continue
+                if entry is not None and entry.position_id == position.id and entry.current_price is not None:
+                    position.current_price = entry.current_price
+                    position.unrealized_pnl = entry.unrealized_pnl
+        return positions
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "positions": len(self._entries),
+                "dirty": sum(1 for entry in self._entries.values() if entry.dirty),
+                "ticks_applied": self.ticks_applied,
+                "flushes": self.flushes,
+                "rows_written": self.rows_written,
+            }
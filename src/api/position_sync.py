@@ -3,15 +3,19 @@ Position Synchronization
 Syncs positions from Zerodha API to local database
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
 from datetime import datetime
 from pytz import UTC
 from src.utils.logger import get_logger
 from src.api.kite_client import KiteClient
 from src.database.repository import PositionRepository
 from src.database.models import Position
+from src.api.position_book import PositionBook
 from src.utils.date_utils import IST
 
+if TYPE_CHECKING:
+    from src.risk_management.broker_snapshot import BrokerSnapshot
+
 logger = get_logger("api")
 
 
@@ -21,6 +25,8 @@ class PositionSync:
     def __init__(self, kite_client: KiteClient, position_repo: PositionRepository):
         self.kite_client = kite_client
         self.position_repo = position_repo
+        # Tick prices of the active positions, written to the database in batches
+        self.position_book = PositionBook(position_repo)
     
     def _parse_order_timestamp(self, timestamp_str: str) -> datetime:
         """
@@ -47,22 +53,40 @@ class PositionSync:
             logger.debug(f"Error parsing timestamp '{timestamp_str}': {e}")
             return datetime.utcnow()
     
-    def sync_positions_from_api(self) -> List[Position]:
+    def _fetch_orders(self, snapshot: Optional['BrokerSnapshot']) -> List[Dict[str, Any]]:
+        """Order book for exit-order lookups (fetched once per snapshot when one is given)"""
+        if snapshot is not None:
+            return snapshot.orders()
+        if self.kite_client and self.kite_client.is_authenticated():
+            return self.kite_client.get_orders()
+        return []
+    
+    def sync_positions_from_api(self, snapshot: Optional['BrokerSnapshot'] = None) -> List[Position]:
         """
         Fetch positions from Zerodha API and sync to database
         
+        Args:
+            snapshot: Broker snapshot of the current risk-monitor cycle; its positions,
+                order book and active-position read are used instead of fetching again
+        
         Returns:
             List of synced positions
         """
         try:
             # Get positions from Zerodha
-            api_positions = self.kite_client.get_positions()
+            if snapshot is not None and snapshot.has_positions:
+                api_positions = snapshot.positions
+            else:
+                api_positions = self.kite_client.get_positions()
             
             # Get all active positions from database BEFORE processing API positions
             # This helps us detect positions that disappeared from API (closed manually)
             db_active_positions = {}
             try:
-                active_positions = self.position_repo.get_active_positions()
+                active_positions = (
+                    snapshot.active_positions() if snapshot is not None
+                    else self.position_repo.get_active_positions()
+                )
                 for pos in active_positions:
                     db_active_positions[str(pos.instrument_token)] = pos
             except Exception as e:
@@ -96,15 +120,7 @@ class PositionSync:
                 # We still process it to mark it as inactive
                 if quantity == 0:
                     # Check if we have an active position for this instrument
-                    existing_position = None
-                    try:
-                        active_positions = self.position_repo.get_active_positions()
-                        existing_position = next(
-                            (p for p in active_positions if p.instrument_token == instrument_token),
-                            None
-                        )
-                    except Exception:
-                        pass
+                    existing_position = db_active_positions.get(instrument_token)
                     
                     # If we have an active position that became 0, mark it as inactive
                     # BUT preserve the original quantity for display purposes
@@ -118,8 +134,8 @@ class PositionSync:
                         
                         # Try to find the exit order from orderbook to get actual exit price and time
                         try:
-                            if self.kite_client and self.kite_client.is_authenticated():
-                                orders = self.kite_client.get_orders()
+                            orders = self._fetch_orders(snapshot)
+                            if orders:
                                 # Find the most recent COMPLETE order for this symbol that would close the position
                                 # For SELL positions (negative qty), look for BUY orders
                                 # For BUY positions (positive qty), look for SELL orders
@@ -215,15 +231,7 @@ class PositionSync:
                 lot_size = api_pos.get('lot_size', 1)
                 
                 # Get existing position to detect quantity changes
-                existing_position = None
-                try:
-                    active_positions = self.position_repo.get_active_positions()
-                    existing_position = next(
-                        (p for p in active_positions if p.instrument_token == instrument_token),
-                        None
-                    )
-                except Exception:
-                    pass
+                existing_position = db_active_positions.get(instrument_token)
                 
                 old_quantity = existing_position.quantity if existing_position else 0
                 
@@ -274,8 +282,8 @@ class PositionSync:
                     
                     # Try to find exit order from orderbook
                     try:
-                        if self.kite_client and self.kite_client.is_authenticated():
-                            orders = self.kite_client.get_orders()
+                        orders = self._fetch_orders(snapshot)
+                        if orders:
                             exit_transaction_type = "BUY" if original_quantity < 0 else "SELL"
                             
                             matching_orders = [
@@ -360,9 +368,16 @@ class PositionSync:
                 )
             
             logger.debug(f"Synced {len(synced_positions)} positions from API")
+            
+            # Restart the price book from the synced rows
+            if snapshot is not None:
+                snapshot.invalidate()
+            self.position_book.reload()
             return synced_positions
             
         except Exception as e:
+            if snapshot is not None:
+                snapshot.invalidate()
             logger.error(f"Error syncing positions from API: {e}")
             return []
     
@@ -396,20 +411,20 @@ class PositionSync:
         """
         Update position prices from WebSocket ticks
         
+        Prices and P&L are updated in the in-memory position book; the database
+        is written in one batch on a material P&L change or when the flush
+        interval has passed (see PositionBook).
+        
         Args:
             price_updates: Dict mapping instrument_token to current_price
         """
         try:
-            active_positions = self.position_repo.get_active_positions()
+            if not self.position_book.loaded:
+                # Ticks before the first position sync
+                self.position_book.reload()
             
-            for position in active_positions:
-                try:
-                    instrument_token = int(position.instrument_token)
-                    if instrument_token in price_updates:
-                        current_price = price_updates[instrument_token]
-                        self.position_repo.update_position_pnl(position.id, current_price)
-                except (ValueError, KeyError):
-                    continue
+            if self.position_book.apply_ticks(price_updates):
+                self.position_book.flush_if_due()
             
         except Exception as e:
             logger.error(f"Error updating position prices: {e}")
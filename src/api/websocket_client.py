@@ -22,6 +22,7 @@ class WebSocketClient:
         self.kite_client = kite_client
         self.kite_ticker: Optional[KiteTicker] = None
         self.subscribed_instruments: List[int] = []
+        self.instrument_modes: Dict[int, str] = {}  # token -> tick mode, re-applied on reconnect
         self._is_connected = False
         self.reconnect_attempts = 0
         self.max_reconnect_attempts = 20  # Increased from 10 to 20 for Azure
@@ -29,6 +30,7 @@ class WebSocketClient:
         self.max_reconnect_delay = 120  # Increased from 60 to 120 seconds for Azure
         self._last_tick_time = 0  # Track last tick received for health monitoring
         self._reconnecting = False  # Flag to prevent multiple simultaneous reconnection attempts
+        self._closing = False  # Set by disconnect(): the close is intentional, do not reconnect
         
         # Callbacks
         self.on_ticks: Optional[Callable] = None
@@ -63,6 +65,8 @@ class WebSocketClient:
                 logger.error("Access token not available for WebSocket connection.")
                 return False
             
+            self._closing = False
+            
             # Initialize KiteTicker
             self.kite_ticker = KiteTicker(
                 self.kite_client.api_key,
@@ -86,7 +90,8 @@ class WebSocketClient:
             return False
     
     def disconnect(self):
-        """Disconnect WebSocket"""
+        """Disconnect WebSocket (no reconnection attempts follow)"""
+        self._closing = True
         try:
             if self.kite_ticker:
                 self.kite_ticker.close()
@@ -109,6 +114,20 @@ class WebSocketClient:
         except Exception as e:
             logger.error(f"Error subscribing to instruments: {e}")
     
+    def set_mode(self, mode: str, instrument_tokens: List[int]):
+        """Set the tick mode ('ltp', 'quote' or 'full') of subscribed instruments"""
+        if not self.kite_ticker or not self._is_connected:
+            logger.warning("WebSocket not connected. Cannot set mode.")
+            return
+        
+        try:
+            self.kite_ticker.set_mode(mode, instrument_tokens)
+            for token in instrument_tokens:
+                self.instrument_modes[token] = mode
+            logger.info(f"Set mode '{mode}' for {len(instrument_tokens)} instruments")
+        except Exception as e:
+            logger.error(f"Error setting mode for instruments: {e}")
+    
     def unsubscribe(self, instrument_tokens: List[int]):
         """Unsubscribe from instrument tokens"""
         if not self.kite_ticker or not self._is_connected:
@@ -120,6 +139,8 @@ class WebSocketClient:
                 token for token in self.subscribed_instruments
                 if token not in instrument_tokens
             ]
+            for token in instrument_tokens:
+                self.instrument_modes.pop(token, None)
             logger.info(f"Unsubscribed from {len(instrument_tokens)} instruments")
         except Exception as e:
             logger.error(f"Error unsubscribing from instruments: {e}")
@@ -175,6 +196,11 @@ class WebSocketClient:
             # Resubscribe to instruments
             if self.subscribed_instruments:
                 self.subscribe(self.subscribed_instruments)
+                modes: Dict[str, List[int]] = {}
+                for token, mode in self.instrument_modes.items():
+                    modes.setdefault(mode, []).append(token)
+                for mode, tokens in modes.items():
+                    self.set_mode(mode, tokens)
             
             if self.on_connect:
                 self.on_connect()
@@ -186,13 +212,17 @@ class WebSocketClient:
         """Handle WebSocket disconnection"""
         try:
             self._is_connected = False
-            logger.warning(f"WebSocket closed: code={code}, reason={reason}")
+            if self._closing:
+                logger.info(f"WebSocket closed: code={code}, reason={reason}")
+            else:
+                logger.warning(f"WebSocket closed: code={code}, reason={reason}")
             
             if self.on_close:
                 self.on_close(code, reason)
             
-            # Attempt reconnection
-            self._attempt_reconnect()
+            # Attempt reconnection unless disconnect() closed it
+            if not self._closing:
+                self._attempt_reconnect()
             
         except Exception as e:
             logger.error(f"Error in on_close: {e}")
@@ -205,8 +235,9 @@ class WebSocketClient:
             if self.on_error:
                 self.on_error(code, reason)
             
-            # Attempt reconnection on error
-            self._attempt_reconnect()
+            # Attempt reconnection on error unless disconnect() closed it
+            if not self._closing:
+                self._attempt_reconnect()
             
         except Exception as e:
             logger.error(f"Error in on_error handler: {e}")
@@ -240,6 +271,10 @@ class WebSocketClient:
             
             time.sleep(delay)
             
+            if self._closing:
+                logger.info("WebSocket was disconnected during the reconnection delay; not reconnecting")
+                return
+            
             # Verify authentication before reconnecting
             if not self.kite_client.is_authenticated():
                 logger.error("Kite client not authenticated. Cannot reconnect WebSocket.")
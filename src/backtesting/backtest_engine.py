@@ -5,17 +5,29 @@ Runs backtests on historical data using RSI strategy
 
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 import re
+import time
 from calendar import month_abbr
 from src.trading.rsi_agent import (
     RSIStrategy, RSITradingAgent, Segment, TradeSignal, OptionType
 )
+from src.trading.indicators import IndicatorCache, IndicatorFrame
+from src.trading.option_pricing import DEFAULT_DAYS_TO_EXPIRY, estimate_option_premium, years_to_expiry
 from src.backtesting.data_fetcher import HistoricalDataFetcher
+from src.api.instrument_store import get_instrument_store
+from src.utils.premium_fetcher import PremiumSeries, fetch_premium_series
 from src.utils.logger import get_logger
 
 logger = get_logger("backtesting")
 
+# Option premium candles: fetched per contract per day, matched within a window
+PREMIUM_INTERVAL = "5minute"
+PREMIUM_WINDOW_MINUTES = 10
+# A failed premium fetch (rate limit, network) is retried after this many seconds
+PREMIUM_RETRY_SECONDS = 60.0
+
 
 class BacktestResult:
     """Backtest result container"""
@@ -67,7 +79,10 @@ class BacktestEngine:
     
     def __init__(self, data_fetcher: HistoricalDataFetcher):
         self.data_fetcher = data_fetcher
-        self.option_premium_cache = {}  # Cache for option premiums: (segment, strike, option_type, expiry, timestamp) -> premium
+        self._option_instruments = {}  # (segment, strike, option_type, expiry) -> instrument details (None if not found)
+        self._premium_series = {}  # (instrument_token, date) -> PremiumSeries of that day (empty if Kite has no data)
+        self._premium_series_failures = {}  # (instrument_token, date) -> time.monotonic() of the last failed fetch
+        self.premium_series_fetches = 0  # Kite historical_data calls made for option premiums
         self._nfo_instruments_cache = None  # Cache for NFO instruments list (expensive to fetch)
         self._kite_authenticated = None  # Cache authentication status
         self._expiry_config = None  # Cache for expiry configuration
@@ -76,28 +91,13 @@ class BacktestEngine:
         """Load expiry configuration from config.json"""
         if self._expiry_config is None:
             try:
-                from src.config.config_manager import ConfigManager
-                import json
-                config_manager = ConfigManager()
-                config_path = config_manager.config_dir / "config.json"
-                if config_path.exists():
-                    with open(config_path, 'r') as f:
-                        config_data = json.load(f)
-                        self._expiry_config = config_data.get("expiry_config", {})
-                else:
-                    # Default config
-                    self._expiry_config = {
-                        "BANKNIFTY": {"duration": "Monthly", "day_of_week": "Thursday"},
-                        "NIFTY": {"duration": "Weekly", "day_of_week": "Tuesday"},
-                        "SENSEX": {"duration": "Weekly", "day_of_week": "Thursday"}
-                    }
+                from src.config.config_snapshot import get_config_snapshot
+                # Defaults when config.json is missing
+                self._expiry_config = get_config_snapshot().expiry_config()
             except Exception as e:
                 logger.warning(f"Could not load expiry config: {e}, using defaults")
-                self._expiry_config = {
-                    "BANKNIFTY": {"duration": "Monthly", "day_of_week": "Thursday"},
-                    "NIFTY": {"duration": "Weekly", "day_of_week": "Tuesday"},
-                    "SENSEX": {"duration": "Weekly", "day_of_week": "Thursday"}
-                }
+                from src.config.config_snapshot import DEFAULT_EXPIRY_CONFIG
+                self._expiry_config = {k: dict(v) for k, v in DEFAULT_EXPIRY_CONFIG.items()}
         return self._expiry_config
     
     def _calculate_atm_strike(self, spot_price: float, segment: str) -> int:
@@ -250,6 +250,10 @@ class BacktestEngine:
         Fetch actual option premium from Kite API for a specific timestamp
         Uses the same format and logic as get_premium_by_symbol.py
         
+        The contract's whole-day series is fetched once (see _get_premium_series)
+        and each timestamp is a binary search in it, so historical calls scale
+        with the number of contracts and days, not with the number of candles.
+        
         Args:
             strike: Strike price
             option_type: CE or PE
@@ -281,64 +285,69 @@ class BacktestEngine:
             minute_rounded = (minute // 5) * 5
             timestamp_aligned = timestamp_aligned.replace(minute=minute_rounded)
             
-            cache_key = (segment, strike, option_type, expiry, timestamp_aligned.isoformat())
-            if cache_key in self.option_premium_cache:
-                cached_result = self.option_premium_cache[cache_key]
-                # Check if it's a tuple (premium, details) or just premium
-                if isinstance(cached_result, tuple):
-                    return cached_result
-                else:
-                    # Old cache format - get details from instrument_details_cache
-                    if hasattr(self, 'instrument_details_cache') and cache_key in self.instrument_details_cache:
-                        return (cached_result, self.instrument_details_cache[cache_key])
-                    return None
+            instrument_details = self._resolve_option_instrument(kite_client, segment, strike, option_type, expiry)
+            if instrument_details is None:
+                return None
             
-            # Use the premium fetcher utility (same as get_premium_by_symbol.py)
-            from src.utils.premium_fetcher import fetch_premium_by_params
+            series = self._get_premium_series(kite_client, instrument_details['instrument_token'], timestamp_aligned.date())
+            if series is None:
+                return None
             
-            if expiry:
-                # Load expiry config
-                expiry_config = self._load_expiry_config()
-                
-                # Try to fetch using tradingsymbol format (BANKNIFTY25DEC59900PE)
-                # Exchange will be auto-detected based on segment (BFO for SENSEX, NFO for others)
-                result = fetch_premium_by_params(
-                    kite_client,
-                    segment,
-                    strike,
-                    option_type,
-                    expiry,
-                    timestamp,
-                    exchange="NFO",  # Default, will be auto-detected in fetch_premium_by_params
-                    window_minutes=10,
-                    interval="5minute",
-                    expiry_config=expiry_config
-                )
+            premium = series.premium_at(timestamp_aligned, max_gap=timedelta(minutes=PREMIUM_WINDOW_MINUTES))
+            if premium is None:
+                return None
+            return (premium, instrument_details)
                 
-                if result:
-                    premium, instrument_details = result
-                    # Cache the result
-                    self.option_premium_cache[cache_key] = (premium, instrument_details)
-                    if not hasattr(self, 'instrument_details_cache'):
-                        self.instrument_details_cache = {}
-                    self.instrument_details_cache[cache_key] = instrument_details
-                    return result
-            
+        except Exception as e:
+            logger.debug(f"Error in _fetch_option_premium_from_kite: {e}")
+            return None
+    
+    def _resolve_option_instrument(
+        self,
+        kite_client,
+        segment: str,
+        strike: int,
+        option_type: str,
+        expiry: Optional[str]
+    ) -> Optional[Dict]:
+        """
+        Instrument details of an option contract (looked up once per contract)
+        
+        Tries the tradingsymbol (BANKNIFTY25DEC59900PE) first, then filters the
+        exchange's instrument dump by expiry, then takes the nearest expiry.
+        """
+        contract_key = (segment, strike, option_type, expiry)
+        if contract_key in self._option_instruments:
+            return self._option_instruments[contract_key]
+        
+        # Use the premium fetcher utility (same as get_premium_by_symbol.py)
+        from src.utils.premium_fetcher import build_tradingsymbol, get_exchange_for_segment
+        
+        # Exchange is auto-detected based on segment (BFO for SENSEX, NFO for others)
+        exchange = get_exchange_for_segment(segment)
+        instrument_details = None
+        
+        if expiry:
+            tradingsymbol = build_tradingsymbol(segment, strike, option_type, expiry, self._load_expiry_config())
+            instrument = None
+            if tradingsymbol:
+                instrument = get_instrument_store().get_index(kite_client, exchange).by_tradingsymbol(tradingsymbol)
+            if instrument:
+                instrument_details = {
+                    'instrument_type': instrument.get('instrument_type', ''),
+                    'tradingsymbol': instrument.get('tradingsymbol', tradingsymbol),
+                    'exchange': instrument.get('exchange', exchange),
+                    'instrument_token': instrument['instrument_token'],
+                    'strike': instrument.get('strike', 0),
+                    'expiry': instrument.get('expiry', None)
+                }
+        
+        if instrument_details is None:
             # Fallback: Use the old filtering method if tradingsymbol lookup fails
-            # Get correct exchange for segment
-            from src.utils.premium_fetcher import get_exchange_for_segment
-            exchange = get_exchange_for_segment(segment)
             segment_code = 'BFO-OPT' if exchange == 'BFO' else 'NFO-OPT'
             
-            # Cache instruments by exchange (cache key includes exchange)
-            cache_key = f"{exchange}_instruments"
-            if not hasattr(self, '_instruments_cache'):
-                self._instruments_cache = {}
-            
-            if cache_key not in self._instruments_cache:
-                self._instruments_cache[cache_key] = kite_client.kite.instruments(exchange)
-            
-            instruments = self._instruments_cache[cache_key]
+            # Shared instrument dump of the exchange (loaded once per day per process)
+            instruments = get_instrument_store().instruments(kite_client, exchange)
             
             # Use the same approach as Straddle10PointswithSL-Limit.py:
             # Find instrument by filtering instruments with segment, name, type, strike, and expiry
@@ -354,8 +363,6 @@ class BacktestEngine:
                     "SENSEX": "SENSEX"
                 }
                 base_name = segment_map.get(segment.upper())
-                if not base_name:
-                    return None
                 
                 # Filter by base name, option type, and strike
                 filtered = [
@@ -364,119 +371,57 @@ class BacktestEngine:
                     inst.get('name') == base_name and
                     inst.get('instrument_type') == option_type.upper() and
                     inst.get('strike') == float(strike)
-                ]
-                
-                if not filtered:
-                    return None
+                ] if base_name else []
                 
                 # Use the first match (nearest expiry)
-                instrument = filtered[0]
-            
-            # Get the instrument token
-            instrument_token = instrument['instrument_token']
+                instrument = filtered[0] if filtered else None
             
-            # Store instrument details for debugging
-            instrument_details = {
-                'instrument_type': instrument.get('instrument_type', option_type.upper()),
-                'tradingsymbol': instrument.get('tradingsymbol', ''),
-                'exchange': instrument.get('exchange', 'NFO'),
-                'instrument_token': instrument_token,
-                'strike': instrument.get('strike', strike),
-                'expiry': instrument.get('expiry', expiry)
-            }
-            
-            # Use the aligned timestamp for fetching (ensures we get the correct 5-minute candle)
-            fetch_timestamp = timestamp_aligned
-            
-            # Make fetch_timestamp timezone-aware for comparison (same as original timestamp)
-            if fetch_timestamp.tzinfo is None:
-                try:
-                    from pytz import timezone
-                    ist = timezone('Asia/Kolkata')
-                    fetch_timestamp = ist.localize(fetch_timestamp)
-                except ImportError:
-                    from datetime import timezone as dt_timezone
-                    ist_offset = dt_timezone(timedelta(hours=5, minutes=30))
-                    fetch_timestamp = fetch_timestamp.replace(tzinfo=ist_offset)
-            
-            # Fetch historical data for the specific timestamp
-            # Get data for a small window around the timestamp
-            from_date = fetch_timestamp - timedelta(minutes=10)
-            to_date = fetch_timestamp + timedelta(minutes=10)
-            
-            # Kite API expects timezone-naive datetimes
-            from_date_naive = from_date.replace(tzinfo=None) if from_date.tzinfo else from_date
-            to_date_naive = to_date.replace(tzinfo=None) if to_date.tzinfo else to_date
-            
-            # Determine interval based on timestamp (if it's a 5-minute candle, use 5minute)
-            interval = "5minute"  # Default, can be made configurable
-            
-            try:
-                candles = kite_client.kite.historical_data(
-                    instrument_token,
-                    from_date_naive,
-                    to_date_naive,
-                    interval,
-                    continuous=False,
-                    oi=False
-                )
-                
-                if not candles:
-                    return None
-                
-                # Find the candle closest to the timestamp
-                df = pd.DataFrame(candles)
-                df['date'] = pd.to_datetime(df['date'])
-                
-                # Ensure both are timezone-aware (Kite returns IST timezone)
-                if df['date'].dt.tz is None:
-                    try:
-                        from pytz import timezone
-                        ist = timezone('Asia/Kolkata')
-                        df['date'] = df['date'].dt.tz_localize(ist)
-                    except ImportError:
-                        from datetime import timezone as dt_timezone
-                        ist_offset = dt_timezone(timedelta(hours=5, minutes=30))
-                        df['date'] = df['date'].dt.tz_localize(ist_offset)
-                
-                # Use aligned timestamp for finding the closest candle
-                df['time_diff'] = abs(df['date'] - fetch_timestamp)
-                closest_candle = df.loc[df['time_diff'].idxmin()]
-                
-                # Use close price as premium
-                premium = float(closest_candle['close'])
-                
-                # Cache the result (premium only for cache, details stored separately)
-                self.option_premium_cache[cache_key] = (premium, instrument_details)
-                
-                # Store instrument details in a separate cache
-                if not hasattr(self, 'instrument_details_cache'):
-                    self.instrument_details_cache = {}
-                self.instrument_details_cache[cache_key] = instrument_details
-                
-                return (premium, instrument_details)
-                
-            except Exception as e:
-                logger.debug(f"Error fetching option premium from Kite: {e}")
-                return None
-                
-        except Exception as e:
-            logger.debug(f"Error in _fetch_option_premium_from_kite: {e}")
+            if instrument:
+                instrument_details = {
+                    'instrument_type': instrument.get('instrument_type', option_type.upper()),
+                    'tradingsymbol': instrument.get('tradingsymbol', ''),
+                    'exchange': instrument.get('exchange', 'NFO'),
+                    'instrument_token': instrument['instrument_token'],
+                    'strike': instrument.get('strike', strike),
+                    'expiry': instrument.get('expiry', expiry)
+                }
+        
+        self._option_instruments[contract_key] = instrument_details
+        return instrument_details
+    
+    def _get_premium_series(self, kite_client, instrument_token: int, day) -> Optional[PremiumSeries]:
+        """A contract's candles for one day, fetched from Kite on first use"""
+        series_key = (instrument_token, day)
+        series = self._premium_series.get(series_key)
+        if series is not None:
+            return series
+        
+        # Failures are transient: remembered only briefly so a Kite outage is not hammered
+        failed_at = self._premium_series_failures.get(series_key)
+        if failed_at is not None and time.monotonic() - failed_at < PREMIUM_RETRY_SECONDS:
             return None
+        
+        series = fetch_premium_series(kite_client, instrument_token, day, interval=PREMIUM_INTERVAL)
+        self.premium_series_fetches += 1
+        if series is None:
+            self._premium_series_failures[series_key] = time.monotonic()
+            logger.debug(f"Premium fetch failed for instrument {instrument_token} on {day}, retrying in {PREMIUM_RETRY_SECONDS:.0f}s")
+            return None
+        
+        self._premium_series_failures.pop(series_key, None)
+        self._premium_series[series_key] = series
+        if not series:
+            logger.debug(f"No {PREMIUM_INTERVAL} premium data for instrument {instrument_token} on {day}")
+        return series
     
     def _estimate_option_premium(self, spot_price: float, strike: int, option_type: str, segment: str, days_to_expiry: int = 0, timestamp: Optional[datetime] = None, expiry: Optional[str] = None) -> Tuple[float, str]:
         """
         Get option premium - tries Kite API first, falls back to estimation
         
-        Premium = Intrinsic Value + Time Value
-        
-        Intrinsic Value:
-        - CE: max(0, spot - strike)
-        - PE: max(0, strike - spot)
-        
-        Time Value:
-        - Based on segment volatility and time to expiry
-        - Decreases as expiry approaches
+        The estimate is the Black-Scholes price at the segment's implied
+        volatility (src.trading.option_pricing). Time to expiry runs to the
+        expiry-day close when timestamp and expiry are known, otherwise it is
+        days_to_expiry (0 assumes DEFAULT_DAYS_TO_EXPIRY).
         
         Args:
             spot_price: Current spot price
@@ -539,79 +484,41 @@ class BacktestEngine:
                     missing_params.append("expiry")
                 log_level(f"Kite API not attempted: Missing {', '.join(missing_params)} (Segment: {segment}, Strike: {strike}, Type: {option_type})")
         
-        # Fall back to estimation if Kite data is not available
-        # Calculate intrinsic value
-        if option_type.upper() == "CE":
-            intrinsic_value = max(0.0, spot_price - strike)
-        elif option_type.upper() == "PE":
-            intrinsic_value = max(0.0, strike - spot_price)
-        else:
-            intrinsic_value = 0.0
-        
-        # Calculate time value based on segment and moneyness
-        # Base time value percentage (for ATM options with ~5 days to expiry)
-        base_time_value_pct = 0.01  # 1% of spot price
-        
-        # Adjust based on segment volatility
-        if segment.upper() == "BANKNIFTY":
-            base_time_value_pct = 0.015  # Higher volatility
-        elif segment.upper() == "SENSEX":
-            base_time_value_pct = 0.008  # Lower volatility
-        
-        # Adjust time value based on moneyness (ITM/OTM)
-        # Moneyness: percentage difference from ATM
-        moneyness_pct = abs(spot_price - strike) / spot_price if spot_price > 0 else 0
-        
-        # Calculate moneyness in points (more accurate for options)
-        moneyness_points = abs(spot_price - strike)
-        
-        # Segment-specific strike intervals
-        if segment.upper() == "NIFTY":
-            strike_interval = 50
-        elif segment.upper() == "BANKNIFTY":
-            strike_interval = 100
-        elif segment.upper() == "SENSEX":
-            strike_interval = 100
-        else:
-            strike_interval = 50
-        
-        # Time value is highest for ATM, decreases for ITM/OTM
-        # For ATM options (within 1 strike interval), use full time value
-        if moneyness_points <= strike_interval:
-            time_value_multiplier = 1.0
-        elif moneyness_points <= strike_interval * 2:  # 1-2 strikes away
-            time_value_multiplier = 0.7
-        elif moneyness_points <= strike_interval * 5:  # 2-5 strikes away
-            time_value_multiplier = 0.5
-        else:  # More than 5 strikes away
-            time_value_multiplier = 0.2
-        
-        # Adjust for time to expiry (assume weekly expiry, ~5 days)
-        # If days_to_expiry is 0, assume we're mid-week (3-4 days remaining)
-        if days_to_expiry == 0:
-            days_to_expiry = 4  # Assume 4 days to expiry for weekly options
-        
-        # Time value decays as expiry approaches
-        # Linear decay: time_value = base * (days_to_expiry / 7)
-        # But minimum 20% of base time value even on expiry day
-        time_decay_factor = max(0.2, min(1.0, days_to_expiry / 7.0))
-        
-        # Calculate time value
-        time_value = spot_price * base_time_value_pct * time_value_multiplier * time_decay_factor
-        
-        # Total premium = Intrinsic + Time Value
-        premium = intrinsic_value + time_value
-        
-        # Ensure minimum premium (options rarely trade below certain levels)
-        # Minimum is higher for ITM options
-        if intrinsic_value > 0:
-            min_premium = max(intrinsic_value * 1.1, 20.0)  # At least 10% above intrinsic or 20
+        # Fall back to the Black-Scholes estimate (shared with the live agents)
+        if timestamp is not None and expiry is not None:
+            years = years_to_expiry(timestamp, expiry)
         else:
-            min_premium = 10.0 if segment.upper() in ["NIFTY", "BANKNIFTY"] else 20.0
-        
-        premium = max(premium, min_premium)
+            years = (days_to_expiry or DEFAULT_DAYS_TO_EXPIRY) / 365.0
+        return (estimate_option_premium(segment, spot_price, strike, option_type, years), "Estimated")
+    
+    def _estimated_premium_path(
+        self,
+        df: pd.DataFrame,
+        frame: IndicatorFrame,
+        start: int,
+        end: int,
+        strike: int,
+        option_type: str,
+        segment: str
+    ) -> Dict:
+        """
+        Estimated premiums of one contract at the close, low and high of candles start..end-1
         
-        return (round(premium, 2), "Estimated")
+        Same values as _estimate_option_premium without Kite data at each
+        candle's timestamp, priced with a single Black-Scholes call.
+        """
+        years = years_to_expiry(df.index[start:end], self.expiry)
+        spots = np.concatenate((frame.close[start:end], frame.low[start:end], frame.high[start:end]))
+        close, low, high = np.split(estimate_option_premium(segment, spots, strike, option_type, np.tile(years, 3)), 3)
+        return {
+            "strike": strike,
+            "option_type": option_type,
+            "start": start,
+            "end": end,
+            "close": close,
+            "low": low,
+            "high": high,
+        }
     
     def _calculate_days_to_expiry(self, current_date: datetime, expiry_date_str: Optional[str] = None) -> int:
         """
@@ -636,6 +543,50 @@ class BacktestEngine:
         # For simplicity, assume 4 days remaining for weekly options
         return 4
     
+    def _entry_candle_data(self, frame: IndicatorFrame, entry_time) -> Dict:
+        """OHLC of the entry candle for trade verification (empty if the entry time is not in the data)"""
+        entry_candle_idx = frame.position_of(entry_time)
+        if entry_candle_idx is None:
+            return {}
+        candle_open, candle_high, candle_low, candle_close = frame.ohlc_at(entry_candle_idx)
+        return {
+            "entry_candle_open": candle_open,
+            "entry_candle_high": candle_high,
+            "entry_candle_low": candle_low,
+            "entry_candle_close": candle_close
+        }
+    
+    def fetch_backtest_data(
+        self,
+        segment: str,
+        from_date: datetime,
+        to_date: datetime,
+        time_interval: str = "5minute",
+        expiry: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Fetch the candles run_backtest needs: the test period plus bootstrap days for the indicators.
+        
+        The result can be passed to run_backtest(data=...) for several runs over the same period.
+        """
+        # Calculate how many days of historical data we need to bootstrap
+        # For 5-minute candles: 29 candles = 145 minutes = ~2.4 hours
+        # We'll fetch 2-3 days of data to ensure we have enough bootstrap data
+        # This allows trading to start from market open time (from config) on the test day
+        bootstrap_days = 3  # Fetch 3 days of data to ensure enough bootstrap candles
+        
+        # Fetch historical data including previous days for bootstrapping
+        bootstrap_from_date = from_date - timedelta(days=bootstrap_days)
+        logger.info(f"Fetching data from {bootstrap_from_date.date()} to {to_date.date()} (including {bootstrap_days} days before test period for indicator bootstrapping)")
+        
+        return self.data_fetcher.fetch_segment_data(
+            segment=segment,
+            from_date=bootstrap_from_date,  # Start earlier to get bootstrap data
+            to_date=to_date,
+            interval=time_interval,
+            expiry=expiry
+        )
+    
     def run_backtest(
         self,
         segment: str,
@@ -648,7 +599,9 @@ class BacktestEngine:
         initial_capital: float = 100000.0,
         expiry: Optional[str] = None,
         stop_loss: Optional[float] = None,
-        trade_regime: str = "Buy"  # "Buy" or "Sell"
+        trade_regime: str = "Buy",  # "Buy" or "Sell"
+        data: Optional[pd.DataFrame] = None,
+        indicator_cache: Optional[IndicatorCache] = None
     ) -> BacktestResult:
         """
         Run backtest on historical data
@@ -665,6 +618,8 @@ class BacktestEngine:
             expiry: Option expiry date (optional)
             stop_loss: Stop loss in points (optional, defaults to 50)
             trade_regime: Trade regime - "Buy" (default) or "Sell"
+            data: Candles from fetch_backtest_data (including bootstrap days); fetched when omitted
+            indicator_cache: IndicatorCache for data, shared between runs with different parameters
         
         Returns:
             BacktestResult object
@@ -706,23 +661,10 @@ class BacktestEngine:
         # RSI(9) needs 9 candles, so WMA(21) needs 21 RSI values = 9 + 20 = 29 candles total
         candles_needed_for_bootstrap = max(29, strategy.rsi_period + strategy.volume_strength_wma - 1)
         
-        # Calculate how many days of historical data we need to bootstrap
-        # For 5-minute candles: 29 candles = 145 minutes = ~2.4 hours
-        # We'll fetch 2-3 days of data to ensure we have enough bootstrap data
-        # This allows trading to start from market open time (from config) on the test day
-        bootstrap_days = 3  # Fetch 3 days of data to ensure enough bootstrap candles
-        
-        # Fetch historical data including previous days for bootstrapping
-        bootstrap_from_date = from_date - timedelta(days=bootstrap_days)
-        logger.info(f"Fetching data from {bootstrap_from_date.date()} to {to_date.date()} (including {bootstrap_days} days before test period for indicator bootstrapping)")
-        
-        df = self.data_fetcher.fetch_segment_data(
-            segment=segment,
-            from_date=bootstrap_from_date,  # Start earlier to get bootstrap data
-            to_date=to_date,
-            interval=time_interval,
-            expiry=expiry
-        )
+        if data is None:
+            df = self.fetch_backtest_data(segment, from_date, to_date, time_interval, expiry)
+        else:
+            df = data
         
         if df.empty:
             logger.error("No historical data fetched")
@@ -777,11 +719,19 @@ class BacktestEngine:
         ce_signals = 0
         no_candle_match = 0
         
+        # Batch mode: compute every indicator generate_signal reads (RSI, PS, VS, ATR, VWAP,
+        # momentum, candle type) once as arrays; the loop below only indexes into them
+        frame = IndicatorFrame.from_strategy(strategy, df, cache=indicator_cache)
+        
+        # Exclusive end index of each candle's trading day (intra-candle premiums are priced per day)
+        candle_days = df.index.normalize().values
+        day_end = np.searchsorted(candle_days, candle_days, side='right')
+        premium_path = None
+        
         # Process each candle
         for idx in range(start_idx, len(df)):
-            candle = df.iloc[idx]
-            timestamp = candle.name if hasattr(candle, 'name') else df.index[idx]
-            current_price = candle['close']
+            timestamp = df.index[idx]
+            current_price = frame.close[idx]
             
             # Track if we just entered a trade in this iteration (to skip exit checks on entry candle)
             just_entered = False
@@ -796,7 +746,8 @@ class BacktestEngine:
                     df, 
                     idx, 
                     allow_reentry=allow_reentry,
-                    reentry_candle_type=reentry_candle_type
+                    reentry_candle_type=reentry_candle_type,
+                    indicators=frame
                 )
                 
                 if signal in [TradeSignal.BUY_CE, TradeSignal.BUY_PE]:
@@ -918,21 +869,7 @@ class BacktestEngine:
                         
                         if exit_result['success']:
                             # Get entry candle data for verification
-                            entry_candle_idx = None
-                            for i in range(len(df)):
-                                if df.index[i] == exit_result['entry_time']:
-                                    entry_candle_idx = i
-                                    break
-                            
-                            entry_candle_data = {}
-                            if entry_candle_idx is not None and entry_candle_idx < len(df):
-                                entry_candle = df.iloc[entry_candle_idx]
-                                entry_candle_data = {
-                                    "entry_candle_open": float(entry_candle.get('open', exit_result['entry_price'])),
-                                    "entry_candle_high": float(entry_candle.get('high', exit_result['entry_price'])),
-                                    "entry_candle_low": float(entry_candle.get('low', exit_result['entry_price'])),
-                                    "entry_candle_close": float(entry_candle.get('close', exit_result['entry_price']))
-                                }
+                            entry_candle_data = self._entry_candle_data(frame, exit_result['entry_time'])
                             
                             # Calculate exit premium based on exit spot price
                             exit_strike = entry_strike_before_exit if entry_strike_before_exit is not None else self._calculate_atm_strike(current_price, segment)
@@ -1083,39 +1020,22 @@ class BacktestEngine:
                 # Kite API is only used for actual entry/exit premiums
                 current_strike = agent.entry_strike if agent.entry_strike is not None else self._calculate_atm_strike(current_price, segment)
                 days_to_expiry_current = self._calculate_days_to_expiry(timestamp, self.expiry)
-                current_premium, current_premium_source = self._estimate_option_premium(
-                    current_price, 
-                    current_strike, 
-                    agent.current_position.value, 
-                    segment, 
-                    days_to_expiry_current,
-                    timestamp=None,  # Skip Kite API for intra-candle checks (performance)
-                    expiry=None
-                )
-                
-                # Also calculate premium at candle high/low for accurate stop loss checks
-                # Use estimation only (skip Kite API) for these intra-candle checks to improve performance
-                candle_low = candle.get('low', current_price)
-                candle_high = candle.get('high', current_price)
-                # For intra-candle checks, use estimation directly (no Kite API call for performance)
-                premium_at_low, _ = self._estimate_option_premium(
-                    candle_low, 
-                    current_strike, 
-                    agent.current_position.value, 
-                    segment, 
-                    days_to_expiry_current,
-                    timestamp=None,  # Skip Kite API for intra-candle checks
-                    expiry=None
-                ) if candle_low != current_price else (current_premium, current_premium_source)
-                premium_at_high, _ = self._estimate_option_premium(
-                    candle_high, 
-                    current_strike, 
-                    agent.current_position.value, 
-                    segment, 
-                    days_to_expiry_current,
-                    timestamp=None,  # Skip Kite API for intra-candle checks
-                    expiry=None
-                ) if candle_high != current_price else (current_premium, current_premium_source)
+                # Close / low / high premiums of the rest of the day are priced in one vectorized call
+                # when the position (or the day) changes; each candle then only indexes into them
+                option_type_current = agent.current_position.value
+                if (premium_path is None or premium_path["strike"] != current_strike
+                        or premium_path["option_type"] != option_type_current
+                        or not premium_path["start"] <= idx < premium_path["end"]):
+                    premium_path = self._estimated_premium_path(
+                        df, frame, idx, int(day_end[idx]), current_strike, option_type_current, segment
+                    )
+                path_offset = idx - premium_path["start"]
+                current_premium = float(premium_path["close"][path_offset])
+                current_premium_source = "Estimated"
+                candle_low = frame.low[idx]
+                candle_high = frame.high[idx]
+                premium_at_low = float(premium_path["low"][path_offset])
+                premium_at_high = float(premium_path["high"][path_offset])
                 
                 exit_premium = current_premium  # Default to current premium
                 exit_premium_source = current_premium_source  # Default to current premium source
@@ -1432,21 +1352,7 @@ class BacktestEngine:
                     
                     if exit_result['success']:
                         # Get entry candle data for verification
-                        entry_candle_idx = None
-                        for i in range(len(df)):
-                            if df.index[i] == exit_result['entry_time']:
-                                entry_candle_idx = i
-                                break
-                        
-                        entry_candle_data = {}
-                        if entry_candle_idx is not None and entry_candle_idx < len(df):
-                            entry_candle = df.iloc[entry_candle_idx]
-                            entry_candle_data = {
-                                "entry_candle_open": float(entry_candle.get('open', exit_result['entry_price'])),
-                                "entry_candle_high": float(entry_candle.get('high', exit_result['entry_price'])),
-                                "entry_candle_low": float(entry_candle.get('low', exit_result['entry_price'])),
-                                "entry_candle_close": float(entry_candle.get('close', exit_result['entry_price']))
-                            }
+                        entry_candle_data = self._entry_candle_data(frame, exit_result['entry_time'])
                         
                         # Use the exit premium we calculated earlier (premium-based exit)
                         # exit_premium was set in the exit condition checks above
@@ -1600,7 +1506,8 @@ class BacktestEngine:
                     df, 
                     idx, 
                     allow_reentry=allow_reentry,
-                    reentry_candle_type=reentry_candle_type
+                    reentry_candle_type=reentry_candle_type,
+                    indicators=frame
                 )
                 
                 # Enhanced logging for debugging (especially for specific dates)
@@ -1691,9 +1598,9 @@ class BacktestEngine:
                             agent.entry_premium = entry_premium
                             
                             # Log detailed entry information for debugging
-                            candle_open = candle.get('open', current_price)
-                            candle_high = candle.get('high', current_price)
-                            candle_low = candle.get('low', current_price)
+                            candle_open = frame.open[idx]
+                            candle_high = frame.high[idx]
+                            candle_low = frame.low[idx]
                             logger.info(f"Signal Generated at: {timestamp} (Close: ₹{current_price:.2f})")
                             logger.info(f"Entry Executed at: {entry_timestamp} (Price: ₹{entry_price:.2f})")
                             logger.info(f"Candle OHLC - Open: ₹{candle_open:.2f}, High: ₹{candle_high:.2f}, Low: ₹{candle_low:.2f}, Close: ₹{current_price:.2f}")
@@ -1742,21 +1649,7 @@ class BacktestEngine:
             
             if exit_result['success']:
                 # Get entry candle data for verification
-                entry_candle_idx = None
-                for i in range(len(df)):
-                    if df.index[i] == exit_result['entry_time']:
-                        entry_candle_idx = i
-                        break
-                
-                entry_candle_data = {}
-                if entry_candle_idx is not None and entry_candle_idx < len(df):
-                    entry_candle = df.iloc[entry_candle_idx]
-                    entry_candle_data = {
-                        "entry_candle_open": float(entry_candle.get('open', exit_result['entry_price'])),
-                        "entry_candle_high": float(entry_candle.get('high', exit_result['entry_price'])),
-                        "entry_candle_low": float(entry_candle.get('low', exit_result['entry_price'])),
-                        "entry_candle_close": float(entry_candle.get('close', exit_result['entry_price']))
-                    }
+                entry_candle_data = self._entry_candle_data(frame, exit_result['entry_time'])
                 
                 # Calculate P&L based on premium difference (not spot difference)
                 # exit_premium and exit_premium_source were already calculated above before exit_trade
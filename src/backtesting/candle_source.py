@@ -0,0 +1,293 @@
+"""
+Candles-table Data Source for Backtesting
+Serves run_backtest from the index candles the live agents stored through
+CandleRepository, with gap detection and optional backfill
+"""
+
+from datetime import date, datetime, time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.backtesting.data_fetcher import HistoricalDataFetcher
+from src.backtesting.ohlcv_cache import OhlcvCache
+from src.database.models import DatabaseManager
+from src.database.repository import CandleRepository
+from src.utils.date_utils import get_current_ist_time
+from src.utils.logger import get_logger
+
+logger = get_logger("backtesting")
+
+# Exchange session: candles are expected from open until the last candle that starts before close
+SESSION_OPEN = time(9, 15)
+SESSION_CLOSE = time(15, 30)
+
+INTERVAL_MINUTES = {
+    "1minute": 1,
+    "3minute": 3,
+    "5minute": 5,
+    "10minute": 10,
+    "15minute": 15,
+    "30minute": 30,
+    "60minute": 60,
+    "1hour": 60,
+}
+
+# "market": Yahoo / Kite through HistoricalDataFetcher; "candles": the local candles table
+DATA_SOURCES = ("market", "candles")
+
+
+class CandleGap(NamedTuple):
+    """Consecutive expected candles missing from the candles table"""
+    start: datetime  # First missing candle
+    end: datetime  # Last missing candle
+    missing: int
+
+
+class CandleDataSource:
+    """
+    BacktestEngine data fetcher backed by the candles table.
+
+    fetch_segment_data() has the same signature and result shape as
+    HistoricalDataFetcher's (naive IST index, OHLCV columns), so
+    BacktestEngine(CandleDataSource(...)) runs offline against exactly the
+    candles the live agents saw. The range is read with one indexed query
+    into NumPy arrays. Weekday session candles that are missing are reported
+    as gaps, and with backfill=True they are downloaded through the fallback
+    fetcher and stored (existing candles are never overwritten).
+
+    Weekdays the market was closed (exchange holidays) are not gaps: a day
+    the OHLCV cache stored without candles, or one a backfill returned no
+    candles for while it did return the days around it, is remembered as
+    closed and neither reported nor downloaded again.
+    """
+
+    def __init__(
+        self,
+        candle_repo: CandleRepository,
+        fallback: Optional[HistoricalDataFetcher] = None,
+        backfill: bool = False,
+        include_synthetic: bool = True,
+        ohlcv_cache: Optional[OhlcvCache] = None
+    ):
+        self.candle_repo = candle_repo
+        self.fallback = fallback
+        self.backfill = backfill
+        self.include_synthetic = include_synthetic
+        # The fallback's cache knows the holidays it has downloaded
+        self.ohlcv_cache = ohlcv_cache if ohlcv_cache is not None else getattr(fallback, "ohlcv_cache", None)
+        # (segment, interval) -> weekdays a backfill found closed
+        self._closed_days: Dict[Tuple[str, str], Set[date]] = {}
+        self.last_gaps: List[CandleGap] = []
+        self.queries = 0
+        self.candles_served = 0
+        self.candles_backfilled = 0
+
+    @property
+    def kite_client(self):
+        """Kite client of the fallback fetcher (BacktestEngine uses it for option premiums)"""
+        return self.fallback.kite_client if self.fallback is not None else None
+
+    def load_arrays(self, segment: str, from_date: datetime, to_date: datetime, interval: str) -> Dict[str, np.ndarray]:
+        """Stored candles of every day from from_date to to_date (inclusive) as NumPy columns"""
+        start = datetime.combine(from_date.date(), time.min)
+        end = datetime.combine(to_date.date(), time.max)
+        self.queries += 1
+        arrays = self.candle_repo.get_candle_arrays(segment, start, end, interval)
+        if not self.include_synthetic and len(arrays['timestamp']):
+            real = ~arrays['is_synthetic']
+            arrays = {key: values[real] for key, values in arrays.items()}
+        return arrays
+
+    def closed_days(self, segment: str, interval: str, days: Iterable[date]) -> Set[date]:
+        """The given weekdays known to be market holidays"""
+        days = set(days)
+        closed = days & self._closed_days.get((segment.upper(), interval), set())
+        if self.ohlcv_cache is not None and days - closed:
+            closed |= self.ohlcv_cache.closed_days(segment, interval, days - closed)
+        return closed
+
+    def find_gaps(
+        self,
+        segment: str,
+        from_date: datetime,
+        to_date: datetime,
+        interval: str,
+        arrays: Optional[Dict[str, np.ndarray]] = None
+    ) -> List[CandleGap]:
+        """
+        Session candles of weekdays in the range that are not stored.
+
+        Only completed candles count, so today is checked up to now. Days
+        without any candle that are known holidays (see closed_days) are skipped.
+        """
+        minutes = INTERVAL_MINUTES.get(interval)
+        if minutes is None:
+            raise ValueError(f"Unsupported interval for gap detection: {interval}")
+        if arrays is None:
+            arrays = self.load_arrays(segment, from_date, to_date, interval)
+        step = np.timedelta64(minutes, 'm')
+        now = np.datetime64(get_current_ist_time().replace(tzinfo=None), 'ns')
+
+        gaps: List[CandleGap] = []
+        empty_days: List[date] = []
+        for day in pd.bdate_range(from_date.date(), to_date.date()):
+            session_open = np.datetime64(datetime.combine(day.date(), SESSION_OPEN), 'ns')
+            session_close = np.datetime64(datetime.combine(day.date(), SESSION_CLOSE), 'ns')
+            expected = np.arange(session_open, min(session_close, now - step + np.timedelta64(1, 'ns')), step)
+            if not len(expected):
+                continue
+            missing = expected[~np.isin(expected, arrays['timestamp'])]
+            if not len(missing):
+                continue
+            if len(missing) == len(expected):
+                empty_days.append(day.date())
+            # Split where consecutive missing candles are more than one interval apart
+            breaks = np.flatnonzero(np.diff(missing) != step) + 1
+            for run in np.split(missing, breaks):
+                gaps.append(CandleGap(
+                    pd.Timestamp(run[0]).to_pydatetime(),
+                    pd.Timestamp(run[-1]).to_pydatetime(),
+                    len(run)
+                ))
+        if empty_days:
+            closed = self.closed_days(segment, interval, empty_days)
+            gaps = [gap for gap in gaps if gap.start.date() not in closed]
+        return gaps
+
+    def backfill_gaps(self, segment: str, gaps: List[CandleGap], interval: str) -> int:
+        """
+        Download the days of the gaps through the fallback fetcher and store their missing candles.
+
+        Each run of gap days is fetched in one call together with the business
+        day on either side, so a gap day without candles between days with
+        candles is recognised as a holiday and remembered as closed.
+        """
+        if self.fallback is None or not gaps:
+            return 0
+        gaps_by_day: Dict[date, List[CandleGap]] = {}
+        for gap in gaps:
+            gaps_by_day.setdefault(gap.start.date(), []).append(gap)
+        today = get_current_ist_time().date()
+        holidays: List[date] = []
+        saved = 0
+        for span_start, span_end in _backfill_spans(sorted(gaps_by_day), today):
+            try:
+                df = self.fallback.fetch_segment_data(
+                    segment, datetime.combine(span_start, time.min), datetime.combine(span_end, time.min), interval
+                )
+            except Exception as e:
+                logger.warning(f"Could not backfill {segment} {interval} candles from {span_start} to {span_end}: {e}")
+                continue
+            if df is None or df.empty:
+                logger.warning(f"Backfill of {segment} {interval} candles from {span_start} to {span_end} returned no data")
+                continue
+            if df.index.tz is not None:
+                df = df.tz_convert("Asia/Kolkata").tz_localize(None)
+            traded = set(df.index.date)
+            first_traded, last_traded = min(traded), max(traded)
+            holidays.extend(day for day in gaps_by_day if first_traded < day < last_traded and day not in traded)
+            rows = [
+                {
+                    'segment': segment,
+                    'timestamp': timestamp.to_pydatetime(),
+                    'interval': interval,
+                    'open': float(row['open']),
+                    'high': float(row['high']),
+                    'low': float(row['low']),
+                    'close': float(row['close']),
+                    'volume': float(row.get('volume', 0.0) or 0.0),
+                    'is_synthetic': False
+                }
+                for timestamp, row in df.iterrows()
+                if any(gap.start <= timestamp <= gap.end for gap in gaps_by_day.get(timestamp.date(), ()))
+            ]
+            if rows:
+                saved += self.candle_repo.save_candles_batch(rows)
+        self.candles_backfilled += saved
+        if saved:
+            logger.info(f"Backfilled {saved} {segment} {interval} candles into the candles table")
+        if holidays:
+            self._closed_days.setdefault((segment.upper(), interval), set()).update(holidays)
+            logger.info(f"{segment} market was closed on {', '.join(str(day) for day in holidays)}; not treated as gaps")
+        return saved
+
+    def fetch_segment_data(
+        self,
+        segment: str,
+        from_date: datetime,
+        to_date: datetime,
+        interval: str = "5minute",
+        expiry: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Candles of a segment from the candles table (same shape as HistoricalDataFetcher.fetch_segment_data)
+
+        Args:
+            segment: NIFTY, SENSEX, or BANKNIFTY
+            from_date: Start date
+            to_date: End date (inclusive)
+            interval: Time interval (3minute, 5minute, 15minute, ...)
+            expiry: Not used (index candles)
+
+        Returns:
+            DataFrame with OHLCV data indexed by naive IST datetime
+        """
+        arrays = self.load_arrays(segment, from_date, to_date, interval)
+        gaps = self.find_gaps(segment, from_date, to_date, interval, arrays)
+        if gaps and self.backfill:
+            if self.backfill_gaps(segment, gaps, interval):
+                arrays = self.load_arrays(segment, from_date, to_date, interval)
+            gaps = self.find_gaps(segment, from_date, to_date, interval, arrays)
+        self.last_gaps = gaps
+        if gaps:
+            logger.warning(
+                f"{segment.upper()} {interval} candles table is missing {sum(gap.missing for gap in gaps)} candles "
+                f"in {len(gaps)} gap(s) between {from_date.date()} and {to_date.date()}"
+            )
+
+        self.candles_served += len(arrays['timestamp'])
+        logger.info(f"Loaded {len(arrays['timestamp'])} {segment.upper()} {interval} candles from the candles table")
+        if not len(arrays['timestamp']):
+            return pd.DataFrame()
+        return pd.DataFrame(
+            {col: arrays[col] for col in ('open', 'high', 'low', 'close', 'volume')},
+            index=pd.DatetimeIndex(arrays['timestamp'], name='date')
+        )
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queries": self.queries,
+            "candles_served": self.candles_served,
+            "candles_backfilled": self.candles_backfilled,
+            "gaps": len(self.last_gaps),
+        }
+
+
+def _backfill_spans(days: List[date], today: date) -> List[Tuple[date, date]]:
+    """Sorted gap days as (start, end) spans padded by one business day on each side (not past today)"""
+    spans: List[Tuple[date, date]] = []
+    for day in days:
+        start = (pd.Timestamp(day) - pd.offsets.BDay(1)).date()
+        end = min((pd.Timestamp(day) + pd.offsets.BDay(1)).date(), max(today, day))
+        if spans and start <= spans[-1][1]:
+            spans[-1] = (spans[-1][0], max(spans[-1][1], end))
+        else:
+            spans.append((start, end))
+    return spans
+
+
+def create_data_fetcher(data_source: str = "market", kite_client=None, backfill: bool = False):
+    """
+    Data fetcher for BacktestEngine by data source name (see DATA_SOURCES)
+
+    "candles" reads the local candles table (the default database) and, with
+    backfill, fills its gaps from Yahoo / Kite.
+    """
+    fetcher = HistoricalDataFetcher(kite_client=kite_client)
+    if data_source == "market":
+        return fetcher
+    if data_source == "candles":
+        return CandleDataSource(CandleRepository(DatabaseManager()), fallback=fetcher, backfill=backfill)
+    raise ValueError(f"Invalid data source: {data_source}. Must be one of: {', '.join(DATA_SOURCES)}")
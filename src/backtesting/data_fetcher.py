@@ -1,6 +1,6 @@
 """
 Historical Data Fetcher for Backtesting
-Fetches historical OHLCV data from Yahoo Finance API
+Fetches historical OHLCV data from Yahoo Finance API, cached on disk per day
 """
 
 from typing import List, Dict, Optional
@@ -11,7 +11,10 @@ try:
 except ImportError:
     yf = None
 from src.api.kite_client import KiteClient
+from src.api.instrument_store import get_instrument_store
+from src.backtesting.ohlcv_cache import OhlcvCache, get_ohlcv_cache
 from src.config.config_manager import ConfigManager
+from src.utils.date_utils import get_current_ist_time
 from src.utils.logger import get_logger
 
 logger = get_logger("backtesting")
@@ -20,9 +23,11 @@ logger = get_logger("backtesting")
 class HistoricalDataFetcher:
     """Fetches historical data for backtesting using Yahoo Finance"""
     
-    def __init__(self, kite_client: KiteClient = None):
+    def __init__(self, kite_client: KiteClient = None, ohlcv_cache: Optional[OhlcvCache] = None):
         self.kite_client = kite_client
         self.instrument_cache = {}
+        # Candles already downloaded are served from disk (see OhlcvCache)
+        self.ohlcv_cache = ohlcv_cache or get_ohlcv_cache()
         
         # Map segments to Yahoo Finance symbols
         self.yahoo_symbols = {
@@ -65,14 +70,13 @@ class HistoricalDataFetcher:
             exchange = get_exchange_for_segment(segment)
             segment_code = 'BFO' if exchange == 'BFO' else 'NFO'
             
-            # Get instruments list from the correct exchange
-            instruments = self.kite_client.kite.instruments(exchange)
+            # Instruments of this name from the shared, indexed instrument dump
+            index = get_instrument_store().get_index(self.kite_client, exchange)
             
-            # Filter by segment and instrument name
+            # Filter by segment
             filtered = [
-                inst for inst in instruments
-                if inst['name'] == instrument_name and
-                inst['segment'] == segment_code
+                inst for inst in index.by_name(instrument_name)
+                if inst['segment'] == segment_code
             ]
             
             if not filtered:
@@ -147,6 +151,26 @@ class HistoricalDataFetcher:
         Returns:
             DataFrame with OHLCV data indexed by datetime
         """
+        if segment.upper() not in ("NIFTY", "BANKNIFTY", "SENSEX"):
+            logger.error(f"Invalid segment: {segment}")
+            return pd.DataFrame()
+        
+        # Only the days not cached yet are downloaded, each run until the end of its last day
+        return self.ohlcv_cache.get(
+            "kite", segment, interval, from_date, to_date,
+            lambda run_start, run_end: self._download_segment_data_from_kite(
+                segment, run_start, run_end + timedelta(days=1) - timedelta(seconds=1), interval
+            )
+        )
+    
+    def _download_segment_data_from_kite(
+        self,
+        segment: str,
+        from_date: datetime,
+        to_date: datetime,
+        interval: str
+    ) -> pd.DataFrame:
+        """Download a segment's candles from the Kite API (bypasses the cache)"""
         if not self.kite_client or not self.kite_client.is_authenticated():
             logger.error("Kite client not authenticated")
             return pd.DataFrame()
@@ -265,6 +289,21 @@ class HistoricalDataFetcher:
             logger.error(f"Invalid segment: {segment}. Valid segments: {list(self.yahoo_symbols.keys())}")
             raise ValueError(f"Invalid segment: {segment}. Valid segments: {list(self.yahoo_symbols.keys())}")
         
+        # Only the days not cached yet are downloaded
+        return self.ohlcv_cache.get(
+            "yahoo", segment, interval, from_date, to_date,
+            lambda run_start, run_end: self._download_segment_data(yahoo_symbol, segment, run_start, run_end, interval)
+        )
+    
+    def _download_segment_data(
+        self,
+        yahoo_symbol: str,
+        segment: str,
+        from_date: datetime,
+        to_date: datetime,
+        interval: str
+    ) -> pd.DataFrame:
+        """Download a segment's candles from Yahoo Finance (bypasses the cache)"""
         logger.info(f"Fetching {segment} data from Yahoo Finance (symbol: {yahoo_symbol})")
         
         try:
@@ -292,11 +331,11 @@ class HistoricalDataFetcher:
                 ticker = yf.Ticker(yahoo_symbol)
                 
                 if is_intraday:
-                    # For intraday, calculate period needed
-                    days_diff = (to_date - from_date).days
-                    if days_diff <= 7:
+                    # For intraday, the period counts back from today, so it must reach from_date
+                    days_diff = (get_current_ist_time().date() - from_date.date()).days
+                    if days_diff < 7:
                         period = "7d"
-                    elif days_diff <= 60:
+                    elif days_diff < 60:
                         period = "60d"
                     else:
                         period = "1y"
@@ -0,0 +1,199 @@
+"""
+On-disk OHLCV Cache for Backtesting
+Stores fetched candles as one compressed NumPy file per (source, segment,
+interval, day) so repeated backtests over overlapping ranges only download
+the days they have not seen before
+"""
+
+import os
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.date_utils import get_current_ist_time
+from src.utils.logger import get_logger
+
+logger = get_logger("backtesting")
+
+# Use file-based path (relative to project root), same as the other data directories
+OHLCV_CACHE_DIR = Path(__file__).parent.parent.parent / "data" / "ohlcv_cache"
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# fetch(from_date, to_date) -> candles of those days (both inclusive)
+RangeFetcher = Callable[[datetime, datetime], pd.DataFrame]
+
+
+class OhlcvCache:
+    """
+    Day-partitioned cache of historical candles.
+
+    get() serves the days it already has from disk and calls the fetcher once
+    per run of consecutive missing days. Only completed days are stored (never
+    today). A fetched day with no candles is stored empty only when the market
+    was closed: a weekend, or a day between two days the same fetch returned
+    candles for (a holiday). Other empty days (before the source's history starts, a failed
+    download) are left uncached and fetched again next time.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else OHLCV_CACHE_DIR
+        self._lock = threading.Lock()
+        self.days_hit = 0
+        self.days_fetched = 0
+        self.fetches = 0
+
+    def _day_path(self, source: str, segment: str, interval: str, day: date) -> Path:
+        return self.cache_dir / source / segment.upper() / interval / f"{day.isoformat()}.npz"
+
+    def load_day(self, source: str, segment: str, interval: str, day: date) -> Optional[pd.DataFrame]:
+        """Cached candles of one day (possibly empty), or None if the day is not cached"""
+        path = self._day_path(source, segment, interval, day)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                index = pd.DatetimeIndex(npz['index'], name=str(npz['index_name']) or None)
+                tz = str(npz['tz'])
+                if tz:
+                    index = index.tz_localize(tz)
+                return pd.DataFrame({col: npz[col] for col in OHLCV_COLUMNS}, index=index)
+        except Exception as e:
+            logger.warning(f"Could not read OHLCV cache {path}: {e}")
+            return None
+
+    def save_day(self, source: str, segment: str, interval: str, day: date, df: pd.DataFrame):
+        """Store one day's candles (wall-clock times plus the timezone name)"""
+        path = self._day_path(source, segment, interval, day)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            index = df.index
+            tz = str(index.tz) if index.tz is not None else ''
+            wall_clock = index.tz_localize(None) if index.tz is not None else index
+            # Parallel backtest workers may write the same day: one temp file per writer
+            tmp_path = path.parent / f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.savez_compressed(
+                    f,
+                    index=wall_clock.values,
+                    index_name=np.array(index.name or ''),
+                    tz=np.array(tz),
+                    **{col: df[col].to_numpy() for col in OHLCV_COLUMNS}
+                )
+            tmp_path.replace(path)
+        except Exception as e:
+            logger.warning(f"Could not write OHLCV cache {path}: {e}")
+
+    def get(
+        self,
+        source: str,
+        segment: str,
+        interval: str,
+        from_date: datetime,
+        to_date: datetime,
+        fetch: RangeFetcher
+    ) -> pd.DataFrame:
+        """
+        Candles of every day from from_date to to_date (inclusive), fetching only missing days.
+
+        Args:
+            source: Data source name ("yahoo", "kite"), part of the cache key
+            segment: NIFTY, SENSEX, or BANKNIFTY
+            interval: Time interval (5minute, 15minute, 1day, ...)
+            from_date: First day
+            to_date: Last day
+            fetch: Called as fetch(run_start, run_end) for each run of missing days
+        """
+        days = [from_date.date() + timedelta(days=i) for i in range((to_date.date() - from_date.date()).days + 1)]
+        today = get_current_ist_time().date()
+
+        frames: Dict[date, pd.DataFrame] = {}
+        missing: List[date] = []
+        for day in days:
+            cached = self.load_day(source, segment, interval, day) if day < today else None
+            if cached is None:
+                missing.append(day)
+            else:
+                frames[day] = cached
+
+        for run_start, run_end in _consecutive_runs(missing):
+            df = fetch(datetime.combine(run_start, datetime.min.time()), datetime.combine(run_end, datetime.min.time()))
+            with self._lock:
+                self.fetches += 1
+            if df is None or df.empty:
+                continue
+            df = df[OHLCV_COLUMNS]
+            by_day = {day: group for day, group in df.groupby(df.index.date)}
+            first_traded, last_traded = min(by_day), max(by_day)
+            for i in range((run_end - run_start).days + 1):
+                day = run_start + timedelta(days=i)
+                frames[day] = by_day.get(day, df.iloc[0:0])
+                # Empty days are known closed on weekends and between the first and last day with candles
+                if day < today and (day in by_day or day.weekday() >= 5 or first_traded < day < last_traded):
+                    self.save_day(source, segment, interval, day, frames[day])
+
+        with self._lock:
+            self.days_hit += len(days) - len(missing)
+            self.days_fetched += len(missing)
+        logger.info(
+            f"OHLCV cache {source}/{segment.upper()}/{interval}: {len(days) - len(missing)}/{len(days)} days from disk, "
+            f"{len(missing)} fetched"
+        )
+
+        non_empty = [frames[day] for day in days if day in frames and not frames[day].empty]
+        if not non_empty:
+            return pd.DataFrame()
+        return pd.concat(non_empty).sort_index()
+
+    def closed_days(self, segment: str, interval: str, days: Iterable[date]) -> Set[date]:
+        """Days any source has stored without candles (weekends and holidays, see get())"""
+        if not self.cache_dir.exists():
+            return set()
+        sources = [path.name for path in self.cache_dir.iterdir() if path.is_dir()]
+        closed = set()
+        for day in days:
+            for source in sources:
+                if not self._day_path(source, segment, interval, day).exists():
+                    continue
+                cached = self.load_day(source, segment, interval, day)
+                if cached is not None and cached.empty:
+                    closed.add(day)
+                    break
+        return closed
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "days_hit": self.days_hit,
+                "days_fetched": self.days_fetched,
+                "fetches": self.fetches,
+            }
+
+
+def _consecutive_runs(days: List[date]) -> List[Tuple[date, date]]:
+    """Group sorted days into (first, last) runs of consecutive days"""
+    runs: List[Tuple[date, date]] = []
+    for day in days:
+        if runs and day == runs[-1][1] + timedelta(days=1):
+            runs[-1] = (runs[-1][0], day)
+        else:
+            runs.append((day, day))
+    return runs
+
+
+# Global cache instance
+_cache_instance: Optional[OhlcvCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_ohlcv_cache() -> OhlcvCache:
+    """Get the process-wide OhlcvCache"""
+    global _cache_instance
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None:
+                _cache_instance = OhlcvCache()
+    return _cache_instance
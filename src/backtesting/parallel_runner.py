@@ -0,0 +1,248 @@
+"""
+Parallel Backtest Runner
+Runs BacktestEngine.run_backtest for several segments / date chunks in a process pool
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.utils.logger import get_logger
+
+logger = get_logger("backtesting")
+
+
+@dataclass
+class BacktestTask:
+    """One run_backtest call: a segment over a (possibly chunked) date range"""
+    segment: str
+    from_date: datetime
+    to_date: datetime
+    params: Dict[str, Any] = field(default_factory=dict)  # Remaining run_backtest keyword arguments
+    chunk_index: int = 0
+    data_source: str = "market"  # See candle_source.DATA_SOURCES
+    backfill: bool = False  # Fill candles-table gaps from the market data source
+
+
+def kite_session_spec(kite_client) -> Optional[Dict[str, str]]:
+    """
+    Picklable description of an authenticated KiteClient.
+
+    The KiteConnect session cannot be shared with worker processes, so workers
+    rebuild their own client from the config directory and access token.
+    """
+    if kite_client is None or not getattr(kite_client, 'access_token', None):
+        return None
+    config_manager = getattr(kite_client, 'config_manager', None)
+    config_dir = getattr(config_manager, 'config_dir', None)
+    return {
+        "config_dir": str(config_dir) if config_dir else None,
+        "access_token": kite_client.access_token
+    }
+
+
+# Per-process engine, reused by every task a worker runs so the instrument and
+# premium caches of BacktestEngine survive between segments / chunks
+_worker_engine = None
+_worker_engine_key = None
+
+
+def get_worker_engine(kite_spec: Optional[Dict[str, str]], data_source: str = "market", backfill: bool = False):
+    """Create (or reuse) the BacktestEngine of this worker process"""
+    global _worker_engine, _worker_engine_key
+
+    key = ((kite_spec or {}).get("access_token"), data_source, backfill)
+    if _worker_engine is not None and _worker_engine_key == key:
+        return _worker_engine
+
+    from src.backtesting.candle_source import create_data_fetcher
+    from src.backtesting.backtest_engine import BacktestEngine
+
+    kite_client = None
+    if kite_spec:
+        try:
+            from pathlib import Path
+            from src.api.kite_client import KiteClient
+            from src.config.config_manager import ConfigManager
+
+            config_dir = kite_spec.get("config_dir")
+            config_manager = ConfigManager(Path(config_dir) if config_dir else None)
+            kite_client = KiteClient(config_manager)
+            kite_client.set_access_token(kite_spec["access_token"])
+        except Exception as e:
+            logger.warning(f"Backtest worker could not restore Kite session, continuing without it: {e}")
+            kite_client = None
+
+    _worker_engine = BacktestEngine(create_data_fetcher(data_source, kite_client=kite_client, backfill=backfill))
+    _worker_engine_key = key
+    return _worker_engine
+
+
+def run_backtest_task(task: BacktestTask, kite_spec: Optional[Dict[str, str]] = None) -> Dict:
+    """
+    Worker entry point: run one task and return BacktestResult.to_dict().
+
+    Module-level so it can be pickled for ProcessPoolExecutor.
+    """
+    engine = get_worker_engine(kite_spec, task.data_source, task.backfill)
+    logger.info(
+        f"[pid {os.getpid()}] Running backtest task: {task.segment} chunk {task.chunk_index} "
+        f"({task.from_date.date()} to {task.to_date.date()})"
+    )
+    result = engine.run_backtest(
+        segment=task.segment,
+        from_date=task.from_date,
+        to_date=task.to_date,
+        **task.params
+    )
+    if result is None:
+        raise RuntimeError(f"Backtest returned None for segment: {task.segment}")
+    return result.to_dict()
+
+
+def split_date_range(from_date: datetime, to_date: datetime, chunk_days: Optional[int]) -> List[Tuple[datetime, datetime]]:
+    """
+    Split [from_date, to_date] at day boundaries into chunks of chunk_days days.
+
+    Chunks do not overlap: each one ends one second before the next one starts
+    (the last chunk keeps the original to_date). Indicator warm-up overlap comes
+    from run_backtest itself, which fetches bootstrap days before its from_date.
+    Positions are squared off intraday, so no trade spans two chunks.
+    """
+    if not chunk_days or chunk_days <= 0:
+        return [(from_date, to_date)]
+
+    start = datetime.combine(from_date.date(), datetime.min.time(), tzinfo=from_date.tzinfo)
+    if start < from_date:
+        start = from_date
+
+    chunks = []
+    chunk_start = start
+    while True:
+        next_start = datetime.combine(
+            chunk_start.date() + timedelta(days=chunk_days), datetime.min.time(), tzinfo=from_date.tzinfo
+        )
+        if next_start > to_date:
+            chunks.append((chunk_start, to_date))
+            break
+        chunks.append((chunk_start, next_start - timedelta(seconds=1)))
+        chunk_start = next_start
+    return chunks
+
+
+def build_tasks(
+    segments: List[str],
+    from_date: datetime,
+    to_date: datetime,
+    params: Dict[str, Any],
+    chunk_days: Optional[int] = None,
+    segment_params: Optional[Dict[str, Dict[str, Any]]] = None,
+    data_source: str = "market",
+    backfill: bool = False
+) -> List[BacktestTask]:
+    """Create one task per segment and date chunk (segment_params override params per segment)"""
+    tasks = []
+    for segment in segments:
+        task_params = dict(params)
+        if segment_params and segment in segment_params:
+            task_params.update(segment_params[segment])
+        for chunk_index, (chunk_from, chunk_to) in enumerate(split_date_range(from_date, to_date, chunk_days)):
+            tasks.append(BacktestTask(
+                segment=segment,
+                from_date=chunk_from,
+                to_date=chunk_to,
+                params=task_params,
+                chunk_index=chunk_index,
+                data_source=data_source,
+                backfill=backfill
+            ))
+    return tasks
+
+
+def merge_chunk_results(
+    chunk_results: List[Dict],
+    from_date: datetime,
+    to_date: datetime,
+    initial_capital: float
+) -> Dict:
+    """
+    Merge the result dicts of consecutive date chunks of one segment.
+
+    Every chunk starts with initial_capital, so final capital is initial_capital plus
+    the capital change of each chunk. max_drawdown / max_profit are the worst / best
+    chunk values (drawdown is not tracked across chunk boundaries).
+    """
+    if len(chunk_results) == 1:
+        return chunk_results[0]
+
+    trades = []
+    summary = {
+        "total_trades": 0,
+        "winning_trades": 0,
+        "losing_trades": 0,
+        "total_profit": 0.0,
+        "total_loss": 0.0,
+        "net_pnl": 0.0,
+        "max_drawdown": 0.0,
+        "max_profit": 0.0,
+        "initial_capital": initial_capital,
+        "final_capital": initial_capital
+    }
+    for chunk in chunk_results:
+        trades.extend(chunk.get('trades', []))
+        chunk_summary = chunk.get('summary', {})
+        for key in ('total_trades', 'winning_trades', 'losing_trades', 'total_profit', 'total_loss', 'net_pnl'):
+            summary[key] += chunk_summary.get(key, 0)
+        summary['final_capital'] += chunk_summary.get('final_capital', initial_capital) - chunk_summary.get('initial_capital', initial_capital)
+        summary['max_drawdown'] = max(summary['max_drawdown'], chunk_summary.get('max_drawdown', 0.0))
+        summary['max_profit'] = max(summary['max_profit'], chunk_summary.get('max_profit', 0.0))
+
+    trades.sort(key=lambda x: x.get('entry_time') or '')
+
+    summary['win_rate'] = (summary['winning_trades'] / summary['total_trades']) * 100 if summary['total_trades'] > 0 else 0.0
+    if summary['total_loss'] > 0:
+        summary['profit_factor'] = summary['total_profit'] / summary['total_loss']
+    elif summary['total_profit'] > 0:
+        summary['profit_factor'] = None  # Use None instead of inf for JSON compatibility
+    else:
+        summary['profit_factor'] = 0.0
+    summary['return_pct'] = ((summary['final_capital'] - initial_capital) / initial_capital) * 100 if initial_capital else 0.0
+    summary['start_date'] = from_date.isoformat()
+    summary['end_date'] = to_date.isoformat()
+
+    return {"trades": trades, "summary": summary}
+
+
+class ParallelBacktestRunner:
+    """Process pool for backtest tasks (shared by all requests of the dashboard process)"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 1))
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: the dashboard process runs threads (agents, risk monitor); forking it is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"Started backtest process pool with {self.max_workers} workers")
+        return self._executor
+
+    def submit(self, tasks: List[BacktestTask], kite_spec: Optional[Dict[str, str]] = None) -> List[Future]:
+        """Submit tasks; futures resolve to BacktestResult.to_dict() of each task"""
+        executor = self._get_executor()
+        return [executor.submit(run_backtest_task, task, kite_spec) for task in tasks]
+
+    def submit_call(self, fn: Callable, *args) -> Future:
+        """Submit any picklable module-level function to the pool"""
+        return self._get_executor().submit(fn, *args)
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
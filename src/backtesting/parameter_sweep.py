@@ -0,0 +1,263 @@
+"""
+Parameter Sweep (Grid Search) for Backtests
+Runs BacktestEngine over every combination of a parameter grid and ranks the results
+"""
+
+import itertools
+import math
+from concurrent.futures import as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from src.backtesting.parallel_runner import ParallelBacktestRunner, get_worker_engine, kite_session_spec
+from src.trading.indicators import IndicatorCache
+from src.utils.logger import get_logger
+
+logger = get_logger("backtesting")
+
+# Parameters that can be swept, with the run_backtest defaults used when a grid omits them
+SWEEP_DEFAULTS: Dict[str, Any] = {
+    "time_interval": "5minute",
+    "rsi_period": 9,
+    "price_strength_ema": 3,
+    "volume_strength_wma": 21,
+    "stop_loss": None,
+    "trade_regime": "Buy"
+}
+
+# Ranking keys: True = higher is better
+RANK_KEYS: Dict[str, bool] = {
+    "net_pnl": True,
+    "return_pct": True,
+    "win_rate": True,
+    "profit_factor": True,
+    "max_drawdown": False
+}
+
+
+@dataclass
+class SweepBatch:
+    """Combinations sharing one segment, candle data and RSI period (run in one worker)"""
+    segment: str
+    from_date: datetime
+    to_date: datetime
+    data: pd.DataFrame
+    combinations: List[Dict[str, Any]]
+    base_params: Dict[str, Any] = field(default_factory=dict)  # initial_capital, expiry
+
+
+def expand_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Cartesian product of a parameter grid.
+
+    Every combination contains all SWEEP_DEFAULTS keys; parameters missing from
+    the grid keep their default.
+    """
+    unknown = set(grid) - set(SWEEP_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameter(s): {', '.join(sorted(unknown))}")
+
+    names = list(SWEEP_DEFAULTS)
+    values = []
+    for name in names:
+        options = grid.get(name)
+        if options is None:
+            options = [SWEEP_DEFAULTS[name]]
+        elif not isinstance(options, (list, tuple)):
+            options = [options]
+        if len(options) == 0:
+            raise ValueError(f"Sweep parameter '{name}' has no values")
+        values.append(list(options))
+    return [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+
+def _summary_row(segment: str, combination: Dict[str, Any], summary: Dict[str, Any]) -> Dict[str, Any]:
+    row = {"segment": segment, **combination}
+    for key in ("total_trades", "net_pnl", "max_drawdown", "win_rate", "profit_factor", "return_pct", "final_capital"):
+        row[key] = summary.get(key)
+    row["error"] = summary.get("error")
+    return row
+
+
+def run_sweep_batch(batch: SweepBatch, kite_spec: Optional[Dict[str, str]] = None, engine=None) -> List[Dict[str, Any]]:
+    """
+    Run every combination of a batch on its shared candle data.
+
+    Worker entry point (module-level so it can be pickled). All runs share one
+    IndicatorCache, so RSI is computed once for the batch and PS / VS once per length.
+    """
+    if engine is None:
+        engine = get_worker_engine(kite_spec)
+    cache = IndicatorCache(batch.data)
+    rows = []
+    for combination in batch.combinations:
+        try:
+            result = engine.run_backtest(
+                segment=batch.segment,
+                from_date=batch.from_date,
+                to_date=batch.to_date,
+                data=batch.data,
+                indicator_cache=cache,
+                **batch.base_params,
+                **combination
+            )
+            rows.append(_summary_row(batch.segment, combination, result.to_dict()["summary"]))
+        except Exception as e:
+            logger.error(f"Sweep run failed for {batch.segment} {combination}: {e}")
+            rows.append(_summary_row(batch.segment, combination, {"error": str(e)}))
+    return rows
+
+
+def rank_results(rows: List[Dict[str, Any]], rank_by: str = "net_pnl") -> List[Dict[str, Any]]:
+    """
+    Sort result rows best-first by rank_by (ties: lower drawdown, then higher win rate)
+    and number them. Failed runs go last.
+    """
+    if rank_by not in RANK_KEYS:
+        raise ValueError(f"Invalid rank_by: {rank_by}. Must be one of: {', '.join(RANK_KEYS)}")
+    higher_is_better = RANK_KEYS[rank_by]
+
+    def number(value, default):
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return default
+        return value
+
+    def sort_key(row):
+        # profit_factor None means "no losses" (infinite) in BacktestResult
+        missing = math.inf if rank_by == "profit_factor" else -math.inf
+        primary = number(row.get(rank_by), missing if higher_is_better else math.inf)
+        return (
+            row.get("error") is not None,
+            -primary if higher_is_better else primary,
+            number(row.get("max_drawdown"), math.inf),
+            -number(row.get("win_rate"), 0.0)
+        )
+
+    ranked = sorted(rows, key=sort_key)
+    for position, row in enumerate(ranked, start=1):
+        row["rank"] = position
+    return ranked
+
+
+class ParameterSweep:
+    """
+    Grid search over backtest parameters.
+
+    Candles are fetched once per (segment, time interval) with the engine's data
+    fetcher; combinations are grouped by RSI period so each group shares its
+    indicators, and the groups are fanned out across the process pool.
+    """
+
+    def __init__(self, engine, runner: Optional[ParallelBacktestRunner] = None):
+        self.engine = engine
+        self.runner = runner
+
+    def plan_batches(
+        self,
+        segments: List[str],
+        from_date: datetime,
+        to_date: datetime,
+        combinations: List[Dict[str, Any]],
+        initial_capital: float = 100000.0,
+        segment_expiries: Optional[Dict[str, Optional[str]]] = None,
+        max_batch_size: Optional[int] = None
+    ) -> Tuple[List[SweepBatch], List[Dict[str, Any]]]:
+        """
+        Fetch data once per (segment, interval) and split combinations into batches.
+
+        Returns:
+            (batches, error rows for combinations whose data could not be fetched)
+        """
+        batches = []
+        failed_rows = []
+        for segment in segments:
+            expiry = (segment_expiries or {}).get(segment)
+            intervals = list(dict.fromkeys(combination["time_interval"] for combination in combinations))
+            for time_interval in intervals:
+                interval_combinations = [c for c in combinations if c["time_interval"] == time_interval]
+                try:
+                    data = self.engine.fetch_backtest_data(segment, from_date, to_date, time_interval, expiry)
+                    error = None if data is not None and not data.empty else "No historical data fetched"
+                except Exception as e:
+                    error = str(e)
+                if error:
+                    logger.error(f"Sweep: no data for {segment} {time_interval} ({error}), skipping its combinations")
+                    failed_rows.extend(
+                        _summary_row(segment, combination, {"error": error}) for combination in interval_combinations
+                    )
+                    continue
+
+                groups: Dict[Any, List[Dict[str, Any]]] = {}
+                for combination in interval_combinations:
+                    groups.setdefault(combination["rsi_period"], []).append(combination)
+
+                for group in groups.values():
+                    size = max_batch_size or len(group)
+                    for start in range(0, len(group), size):
+                        batches.append(SweepBatch(
+                            segment=segment,
+                            from_date=from_date,
+                            to_date=to_date,
+                            data=data,
+                            combinations=group[start:start + size],
+                            base_params={"initial_capital": initial_capital, "expiry": expiry}
+                        ))
+        return batches, failed_rows
+
+    def run(
+        self,
+        segments: List[str],
+        from_date: datetime,
+        to_date: datetime,
+        grid: Dict[str, List[Any]],
+        initial_capital: float = 100000.0,
+        segment_expiries: Optional[Dict[str, Optional[str]]] = None,
+        rank_by: str = "net_pnl",
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run the sweep.
+
+        Returns:
+            Dict with "results" (ranked rows: segment, parameters, total_trades, net_pnl,
+            max_drawdown, win_rate, profit_factor, return_pct, final_capital, error, rank),
+            "combinations" and "rank_by"
+        """
+        if rank_by not in RANK_KEYS:
+            raise ValueError(f"Invalid rank_by: {rank_by}. Must be one of: {', '.join(RANK_KEYS)}")
+        combinations = expand_grid(grid)
+        total = len(combinations) * len(segments)
+
+        # Enough batches to keep every worker busy, but never mix RSI periods in one batch
+        max_batch_size = None
+        if self.runner is not None:
+            max_batch_size = max(1, math.ceil(total / self.runner.max_workers))
+        batches, rows = self.plan_batches(
+            segments, from_date, to_date, combinations, initial_capital, segment_expiries, max_batch_size
+        )
+        logger.info(f"Parameter sweep: {total} runs in {len(batches)} batch(es) for {', '.join(segments)}")
+
+        completed = len(rows)
+        if self.runner is None:
+            for batch in batches:
+                rows.extend(run_sweep_batch(batch, engine=self.engine))
+                completed += len(batch.combinations)
+                if progress_callback:
+                    progress_callback(completed, total)
+        else:
+            kite_spec = kite_session_spec(getattr(self.engine.data_fetcher, 'kite_client', None))
+            futures = {self.runner.submit_call(run_sweep_batch, batch, kite_spec): batch for batch in batches}
+            for future in as_completed(futures):
+                rows.extend(future.result())
+                completed += len(futures[future].combinations)
+                if progress_callback:
+                    progress_callback(completed, total)
+
+        return {
+            "results": rank_results(rows, rank_by),
+            "combinations": total,
+            "rank_by": rank_by
+        }
@@ -9,6 +9,8 @@ from pathlib import Path
 from typing import Dict, Any, Optional, Tuple
 from pydantic import BaseModel, Field, validator
 
+from src.utils.logger import QUEUE_POLICIES
+
 
 class UserConfig(BaseModel):
     """User-configurable parameters"""
@@ -16,6 +18,8 @@ class UserConfig(BaseModel):
     api_secret: str = Field(..., description="Zerodha API Secret")
     environment: str = Field(default="dev", description="Environment: dev or prod")
     log_level: str = Field(default="INFO", description="Logging level")
+    log_queue_size: Optional[int] = Field(None, gt=0, description="Maximum log records waiting to be written (default 10000)")
+    log_queue_policy: Optional[str] = Field(None, description="When the log queue is full: drop or block (default drop)")
     notification_email: Optional[str] = Field(None, description="Email for notifications")
     notification_phone: Optional[str] = Field(None, description="Phone for SMS notifications")
     
@@ -31,6 +35,12 @@ class UserConfig(BaseModel):
         if v.upper() not in valid_levels:
             raise ValueError(f'Log level must be one of {valid_levels}')
         return v.upper()
+    
+    @validator('log_queue_policy')
+    def validate_log_queue_policy(cls, v):
+        if v is not None and v.lower() not in QUEUE_POLICIES:
+            raise ValueError(f'Log queue policy must be one of {list(QUEUE_POLICIES)}')
+        return v.lower() if v is not None else v
 
 
 class AdminConfig(BaseModel):
@@ -0,0 +1,177 @@
+"""
+Process-wide snapshot of config/config.json.
+
+Hot paths (market-hours checks every second, strategy construction, expiry
+lookups) read settings from an immutable ConfigSnapshot instead of opening
+and parsing config.json on every call. The file's mtime is checked at most
+once per CHECK_INTERVAL_SECONDS and the snapshot is rebuilt only when it
+changed, so edits still take effect without a restart.
+"""
+
+import copy
+import json
+import os
+import threading
+import time as time_module
+from datetime import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from src.utils.logger import get_logger
+
+logger = get_logger("config")
+
+CONFIG_PATH = Path(__file__).parent.parent.parent / "config" / "config.json"
+
+# How often the file's mtime is looked at (seconds)
+CHECK_INTERVAL_SECONDS = 1.0
+
+DEFAULT_MARKET_HOURS = (time(9, 30), time(15, 30))
+
+DEFAULT_EXPIRY_CONFIG = {
+    "BANKNIFTY": {"duration": "Monthly", "day_of_week": "Thursday"},
+    "NIFTY": {"duration": "Weekly", "day_of_week": "Tuesday"},
+    "SENSEX": {"duration": "Weekly", "day_of_week": "Thursday"},
+}
+
+# Entry filter sections read by RSIStrategy
+FILTER_SECTIONS = (
+    "vwap_entry_conditions",
+    "strength_diff_conditions",
+    "multi_timeframe_confirmation",
+    "divergence_detection",
+    "volume_confirmation",
+    "dynamic_threshold",
+    "time_session_filter",
+    "atr_volatility_filter",
+    "rsi_extreme_filter",
+)
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+def _freeze(value: Any) -> Any:
+    """Read-only view of parsed JSON: dicts become mappingproxies, lists tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+def _parse_market_hours(data: Mapping[str, Any]) -> Tuple[time, time]:
+    market_hours = data.get("market_hours", _EMPTY)
+    try:
+        open_hour, open_minute = map(int, market_hours.get("open_time", "09:30").split(":"))
+        close_hour, close_minute = map(int, market_hours.get("close_time", "15:30").split(":"))
+        return time(open_hour, open_minute), time(close_hour, close_minute)
+    except Exception as e:
+        logger.warning(f"Could not parse market hours from config: {e}, using defaults (9:30 AM - 3:30 PM)")
+        return DEFAULT_MARKET_HOURS
+
+
+class ConfigSnapshot:
+    """Immutable, parsed view of config.json at one point in time"""
+
+    __slots__ = ("data", "exists", "mtime", "_market_hours")
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None, exists: bool = False, mtime: Optional[int] = None):
+        self.data: Mapping[str, Any] = _freeze(data or {})
+        self.exists = exists
+        self.mtime = mtime
+        self._market_hours = _parse_market_hours(self.data)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    def section(self, name: str) -> Mapping[str, Any]:
+        """Read-only settings section (empty mapping if missing)"""
+        value = self.data.get(name)
+        return value if isinstance(value, Mapping) else _EMPTY
+
+    def to_dict(self, name: Optional[str] = None) -> Dict[str, Any]:
+        """Mutable copy of the whole config or of one section, for callers that modify or serialise it"""
+        return _thaw(self.data if name is None else self.section(name))
+
+    @property
+    def market_hours(self) -> Tuple[time, time]:
+        """(open, close) market times; 9:30 - 15:30 when not configured"""
+        return self._market_hours
+
+    def expiry_config(self) -> Dict[str, Any]:
+        """Per-segment expiry settings (defaults when config.json is missing)"""
+        if not self.exists:
+            return copy.deepcopy(DEFAULT_EXPIRY_CONFIG)
+        return self.to_dict("expiry_config")
+
+    def filters(self) -> Mapping[str, Mapping[str, Any]]:
+        """Entry filter sections keyed by name (sections missing from the file are empty)"""
+        return MappingProxyType({name: self.section(name) for name in FILTER_SECTIONS})
+
+
+class ConfigSnapshotCache:
+    """Holds the current snapshot of one config file and rebuilds it when the file changes"""
+
+    def __init__(self, path: Path = CONFIG_PATH, check_interval: float = CHECK_INTERVAL_SECONDS,
+                 clock: Callable[[], float] = time_module.monotonic):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._snapshot: Optional[ConfigSnapshot] = None
+        # mtime of a file that failed to parse, not read again until it changes
+        self._invalid_mtime: Optional[int] = None
+        self._checked_at = 0.0
+        self.loads = 0
+
+    def _stat_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _load(self, mtime: Optional[int]) -> None:
+        if mtime is None:
+            self._snapshot = ConfigSnapshot()
+        else:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self._snapshot = ConfigSnapshot(data, exists=True, mtime=mtime)
+            except (json.JSONDecodeError, OSError) as e:
+                # Keep serving the last good snapshot (e.g. while the file is being rewritten)
+                logger.warning(f"Could not load {self.path.name}: {e}; keeping previous settings")
+                self._invalid_mtime = mtime
+                if self._snapshot is None:
+                    self._snapshot = ConfigSnapshot(exists=True, mtime=mtime)
+                return
+        self.loads += 1
+
+    def get(self, force_check: bool = False) -> ConfigSnapshot:
+        snapshot = self._snapshot
+        now = self._clock()
+        if snapshot is not None and not force_check and now - self._checked_at < self.check_interval:
+            return snapshot
+        with self._lock:
+            self._checked_at = now
+            mtime = self._stat_mtime()
+            if self._snapshot is None or (mtime != self._snapshot.mtime and (mtime is None or mtime != self._invalid_mtime)):
+                self._load(mtime)
+            return self._snapshot
+
+
+_cache = ConfigSnapshotCache()
+
+
+def get_config_snapshot(force_check: bool = False) -> ConfigSnapshot:
+    """Current snapshot of config/config.json (force_check looks at the file's mtime right away)"""
+    return _cache.get(force_check)
@@ -2,11 +2,14 @@
 Database Models for Positions, Trades, and Daily Statistics
 """
 
-from sqlalchemy import create_engine, Column, Integer, Float, String, DateTime, Boolean, ForeignKey, Index
+import os
+import threading
+from sqlalchemy import create_engine, event, text, Column, Integer, Float, String, Date, DateTime, Boolean, ForeignKey, Index
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 from src.utils.logger import get_logger
 
 Base = declarative_base()
@@ -145,30 +148,171 @@ class Candle(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     __table_args__ = (
-        Index('idx_candle_segment_timestamp', 'segment', 'timestamp', 'interval'),
+        # One row per (segment, timestamp, interval): target of the bulk upsert in CandleRepository
+        Index('idx_candle_segment_timestamp', 'segment', 'timestamp', 'interval', unique=True),
         Index('idx_candle_timestamp', 'timestamp'),
     )
 
 
+class DailyPnlRollup(Base):
+    """Realized P&L of the trades table summed per broker and exit date (maintained by TradeRepository)"""
+    __tablename__ = 'daily_pnl_rollup'
+    
+    id = Column(Integer, primary_key=True)
+    broker_id = Column(String, nullable=False)
+    date = Column(Date, nullable=False)  # Date of Trade.exit_time
+    realized_pnl = Column(Float, nullable=False, default=0.0)
+    trade_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('idx_rollup_broker_date', 'broker_id', 'date', unique=True),
+    )
+
+
+class SchemaVersion(Base):
+    """Applied schema migrations (one row per migration version)"""
+    __tablename__ = 'schema_version'
+    
+    version = Column(Integer, primary_key=True)
+    applied_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+# Connection settings for every SQLite connection: WAL lets readers run while
+# one connection writes, NORMAL sync is durable enough under WAL, and
+# busy_timeout makes a writer wait for the lock instead of failing at once
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=10000",
+)
+# Connection pool per database file (agent threads, risk monitor, Flask workers)
+SQLITE_POOL_SIZE = 10
+SQLITE_MAX_OVERFLOW = 20
+
+
+def _configure_sqlite_connection(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+class _EngineEntry:
+    """Shared engine of one database file and whether its schema is up to date"""
+    
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.session_factory = sessionmaker(bind=engine)
+        self.schema_ready = False
+        self.lock = threading.Lock()
+
+
+_engines: Dict[str, _EngineEntry] = {}
+_engines_lock = threading.Lock()
+
+
+def _engine_key(db_path: str) -> str:
+    return db_path if db_path == ":memory:" else os.path.abspath(db_path)
+
+
+def _get_engine_entry(db_path: str) -> _EngineEntry:
+    """Process-wide engine for a database file, created on first use"""
+    key = _engine_key(db_path)
+    with _engines_lock:
+        entry = _engines.get(key)
+        if entry is not None and key != ":memory:" and not os.path.exists(key):
+            # File was removed (e.g. a test's temporary database): start over
+            entry.engine.dispose()
+            entry = None
+        if entry is None:
+            if key == ":memory:":
+                engine = create_engine('sqlite://', echo=False)
+            else:
+                engine = create_engine(
+                    f'sqlite:///{db_path}',
+                    echo=False,
+                    connect_args={"check_same_thread": False},
+                    pool_size=SQLITE_POOL_SIZE,
+                    max_overflow=SQLITE_MAX_OVERFLOW,
+                )
+                event.listen(engine, "connect", _configure_sqlite_connection)
+            entry = _EngineEntry(engine)
+            _engines[key] = entry
+        return entry
+
+
 class DatabaseManager:
-    """Database connection and session management"""
+    """
+    Database connection and session management
+    
+    Managers for the same file share one engine (and connection pool); tables
+    and migrations are checked once per process, the first time the file is
+    opened.
+    """
+    
+    # (version, migration method) in the order they were introduced
+    MIGRATIONS = (
+        (1, "_migrate_transaction_type"),
+        (2, "_migrate_broker_id"),
+        (3, "_migrate_candle_unique_index"),
+        (4, "_migrate_pnl_rollup"),
+    )
     
     def __init__(self, db_path: str = "data/risk_management.db"):
         self.db_path = db_path
-        self.engine = create_engine(f'sqlite:///{db_path}', echo=False)
-        self.SessionLocal = sessionmaker(bind=self.engine)
-        self._create_tables()
+        entry = _get_engine_entry(db_path)
+        self.engine = entry.engine
+        self.SessionLocal = entry.session_factory
+        with entry.lock:
+            if not entry.schema_ready:
+                self._create_tables()
+                entry.schema_ready = True
     
     def _create_tables(self):
         """Create all database tables"""
         Base.metadata.create_all(self.engine)
         # Run migrations to add new columns if they don't exist
-        self._migrate_transaction_type()
-        self._migrate_broker_id()
+        self._run_migrations()
+    
+    def _run_migrations(self):
+        """Run the migrations newer than the database's schema version, recording each one"""
+        logger = get_logger("database")
+        session = self.get_session()
+        try:
+            applied = {row.version for row in session.query(SchemaVersion.version)}
+        finally:
+            session.close()
+        
+        for version, method_name in self.MIGRATIONS:
+            if version in applied:
+                continue
+            if not getattr(self, method_name)():
+                # Leave it (and later ones) unrecorded so they are retried on the next start
+                logger.warning(f"Migration {version} ({method_name}) failed; schema left at its previous version")
+                return
+            session = self.get_session()
+            try:
+                session.add(SchemaVersion(version=version))
+                session.commit()
+            finally:
+                session.close()
+    
+    def schema_version(self) -> int:
+        """Highest migration version applied to this database"""
+        from sqlalchemy import func
+        session = self.get_session()
+        try:
+            return session.query(func.max(SchemaVersion.version)).scalar() or 0
+        finally:
+            session.close()
     
-    def _migrate_transaction_type(self):
+    def _migrate_transaction_type(self) -> bool:
         """Migrate trades table to add transaction_type column if needed"""
         from sqlalchemy import text
+        logger = get_logger("database")
         session = self.get_session()
         try:
             # Check if column already exists
@@ -197,15 +341,16 @@ class DatabaseManager:
                 """))
                 
                 session.commit()
-                logger = get_logger("database")
                 logger.info("Migration: Added transaction_type column to trades table")
+            return True
         except Exception as e:
             session.rollback()
             logger.error(f"Migration error: {e}")
+            return False
         finally:
             session.close()
     
-    def _migrate_broker_id(self):
+    def _migrate_broker_id(self) -> bool:
         """Migrate tables to add broker_id column if needed"""
         from sqlalchemy import text
         logger = get_logger("database")
@@ -253,9 +398,93 @@ class DatabaseManager:
                     
                     session.commit()
                     logger.info(f"Migration: Added broker_id column to {table_name} table")
+            return True
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Migration error: {e}")
+            return False
+        finally:
+            session.close()
+    
+    def _migrate_candle_unique_index(self) -> bool:
+        """Migrate candles table to a unique (segment, timestamp, interval) index if needed"""
+        from sqlalchemy import text
+        logger = get_logger("database")
+        session = self.get_session()
+        try:
+            # Check whether the index is already unique
+            result = session.execute(text("""
+                SELECT "unique" 
+                FROM pragma_index_list('candles') 
+                WHERE name='idx_candle_segment_timestamp'
+            """))
+            row = result.fetchone()
+            
+            if row is None or not row[0]:
+                # Remove duplicates first, keeping the non-synthetic (then the newest) row
+                deleted = session.execute(text("""
+                    DELETE FROM candles 
+                    WHERE id IN (
+                        SELECT id FROM (
+                            SELECT id, ROW_NUMBER() OVER (
+                                PARTITION BY segment, timestamp, interval 
+                                ORDER BY COALESCE(is_synthetic, 0) ASC, id DESC
+                            ) AS row_num 
+                            FROM candles
+                        ) 
+                        WHERE row_num > 1
+                    )
+                """)).rowcount
+                
+                session.execute(text("DROP INDEX IF EXISTS idx_candle_segment_timestamp"))
+                session.execute(text("""
+                    CREATE UNIQUE INDEX idx_candle_segment_timestamp 
+                    ON candles(segment, timestamp, interval)
+                """))
+                
+                session.commit()
+                logger.info(f"Migration: Made candles (segment, timestamp, interval) unique ({deleted} duplicate rows removed)")
+            return True
         except Exception as e:
             session.rollback()
             logger.error(f"Migration error: {e}")
+            return False
+        finally:
+            session.close()
+    
+    def _migrate_pnl_rollup(self) -> bool:
+        """Fill daily_pnl_rollup from the trades already in the database"""
+        logger = get_logger("database")
+        try:
+            days = self.rebuild_pnl_rollup()
+            logger.info(f"Migration: Backfilled daily_pnl_rollup ({days} broker-days)")
+            return True
+        except Exception as e:
+            logger.error(f"Migration error: {e}")
+            return False
+    
+    def rebuild_pnl_rollup(self, broker_id: Optional[str] = None) -> int:
+        """
+        Recompute daily_pnl_rollup from the trades table (all brokers, or one).
+        
+        Returns the number of (broker, date) rows written.
+        """
+        broker_filter = "WHERE broker_id = :broker_id" if broker_id else ""
+        params = {"broker_id": broker_id} if broker_id else {}
+        session = self.get_session()
+        try:
+            session.execute(text(f"DELETE FROM daily_pnl_rollup {broker_filter}"), params)
+            result = session.execute(text(f"""
+                INSERT INTO daily_pnl_rollup (broker_id, date, realized_pnl, trade_count, updated_at)
+                SELECT broker_id, date(exit_time), SUM(realized_pnl), COUNT(*), CURRENT_TIMESTAMP
+                FROM trades {broker_filter}
+                GROUP BY broker_id, date(exit_time)
+            """), params)
+            session.commit()
+            return result.rowcount
+        except Exception:
+            session.rollback()
+            raise
         finally:
             session.close()
     
@@ -264,6 +493,6 @@ class DatabaseManager:
         return self.SessionLocal()
     
     def close(self):
-        """Close database connection"""
+        """Close the pooled connections of this database (the shared engine stays usable)"""
         self.engine.dispose()
 
@@ -4,11 +4,13 @@ All operations are filtered by BrokerID for multi-tenancy support.
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy import and_, bindparam, func, or_, select, true, false
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from datetime import datetime, date
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Tuple
+import numpy as np
 from src.database.models import (
-    Position, Trade, DailyStats, AuditLog, DatabaseManager, DailyPurgeFlag, Candle
+    Position, Trade, DailyStats, AuditLog, DatabaseManager, DailyPurgeFlag, Candle, DailyPnlRollup
 )
 from src.utils.logger import get_logger
 from src.utils.broker_context import BrokerContext
@@ -179,6 +181,57 @@ class PositionRepository:
         finally:
             session.close()
     
+    def update_position_prices_batch(
+        self,
+        updates: List[Dict[str, Any]],
+        broker_id: Optional[str] = None
+    ) -> int:
+        """
+        Write current_price / unrealized_pnl of several active positions in one transaction
+        
+        Args:
+            updates: Dicts with position_id, current_price and unrealized_pnl
+            broker_id: BrokerID the positions belong to (default: current thread's BrokerID)
+        
+        Returns:
+            Number of rows updated
+        """
+        if not updates:
+            return 0
+        broker_id = broker_id or BrokerContext.require_broker_id()
+        now = datetime.utcnow()
+        table = Position.__table__
+        stmt = table.update().where(
+            and_(
+                table.c.broker_id == broker_id,
+                table.c.id == bindparam('b_position_id'),
+                table.c.is_active == true()
+            )
+        ).values(
+            current_price=bindparam('b_current_price'),
+            unrealized_pnl=bindparam('b_unrealized_pnl'),
+            updated_at=now
+        )
+        params = [
+            {
+                'b_position_id': update['position_id'],
+                'b_current_price': update['current_price'],
+                'b_unrealized_pnl': update['unrealized_pnl']
+            }
+            for update in updates
+        ]
+        session = self.db_manager.get_session()
+        try:
+            result = session.execute(stmt, params)
+            session.commit()
+            return result.rowcount
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error updating position prices: {e}")
+            raise
+        finally:
+            session.close()
+    
     def deactivate_position(self, position_id: int):
         """Mark position as inactive (filtered by BrokerID)"""
         broker_id = BrokerContext.require_broker_id()
@@ -232,6 +285,50 @@ class TradeRepository:
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
     
+    @staticmethod
+    def _update_pnl_rollup(
+        session: Session,
+        trades: Iterable[Tuple[str, datetime, float]],
+        sign: int = 1
+    ):
+        """
+        Add (sign=1) or remove (sign=-1) the realized P&L of (broker_id, exit_time, realized_pnl)
+        trades in daily_pnl_rollup, within the caller's transaction.
+        """
+        totals: Dict[Tuple[str, date], List[float]] = {}
+        for broker_id, exit_time, realized_pnl in trades:
+            total = totals.setdefault((broker_id, exit_time.date()), [0.0, 0])
+            total[0] += realized_pnl or 0.0
+            total[1] += 1
+        if not totals:
+            return
+        
+        now = datetime.utcnow()
+        table = DailyPnlRollup.__table__
+        stmt = sqlite_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.broker_id, table.c.date],
+            set_={
+                'realized_pnl': table.c.realized_pnl + stmt.excluded.realized_pnl,
+                'trade_count': table.c.trade_count + stmt.excluded.trade_count,
+                'updated_at': stmt.excluded.updated_at
+            }
+        )
+        session.execute(stmt, [
+            {
+                'broker_id': broker_id,
+                'date': day,
+                'realized_pnl': sign * pnl,
+                'trade_count': sign * count,
+                'updated_at': now
+            }
+            for (broker_id, day), (pnl, count) in totals.items()
+        ])
+        if sign < 0:
+            session.query(DailyPnlRollup).filter(
+                DailyPnlRollup.trade_count <= 0
+            ).delete(synchronize_session=False)
+    
     def create_trade(
         self,
         instrument_token: str,
@@ -283,6 +380,7 @@ class TradeRepository:
                 exit_type=exit_type
             )
             session.add(trade)
+            self._update_pnl_rollup(session, [(broker_id, exit_time, realized_pnl)])
             session.commit()
             session.refresh(trade)
             return trade
@@ -459,14 +557,15 @@ class TradeRepository:
             end_datetime_utc = end_datetime_ist.astimezone(UTC).replace(tzinfo=None)
             
             broker_id = BrokerContext.require_broker_id()
-            # Count trades before deletion (filtered by BrokerID)
-            count = session.query(Trade).filter(
+            # Take the trades out of the P&L rollup before deleting them (filtered by BrokerID)
+            deleted_trades = session.query(Trade.broker_id, Trade.exit_time, Trade.realized_pnl).filter(
                 and_(
                     Trade.broker_id == broker_id,
                     Trade.exit_time >= start_datetime_utc,
                     Trade.exit_time <= end_datetime_utc
                 )
-            ).count()
+            ).all()
+            self._update_pnl_rollup(session, deleted_trades, sign=-1)
             
             # Delete trades (filtered by BrokerID)
             deleted = session.query(Trade).filter(
@@ -595,6 +694,11 @@ class TradeRepository:
             for trade in trades_to_delete:
                 session.delete(trade)
                 deleted_count += 1
+            self._update_pnl_rollup(
+                session,
+                [(trade.broker_id, trade.exit_time, trade.realized_pnl) for trade in trades_to_delete],
+                sign=-1
+            )
             
             if deleted_count > 0:
                 session.commit()
@@ -697,8 +801,9 @@ class DailyStatsRepository:
         """
         Calculate cumulative P&L metrics for different time periods.
         Returns: Dict with 'all_time', 'year', 'month', 'week', 'day' P&L values.
-        Uses trades table for historical data and daily_stats for today's unrealized P&L.
-        All queries filtered by BrokerID.
+        Realized P&L comes from the daily_pnl_rollup table (one row per trading day,
+        so at most ~370 rows cover the year and the current week) and today's
+        unrealized P&L from daily_stats. All queries filtered by BrokerID.
         """
         broker_id = BrokerContext.require_broker_id()
         session = self.db_manager.get_session()
@@ -708,17 +813,22 @@ class DailyStatsRepository:
             
             now = get_current_ist_time()
             today = now.date()
-            today_start = datetime.combine(today, datetime.min.time())
-            today_end = datetime.combine(today, datetime.max.time())
+            # Start of current week (Monday is 0, Sunday is 6), month and year
+            week_start = today - timedelta(days=today.weekday())
+            month_start = today.replace(day=1)
+            year_start = today.replace(month=1, day=1)
             
-            # Day P&L: Realized from trades today + Unrealized from daily_stats
-            day_realized = session.query(func.sum(Trade.realized_pnl)).filter(
+            # Realized P&L per day since the earliest period start (the week can begin last year)
+            daily_realized = session.query(DailyPnlRollup.date, DailyPnlRollup.realized_pnl).filter(
                 and_(
-                    Trade.broker_id == broker_id,
-                    Trade.exit_time >= today_start,
-                    Trade.exit_time <= today_end
+                    DailyPnlRollup.broker_id == broker_id,
+                    DailyPnlRollup.date >= min(week_start, year_start),
+                    DailyPnlRollup.date <= today
                 )
-            ).scalar() or 0.0
+            ).all()
+            
+            def realized_since(start: date) -> float:
+                return sum(pnl for day, pnl in daily_realized if day >= start)
             
             day_stats = session.query(DailyStats).filter(
                 and_(
@@ -727,34 +837,11 @@ class DailyStatsRepository:
                 )
             ).first()
             day_unrealized = (day_stats.total_unrealized_pnl or 0.0) if day_stats else 0.0
-            day_pnl = day_realized + day_unrealized
-            
-            # Week P&L: Realized from trades (current week, Monday to today) + Today's unrealized
-            # Calculate start of current week (Monday)
-            days_since_monday = today.weekday()  # Monday is 0, Sunday is 6
-            week_start = today - timedelta(days=days_since_monday)
-            week_start_datetime = datetime.combine(week_start, datetime.min.time())
-            week_realized = session.query(func.sum(Trade.realized_pnl)).filter(
-                and_(
-                    Trade.broker_id == broker_id,
-                    Trade.exit_time >= week_start_datetime,
-                    Trade.exit_time <= today_end
-                )
-            ).scalar() or 0.0
-            week_pnl = week_realized + day_unrealized  # Only add today's unrealized
             
-            # Month P&L: Realized from trades (current month, 1st to today) + Today's unrealized
-            # Month should always be >= Week if Week is within the month
-            month_start = today.replace(day=1)
-            month_start_datetime = datetime.combine(month_start, datetime.min.time())
-            month_realized = session.query(func.sum(Trade.realized_pnl)).filter(
-                and_(
-                    Trade.broker_id == broker_id,
-                    Trade.exit_time >= month_start_datetime,
-                    Trade.exit_time <= today_end
-                )
-            ).scalar() or 0.0
-            month_pnl = month_realized + day_unrealized  # Only add today's unrealized
+            # Each period: realized P&L from its start to today + today's unrealized
+            day_pnl = realized_since(today) + day_unrealized
+            week_pnl = realized_since(week_start) + day_unrealized
+            month_pnl = realized_since(month_start) + day_unrealized
             
             # Ensure Month >= Week if current week is within the current month
             # If week starts before month start, week might be larger (which is correct)
@@ -769,21 +856,11 @@ class DailyStatsRepository:
                         f"This may indicate data inconsistency."
                     )
             
-            # Year P&L: Realized from trades (current year) + Today's unrealized
-            year_start = today.replace(month=1, day=1)
-            year_start_datetime = datetime.combine(year_start, datetime.min.time())
-            year_realized = session.query(func.sum(Trade.realized_pnl)).filter(
-                and_(
-                    Trade.broker_id == broker_id,
-                    Trade.exit_time >= year_start_datetime,
-                    Trade.exit_time <= today_end
-                )
-            ).scalar() or 0.0
-            year_pnl = year_realized + day_unrealized  # Only add today's unrealized
+            year_pnl = realized_since(year_start) + day_unrealized
             
-            # All time P&L: All realized trades + Today's unrealized
-            all_time_realized = session.query(func.sum(Trade.realized_pnl)).filter(
-                Trade.broker_id == broker_id
+            # All time P&L: every day in the rollup + Today's unrealized
+            all_time_realized = session.query(func.sum(DailyPnlRollup.realized_pnl)).filter(
+                DailyPnlRollup.broker_id == broker_id
             ).scalar() or 0.0
             all_time_pnl = all_time_realized + day_unrealized  # Only add today's unrealized
             
@@ -866,6 +943,92 @@ class CandleRepository:
         finally:
             session.close()
     
+    def get_candle_arrays(
+        self,
+        segment: str,
+        start_time: datetime,
+        end_time: datetime,
+        interval: str
+    ) -> Dict[str, np.ndarray]:
+        """
+        Candles of a time range as NumPy columns in timestamp order.
+        
+        One query on the (segment, timestamp, interval) index that reads the column
+        values directly (no Candle objects). Keys: timestamp (datetime64[ns], naive
+        IST as stored), open, high, low, close, volume and is_synthetic.
+        """
+        table = Candle.__table__
+        stmt = select(
+            table.c.timestamp, table.c.open, table.c.high, table.c.low,
+            table.c.close, table.c.volume, table.c.is_synthetic
+        ).where(
+            table.c.segment == segment.upper(),
+            table.c.timestamp >= start_time,
+            table.c.timestamp <= end_time,
+            table.c.interval == interval
+        ).order_by(table.c.timestamp)
+        session = self.db_manager.get_session()
+        try:
+            rows = session.execute(stmt).all()
+        except Exception as e:
+            logger.error(f"Error getting candle arrays: {e}")
+            rows = []
+        finally:
+            session.close()
+        
+        columns = list(zip(*rows)) if rows else [()] * 7
+        return {
+            'timestamp': np.array(columns[0], dtype='datetime64[ns]'),
+            'open': np.array(columns[1], dtype=np.float64),
+            'high': np.array(columns[2], dtype=np.float64),
+            'low': np.array(columns[3], dtype=np.float64),
+            'close': np.array(columns[4], dtype=np.float64),
+            'volume': np.array([v or 0.0 for v in columns[5]], dtype=np.float64),
+            'is_synthetic': np.array(columns[6], dtype=bool)
+        }
+    
+    @staticmethod
+    def _candle_row(candle_data: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+        """Column values of one candle for the upsert statement"""
+        return {
+            'segment': candle_data['segment'].upper(),
+            'timestamp': candle_data['timestamp'],
+            'interval': candle_data['interval'],
+            'open': candle_data['open'],
+            'high': candle_data['high'],
+            'low': candle_data['low'],
+            'close': candle_data['close'],
+            'volume': candle_data.get('volume', 0.0),
+            'is_synthetic': bool(candle_data.get('is_synthetic', False)),
+            'created_at': now,
+            'updated_at': now
+        }
+    
+    @staticmethod
+    def _upsert_statement():
+        """
+        INSERT ... ON CONFLICT(segment, timestamp, interval) DO UPDATE for the candles table.
+        
+        Existing rows are overwritten unless that would replace a real candle with a
+        synthetic one (prefer non-synthetic data).
+        """
+        table = Candle.__table__
+        stmt = sqlite_insert(table)
+        excluded = stmt.excluded
+        return stmt.on_conflict_do_update(
+            index_elements=[table.c.segment, table.c.timestamp, table.c.interval],
+            set_={
+                'open': excluded.open,
+                'high': excluded.high,
+                'low': excluded.low,
+                'close': excluded.close,
+                'volume': excluded.volume,
+                'is_synthetic': excluded.is_synthetic,
+                'updated_at': excluded.updated_at
+            },
+            where=or_(table.c.is_synthetic == true(), excluded.is_synthetic == false())
+        )
+    
     def save_candle(
         self,
         segment: str,
@@ -881,42 +1044,27 @@ class CandleRepository:
         """Save or update a candle"""
         session = self.db_manager.get_session()
         try:
-            # Check if candle already exists
-            existing = session.query(Candle).filter(
+            row = self._candle_row({
+                'segment': segment,
+                'timestamp': timestamp,
+                'interval': interval,
+                'open': open,
+                'high': high,
+                'low': low,
+                'close': close,
+                'volume': volume,
+                'is_synthetic': is_synthetic
+            }, datetime.utcnow())
+            session.execute(self._upsert_statement(), [row])
+            session.commit()
+            
+            candle = session.query(Candle).filter(
                 and_(
-                    Candle.segment == segment.upper(),
+                    Candle.segment == row['segment'],
                     Candle.timestamp == timestamp,
                     Candle.interval == interval
                 )
             ).first()
-            
-            if existing:
-                # Update existing candle (prefer non-synthetic data)
-                if not existing.is_synthetic or not is_synthetic:
-                    existing.open = open
-                    existing.high = high
-                    existing.low = low
-                    existing.close = close
-                    existing.volume = volume
-                    existing.is_synthetic = is_synthetic
-                    existing.updated_at = datetime.utcnow()
-                candle = existing
-            else:
-                # Create new candle
-                candle = Candle(
-                    segment=segment.upper(),
-                    timestamp=timestamp,
-                    interval=interval,
-                    open=open,
-                    high=high,
-                    low=low,
-                    close=close,
-                    volume=volume,
-                    is_synthetic=is_synthetic
-                )
-                session.add(candle)
-            
-            session.commit()
             return candle
         except Exception as e:
             session.rollback()
@@ -929,48 +1077,21 @@ class CandleRepository:
         self,
         candles_data: List[Dict[str, Any]]
     ) -> int:
-        """Save multiple candles in a batch"""
+        """
+        Save multiple candles in a batch.
+        
+        All rows go through one upsert statement (executemany) in a single transaction;
+        the unique (segment, timestamp, interval) index resolves existing candles.
+        """
+        if not candles_data:
+            return 0
         session = self.db_manager.get_session()
-        saved_count = 0
         try:
-            for candle_data in candles_data:
-                # Check if candle already exists
-                existing = session.query(Candle).filter(
-                    and_(
-                        Candle.segment == candle_data['segment'].upper(),
-                        Candle.timestamp == candle_data['timestamp'],
-                        Candle.interval == candle_data['interval']
-                    )
-                ).first()
-                
-                if existing:
-                    # Update if new data is non-synthetic
-                    if not existing.is_synthetic or not candle_data.get('is_synthetic', False):
-                        existing.open = candle_data['open']
-                        existing.high = candle_data['high']
-                        existing.low = candle_data['low']
-                        existing.close = candle_data['close']
-                        existing.volume = candle_data.get('volume', 0.0)
-                        existing.is_synthetic = candle_data.get('is_synthetic', False)
-                        existing.updated_at = datetime.utcnow()
-                    saved_count += 1
-                else:
-                    candle = Candle(
-                        segment=candle_data['segment'].upper(),
-                        timestamp=candle_data['timestamp'],
-                        interval=candle_data['interval'],
-                        open=candle_data['open'],
-                        high=candle_data['high'],
-                        low=candle_data['low'],
-                        close=candle_data['close'],
-                        volume=candle_data.get('volume', 0.0),
-                        is_synthetic=candle_data.get('is_synthetic', False)
-                    )
-                    session.add(candle)
-                    saved_count += 1
-            
+            now = datetime.utcnow()
+            rows = [self._candle_row(candle_data, now) for candle_data in candles_data]
+            session.execute(self._upsert_statement(), rows)
             session.commit()
-            return saved_count
+            return len(rows)
         except Exception as e:
             session.rollback()
             logger.error(f"Error saving candles batch: {e}")
@@ -10,7 +10,7 @@ from __future__ import annotations
 
 import threading
 import time
-import csv
+import queue
 import re
 from dataclasses import dataclass
 from datetime import datetime, timedelta, date
@@ -19,15 +19,19 @@ from typing import Any, Dict, Optional, List, Tuple
 import pandas as pd
 
 from src.trading.rsi_agent import RSIStrategy, RSITradingAgent, Segment, TradeSignal, OptionType
+from src.trading.indicators import IncrementalIndicatorEngine
+from src.trading.option_pricing import estimate_option_premium, years_to_expiry
 from src.api.kite_client import KiteClient
-from src.api.live_data import fetch_live_index_ltp, fetch_recent_index_candles
+from src.api.market_data_hub import MarketSnapshot, get_market_data_hub
 from src.live_trader.instruments import select_itm_strike, get_segment_config, SegmentConfig
-from src.live_trader.execution import PaperExecutionClient, LiveExecutionClient, PaperTradeRecord, OpenPositionRecord, LOG_DIR
+from src.live_trader.execution import PaperExecutionClient, LiveExecutionClient, PaperTradeRecord, OpenPositionRecord
+from src.live_trader.candle_store import CandleWriteBehind, get_candle_buffer
+from src.live_trader.ps_vs_store import get_ps_vs_store
+from src.live_trader.position_journal import get_position_journal
 from src.utils.logger import get_logger, get_segment_logger
 from src.utils.premium_fetcher import build_tradingsymbol
 from src.database.models import DatabaseManager
 from src.database.repository import CandleRepository
-import json
 
 
 INTERVAL_SECONDS = {
@@ -69,7 +73,8 @@ class LiveSegmentAgent(threading.Thread):
     Per-segment live trading agent running in its own thread.
 
     Simplifications:
-      - Uses LTP polling; each poll is treated as a candle close (OHLC equal).
+      - Ticks on the hub's snapshots: streamed bar closes (IndexTickFeed) when the
+        websocket feed runs, else LTP polls treated as candle closes (OHLC equal).
       - Only supports PAPER mode; uses PaperExecutionClient.
     """
 
@@ -116,6 +121,11 @@ class LiveSegmentAgent(threading.Thread):
             self.trade_regime = "Buy"
         self.logger.info(f"Trade Regime: {self.trade_regime}")
 
+        # Quotes and candles come from the segment's shared market-data hub, so PAPER and
+        # LIVE agents on the same segment share Kite requests
+        self.market_data = get_market_data_hub(kite_client, params.segment)
+        self._snapshots: "queue.Queue[MarketSnapshot]" = queue.Queue(maxsize=1)
+
         # Initialize database for candle storage
         self.db_manager = db_manager or DatabaseManager()
         self.candle_repo = CandleRepository(self.db_manager)
@@ -131,6 +141,8 @@ class LiveSegmentAgent(threading.Thread):
             trade_regime=self.trade_regime,
         )
         self.agent = RSITradingAgent(self.strategy)
+        # Streaming RSI/PS/VS kept in step with self.df (O(1) per appended candle)
+        self.indicator_engine = IncrementalIndicatorEngine.from_strategy(self.strategy)
         
         # Initialize premium tracking for trailing stops
         # For Buy: track highest_premium (already in agent)
@@ -174,7 +186,11 @@ class LiveSegmentAgent(threading.Thread):
                 f"lot_addition={self.segment_cfg.lot_addition}, max_quantity={self.segment_cfg.max_quantity}"
             )
 
-        self.df = pd.DataFrame(columns=["open", "high", "low", "close", "volume"])
+        # Candles of this (segment, interval) live in a shared in-memory ring buffer
+        # (self.df is a read-only DataFrame view of it); the database only receives
+        # write-behind copies of new candles
+        self.candles = get_candle_buffer(params.segment, params.time_interval)
+        self._candle_writer = CandleWriteBehind(self.candle_repo, params.segment, params.time_interval)
         # Store last trading day's candles for fallback use
         self._last_trading_day_candles = pd.DataFrame(columns=["open", "high", "low", "close", "volume"])
         self._bootstrap_history()
@@ -190,6 +206,36 @@ class LiveSegmentAgent(threading.Thread):
         if isinstance(self.execution, LiveExecutionClient):
             self._recover_positions_from_kite()
 
+    @property
+    def df(self) -> pd.DataFrame:
+        """OHLCV DataFrame of the candle buffer (rebuilt only when a candle changed)"""
+        return self.candles.frame()
+
+    def _add_candle(self, timestamp, candle: Dict[str, Any], is_synthetic: bool = False) -> None:
+        """Add a candle to the buffer and queue it for the database"""
+        self.candles.append(
+            timestamp,
+            candle['open'],
+            candle['high'],
+            candle['low'],
+            candle['close'],
+            candle.get('volume', 0.0),
+            is_synthetic=is_synthetic
+        )
+        self._candle_writer.add(timestamp, candle, is_synthetic)
+
+    def _store_fetched_candles(self, candles: List[Tuple[Any, Any]]) -> None:
+        """
+        Add real candles fetched from the API to the buffer (existing candles are kept)
+        and queue all of them for the database.
+        """
+        for ts, row in candles:
+            if ts not in self.candles:
+                self._add_candle(ts, row)
+            else:
+                self._candle_writer.add(ts, row)
+        self.logger.info(f" Added {len(candles)} fetched candles to the candle buffer")
+
     def stop(self) -> None:
         self._stop_flag.set()
 
@@ -251,7 +297,7 @@ class LiveSegmentAgent(threading.Thread):
                 if len(filtered_candles) >= min_candles_needed:
                     db_candles = filtered_candles
                 
-                # Convert database candles to DataFrame
+                # Load database candles into the candle buffer
                 candles_data = []
                 for candle in db_candles:
                     candles_data.append({
@@ -259,13 +305,13 @@ class LiveSegmentAgent(threading.Thread):
                         'high': candle.high,
                         'low': candle.low,
                         'close': candle.close,
-                        'volume': candle.volume
+                        'volume': candle.volume,
+                        'is_synthetic': bool(candle.is_synthetic)
                     })
                 
                 if candles_data:
-                    self.df = pd.DataFrame(candles_data, index=[c.timestamp for c in db_candles])
-                    # Sort by timestamp to ensure chronological order
-                    self.df = self.df.sort_index()
+                    # Sorted by timestamp on load
+                    self.candles.load_frame(pd.DataFrame(candles_data, index=[c.timestamp for c in db_candles]))
                     
                     self.logger.info(
                         f" ✅ Loaded {len(self.df)} candles from database "
@@ -299,11 +345,11 @@ class LiveSegmentAgent(threading.Thread):
                         'high': candle.high,
                         'low': candle.low,
                         'close': candle.close,
-                        'volume': candle.volume
+                        'volume': candle.volume,
+                        'is_synthetic': bool(candle.is_synthetic)
                     })
                 if candles_data:
-                    self.df = pd.DataFrame(candles_data, index=[c.timestamp for c in db_candles])
-                    self.df = self.df.sort_index()
+                    self.candles.load_frame(pd.DataFrame(candles_data, index=[c.timestamp for c in db_candles]))
         except Exception as e:
             self.logger.warning(f" Error loading candles from database: {e}", exc_info=True)
 
@@ -353,9 +399,7 @@ class LiveSegmentAgent(threading.Thread):
                         needed_count * interval_minutes,
                         interval_minutes * 12,
                     )
-                    history = fetch_recent_index_candles(
-                        self.kite_client,
-                        self.params.segment,
+                    history = self.market_data.recent_candles(
                         self.params.time_interval,
                         lookback_minutes=lookback_minutes,
                     )
@@ -364,13 +408,11 @@ class LiveSegmentAgent(threading.Thread):
                     end_time = ist_time.replace(tzinfo=None) if ist_time.time() >= market_open_time else today_market_open
                     
                     try:
-                        candles = self.kite_client.kite.historical_data(
+                        candles = self.market_data.historical_data(
                             instrument_token,
                             fetch_from_date,
                             end_time,
                             self.params.time_interval,
-                            continuous=False,
-                            oi=False,
                         )
                         
                         if not candles:
@@ -380,9 +422,7 @@ class LiveSegmentAgent(threading.Thread):
                                 needed_count * interval_minutes,
                                 interval_minutes * 12,
                             )
-                            history = fetch_recent_index_candles(
-                                self.kite_client,
-                                self.params.segment,
+                            history = self.market_data.recent_candles(
                                 self.params.time_interval,
                                 lookback_minutes=lookback_minutes,
                             )
@@ -426,9 +466,7 @@ class LiveSegmentAgent(threading.Thread):
                                     needed_count * interval_minutes,
                                     interval_minutes * 12,
                                 )
-                                history = fetch_recent_index_candles(
-                                    self.kite_client,
-                                    self.params.segment,
+                                history = self.market_data.recent_candles(
                                     self.params.time_interval,
                                     lookback_minutes=lookback_minutes,
                                 )
@@ -439,9 +477,7 @@ class LiveSegmentAgent(threading.Thread):
                             needed_count * interval_minutes,
                             interval_minutes * 12,
                         )
-                        history = fetch_recent_index_candles(
-                            self.kite_client,
-                            self.params.segment,
+                        history = self.market_data.recent_candles(
                             self.params.time_interval,
                             lookback_minutes=lookback_minutes,
                         )
@@ -488,19 +524,16 @@ class LiveSegmentAgent(threading.Thread):
             if getattr(history.index, "tz", None) is not None:
                 history.index = history.index.tz_convert("Asia/Kolkata").tz_localize(None)
             
-            # Merge with existing DataFrame if we have one
+            # Merge with existing candles if we have any
             if hasattr(self, 'df') and not self.df.empty:
-                # Combine existing and new candles, removing duplicates
-                combined = pd.concat([self.df, history])
-                combined = combined[~combined.index.duplicated(keep='last')]  # Keep latest if duplicate
-                combined = combined.sort_index()
-                self.df = combined
+                # Fetched candles replace existing ones with the same timestamp
+                self.candles.merge_frame(history)
                 self.logger.info(
                     f" Merged {len(history)} new candles with {existing_count} existing. "
                     f"Total: {len(self.df)} candles"
                 )
             else:
-                self.df = history
+                self.candles.load_frame(history)
 
             # Store fetched candles in database
             try:
@@ -546,15 +579,9 @@ class LiveSegmentAgent(threading.Thread):
         This ensures we have historical data available when recent candles aren't available.
         """
         try:
-            from src.api.live_data import fetch_last_trading_day_candles
-            
             self.logger.info("📅 Fetching complete last trading day's candles for fallback use...")
             
-            fetched_last_day = fetch_last_trading_day_candles(
-                self.kite_client,
-                self.params.segment,
-                self.params.time_interval
-            )
+            fetched_last_day = self.market_data.last_trading_day_candles(self.params.time_interval)
             
             if fetched_last_day is not None and not fetched_last_day.empty:
                 # Normalize timezone: convert fetched index to timezone-naive if needed
@@ -566,21 +593,11 @@ class LiveSegmentAgent(threading.Thread):
                 # Store in instance variable for quick access
                 self._last_trading_day_candles = fetched_last_day
                 
-                # Also save to database for persistence
+                # Also save to database for persistence (written behind in one batch)
                 try:
                     for ts, row in fetched_last_day.iterrows():
                         is_synthetic = (row['open'] == row['high'] == row['low'] == row['close'])
-                        self.candle_repo.save_candle(
-                            segment=self.params.segment,
-                            timestamp=ts,
-                            interval=self.params.time_interval,
-                            open=float(row['open']),
-                            high=float(row['high']),
-                            low=float(row['low']),
-                            close=float(row['close']),
-                            volume=float(row.get('volume', 0.0)),
-                            is_synthetic=is_synthetic
-                        )
+                        self._candle_writer.add(ts, row, is_synthetic)
                 except Exception as e:
                     self.logger.warning(f"Failed to save last trading day candles to database: {e}")
                 
@@ -639,29 +656,44 @@ class LiveSegmentAgent(threading.Thread):
             else:
                 time.sleep(1)
 
-        next_tick_at = datetime.now()
+        # Persist new candles in the background while trading
+        self._candle_writer.start()
+        # Ticks are driven by the segment's market-data hub: it fetches the LTP once per
+        # monitoring interval and hands the same snapshot to every subscribed agent
+        self.market_data.subscribe(self.name, self._on_market_snapshot, self._tick_interval_seconds)
 
         while not self._stop_flag.is_set():
-            now = datetime.now()
-            if now >= next_tick_at:
-                try:
-                    self._tick()
-                except Exception as e:
-                    self.logger.error(
-                        f"Error in LiveSegmentAgent[{self.params.segment}]: {e}",
-                        exc_info=True,
-                    )
-                next_tick_at = now + timedelta(seconds=self._tick_interval_seconds)
-            else:
-                remaining = (next_tick_at - now).total_seconds()
-                sleep_for = 0.5 if remaining <= 0 else min(remaining, 1.0)
-                time.sleep(sleep_for)
+            try:
+                snapshot = self._snapshots.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            try:
+                self._tick(snapshot)
+            except Exception as e:
+                self.logger.error(
+                    f"Error in LiveSegmentAgent[{self.params.segment}]: {e}",
+                    exc_info=True,
+                )
 
+        self.market_data.unsubscribe(self.name)
+        # Final flush of queued candles
+        self._candle_writer.stop()
         self.logger.info(f"LiveSegmentAgent stopped for {self.params.segment}")
 
     # === Core loop helpers ===
 
-    def _tick(self) -> None:
+    def _on_market_snapshot(self, snapshot: MarketSnapshot) -> None:
+        """Hub callback: keep only the newest snapshot for the agent loop"""
+        try:
+            self._snapshots.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            self._snapshots.put_nowait(snapshot)
+        except queue.Full:
+            pass
+
+    def _tick(self, snapshot: Optional[MarketSnapshot] = None) -> None:
         """One iteration: fetch price, update candle, run strategy/agent."""
         try:
             # Check if market is open (from config.json)
@@ -683,8 +715,13 @@ class LiveSegmentAgent(threading.Thread):
                     self.logger.debug(f" Market not yet open. Current time: {current_time.strftime('%H:%M:%S')} IST")
                     return
             
-            # Fetch live price from Kite
-            price = fetch_live_index_ltp(self.kite_client, self.params.segment)
+            # Live price from the hub's snapshot (fetched once for all agents on this segment);
+            # re-fetched through the hub if the snapshot is missing or stale
+            if snapshot is not None and snapshot.ltp is not None and \
+                    (ist_time.replace(tzinfo=None) - snapshot.fetched_at).total_seconds() <= 5:
+                price = snapshot.ltp
+            else:
+                price = self.market_data.ltp()
             
             # Validate price is not None before using it
             if price is None:
@@ -926,8 +963,8 @@ class LiveSegmentAgent(threading.Thread):
                 
                 # PRIORITY 1: Check DataFrame first (candles collected during the day)
                 # This should have all today's candles that were already fetched and processed
-                if hasattr(self, 'df') and not self.df.empty and signal_candle_time in self.df.index:
-                    df_row = self.df.loc[signal_candle_time]
+                if signal_candle_time in self.candles:
+                    df_row = self.candles.get(signal_candle_time)._asdict()
                     time_since_candle = (now - signal_candle_time).total_seconds()
                     
                     # Check if candle is old enough and not synthetic
@@ -950,11 +987,8 @@ class LiveSegmentAgent(threading.Thread):
                 db_candle = None
                 most_recent_candle = None  # Initialize outside the if block to avoid UnboundLocalError
                 if candle is None:
-                    latest_db_candles = self.candle_repo.get_latest_candles(
-                        segment=self.params.segment,
-                        interval=self.params.time_interval,
-                        limit=20  # Get last 20 candles to find the most recent completed one
-                    )
+                    # Last 20 candles of the in-memory buffer (loaded from / written behind to the database)
+                    latest_db_candles = self.candles.latest(20)
                     
                     # Require an exact candle for signal_candle_time (no older fallback)
                     # A candle is usable if it's at least 1 minute old (to avoid using current forming candle)
@@ -999,9 +1033,7 @@ class LiveSegmentAgent(threading.Thread):
                 if candle is None and db_candle is None:
                     # Fetch fresh candles from API
                         try:
-                            fetched = fetch_recent_index_candles(
-                                self.kite_client,
-                                self.params.segment,
+                            fetched = self.market_data.recent_candles(
                                 self.params.time_interval,
                                 lookback_minutes=interval_minutes * 10  # Fetch 10 intervals
                             )
@@ -1050,37 +1082,9 @@ class LiveSegmentAgent(threading.Thread):
                                             f"L:{newest_row['low']:.2f} C:{newest_row['close']:.2f})"
                                         )
                                         
-                                        # Save the new candles to database AND add to DataFrame immediately
-                                        candles_to_save = []
-                                        for ts, row in usable_candles:
-                                            # Save all usable candles that are at least 1 minute old
-                                            candles_to_save.append({
-                                                'segment': self.params.segment,
-                                                'timestamp': ts,
-                                                'interval': self.params.time_interval,
-                                                'open': float(row['open']),
-                                                'high': float(row['high']),
-                                                'low': float(row['low']),
-                                                'close': float(row['close']),
-                                                'volume': float(row.get('volume', 0.0)),
-                                                'is_synthetic': False
-                                            })
-                                            
-                                            # Add to DataFrame immediately so it's available for next tick
-                                            if ts not in self.df.index:
-                                                self.df.loc[ts] = {
-                                                    'open': float(row['open']),
-                                                    'high': float(row['high']),
-                                                    'low': float(row['low']),
-                                                    'close': float(row['close']),
-                                                    'volume': float(row.get('volume', 0.0))
-                                                }
-                                        
-                                        if candles_to_save:
-                                            saved_count = self.candle_repo.save_candles_batch(candles_to_save)
-                                            self.logger.info(f" Saved {saved_count} new candles to database and DataFrame")
-                                            # Sort DataFrame after adding new candles
-                                            self.df = self.df.sort_index()
+                                        # Add all usable candles (at least 1 minute old) to the candle buffer
+                                        # immediately; the database copy is written behind
+                                        self._store_fetched_candles(usable_candles)
                                     else:
                                         # No exact candle available from API
                                         # CRITICAL: Only use candles from the SAME WINDOW to avoid PS/VS mismatch
@@ -1118,24 +1122,8 @@ class LiveSegmentAgent(threading.Thread):
                                                 f"L:{newest_row['low']:.2f} C:{newest_row['close']:.2f})"
                                             )
                                             
-                                            # Save candles to database
-                                            candles_to_save = []
-                                            for ts, row in usable_candles:
-                                                candles_to_save.append({
-                                                    'segment': self.params.segment,
-                                                    'timestamp': ts,
-                                                    'interval': self.params.time_interval,
-                                                    'open': float(row['open']),
-                                                    'high': float(row['high']),
-                                                    'low': float(row['low']),
-                                                    'close': float(row['close']),
-                                                    'volume': float(row.get('volume', 0.0)),
-                                                    'is_synthetic': False
-                                                })
-                                            
-                                            if candles_to_save:
-                                                saved_count = self.candle_repo.save_candles_batch(candles_to_save)
-                                                self.logger.info(f" Saved {saved_count} new candles to database")
+                                            # Add candles to the candle buffer (database written behind)
+                                            self._store_fetched_candles(usable_candles)
                                         else:
                                             # No candle from same window - implement fallback strategy
                                             # Try previous windows one by one until we find an available candle
@@ -1229,36 +1217,8 @@ class LiveSegmentAgent(threading.Thread):
                                                                 f"L:{newest_row['low']:.2f} C:{newest_row['close']:.2f})"
                                                             )
                                                             
-                                                            # Save candles to database AND add to DataFrame immediately
-                                                            candles_to_save = []
-                                                            for ts, row in usable_candles:
-                                                                candles_to_save.append({
-                                                                    'segment': self.params.segment,
-                                                                    'timestamp': ts,
-                                                                    'interval': self.params.time_interval,
-                                                                    'open': float(row['open']),
-                                                                    'high': float(row['high']),
-                                                                    'low': float(row['low']),
-                                                                    'close': float(row['close']),
-                                                                    'volume': float(row.get('volume', 0.0)),
-                                                                    'is_synthetic': False
-                                                                })
-                                                                
-                                                                # Add to DataFrame immediately
-                                                                if ts not in self.df.index:
-                                                                    self.df.loc[ts] = {
-                                                                        'open': float(row['open']),
-                                                                        'high': float(row['high']),
-                                                                        'low': float(row['low']),
-                                                                        'close': float(row['close']),
-                                                                        'volume': float(row.get('volume', 0.0))
-                                                                    }
-                                                            
-                                                            if candles_to_save:
-                                                                saved_count = self.candle_repo.save_candles_batch(candles_to_save)
-                                                                self.logger.info(f" Saved {saved_count} new candles to database and DataFrame")
-                                                                # Sort DataFrame after adding
-                                                                self.df = self.df.sort_index()
+                                                            # Add candles to the candle buffer immediately (database written behind)
+                                                            self._store_fetched_candles(usable_candles)
                                                             
                                                             found_fallback = True
                                                             break
@@ -1349,11 +1309,7 @@ class LiveSegmentAgent(threading.Thread):
                 
                 # If we didn't find a good candle in database, try exact timestamp match
                 if not db_candle:
-                    db_candle = self.candle_repo.get_candle(
-                        segment=self.params.segment,
-                        timestamp=signal_candle_time,
-                        interval=self.params.time_interval
-                    )
+                    db_candle = self.candles.get(signal_candle_time)
                 
                 # Check if candle is synthetic (all OHLC same) or marked as synthetic
                 # If synthetic and enough time has passed, re-fetch real candle from API
@@ -1417,9 +1373,7 @@ class LiveSegmentAgent(threading.Thread):
                                 f"to find candle for {signal_candle_time}..."
                             )
                             
-                            fetched = fetch_recent_index_candles(
-                                self.kite_client,
-                                self.params.segment,
+                            fetched = self.market_data.recent_candles(
                                 self.params.time_interval,
                                 lookback_minutes=lookback_minutes
                             )
@@ -1497,23 +1451,12 @@ class LiveSegmentAgent(threading.Thread):
                                             f"Will use this candle but signal generation may be limited."
                                         )
                                     
-                                    # Save to database and add to DataFrame immediately
-                                    self.candle_repo.save_candle(
-                                        segment=self.params.segment,
-                                        timestamp=signal_candle_time,
-                                        interval=self.params.time_interval,
-                                        open=candle['open'],
-                                        high=candle['high'],
-                                        low=candle['low'],
-                                        close=candle['close'],
-                                        volume=candle['volume'],
-                                        is_synthetic=not is_real_candle
-                                    )
-                                    
-                                    # Add to DataFrame immediately so it's available for next tick
-                                    if signal_candle_time not in self.df.index:
-                                        self.df.loc[signal_candle_time] = candle
-                                        self.df = self.df.sort_index()
+                                    # Add to the candle buffer immediately so it's available for next tick
+                                    # (database written behind)
+                                    if signal_candle_time not in self.candles:
+                                        self._add_candle(signal_candle_time, candle, is_synthetic=not is_real_candle)
+                                    else:
+                                        self._candle_writer.add(signal_candle_time, candle, is_synthetic=not is_real_candle)
                                     
                                     if is_real_candle:
                                         self.logger.info(
@@ -1559,12 +1502,7 @@ class LiveSegmentAgent(threading.Thread):
                             else:
                                 # Fallback: try to fetch now if not stored (shouldn't happen if startup worked)
                                 self.logger.warning("⚠️ Last trading day candles not stored, fetching now...")
-                                from src.api.live_data import fetch_last_trading_day_candles
-                                fetched_last_day = fetch_last_trading_day_candles(
-                                    self.kite_client,
-                                    self.params.segment,
-                                    self.params.time_interval
-                                )
+                                fetched_last_day = self.market_data.last_trading_day_candles(self.params.time_interval)
                             
                             if fetched_last_day is not None and not fetched_last_day.empty:
                                 # Normalize timezone: convert fetched index to timezone-naive if needed
@@ -1617,23 +1555,11 @@ class LiveSegmentAgent(threading.Thread):
                                     
                                     # Save the candle with TODAY's timestamp (not yesterday's)
                                     # This ensures the DataFrame uses today's timestamp for signal generation
-                                    # Save with TODAY's timestamp and add to DataFrame immediately
-                                    self.candle_repo.save_candle(
-                                        segment=self.params.segment,
-                                        timestamp=original_signal_candle_time,  # Use TODAY's timestamp, not yesterday's
-                                        interval=self.params.time_interval,
-                                        open=candle['open'],
-                                        high=candle['high'],
-                                        low=candle['low'],
-                                        close=candle['close'],
-                                        volume=candle['volume'],
-                                        is_synthetic=not is_real_candle
-                                    )
-                                    
-                                    # Add to DataFrame immediately so it's available for next tick
-                                    if original_signal_candle_time not in self.df.index:
-                                        self.df.loc[original_signal_candle_time] = candle
-                                        self.df = self.df.sort_index()
+                                    # Add to the candle buffer immediately (database written behind)
+                                    if original_signal_candle_time not in self.candles:
+                                        self._add_candle(original_signal_candle_time, candle, is_synthetic=not is_real_candle)
+                                    else:
+                                        self._candle_writer.add(original_signal_candle_time, candle, is_synthetic=not is_real_candle)
                                     
                                     if is_real_candle:
                                         self.logger.info(
@@ -1701,19 +1627,19 @@ class LiveSegmentAgent(threading.Thread):
                         f"This shouldn't happen for signal generation."
                     )
                 
-                # Add the completed candle to DataFrame for signal generation
+                # Add the completed candle to the candle buffer for signal generation
                 # Use signal_candle_time (last completed) instead of rounded_time (current forming)
-                if signal_candle_time not in self.df.index:
-                    self.df.loc[signal_candle_time] = candle
+                # (the buffer keeps candles in chronological order)
+                if signal_candle_time not in self.candles:
+                    self.candles.append(
+                        signal_candle_time, candle['open'], candle['high'], candle['low'], candle['close'],
+                        candle.get('volume', 0.0), is_synthetic=is_synthetic_candle
+                    )
                     self.logger.debug(f" ✅ Added completed candle to DataFrame: {signal_candle_time} (O:{candle['open']:.2f} H:{candle['high']:.2f} L:{candle['low']:.2f} C:{candle['close']:.2f})")
                 
-                # Sort DataFrame by index to ensure chronological order
-                self.df = self.df.sort_index()
-                
                 # Find index of signal_candle_time (the last completed candle we're using for signals)
-                if signal_candle_time in self.df.index:
-                    idx = self.df.index.get_loc(signal_candle_time)
-                else:
+                idx = self.candles.index_of(signal_candle_time)
+                if idx is None:
                     # Fallback: use last index
                     idx = len(self.df) - 1
                     self.logger.warning(f" ⚠️ signal_candle_time {signal_candle_time} not in DataFrame, using last index {idx}")
@@ -1729,10 +1655,13 @@ class LiveSegmentAgent(threading.Thread):
                     self.logger.info(f" Building data history: {idx + 1}/{min_candles_needed} candles collected (need {min_candles_needed} for Price Strength and Volume Strength calculation)")
                     return
 
+                # Advance the streaming indicators on the buffer's close view (rebuilds only if history changed)
+                self.indicator_engine.sync_arrays(self.candles.timestamps, self.candles.close)
+
                 # Calculate RSI for logging
                 try:
-                    rsi_values = self.strategy.calculate_rsi(self.df['close'], self.strategy.rsi_period)
-                    current_rsi = rsi_values.iloc[idx] if not pd.isna(rsi_values.iloc[idx]) else None
+                    rsi_value = self.indicator_engine.rsi[idx]
+                    current_rsi = rsi_value if not pd.isna(rsi_value) else None
                     if current_rsi is not None:
                         self.logger.info(f" 📊 Strategy Analysis - RSI: {current_rsi:.2f}, Price: ₹{price:.2f}, Candles: {idx + 1}")
                 except Exception as e:
@@ -1837,28 +1766,13 @@ class LiveSegmentAgent(threading.Thread):
         """Load expiry configuration from config.json (same as backtesting)"""
         if self._expiry_config is None:
             try:
-                from src.config.config_manager import ConfigManager
-                import json
-                config_manager = ConfigManager()
-                config_path = config_manager.config_dir / "config.json"
-                if config_path.exists():
-                    with open(config_path, 'r') as f:
-                        config_data = json.load(f)
-                        self._expiry_config = config_data.get("expiry_config", {})
-                else:
-                    # Default config
-                    self._expiry_config = {
-                        "BANKNIFTY": {"duration": "Monthly", "day_of_week": "Thursday"},
-                        "NIFTY": {"duration": "Weekly", "day_of_week": "Tuesday"},
-                        "SENSEX": {"duration": "Weekly", "day_of_week": "Thursday"}
-                    }
+                from src.config.config_snapshot import get_config_snapshot
+                # Defaults when config.json is missing
+                self._expiry_config = get_config_snapshot().expiry_config()
             except Exception as e:
                 self.logger.warning(f"Could not load expiry config: {e}, using defaults")
-                self._expiry_config = {
-                    "BANKNIFTY": {"duration": "Monthly", "day_of_week": "Thursday"},
-                    "NIFTY": {"duration": "Weekly", "day_of_week": "Tuesday"},
-                    "SENSEX": {"duration": "Weekly", "day_of_week": "Thursday"}
-                }
+                from src.config.config_snapshot import DEFAULT_EXPIRY_CONFIG
+                self._expiry_config = {k: dict(v) for k, v in DEFAULT_EXPIRY_CONFIG.items()}
         return self._expiry_config
     
     def _get_expiry_date(self, timestamp: datetime) -> Optional[str]:
@@ -2016,26 +1930,10 @@ class LiveSegmentAgent(threading.Thread):
             premium, instrument_details = kite_result
             return (premium, "Kite API")
         
-        # Fallback to estimation (same formula as backtesting)
-        expiry = self._get_expiry_date(timestamp)
-        days_to_expiry = self._calculate_days_to_expiry(timestamp, expiry)
-        
-        # Intrinsic value
-        if option_type.upper() == "CE":
-            intrinsic = max(0, spot_price - strike)
-        else:  # PE
-            intrinsic = max(0, strike - spot_price)
-        
-        # Time value estimation (simplified)
-        # Use segment-specific volatility estimates
-        volatility_multiplier = {
-            "NIFTY": 0.5,
-            "BANKNIFTY": 0.8,
-            "SENSEX": 0.6
-        }.get(self.params.segment.upper(), 0.5)
-        
-        time_value = intrinsic * 0.1 * volatility_multiplier * (1 + days_to_expiry / 7)
-        premium = intrinsic + time_value
+        # Fallback to the Black-Scholes estimate (same estimator as backtesting)
+        expiry = expiry_override or self._get_expiry_date(timestamp)
+        years = years_to_expiry(timestamp, expiry)
+        premium = estimate_option_premium(self.params.segment, spot_price, strike, option_type, years)
         
         return (premium, "Estimated")
 
@@ -2057,10 +1955,7 @@ class LiveSegmentAgent(threading.Thread):
         # Fetch 1-minute candles for multi-timeframe confirmation
         df_1min = None
         try:
-            from src.api.live_data import fetch_recent_index_candles
-            df_1min = fetch_recent_index_candles(
-                self.kite_client,
-                self.params.segment,
+            df_1min = self.market_data.recent_candles(
                 interval="1minute",
                 lookback_minutes=30  # Get last 30 minutes of 1-minute candles
             )
@@ -2077,7 +1972,8 @@ class LiveSegmentAgent(threading.Thread):
             idx,
             allow_reentry=allow_reentry,
             reentry_candle_type=reentry_candle_type,
-            df_1min=df_1min
+            df_1min=df_1min,
+            indicators=self.indicator_engine
         )
         
         # Check for strangle position (both CE and PE open) - check after we know option_type
@@ -2540,7 +2436,7 @@ class LiveSegmentAgent(threading.Thread):
         )
         self.execution.log_open_position(position_record)
         self.logger.info(
-            f" 📝 Position logged to CSV: data/live_trader/open_positions_{datetime.now().strftime('%Y-%m-%d')}.csv"
+            f" 📝 Position logged to journal: data/live_trader/open_positions_{datetime.now().strftime('%Y-%m-%d')}.jsonl"
         )
 
         # Store extra metadata on agent for later use (directly on position dict)
@@ -2857,7 +2753,7 @@ class LiveSegmentAgent(threading.Thread):
             f" ✅ Trade saved to: data/live_trader/live_trades_{datetime.now().strftime('%Y-%m-%d')}.csv"
         )
         self.logger.info(
-            f" ✅ Position marked as CLOSED in: data/live_trader/open_positions_{datetime.now().strftime('%Y-%m-%d')}.csv"
+            f" ✅ Position marked as CLOSED in: data/live_trader/open_positions_{datetime.now().strftime('%Y-%m-%d')}.jsonl"
         )
         self._position_key = None  # Clear position key after exit
         self._pyramiding_count = 0  # Reset pyramiding counter
@@ -3390,14 +3286,9 @@ class LiveSegmentAgent(threading.Thread):
         filter_info: Optional[Dict[str, Any]] = None
     ) -> None:
         """
-        Save PS/VS data to JSON file for time series chart visualization.
-        Stores data per segment per day, preserving ALL historical data across restarts.
-        
-        Append-equivalent behavior for JSON:
-        - Loads existing data from file if it exists (same day)
-        - Adds new data points to the existing array
-        - Writes entire array back to file
-        - This preserves all data across application restarts on the same day
+        Save PS/VS data for time series chart visualization.
+        Points go to the append-only per-segment, per-day PS/VS store, which keeps
+        all data of the day across restarts; re-saving a timestamp replaces its point.
         
         Args:
             price_strength: Current PS value
@@ -3412,58 +3303,18 @@ class LiveSegmentAgent(threading.Thread):
             return
         
         try:
-            # Create data directory if it doesn't exist
-            ps_vs_dir = LOG_DIR / "ps_vs_data"
-            ps_vs_dir.mkdir(parents=True, exist_ok=True)
-            
-            # File name: ps_vs_{segment}_{date}.json
-            date_str = timestamp.strftime("%Y-%m-%d")
-            file_path = ps_vs_dir / f"ps_vs_{self.params.segment}_{date_str}.json"
-            
-            # Load existing data or create new (preserves all historical data)
-            # This is the JSON equivalent of append mode - we load existing data, add new points, and write back
-            # This ensures data is preserved across application restarts on the same day
-            data = []
-            existing_timestamps = set()  # Track existing timestamps to avoid duplicates
-            if file_path.exists():
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        # Build set of existing timestamps to avoid duplicates
-                        existing_timestamps = {d.get("timestamp") for d in data if d.get("timestamp")}
-                        self.logger.debug(f" Loaded {len(data)} existing PS/VS data points from {file_path.name}")
-                except (json.JSONDecodeError, IOError) as e:
-                    self.logger.warning(f" Error loading existing PS/VS data: {e}, starting fresh")
-                    data = []
-                    existing_timestamps = set()
-            
-            # If crossover was detected, save it with the crossover timestamp
+            store = get_ps_vs_store()
+            segment = self.params.segment
+            
+            # If crossover was detected, save it with the crossover timestamp (once)
             if crossover_timestamp is not None and crossover_type is not None:
-                # Check if crossover point already exists (avoid duplicates)
-                crossover_iso = crossover_timestamp.isoformat()
-                existing_crossover = any(
-                    d.get("timestamp") == crossover_iso and d.get("crossover") == crossover_type
-                    for d in data
-                )
-                
-                if not existing_crossover:
-                    # Find PS/VS values at crossover time (use previous data point's values)
-                    crossover_ps = price_strength
-                    crossover_vs = volume_strength
+                if not store.has_crossover(segment, crossover_timestamp, crossover_type):
+                    # PS/VS values at crossover time (from the stored point at or before it)
+                    crossover_ps, crossover_vs = store.strengths_at(segment, crossover_timestamp) or \
+                        (price_strength, volume_strength)
                     
-                    # Try to find the actual PS/VS values at crossover time from previous data
-                    if len(data) > 0:
-                        # Look for data point closest to crossover timestamp
-                        for d in reversed(data):
-                            d_timestamp = datetime.fromisoformat(d["timestamp"])
-                            if d_timestamp <= crossover_timestamp:
-                                crossover_ps = d.get("price_strength", price_strength)
-                                crossover_vs = d.get("volume_strength", volume_strength)
-                                break
-                    
-                    # Create crossover data point with crossover timestamp
                     crossover_point = {
-                        "timestamp": crossover_iso,
+                        "timestamp": crossover_timestamp.isoformat(),
                         "price_strength": round(crossover_ps, 2),
                         "volume_strength": round(crossover_vs, 2),
                         "price": round(current_price, 2) if current_price is not None else None,
@@ -3471,7 +3322,7 @@ class LiveSegmentAgent(threading.Thread):
                         "crossover": crossover_type,
                         "filters": filter_info if filter_info else None
                     }
-                    data.append(crossover_point)
+                    store.append(segment, crossover_point, crossover_point=True)
             
             # Create new data point for current timestamp
             data_point = {
@@ -3485,12 +3336,10 @@ class LiveSegmentAgent(threading.Thread):
             }
             
             # Detect crossover from previous point (fallback if not explicitly provided)
-            if crossover_type is None and len(data) > 0:
-                prev_point = data[-1]
-                prev_ps = prev_point.get("price_strength")
-                prev_vs = prev_point.get("volume_strength")
-                
-                if prev_ps is not None and prev_vs is not None:
+            if crossover_type is None:
+                previous = store.previous_strengths(segment, timestamp)
+                if previous is not None:
+                    prev_ps, prev_vs = previous
                     # PE crossover: PS crosses DOWN to VS (from above to below)
                     if prev_ps > prev_vs and price_strength < volume_strength:
                         data_point["crossover"] = "PE"
@@ -3498,37 +3347,11 @@ class LiveSegmentAgent(threading.Thread):
                     elif prev_ps < prev_vs and price_strength > volume_strength:
                         data_point["crossover"] = "CE"
             
-            # Add new data point only if it doesn't already exist (avoid duplicates on restart)
-            timestamp_iso = timestamp.isoformat()
-            if timestamp_iso not in existing_timestamps:
-                data.append(data_point)
-            else:
-                # Update existing data point if it exists (in case of restart with same timestamp)
-                for i, d in enumerate(data):
-                    if d.get("timestamp") == timestamp_iso:
-                        # Update with latest values
-                        data[i] = data_point
-                        self.logger.debug(f" Updated existing PS/VS data point for {timestamp_iso}")
-                        break
-            
-            # PRESERVE ALL DATA - Do not filter/delete old data
-            # Historical data is preserved across restarts for complete time series visualization
-            # The UI can filter by hours if needed, but we keep all data in the file
-            
-            # Sort data by timestamp to maintain chronological order
-            data.sort(key=lambda x: datetime.fromisoformat(x["timestamp"]) if x.get("timestamp") else datetime.min)
-            
-            # Save to file (preserves all historical data across restarts)
-            # Note: We use 'w' mode here, but since we loaded existing data above and merged new points,
-            # this effectively appends to the file. This is the correct approach for JSON files since
-            # JSON must be a valid structure - we can't append raw text like with log files.
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            store.append(segment, data_point)
             
             # Log successful save (at debug level to avoid spam, but can be enabled for troubleshooting)
             self.logger.debug(
-                f"✅ Saved PS/VS data to {file_path.name}: PS={price_strength:.2f}, VS={volume_strength:.2f}, "
-                f"timestamp={timestamp}, total_points={len(data)}"
+                f"✅ Saved PS/VS data: PS={price_strength:.2f}, VS={volume_strength:.2f}, timestamp={timestamp}"
             )
             
         except Exception as e:
@@ -3602,112 +3425,110 @@ class LiveSegmentAgent(threading.Thread):
     
     def _restore_position_from_csv(self, option_type: OptionType, tradingsymbol: str) -> Optional[Dict[str, Any]]:
         """
-        Try to restore position details from CSV file.
+        Try to restore position details from the open-position journal.
         
         Returns:
             Position dict if found and restored, None otherwise
         """
         try:
-            csv_file = LOG_DIR / f"open_positions_{datetime.now().strftime('%Y-%m-%d')}.csv"
+            journal = get_position_journal()
+            rows = journal.rows(datetime.now())
             
-            if not csv_file.exists():
-                # Try yesterday's file as fallback
-                yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-                csv_file = LOG_DIR / f"open_positions_{yesterday}.csv"
+            if not rows:
+                # Try yesterday's positions as fallback
+                rows = journal.rows(datetime.now() - timedelta(days=1))
             
-            if not csv_file.exists():
+            if not rows:
                 return None
             
-            with open(csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    # Match by segment, option_type, and tradingsymbol
-                    if (row.get('segment', '').upper() == self.params.segment.upper() and
-                        row.get('option_type', '').upper() == option_type.value.upper() and
-                        row.get('status', '').upper() == 'OPEN' and
-                        tradingsymbol.upper() in row.get('option_symbol', '').upper()):
-                        
-                        # Parse position data
-                        try:
-                            entry_strike = float(row.get('strike_price', 0))
-                            # Validate entry_price - ensure it's a valid float, not None or empty
-                            entry_price_raw = row.get('entry_price', '0')
-                            if entry_price_raw is None or entry_price_raw == '':
-                                self.logger.warning(f"Missing entry_price in CSV for {tradingsymbol}, using 0 as fallback")
+            for row in rows:
+                # Match by segment, option_type, and tradingsymbol
+                if (row.get('segment', '').upper() == self.params.segment.upper() and
+                    row.get('option_type', '').upper() == option_type.value.upper() and
+                    row.get('status', '').upper() == 'OPEN' and
+                    tradingsymbol.upper() in row.get('option_symbol', '').upper()):
+                    
+                    # Parse position data
+                    try:
+                        entry_strike = float(row.get('strike_price', 0))
+                        # Validate entry_price - ensure it's a valid float, not None or empty
+                        entry_price_raw = row.get('entry_price', '0')
+                        if entry_price_raw is None or entry_price_raw == '':
+                            self.logger.warning(f"Missing entry_price in CSV for {tradingsymbol}, using 0 as fallback")
+                            entry_price = 0.0
+                        else:
+                            try:
+                                entry_price = float(entry_price_raw)
+                                if entry_price <= 0:
+                                    self.logger.warning(f"Invalid entry_price ({entry_price}) in CSV for {tradingsymbol}, using average_price from Kite")
+                                    # Try to get average_price from Kite if available
+                                    kite_pos = self.execution.check_kite_position_by_option_type(
+                                        self.params.segment,
+                                        option_type.value
+                                    )
+                                    if kite_pos:
+                                        entry_price = float(kite_pos.get('average_price', 0))
+                            except (ValueError, TypeError):
+                                self.logger.warning(f"Could not parse entry_price '{entry_price_raw}' from CSV, using 0")
                                 entry_price = 0.0
-                            else:
-                                try:
-                                    entry_price = float(entry_price_raw)
-                                    if entry_price <= 0:
-                                        self.logger.warning(f"Invalid entry_price ({entry_price}) in CSV for {tradingsymbol}, using average_price from Kite")
-                                        # Try to get average_price from Kite if available
-                                        kite_pos = self.execution.check_kite_position_by_option_type(
-                                            self.params.segment,
-                                            option_type.value
-                                        )
-                                        if kite_pos:
-                                            entry_price = float(kite_pos.get('average_price', 0))
-                                except (ValueError, TypeError):
-                                    self.logger.warning(f"Could not parse entry_price '{entry_price_raw}' from CSV, using 0")
-                                    entry_price = 0.0
-                            
-                            entry_time_str = row.get('entry_time', '')
-                            expiry = row.get('expiry', '')
-                            lots = int(row.get('current_lots', 1))
-                            quantity = int(row.get('current_quantity', 0))
-                            
-                            # Parse entry time
-                            entry_time = datetime.now()
-                            if entry_time_str:
-                                try:
-                                    entry_time = datetime.fromisoformat(entry_time_str.replace('Z', '+00:00'))
-                                    if entry_time.tzinfo:
-                                        entry_time = entry_time.replace(tzinfo=None)
-                                except:
-                                    pass
-                            
-                            # Validate entry_price before restoring
-                            if entry_price is None or entry_price <= 0:
-                                self.logger.error(
-                                    f"❌ Cannot restore {option_type.value} position from CSV: "
-                                    f"Invalid entry_price ({entry_price}). Skipping restoration."
-                                )
-                                return None
-                            
-                            # Restore position in agent
-                            # Calculate total_investment from entry_price and lots
-                            total_investment = entry_price * lots if entry_price > 0 and lots > 0 else 0
-                            position_data = {
-                                'entry_strike': entry_strike,
-                                'entry_price': float(entry_price),  # Ensure it's a float
-                                'entry_time': entry_time,
-                                'lots': lots,
-                                'quantity': quantity,
-                                'expiry': expiry,
-                                'tradingsymbol': tradingsymbol,
-                                'highest_profit': 0,  # Initialize for tracking
-                                'trailing_stop_price': None,  # Initialize for tracking
-                                'total_investment': total_investment  # Initialize for tracking
-                            }
-                            
-                            self.agent.positions[option_type] = position_data
-                            self.agent.current_position = option_type
-                            
-                            # Set position metadata
-                            self.agent.set_position_metadata(
-                                option_type,
-                                entry_expiry=expiry,
-                                tradingsymbol=tradingsymbol
+                        
+                        entry_time_str = row.get('entry_time', '')
+                        expiry = row.get('expiry', '')
+                        lots = int(row.get('current_lots', 1))
+                        quantity = int(row.get('current_quantity', 0))
+                        
+                        # Parse entry time
+                        entry_time = datetime.now()
+                        if entry_time_str:
+                            try:
+                                entry_time = datetime.fromisoformat(entry_time_str.replace('Z', '+00:00'))
+                                if entry_time.tzinfo:
+                                    entry_time = entry_time.replace(tzinfo=None)
+                            except:
+                                pass
+                        
+                        # Validate entry_price before restoring
+                        if entry_price is None or entry_price <= 0:
+                            self.logger.error(
+                                f"❌ Cannot restore {option_type.value} position from CSV: "
+                                f"Invalid entry_price ({entry_price}). Skipping restoration."
                             )
-                            
-                            # Set position key for tracking
-                            self._position_key = f"{self.params.segment}_{entry_strike}_{option_type.value}"
-                            
-                            return position_data
-                        except Exception as e:
-                            self.logger.warning(f"Error parsing CSV position data: {e}")
-                            continue
-            
+                            return None
+                        
+                        # Restore position in agent
+                        # Calculate total_investment from entry_price and lots
+                        total_investment = entry_price * lots if entry_price > 0 and lots > 0 else 0
+                        position_data = {
+                            'entry_strike': entry_strike,
+                            'entry_price': float(entry_price),  # Ensure it's a float
+                            'entry_time': entry_time,
+                            'lots': lots,
+                            'quantity': quantity,
+                            'expiry': expiry,
+                            'tradingsymbol': tradingsymbol,
+                            'highest_profit': 0,  # Initialize for tracking
+                            'trailing_stop_price': None,  # Initialize for tracking
+                            'total_investment': total_investment  # Initialize for tracking
+                        }
+                        
+                        self.agent.positions[option_type] = position_data
+                        self.agent.current_position = option_type
+                        
+                        # Set position metadata
+                        self.agent.set_position_metadata(
+                            option_type,
+                            entry_expiry=expiry,
+                            tradingsymbol=tradingsymbol
+                        )
+                        
+                        # Set position key for tracking
+                        self._position_key = f"{self.params.segment}_{entry_strike}_{option_type.value}"
+                        
+                        return position_data
+                    except Exception as e:
+                        self.logger.warning(f"Error parsing CSV position data: {e}")
+                        continue
+        
             return None
             
         except Exception as e:
@@ -0,0 +1,413 @@
+"""
+In-memory candle store for live trading.
+
+CandleRingBuffer keeps the OHLCV candles of one (segment, interval) in
+fixed-capacity NumPy arrays with O(1) append and timestamp lookup; its column
+views are zero-copy and always in chronological order, so indicator code can
+consume them directly. CandleWriteBehind persists new candles to the database
+in batches from a background thread.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.logger import get_logger
+
+logger = get_logger("live_trader")
+
+# Enough for several trading days of 1-minute candles
+DEFAULT_CAPACITY = 2000
+
+OHLCV_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class CandleRecord(NamedTuple):
+    """One stored candle (attribute-compatible with the Candle DB model)"""
+    timestamp: pd.Timestamp
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    is_synthetic: bool
+
+
+def _to_ns(timestamp) -> int:
+    """Naive IST timestamp as int64 nanoseconds (timezone-aware values are converted to IST)"""
+    ts = pd.Timestamp(timestamp)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("Asia/Kolkata").tz_localize(None)
+    return ts.value
+
+
+class CandleRingBuffer:
+    """
+    Fixed-capacity OHLCV ring buffer.
+
+    Every value is written twice (at slot and slot + capacity), so the live
+    window [start, start + len) is always one contiguous slice: the column
+    properties return read-only views without copying. When the buffer is
+    full the oldest candle is evicted.
+
+    Appends in timestamp order and updates of an existing timestamp are O(1);
+    an out-of-order candle (rare back-fill) rebuilds the buffer in O(n).
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._timestamps = np.zeros(2 * capacity, dtype=np.int64)
+        self._values = np.zeros((len(OHLCV_FIELDS), 2 * capacity), dtype=float)
+        self._synthetic = np.zeros(2 * capacity, dtype=bool)
+        self._start = 0
+        self._size = 0
+        self._first_seq = 0  # sequence number of the oldest candle
+        self._seq_by_ts: Dict[int, int] = {}
+        self._lock = threading.RLock()
+        self._frame: Optional[pd.DataFrame] = None
+        self._frame_version = -1
+        self.version = 0  # bumped on every change
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, timestamp) -> bool:
+        return _to_ns(timestamp) in self._seq_by_ts
+
+    # --- zero-copy views (chronological) ---
+
+    def _view(self, array: np.ndarray) -> np.ndarray:
+        view = array[self._start:self._start + self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Candle timestamps as int64 nanoseconds"""
+        return self._view(self._timestamps)
+
+    @property
+    def open(self) -> np.ndarray:
+        return self._view(self._values[0])
+
+    @property
+    def high(self) -> np.ndarray:
+        return self._view(self._values[1])
+
+    @property
+    def low(self) -> np.ndarray:
+        return self._view(self._values[2])
+
+    @property
+    def close(self) -> np.ndarray:
+        return self._view(self._values[3])
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self._view(self._values[4])
+
+    @property
+    def is_synthetic(self) -> np.ndarray:
+        return self._view(self._synthetic)
+
+    # --- lookups ---
+
+    def index_of(self, timestamp) -> Optional[int]:
+        """Position of a candle in the chronological views, or None"""
+        seq = self._seq_by_ts.get(_to_ns(timestamp))
+        return None if seq is None else seq - self._first_seq
+
+    def get(self, timestamp) -> Optional[CandleRecord]:
+        """Candle at a timestamp, or None"""
+        position = self.index_of(timestamp)
+        return None if position is None else self.record_at(position)
+
+    def record_at(self, position: int) -> CandleRecord:
+        """Candle at a chronological position (negative positions count from the newest)"""
+        if position < 0:
+            position += self._size
+        if not 0 <= position < self._size:
+            raise IndexError("candle position out of range")
+        slot = self._start + position
+        values = self._values[:, slot]
+        return CandleRecord(
+            pd.Timestamp(int(self._timestamps[slot])),
+            float(values[0]), float(values[1]), float(values[2]), float(values[3]), float(values[4]),
+            bool(self._synthetic[slot])
+        )
+
+    def latest(self, limit: int) -> List[CandleRecord]:
+        """Newest `limit` candles in chronological order"""
+        count = min(limit, self._size)
+        return [self.record_at(position) for position in range(self._size - count, self._size)]
+
+    @property
+    def last_timestamp(self) -> Optional[pd.Timestamp]:
+        return self.record_at(-1).timestamp if self._size else None
+
+    # --- writes ---
+
+    def _write(self, slot: int, ts_ns: int, values: Tuple[float, ...], is_synthetic: bool) -> None:
+        mirror = slot + self.capacity if slot < self.capacity else slot - self.capacity
+        for s in (slot, mirror):
+            self._timestamps[s] = ts_ns
+            self._values[:, s] = values
+            self._synthetic[s] = is_synthetic
+
+    def append(
+        self,
+        timestamp,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float = 0.0,
+        is_synthetic: bool = False
+    ) -> None:
+        """
+        Add a candle, or update the candle already stored at that timestamp.
+
+        An existing real candle is never replaced by a synthetic one (same rule
+        as CandleRepository).
+        """
+        ts_ns = _to_ns(timestamp)
+        values = (float(open), float(high), float(low), float(close), float(volume or 0.0))
+        with self._lock:
+            seq = self._seq_by_ts.get(ts_ns)
+            if seq is not None:
+                slot = self._start + seq - self._first_seq
+                if is_synthetic and not self._synthetic[slot]:
+                    return
+                self._write(slot % self.capacity, ts_ns, values, bool(is_synthetic))
+            elif self._size and ts_ns < self._timestamps[self._start + self._size - 1]:
+                self._insert_out_of_order(ts_ns, values, bool(is_synthetic))
+                return
+            else:
+                if self._size == self.capacity:
+                    evicted = int(self._timestamps[self._start])
+                    del self._seq_by_ts[evicted]
+                    self._start = (self._start + 1) % self.capacity
+                    self._first_seq += 1
+                    self._size -= 1
+                slot = (self._start + self._size) % self.capacity
+                self._write(slot, ts_ns, values, bool(is_synthetic))
+                self._seq_by_ts[ts_ns] = self._first_seq + self._size
+                self._size += 1
+            self.version += 1
+
+    def _insert_out_of_order(self, ts_ns: int, values: Tuple[float, ...], is_synthetic: bool) -> None:
+        timestamps = self.timestamps.copy()
+        data = self._values[:, self._start:self._start + self._size].copy()
+        synthetic = self.is_synthetic.copy()
+        position = int(np.searchsorted(timestamps, ts_ns))
+        timestamps = np.insert(timestamps, position, ts_ns)
+        data = np.insert(data, position, values, axis=1)
+        synthetic = np.insert(synthetic, position, is_synthetic)
+        self._load_arrays(timestamps, data, synthetic)
+
+    def _load_arrays(self, timestamps: np.ndarray, data: np.ndarray, synthetic: np.ndarray) -> None:
+        """Replace the contents with sorted, unique candles (keeps the newest `capacity`)"""
+        timestamps = timestamps[-self.capacity:]
+        data = data[:, -self.capacity:]
+        synthetic = synthetic[-self.capacity:]
+        size = len(timestamps)
+        for offset in (0, self.capacity):
+            self._timestamps[offset:offset + size] = timestamps
+            self._values[:, offset:offset + size] = data
+            self._synthetic[offset:offset + size] = synthetic
+        self._start = 0
+        self._size = size
+        self._first_seq = 0
+        self._seq_by_ts = {int(ts): seq for seq, ts in enumerate(timestamps)}
+        self.version += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._start = 0
+            self._size = 0
+            self._first_seq = 0
+            self._seq_by_ts = {}
+            self.version += 1
+
+    def load_frame(self, df: pd.DataFrame) -> None:
+        """
+        Replace the contents with an OHLCV DataFrame (DatetimeIndex-like index).
+        An optional boolean 'is_synthetic' column is kept; duplicates keep the last row.
+        """
+        with self._lock:
+            if df is None or df.empty:
+                self.clear()
+                return
+            index = pd.DatetimeIndex(df.index)
+            if index.tz is not None:
+                index = index.tz_convert("Asia/Kolkata").tz_localize(None)
+            timestamps = index.as_unit("ns").asi8
+            order = np.argsort(timestamps, kind="stable")
+            timestamps = timestamps[order]
+            # Keep the last occurrence of duplicated timestamps
+            keep = np.append(timestamps[1:] != timestamps[:-1], True)
+            data = np.vstack([
+                df[field].to_numpy(dtype=float) if field in df.columns else np.zeros(len(df))
+                for field in OHLCV_FIELDS
+            ])[:, order][:, keep]
+            if "is_synthetic" in df.columns:
+                synthetic = df["is_synthetic"].fillna(False).to_numpy(dtype=bool)[order][keep]
+            else:
+                synthetic = np.zeros(int(keep.sum()), dtype=bool)
+            self._load_arrays(timestamps[keep], np.nan_to_num(data, nan=0.0), synthetic)
+
+    def merge_frame(self, df: pd.DataFrame, is_synthetic: bool = False) -> None:
+        """Add or update every candle of an OHLCV DataFrame"""
+        if df is None or df.empty:
+            return
+        with self._lock:
+            current = self.frame(include_synthetic=True)
+            incoming = df[[field for field in OHLCV_FIELDS if field in df.columns]].copy()
+            incoming["is_synthetic"] = is_synthetic
+            if current.empty:
+                self.load_frame(incoming)
+                return
+            index = pd.DatetimeIndex(incoming.index)
+            if index.tz is not None:
+                incoming.index = index.tz_convert("Asia/Kolkata").tz_localize(None)
+            if is_synthetic:
+                # Do not replace real candles with synthetic ones
+                real = current.index[~current["is_synthetic"].to_numpy(dtype=bool)]
+                incoming = incoming[~incoming.index.isin(real)]
+            self.load_frame(pd.concat([current, incoming]))
+
+    # --- DataFrame adapter ---
+
+    def frame(self, include_synthetic: bool = False) -> pd.DataFrame:
+        """
+        OHLCV DataFrame indexed by timestamp.
+
+        The OHLCV frame is rebuilt only after the buffer changed; treat it as read-only.
+        """
+        with self._lock:
+            if include_synthetic:
+                return self._build_frame(include_synthetic=True)
+            if self._frame is None or self._frame_version != self.version:
+                self._frame = self._build_frame()
+                self._frame_version = self.version
+            return self._frame
+
+    def _build_frame(self, include_synthetic: bool = False) -> pd.DataFrame:
+        columns = {field: getattr(self, field) for field in OHLCV_FIELDS}
+        if include_synthetic:
+            columns["is_synthetic"] = self.is_synthetic
+        return pd.DataFrame(columns, index=pd.DatetimeIndex(self.timestamps))
+
+
+# Shared buffers, one per (segment, interval)
+_buffers: Dict[Tuple[str, str], CandleRingBuffer] = {}
+_buffers_lock = threading.Lock()
+
+
+def get_candle_buffer(segment: str, interval: str, capacity: int = DEFAULT_CAPACITY) -> CandleRingBuffer:
+    """Get the process-wide ring buffer of a (segment, interval)"""
+    key = (segment.upper(), interval)
+    with _buffers_lock:
+        buffer = _buffers.get(key)
+        if buffer is None:
+            buffer = CandleRingBuffer(capacity)
+            _buffers[key] = buffer
+        return buffer
+
+
+class CandleWriteBehind:
+    """
+    Batched, deferred persistence of candles to CandleRepository.
+
+    Candles are queued with `add` (the newest version per timestamp wins) and
+    written with one bulk upsert per flush, either from the background thread
+    started with `start` or by calling `flush` directly.
+    """
+
+    def __init__(self, candle_repo, segment: str, interval: str, flush_interval: float = 5.0):
+        self.candle_repo = candle_repo
+        self.segment = segment
+        self.interval = interval
+        self.flush_interval = flush_interval
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.written = 0
+
+    def add(self, timestamp, candle: Dict[str, float], is_synthetic: bool = False) -> None:
+        """Queue one candle (dict with open/high/low/close[/volume]) for persistence"""
+        ts = pd.Timestamp(timestamp)
+        row = {
+            'segment': self.segment,
+            'timestamp': ts.to_pydatetime(),
+            'interval': self.interval,
+            'open': float(candle['open']),
+            'high': float(candle['high']),
+            'low': float(candle['low']),
+            'close': float(candle['close']),
+            'volume': float(candle.get('volume', 0.0) or 0.0),
+            'is_synthetic': bool(is_synthetic)
+        }
+        with self._lock:
+            queued = self._pending.get(ts.value)
+            # Same rule as the database: a queued real candle is not replaced by a synthetic one
+            if queued is not None and is_synthetic and not queued['is_synthetic']:
+                return
+            self._pending[ts.value] = row
+
+    def add_frame(self, df: pd.DataFrame, is_synthetic: bool = False) -> None:
+        for ts, row in df.iterrows():
+            self.add(ts, row, is_synthetic)
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def flush(self) -> int:
+        """Write all queued candles; on failure they stay queued for the next flush"""
+        with self._lock:
+            if not self._pending:
+                return 0
+            batch = self._pending
+            self._pending = {}
+        try:
+            saved = self.candle_repo.save_candles_batch(list(batch.values()))
+            self.written += saved
+            return saved
+        except Exception as e:
+            logger.warning(f"Candle write-behind for {self.segment} {self.interval} failed, will retry: {e}")
+            with self._lock:
+                # Candles queued meanwhile are newer and take precedence
+                batch.update(self._pending)
+                self._pending = batch
+            return 0
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+        self.flush()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, daemon=True, name=f"CandleWriter-{self.segment}-{self.interval}"
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """Stop the background thread after a final flush"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        else:
+            self.flush()
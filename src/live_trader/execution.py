@@ -13,9 +13,12 @@ import csv
 import os
 
 from src.api.kite_client import KiteClient
+from src.api.instrument_store import get_instrument_store
+from src.live_trader.position_journal import get_position_journal
 from src.utils.logger import get_logger
 from src.utils.exceptions import OrderExecutionError
 from src.utils.date_utils import get_current_ist_time
+from src.utils.status_stream import publish_status
 
 logger = get_logger("live_trader")
 
@@ -141,80 +144,24 @@ class PaperExecutionClient:
         except Exception as e:
             logger.debug(f"Could not backup CSV to Azure: {e}")
 
+        publish_status("live_trade", asdict(record), key=record.segment)
         logger.info(
             f"Logged paper trade: segment={record.segment}, symbol={record.option_symbol}, "
             f"pnl={record.pnl_value:.2f} ({record.pnl_points:.2f} pts)"
         )
     
     def log_open_position(self, record: OpenPositionRecord) -> None:
-        """Log or update an open position in CSV file."""
-        file_path = LOG_DIR / f"open_positions_{_today_str()}.csv"
-        is_new = not file_path.exists()
-        
-        # Create record dict with all fields
-        record_dict = asdict(record)
-        # Ensure update_time is set
-        if record_dict.get('update_time') is None:
-            record_dict['update_time'] = get_current_ist_time()
-        
-        # Convert datetime fields to ISO format
-        for k, v in record_dict.items():
-            if isinstance(v, datetime):
-                record_dict[k] = v.isoformat() if v else ""
-            elif v is None:
-                record_dict[k] = ""
-        
-        fieldnames = list(record_dict.keys())
-        
-        # If file exists, try to update existing row or append new one
-        position_key = f"{record.segment}_{record.strike_price}_{record.option_type}"
-        
-        if is_new:
-            # Create new file with header
-            with file_path.open("w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerow(record_dict)
-        else:
-            # Read existing file, update matching row, or append new row
-            rows = []
-            updated = False
-            
-            if file_path.exists():
-                with file_path.open("r", newline="", encoding="utf-8") as f:
-                    reader = csv.DictReader(f)
-                    fieldnames = reader.fieldnames or fieldnames
-                    for row in reader:
-                        # Check if this row matches our position
-                        row_key = f"{row.get('segment', '')}_{row.get('strike_price', '')}_{row.get('option_type', '')}"
-                        if row_key == position_key and row.get('status', '') == 'OPEN':
-                            # Update existing open position
-                            rows.append(record_dict)
-                            updated = True
-                        else:
-                            rows.append(row)
-            
-            # If not updated, append as new row
-            if not updated:
-                rows.append(record_dict)
-            
-            # Write all rows back
-            with file_path.open("w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(rows)
-            
-            # Backup to Azure Blob Storage after writing
-            try:
-                from src.utils.csv_backup import backup_csv_file
-                backup_csv_file(file_path)
-            except Exception as e:
-                logger.debug(f"Could not backup CSV to Azure: {e}")
+        """
+        Log or update an open position in the open-position journal.
+        open_positions_{date}.csv is exported from the journal on demand.
+        """
+        row = get_position_journal().record(record)
+        publish_status("live_position", asdict(record), key=f"{record.segment}:{record.mode}", state=True)
         
         logger.debug(
             f"Updated open position: segment={record.segment}, symbol={record.option_symbol}, "
             f"status={record.status}, P&L=₹{record.current_pnl_value:.2f} ({record.current_pnl_points:.2f} pts), "
-            f"lots={record.current_lots}, update_time={record_dict.get('update_time', '')}"
+            f"lots={record.current_lots}, update_time={row.get('update_time', '')}"
         )
 
 
@@ -258,8 +205,8 @@ class LiveExecutionClient:
             from src.utils.premium_fetcher import get_exchange_for_segment
             exchange = get_exchange_for_segment(segment)
             
-            # Get instruments list from the correct exchange
-            instruments = self.kite_client.kite.instruments(exchange)
+            # Indexed instrument dump of the correct exchange (shared, loaded once per day)
+            index = get_instrument_store().get_index(self.kite_client, exchange)
             
             # Map segment to base name
             segment_map = {
@@ -277,32 +224,32 @@ class LiveExecutionClient:
             
             # First, try to find by tradingsymbol if expiry is provided (same format as get_premium_by_symbol.py)
             if expiry:
-                from src.utils.premium_fetcher import build_tradingsymbol, find_instrument_by_tradingsymbol
-                import json
-                from pathlib import Path
+                from src.utils.premium_fetcher import build_tradingsymbol
+                from src.config.config_snapshot import get_config_snapshot
                 
                 # Load expiry config
                 try:
-                    config_path = Path(__file__).parent.parent.parent / "config" / "config.json"
-                    expiry_config = None
-                    if config_path.exists():
-                        with open(config_path, 'r') as f:
-                            config_data = json.load(f)
-                            expiry_config = config_data.get("expiry_config", {})
+                    snapshot = get_config_snapshot()
+                    expiry_config = snapshot.to_dict("expiry_config") if snapshot.exists else None
                 except Exception as e:
                     logger.debug(f"Could not load expiry config: {e}, using defaults")
                     expiry_config = None
                 
                 tradingsymbol = build_tradingsymbol(segment, strike, option_type, expiry, expiry_config)
                 if tradingsymbol:
-                    instrument = find_instrument_by_tradingsymbol(tradingsymbol, instruments, exchange)
+                    instrument = index.by_tradingsymbol(tradingsymbol)
                     if instrument:
                         logger.debug(f"Found instrument by tradingsymbol: {tradingsymbol}")
                         return instrument
+                
+                # Exact contract lookup by (name, expiry, strike, type)
+                instrument = index.find_option(base_name, expiry, strike, option_type)
+                if instrument and instrument.get('segment') == segment_code:
+                    return instrument
             
             # Fallback: Filter by base name and option type
             filtered = [
-                inst for inst in instruments
+                inst for inst in index.by_name(base_name)
                 if inst.get('segment') == segment_code and
                 inst['name'] == base_name and
                 inst['instrument_type'] == option_type.upper() and
@@ -343,7 +290,7 @@ class LiveExecutionClient:
                 # Get all expiries and find nearest
                 expiries = sorted(set(
                     inst['expiry'].date() if hasattr(inst['expiry'], 'date') else inst['expiry']
-                    for inst in instruments 
+                    for inst in index.by_name(base_name) 
                     if inst.get('name') == base_name and inst.get('expiry')
                 ))
                 if expiries:
@@ -366,7 +313,7 @@ class LiveExecutionClient:
                         return None
                     
                     filtered = [
-                        inst for inst in instruments
+                        inst for inst in index.by_name(base_name)
                         if inst.get('segment') == 'NFO-OPT' and
                         inst['name'] == base_name and
                         inst['instrument_type'] == option_type.upper() and
@@ -942,16 +889,15 @@ class LiveExecutionClient:
         except Exception as e:
             logger.debug(f"Could not backup CSV to Azure: {e}")
 
+        publish_status("live_trade", asdict(record), key=record.segment)
         logger.info(
             f"Logged LIVE trade: segment={record.segment}, symbol={record.option_symbol}, "
             f"pnl={record.pnl_value:.2f} ({record.pnl_points:.2f} pts)"
         )
     
     def log_open_position(self, record: OpenPositionRecord) -> None:
-        """Log or update an open position in CSV file (same as PaperExecutionClient)."""
-        # Delegate to PaperExecutionClient's implementation
-        # Create a temporary instance to use the method
-        temp_paper_client = PaperExecutionClient(mode="PAPER")
-        temp_paper_client.log_open_position(record)
+        """Log or update an open position in the open-position journal (same as PaperExecutionClient)."""
+        get_position_journal().record(record)
+        publish_status("live_position", asdict(record), key=f"{record.segment}:{record.mode}", state=True)
 
 
@@ -0,0 +1,204 @@
+"""
+Streaming index feed for the Live Trader.
+
+IndexTickFeed subscribes the index tokens of INDEX_INSTRUMENT_TOKENS over the
+Kite websocket, aggregates their ticks into 1/3/5-minute bars and, as each bar
+closes, stores it in the shared candle buffer of its (segment, interval) and
+publishes a bar-close snapshot through the segment's MarketDataHub, so agents
+evaluate signals within a fraction of a second of the close instead of
+waiting for the next poll and back-filling candles from the REST API.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, IO, List, Optional, Sequence, Tuple
+
+from kiteconnect import KiteTicker
+
+from src.api.live_data import INDEX_INSTRUMENT_TOKENS
+from src.api.market_data_hub import MarketSnapshot, get_market_data_hub
+from src.api.websocket_client import WebSocketClient
+from src.live_trader.candle_store import CandleWriteBehind, get_candle_buffer
+from src.live_trader.tick_aggregator import BAR_MINUTES, TickBar, TickBarAggregator, tick_record
+from src.utils.date_utils import get_current_ist_time
+from src.utils.logger import get_logger
+
+logger = get_logger("live_trader")
+
+DEFAULT_BAR_INTERVALS = ("1minute", "3minute", "5minute")
+
+
+def _ist_now() -> datetime:
+    return get_current_ist_time().replace(tzinfo=None)
+
+
+class IndexTickFeed:
+    """
+    KiteTicker index feed -> in-memory bars -> candle buffers and agents.
+
+    Bars that started before the feed did are incomplete and are dropped.
+    Open bars are closed by a timer close_grace_seconds after their end, so a
+    bar is published even if the next tick is late. With a candle_repo, closed
+    bars are also written behind to the database; with record_path, raw ticks
+    are appended as JSON lines for offline replay (see tick_aggregator).
+    """
+
+    def __init__(
+        self,
+        kite_client,
+        segments: Sequence[str],
+        intervals: Sequence[str] = DEFAULT_BAR_INTERVALS,
+        candle_repo=None,
+        record_path: Optional[str] = None,
+        close_grace_seconds: float = 0.25,
+        websocket_client: Optional[WebSocketClient] = None,
+    ):
+        self.kite_client = kite_client
+        self.segments = [segment.upper() for segment in segments if segment.upper() in INDEX_INSTRUMENT_TOKENS]
+        unsupported = [segment for segment in segments if segment.upper() not in INDEX_INSTRUMENT_TOKENS]
+        if unsupported:
+            logger.warning(f"IndexTickFeed: no index token for {unsupported}; they keep polling")
+        self._segment_by_token: Dict[int, str] = {INDEX_INSTRUMENT_TOKENS[s]: s for s in self.segments}
+        self.intervals = [interval for interval in dict.fromkeys(intervals) if interval in BAR_MINUTES]
+        self.candle_repo = candle_repo
+        self.record_path = record_path
+        self.close_grace_seconds = close_grace_seconds
+        self.websocket_client = websocket_client
+
+        self._aggregator = TickBarAggregator(self.intervals)
+        self._lock = threading.Lock()
+        self._writers: Dict[Tuple[str, str], CandleWriteBehind] = {}
+        self._record_file: Optional[IO[str]] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._started_at: Optional[datetime] = None
+        self.bars_stored = 0
+        self.partial_bars_dropped = 0
+        self.last_tick_at: Optional[datetime] = None
+
+    @property
+    def tokens(self) -> List[int]:
+        return list(self._segment_by_token)
+
+    # --- lifecycle ---
+
+    def start(self) -> bool:
+        """Connect the websocket and start closing bars; False if the feed could not connect"""
+        if not self.segments:
+            return False
+        self._started_at = _ist_now()
+        if self.candle_repo is not None:
+            for segment in self.segments:
+                for interval in self.intervals:
+                    writer = CandleWriteBehind(self.candle_repo, segment, interval)
+                    writer.start()
+                    self._writers[(segment, interval)] = writer
+        if self.record_path:
+            self._record_file = open(self.record_path, "a", encoding="utf-8")
+
+        if self.websocket_client is None:
+            self.websocket_client = WebSocketClient(self.kite_client)
+        self.websocket_client.set_callbacks(on_ticks=self.on_ticks, on_connect=self._on_connect)
+        if not self.websocket_client.connect():
+            logger.warning("IndexTickFeed: websocket connection failed; agents fall back to polling")
+            self.stop()
+            return False
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="IndexTickFeed")
+        self._thread.start()
+        logger.info(f"IndexTickFeed started for {self.segments} with bars {self.intervals}")
+        return True
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Disconnect and flush written-behind bars (the incomplete open bars are discarded)"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self.websocket_client is not None:
+            self.websocket_client.disconnect()
+        for writer in self._writers.values():
+            writer.stop()
+        self._writers = {}
+        if self._record_file is not None:
+            self._record_file.close()
+            self._record_file = None
+        logger.info("IndexTickFeed stopped")
+
+    def _on_connect(self) -> None:
+        self.websocket_client.subscribe(self.tokens)
+        # Full mode is the only one that carries the exchange timestamp of index ticks
+        self.websocket_client.set_mode(KiteTicker.MODE_FULL, self.tokens)
+
+    def _run(self) -> None:
+        # Close bars on time even when no further tick arrives
+        while not self._stop_event.wait(0.1):
+            now = _ist_now()
+            with self._lock:
+                closed = self._aggregator.close_due(now - timedelta(seconds=self.close_grace_seconds))
+            self._on_bars(closed, now)
+
+    # --- ticks and bars ---
+
+    def on_ticks(self, ticks: List[Dict[str, Any]]) -> None:
+        """WebSocketClient callback"""
+        received_at = _ist_now()
+        closed: List[TickBar] = []
+        latest: Dict[str, Tuple[float, datetime]] = {}
+        with self._lock:
+            for tick in ticks:
+                segment = self._segment_by_token.get(tick.get("instrument_token"))
+                if segment is None or tick.get("last_price") is None:
+                    continue
+                record = tick_record(tick, received_at)
+                timestamp = tick.get("exchange_timestamp") or received_at
+                closed.extend(self._aggregator.add_tick(
+                    record["instrument_token"], record["last_price"], timestamp, record["volume"]
+                ))
+                latest[segment] = (record["last_price"], timestamp)
+                if self._record_file is not None:
+                    self._record_file.write(json.dumps(record) + "\n")
+            self.last_tick_at = received_at
+        for segment, (ltp, timestamp) in latest.items():
+            get_market_data_hub(self.kite_client, segment).push_ltp(ltp, timestamp)
+        self._on_bars(closed, received_at)
+
+    def _on_bars(self, bars: List[TickBar], now: datetime) -> None:
+        """Store closed bars, then send one bar-close snapshot per segment"""
+        closed_by_segment: Dict[str, TickBar] = {}
+        for bar in bars:
+            if self._started_at is not None and bar.start < self._started_at:
+                self.partial_bars_dropped += 1
+                continue
+            segment = self._segment_by_token[bar.instrument_token]
+            candle = bar.as_candle()
+            get_candle_buffer(segment, bar.interval).append(
+                bar.start, bar.open, bar.high, bar.low, bar.close, bar.volume
+            )
+            writer = self._writers.get((segment, bar.interval))
+            if writer is not None:
+                writer.add(bar.start, candle)
+            self.bars_stored += 1
+            previous = closed_by_segment.get(segment)
+            if previous is None or BAR_MINUTES[bar.interval] > BAR_MINUTES[previous.interval]:
+                closed_by_segment[segment] = bar
+        for segment, bar in closed_by_segment.items():
+            get_market_data_hub(self.kite_client, segment).publish(
+                MarketSnapshot(segment, bar.close, now)
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "segments": self.segments,
+            "intervals": self.intervals,
+            "connected": bool(self.websocket_client and self.websocket_client.is_connected()),
+            "ticks": self._aggregator.ticks,
+            "late_ticks": self._aggregator.late_ticks,
+            "bars_stored": self.bars_stored,
+            "partial_bars_dropped": self.partial_bars_dropped,
+            "last_tick_at": self.last_tick_at.isoformat() if self.last_tick_at else None,
+        }
@@ -8,6 +8,7 @@ per segment.
 from dataclasses import dataclass
 from typing import Dict, Tuple, Optional, List, Any
 
+from src.api.option_chain import get_option_chain_service
 from src.utils.logger import get_logger
 
 logger = get_logger("live_trader")
@@ -65,8 +66,10 @@ def select_strike_by_delta(
     """
     Select strike based on Delta range instead of fixed ITM offset.
     
-    This method fetches the option chain, filters by Delta range, and selects
-    the best strike within that range.
+    The chain comes from the shared OptionChainService: one quote for the
+    strikes around ATM, with delta computed locally from their LTPs (reused
+    for a few seconds). It is filtered by Delta range and the best strike
+    within that range is selected.
     
     Args:
         kite_client: Authenticated KiteClient instance
@@ -82,11 +85,13 @@ def select_strike_by_delta(
         Dict with strike details (strike, delta, premium, tradingsymbol, etc.) or None if no match
     """
     try:
-        # Get option chain with Delta values
-        option_chain = kite_client.get_option_chain_with_delta(
+        # Get option chain around ATM with Delta values
+        option_chain = get_option_chain_service().get_chain(
+            kite_client,
             segment=segment,
             option_type=option_type,
-            expiry=expiry
+            expiry=expiry,
+            spot_price=spot_price
         )
         
         if not option_chain:
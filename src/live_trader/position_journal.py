@@ -0,0 +1,200 @@
+"""
+Open-position journal for the Live Trader.
+
+Position updates (entry, periodic P&L refresh, pyramiding, exit) are appended
+as JSON lines to open_positions_{date}.jsonl and applied to an in-memory copy
+of the day's rows, so an update costs the same however many positions the day
+has seen. Rows follow the open_positions CSV semantics: an update replaces the
+OPEN row of the same position key, anything else adds a row. The journal is
+compacted to one line per row once it has grown well past the row count, and
+open_positions_{date}.csv is written only on demand (export_csv).
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import threading
+from dataclasses import asdict, fields
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from src.utils.date_utils import get_current_ist_time
+from src.utils.logger import get_logger
+
+logger = get_logger("live_trader")
+
+# Compact once the journal has this many lines more than the day has rows
+COMPACT_SLACK = 500
+
+
+def _day_str(day: Union[None, str, date, datetime]) -> str:
+    if day is None:
+        return get_current_ist_time().strftime("%Y-%m-%d")
+    if isinstance(day, (date, datetime)):
+        return day.strftime("%Y-%m-%d")
+    return day
+
+
+def position_key(row: Dict[str, Any]) -> str:
+    """Same key as the CSV rows were matched on: {segment}_{strike_price}_{option_type}"""
+    return f"{row.get('segment', '')}_{row.get('strike_price', '')}_{row.get('option_type', '')}"
+
+
+def _backup(path: Path) -> None:
+    try:
+        from src.utils.csv_backup import backup_csv_file
+        backup_csv_file(path)
+    except Exception as e:
+        logger.debug(f"Could not backup {path.name} to Azure: {e}")
+
+
+class _DayJournal:
+    """Journal file and current rows of one day"""
+
+    def __init__(self, path: Path, legacy_csv: Path):
+        self.path = path
+        self.rows: List[Dict[str, Any]] = []
+        self._open: Dict[str, int] = {}  # position key -> index of its OPEN row
+        self.lines = 0
+        self._load(legacy_csv)
+
+    def _load(self, legacy_csv: Path) -> None:
+        if not self.path.exists():
+            try:
+                from src.utils.csv_backup import restore_csv_file
+                restore_csv_file(self.path)
+            except Exception as e:
+                logger.debug(f"Could not restore {self.path.name} from backup: {e}")
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        self.apply(json.loads(line))
+                    except json.JSONDecodeError as e:
+                        logger.warning(f"Skipping invalid line in {self.path.name}: {e}")
+                    self.lines += 1
+        elif legacy_csv.exists():
+            # Day started before the journal existed: take over the rows of its CSV
+            with open(legacy_csv, "r", newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    self.apply(dict(row))
+            self.compact()
+            logger.info(f"Imported {len(self.rows)} rows from {legacy_csv.name} into {self.path.name}")
+
+    def apply(self, row: Dict[str, Any]) -> bool:
+        """Apply one update to the rows; True if it added a row or changed a row's status"""
+        key = position_key(row)
+        index = self._open.get(key)
+        if index is None:
+            self.rows.append(row)
+            index = len(self.rows) - 1
+            changed = True
+        else:
+            self.rows[index] = row
+            changed = row.get("status") != "OPEN"
+        if row.get("status") == "OPEN":
+            self._open[key] = index
+        else:
+            self._open.pop(key, None)
+        return changed
+
+    def append(self, row: Dict[str, Any]) -> bool:
+        with open(self.path, "a", encoding="utf-8", newline="\n") as f:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.lines += 1
+        return self.apply(row)
+
+    def needs_compaction(self) -> bool:
+        return self.lines - len(self.rows) >= COMPACT_SLACK
+
+    def compact(self) -> None:
+        """Rewrite the journal with one line per current row"""
+        tmp_path = self.path.with_suffix(".jsonl.tmp")
+        with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+            for row in self.rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.path)
+        self.lines = len(self.rows)
+
+
+class OpenPositionJournal:
+    """Per-day open-position journals (one shared instance per process, see get_position_journal)"""
+
+    def __init__(self, base_dir: Path):
+        self.base_dir = Path(base_dir)
+        self._days: Dict[str, _DayJournal] = {}
+        self._lock = threading.Lock()
+
+    def journal_path(self, day=None) -> Path:
+        return self.base_dir / f"open_positions_{_day_str(day)}.jsonl"
+
+    def csv_path(self, day=None) -> Path:
+        return self.base_dir / f"open_positions_{_day_str(day)}.csv"
+
+    def _journal(self, day: str) -> _DayJournal:
+        journal = self._days.get(day)
+        if journal is None:
+            self.base_dir.mkdir(parents=True, exist_ok=True)
+            journal = _DayJournal(self.journal_path(day), self.csv_path(day))
+            self._days[day] = journal
+        return journal
+
+    def record(self, record) -> Dict[str, Any]:
+        """Journal an OpenPositionRecord for today; returns the stored row"""
+        row = asdict(record)
+        if row.get("update_time") is None:
+            row["update_time"] = get_current_ist_time()
+        for k, v in row.items():
+            if isinstance(v, datetime):
+                row[k] = v.isoformat()
+            elif v is None:
+                row[k] = ""
+        with self._lock:
+            journal = self._journal(_day_str(None))
+            changed = journal.append(row)
+            compacted = journal.needs_compaction()
+            if compacted:
+                journal.compact()
+            if changed or compacted:
+                # Entries and exits are backed up right away; periodic P&L refreshes ride along
+                _backup(journal.path)
+        return row
+
+    def rows(self, day=None) -> List[Dict[str, Any]]:
+        """Current rows of a day (copies), in the order positions were first logged"""
+        with self._lock:
+            return [dict(row) for row in self._journal(_day_str(day)).rows]
+
+    def export_csv(self, day=None) -> Optional[Path]:
+        """Write the day's rows to open_positions_{date}.csv; None if the day has no rows"""
+        rows = self.rows(day)
+        if not rows:
+            return None
+        from src.live_trader.execution import OpenPositionRecord
+        fieldnames = [f.name for f in fields(OpenPositionRecord)]
+        path = self.csv_path(day)
+        with path.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
+
+
+_journal: Optional[OpenPositionJournal] = None
+_journal_lock = threading.Lock()
+
+
+def get_position_journal() -> OpenPositionJournal:
+    """Process-wide open-position journal under data/live_trader"""
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            from src.live_trader.execution import LOG_DIR
+            _journal = OpenPositionJournal(LOG_DIR)
+        return _journal
@@ -0,0 +1,266 @@
+"""
+Append-only store for the PS/VS time series of the Live Trader chart.
+
+Points are appended as JSON lines to one file per segment and day
+(ps_vs_{segment}_{date}.jsonl), so a write costs one small append instead of a
+rewrite of the whole day. Each file has an in-memory index of
+(timestamp, byte offset) kept in timestamp order: range queries bisect it and
+read only the lines they return. Re-saving a point (same timestamp, or same
+timestamp and type for crossover points) appends a new version; readers only
+see the latest one.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from src.utils.logger import get_logger
+from src.utils.status_stream import publish_status
+
+logger = get_logger("live_trader")
+
+
+class PsVsEntry(NamedTuple):
+    """Index entry of one stored point"""
+    timestamp: datetime
+    offset: int
+    length: int
+    price_strength: Optional[float]
+    volume_strength: Optional[float]
+    key: Tuple
+
+
+def _point_key(point: Dict[str, Any], timestamp: str) -> Tuple:
+    """Regular points are unique per timestamp, explicit crossover points per (timestamp, type)"""
+    if point.get("crossover_point"):
+        return ("crossover", timestamp, point.get("crossover"))
+    return ("point", timestamp)
+
+
+class _DayLog:
+    """Append-only JSONL file of one segment and day with its timestamp index"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = threading.Lock()
+        self._times: List[Tuple[datetime, int]] = []
+        self._entries: List[PsVsEntry] = []
+        self._latest: Dict[Tuple, int] = {}  # key -> offset of its newest version
+        self._indexed_size = 0
+
+    def _index_line(self, line: bytes, offset: int) -> None:
+        try:
+            point = json.loads(line)
+            timestamp = datetime.fromisoformat(point["timestamp"])
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Skipping invalid PS/VS line at {self.path.name}:{offset}: {e}")
+            return
+        key = _point_key(point, point["timestamp"])
+        entry = PsVsEntry(
+            timestamp, offset, len(line), point.get("price_strength"), point.get("volume_strength"), key
+        )
+        sort_key = (timestamp, offset)
+        if not self._times or sort_key >= self._times[-1]:
+            self._times.append(sort_key)
+            self._entries.append(entry)
+        else:
+            # Rare: a point older than the newest one (e.g. a crossover back-dated to its candle)
+            position = bisect.bisect(self._times, sort_key)
+            self._times.insert(position, sort_key)
+            self._entries.insert(position, entry)
+        self._latest[key] = offset
+
+    def refresh(self) -> None:
+        """Index lines appended since the last call (by this or another process)"""
+        if not self.path.exists():
+            return
+        size = self.path.stat().st_size
+        if size <= self._indexed_size:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self._indexed_size)
+            offset = self._indexed_size
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Partially written line; pick it up on the next refresh
+                    break
+                self._index_line(line, offset)
+                offset += len(line)
+        self._indexed_size = offset
+
+    def append(self, point: Dict[str, Any]) -> None:
+        self.refresh()
+        line = (json.dumps(point, ensure_ascii=False) + "\n").encode("utf-8")
+        with open(self.path, "ab") as f:
+            f.write(line)
+            end = f.tell()
+        if end - len(line) == self._indexed_size:
+            self._index_line(line, self._indexed_size)
+            self._indexed_size = end
+        else:
+            # Another process appended in between; index everything from the file
+            self.refresh()
+
+    def entries(self) -> List[PsVsEntry]:
+        """Current version of every point, in timestamp order"""
+        return [entry for entry in self._entries if self._latest[entry.key] == entry.offset]
+
+    def last_entry(self, exclude_key: Optional[Tuple] = None) -> Optional[PsVsEntry]:
+        for entry in reversed(self._entries):
+            if self._latest[entry.key] == entry.offset and entry.key != exclude_key:
+                return entry
+        return None
+
+    def entry_at_or_before(self, timestamp: datetime) -> Optional[PsVsEntry]:
+        position = bisect.bisect_right(self._times, (timestamp, float("inf")))
+        for entry in reversed(self._entries[:position]):
+            if self._latest[entry.key] == entry.offset:
+                return entry
+        return None
+
+    def has_key(self, key: Tuple) -> bool:
+        return key in self._latest
+
+    def query(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        lo = 0 if start is None else bisect.bisect_left(self._times, (start, -1))
+        hi = len(self._times) if end is None else bisect.bisect_right(self._times, (end, float("inf")))
+        selected = [entry for entry in self._entries[lo:hi] if self._latest[entry.key] == entry.offset]
+        if not selected:
+            return []
+        points = []
+        with open(self.path, "rb") as f:
+            for entry in selected:
+                f.seek(entry.offset)
+                point = json.loads(f.read(entry.length))
+                point.pop("crossover_point", None)
+                points.append(point)
+        return points
+
+
+class PsVsStore:
+    """
+    PS/VS points of every segment, one append-only log per segment and day.
+
+    Legacy ps_vs_{segment}_{date}.json arrays are converted to the JSONL
+    format the first time their day is opened.
+    """
+
+    def __init__(self, base_dir: Path):
+        self.base_dir = Path(base_dir)
+        self._logs: Dict[Tuple[str, str], _DayLog] = {}
+        self._lock = threading.Lock()
+
+    def path(self, segment: str, day: str) -> Path:
+        return self.base_dir / f"ps_vs_{segment.upper()}_{day}.jsonl"
+
+    def _log(self, segment: str, day) -> _DayLog:
+        if isinstance(day, (date, datetime)):
+            day = day.strftime("%Y-%m-%d")
+        key = (segment.upper(), day)
+        with self._lock:
+            log = self._logs.get(key)
+            if log is None:
+                self.base_dir.mkdir(parents=True, exist_ok=True)
+                path = self.path(segment, day)
+                self._convert_legacy(path)
+                log = _DayLog(path)
+                self._logs[key] = log
+        return log
+
+    @staticmethod
+    def _convert_legacy(path: Path) -> None:
+        legacy = path.with_suffix(".json")
+        if path.exists() or not legacy.exists():
+            return
+        try:
+            with open(legacy, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            lines = [json.dumps(point, ensure_ascii=False) + "\n" for point in data if point.get("timestamp")]
+            with open(path, "w", encoding="utf-8", newline="\n") as f:
+                f.writelines(lines)
+            logger.info(f"Converted {legacy.name} to {path.name} ({len(lines)} points)")
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning(f"Could not convert legacy PS/VS file {legacy.name}: {e}")
+
+    # --- writes ---
+
+    def append(self, segment: str, point: Dict[str, Any], crossover_point: bool = False) -> None:
+        """Append a point (its 'timestamp' is an ISO string); replaces an earlier version with the same key"""
+        timestamp = datetime.fromisoformat(point["timestamp"])
+        if crossover_point:
+            point = dict(point, crossover_point=True)
+        log = self._log(segment, timestamp)
+        with log.lock:
+            log.append(point)
+        publish_status("ps_vs", dict(point, segment=segment.upper()), key=segment.upper())
+
+    # --- reads ---
+
+    def has_crossover(self, segment: str, timestamp: datetime, crossover_type: str) -> bool:
+        log = self._log(segment, timestamp)
+        with log.lock:
+            log.refresh()
+            return log.has_key(("crossover", timestamp.isoformat(), crossover_type))
+
+    def strengths_at(self, segment: str, timestamp: datetime) -> Optional[Tuple[float, float]]:
+        """(PS, VS) of the newest point at or before timestamp on its day"""
+        log = self._log(segment, timestamp)
+        with log.lock:
+            log.refresh()
+            entry = log.entry_at_or_before(timestamp)
+        if entry is None or entry.price_strength is None or entry.volume_strength is None:
+            return None
+        return entry.price_strength, entry.volume_strength
+
+    def previous_strengths(self, segment: str, timestamp: datetime) -> Optional[Tuple[float, float]]:
+        """(PS, VS) of the last stored point of the day other than the regular point at timestamp"""
+        log = self._log(segment, timestamp)
+        with log.lock:
+            log.refresh()
+            entry = log.last_entry(exclude_key=("point", timestamp.isoformat()))
+        if entry is None or entry.price_strength is None or entry.volume_strength is None:
+            return None
+        return entry.price_strength, entry.volume_strength
+
+    def count(self, segment: str, day) -> int:
+        log = self._log(segment, day)
+        with log.lock:
+            log.refresh()
+            return len(log.entries())
+
+    def query(self, segment: str, day, start: Optional[datetime] = None,
+              end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Points of one day with start <= timestamp <= end (naive IST), in timestamp order"""
+        log = self._log(segment, day)
+        with log.lock:
+            log.refresh()
+            return log.query(start, end)
+
+    def days(self, segment: str) -> List[str]:
+        """Dates (YYYY-MM-DD) with a stored file for the segment, newest first"""
+        prefix = f"ps_vs_{segment.upper()}_"
+        found = {
+            path.stem[len(prefix):]
+            for pattern in (f"{prefix}*.jsonl", f"{prefix}*.json")
+            for path in self.base_dir.glob(pattern)
+        }
+        return sorted(found, reverse=True)
+
+
+_store: Optional[PsVsStore] = None
+_store_lock = threading.Lock()
+
+
+def get_ps_vs_store() -> PsVsStore:
+    """Process-wide PS/VS store under data/live_trader/ps_vs_data"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            from src.live_trader.execution import LOG_DIR
+            _store = PsVsStore(LOG_DIR / "ps_vs_data")
+        return _store
@@ -0,0 +1,190 @@
+"""
+Tick-to-candle aggregation for the live index feed.
+
+TickBarAggregator turns a stream of index ticks into exact OHLCV bars of one
+or more intervals, aligned like Kite's historical candles (buckets counted from
+the 09:15 IST session open). A bar is emitted once, when it closes: either a
+tick of a later bucket arrives or close_due() is called after the bar's end.
+Ticks can be recorded to and replayed from a JSONL file, which makes the
+aggregation reproducible offline.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from src.utils.date_utils import IST
+from src.utils.logger import get_logger
+
+logger = get_logger("live_trader")
+
+# Kite candles of every intraday interval are counted from the NSE/BSE open
+SESSION_ANCHOR = time(9, 15)
+
+# Interval names accepted by the aggregator -> bar length in minutes
+BAR_MINUTES = {
+    "minute": 1,
+    "1minute": 1,
+    "3minute": 3,
+    "5minute": 5,
+    "15minute": 15,
+    "30minute": 30,
+    "1hour": 60,
+    "60minute": 60,
+}
+
+
+@dataclass
+class TickBar:
+    """OHLCV bar of one instrument built from ticks (start is the naive IST bucket start)"""
+    instrument_token: int
+    interval: str
+    start: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float = 0.0
+    ticks: int = 0
+
+    @property
+    def end(self) -> datetime:
+        return self.start + timedelta(minutes=BAR_MINUTES[self.interval])
+
+    def as_candle(self) -> Dict[str, float]:
+        return {"open": self.open, "high": self.high, "low": self.low, "close": self.close, "volume": self.volume}
+
+
+def bar_start(timestamp: datetime, minutes: int) -> datetime:
+    """Start of the bucket containing timestamp for bars of the given length"""
+    anchor = datetime.combine(timestamp.date(), SESSION_ANCHOR)
+    offset = int((timestamp - anchor).total_seconds() // 60)
+    return anchor + timedelta(minutes=(offset // minutes) * minutes)
+
+
+def _naive_ist(timestamp) -> datetime:
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(IST).replace(tzinfo=None)
+    return timestamp
+
+
+class TickBarAggregator:
+    """
+    Aggregates ticks into bars for every (instrument, interval) pair.
+
+    on_bar is called with each closed TickBar (in addition to the bars being
+    returned by add_tick()/close_due()). Ticks older than the open bar of an
+    interval (i.e. for an already emitted bar) are counted and ignored.
+    Index ticks carry no traded volume, so volume is only accumulated when a
+    tick supplies it.
+    """
+
+    def __init__(
+        self,
+        intervals: Sequence[str] = ("1minute", "3minute", "5minute"),
+        on_bar: Optional[Callable[[TickBar], None]] = None,
+    ):
+        unknown = [interval for interval in intervals if interval not in BAR_MINUTES]
+        if unknown:
+            raise ValueError(f"Unsupported bar interval(s): {unknown}")
+        self.intervals = list(intervals)
+        self.on_bar = on_bar
+        self._bars: Dict[Tuple[int, str], TickBar] = {}
+        self.ticks = 0
+        self.late_ticks = 0
+        self.bars_emitted = 0
+
+    def current(self, instrument_token: int, interval: str) -> Optional[TickBar]:
+        """The bar still being built for an instrument and interval"""
+        return self._bars.get((instrument_token, interval))
+
+    def _emit(self, bar: TickBar, closed: List[TickBar]) -> None:
+        closed.append(bar)
+        self.bars_emitted += 1
+        if self.on_bar is not None:
+            try:
+                self.on_bar(bar)
+            except Exception as e:
+                logger.warning(f"TickBarAggregator: on_bar callback failed for {bar.interval} bar {bar.start}: {e}")
+
+    def add_tick(self, instrument_token: int, price: float, timestamp, volume: float = 0.0) -> List[TickBar]:
+        """Add one tick; returns the bars it closed"""
+        timestamp = _naive_ist(timestamp)
+        price = float(price)
+        self.ticks += 1
+        closed: List[TickBar] = []
+        for interval in self.intervals:
+            start = bar_start(timestamp, BAR_MINUTES[interval])
+            key = (instrument_token, interval)
+            bar = self._bars.get(key)
+            if bar is not None and start < bar.start:
+                self.late_ticks += 1
+                continue
+            if bar is None or start > bar.start:
+                if bar is not None:
+                    self._emit(bar, closed)
+                self._bars[key] = TickBar(instrument_token, interval, start, price, price, price, price, volume, 1)
+                continue
+            bar.high = max(bar.high, price)
+            bar.low = min(bar.low, price)
+            bar.close = price
+            bar.volume += volume
+            bar.ticks += 1
+        return closed
+
+    def close_due(self, now: datetime) -> List[TickBar]:
+        """Emit every open bar whose end is at or before now (call periodically from a timer)"""
+        now = _naive_ist(now)
+        closed: List[TickBar] = []
+        for key, bar in list(self._bars.items()):
+            if bar.end <= now:
+                del self._bars[key]
+                self._emit(bar, closed)
+        return closed
+
+    def flush(self) -> List[TickBar]:
+        """Emit all open bars (end of a replay or of the session)"""
+        closed: List[TickBar] = []
+        for key in list(self._bars):
+            self._emit(self._bars.pop(key), closed)
+        return closed
+
+
+# --- recorded tick files ---
+
+def tick_record(tick: Dict[str, Any], received_at: Optional[datetime] = None) -> Dict[str, Any]:
+    """JSON-serialisable subset of a KiteTicker tick used by the aggregator"""
+    timestamp = tick.get("exchange_timestamp") or tick.get("last_trade_time") or received_at
+    return {
+        "instrument_token": int(tick["instrument_token"]),
+        "last_price": float(tick["last_price"]),
+        "timestamp": timestamp.isoformat() if isinstance(timestamp, datetime) else timestamp,
+        "volume": float(tick.get("last_traded_quantity") or 0.0),
+    }
+
+
+def load_tick_file(path) -> Iterator[Dict[str, Any]]:
+    """Read ticks recorded as JSON lines (see tick_record)"""
+    with open(Path(path), "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def replay_ticks(ticks: Iterable[Dict[str, Any]], aggregator: TickBarAggregator, flush: bool = True) -> List[TickBar]:
+    """Feed recorded ticks through an aggregator and return all bars it emitted, in order"""
+    bars: List[TickBar] = []
+    for tick in ticks:
+        bars.extend(aggregator.add_tick(
+            tick["instrument_token"], tick["last_price"], tick["timestamp"], tick.get("volume", 0.0)
+        ))
+    if flush:
+        bars.extend(aggregator.flush())
+    return bars
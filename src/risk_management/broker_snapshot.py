@@ -0,0 +1,106 @@
+"""
+Broker Snapshot
+Broker and repository state shared by the risk components within one RiskMonitor cycle
+"""
+
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from src.utils.logger import get_logger
+from src.api.kite_client import KiteClient
+from src.database.repository import PositionRepository, TradeRepository
+from src.database.models import Position
+
+if TYPE_CHECKING:
+    from src.api.position_book import PositionBook
+
+logger = get_logger("risk")
+
+
+class BrokerSnapshot:
+    """
+    One cycle's view of the broker account.
+
+    Positions are fetched from Kite once, when the snapshot is captured (and
+    only if requested); the order book is fetched on first use. Active
+    positions and today's protected profit are read from the repositories on
+    first use and kept until invalidate() is called after a component changed
+    them, so PositionSync, ProfitProtection, QuantityManager,
+    DailyLossProtection and TrailingStopLoss share the same reads. With a
+    position book, active positions carry the book's latest tick prices and
+    P&L rather than the last values written to the database.
+    """
+
+    def __init__(
+        self,
+        kite_client: Optional[KiteClient],
+        position_repo: PositionRepository,
+        trade_repo: Optional[TradeRepository] = None,
+        authenticated: bool = False,
+        positions: Optional[List[Dict[str, Any]]] = None,
+        position_book: Optional['PositionBook'] = None
+    ):
+        self.kite_client = kite_client
+        self.position_repo = position_repo
+        self.trade_repo = trade_repo
+        self.position_book = position_book
+        self.authenticated = authenticated
+        self.positions = positions  # None when not fetched this cycle (or the fetch failed)
+        self.captured_at = datetime.utcnow()
+        self.api_calls = 1 if positions is not None else 0
+        self._orders: Optional[List[Dict[str, Any]]] = None
+        self._active_positions: Optional[List[Position]] = None
+        self._protected_profit: Dict[date, float] = {}
+
+    @classmethod
+    def capture(
+        cls,
+        kite_client: Optional[KiteClient],
+        position_repo: PositionRepository,
+        trade_repo: Optional[TradeRepository] = None,
+        fetch_positions: bool = True,
+        position_book: Optional['PositionBook'] = None
+    ) -> "BrokerSnapshot":
+        """Read auth state and (optionally) positions from Kite"""
+        authenticated = bool(kite_client and kite_client.is_authenticated())
+        positions = None
+        if authenticated and fetch_positions:
+            try:
+                positions = kite_client.get_positions()
+            except Exception as e:
+                logger.error(f"Error fetching positions for broker snapshot: {e}")
+        return cls(kite_client, position_repo, trade_repo, authenticated, positions, position_book)
+
+    @property
+    def has_positions(self) -> bool:
+        return self.positions is not None
+
+    def orders(self) -> List[Dict[str, Any]]:
+        """Order book, fetched from Kite at most once per snapshot"""
+        if self._orders is None:
+            if not self.authenticated:
+                return []
+            self._orders = self.kite_client.get_orders()
+            self.api_calls += 1
+        return self._orders
+
+    def active_positions(self) -> List[Position]:
+        """Active positions from the repository (cached until invalidate())"""
+        if self._active_positions is None:
+            positions = self.position_repo.get_active_positions()
+            if self.position_book is not None and self.position_book.loaded:
+                positions = self.position_book.apply_to(positions)
+            self._active_positions = positions
+        return self._active_positions
+
+    def protected_profit(self, trade_date: Optional[date] = None) -> float:
+        """Today's (or trade_date's) protected profit (cached until invalidate())"""
+        if trade_date is None:
+            trade_date = datetime.now().date()
+        if trade_date not in self._protected_profit:
+            self._protected_profit[trade_date] = self.trade_repo.get_protected_profit(trade_date)
+        return self._protected_profit[trade_date]
+
+    def invalidate(self):
+        """Forget repository reads after positions or trades were written"""
+        self._active_positions = None
+        self._protected_profit.clear()
@@ -16,6 +16,7 @@ from src.database.models import Position
 
 if TYPE_CHECKING:
     from src.utils.notifications import NotificationService
+    from src.risk_management.broker_snapshot import BrokerSnapshot
 
 logger = get_logger("risk")
 
@@ -45,19 +46,25 @@ class DailyLossProtection:
         self.trading_blocked = False
         self.notification_service: Optional['NotificationService'] = None
     
-    def calculate_daily_loss(self, protected_profit: float = 0.0) -> float:
+    def calculate_daily_loss(
+        self, protected_profit: float = 0.0, snapshot: Optional['BrokerSnapshot'] = None
+    ) -> float:
         """
         Calculate cumulative daily loss from all live positions only
         Protected profit is NOT included in loss calculation
         
         Args:
             protected_profit: Protected profit from completed trades (for reference only)
+            snapshot: Broker snapshot of the current risk-monitor cycle (shares the position read)
         
         Returns:
             Total daily loss from live positions only (positive value) or 0 if profit
         """
         try:
-            active_positions = self.position_repo.get_active_positions()
+            active_positions = (
+                snapshot.active_positions() if snapshot is not None
+                else self.position_repo.get_active_positions()
+            )
             total_unrealized_pnl = sum(pos.unrealized_pnl for pos in active_positions)
             
             # Daily loss = negative of unrealized P&L (only from live positions)
@@ -71,14 +78,16 @@ class DailyLossProtection:
             logger.error(f"Error calculating daily loss: {e}")
             return 0.0
     
-    def check_loss_limit(self, protected_profit: float = 0.0) -> Dict[str, Any]:
+    def check_loss_limit(
+        self, protected_profit: float = 0.0, snapshot: Optional['BrokerSnapshot'] = None
+    ) -> Dict[str, Any]:
         """
         Check if daily loss limit is reached
         
         Returns:
             Dict with status information
         """
-        daily_loss = self.calculate_daily_loss(protected_profit)
+        daily_loss = self.calculate_daily_loss(protected_profit, snapshot)
         warning_threshold = self.daily_loss_limit * self.loss_warning_threshold
         
         status = {
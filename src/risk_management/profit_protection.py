@@ -15,6 +15,7 @@ from src.api.kite_client import KiteClient
 
 if TYPE_CHECKING:
     from src.utils.notifications import NotificationService
+    from src.risk_management.broker_snapshot import BrokerSnapshot
 
 logger = get_logger("risk")
 
@@ -59,7 +60,8 @@ class ProfitProtection:
         except Exception as e:
             logger.error(f"Error loading previous positions: {e}")
     
-    def get_protected_profit(self, trade_date: Optional[date] = None) -> float:
+    def get_protected_profit(self, trade_date: Optional[date] = None,
+                             snapshot: Optional['BrokerSnapshot'] = None) -> float:
         """
         Get protected profit from completed trades (sum of ALL completed trades - profit + loss)
         
@@ -69,6 +71,7 @@ class ProfitProtection:
         
         Args:
             trade_date: Date to get protected profit for (default: today)
+            snapshot: Broker snapshot of the current risk-monitor cycle (shares the read)
         
         Returns:
             Total P&L from all completed trades (can be positive or negative)
@@ -77,12 +80,14 @@ class ProfitProtection:
             trade_date = datetime.now().date()
         
         try:
+            if snapshot is not None:
+                return snapshot.protected_profit(trade_date)
             return self.trade_repo.get_protected_profit(trade_date)
         except Exception as e:
             logger.error(f"Error getting protected profit: {e}")
             return 0.0
     
-    def get_current_positions_pnl(self) -> float:
+    def get_current_positions_pnl(self, snapshot: Optional['BrokerSnapshot'] = None) -> float:
         """
         Get current unrealized P&L from all active positions
         
@@ -90,21 +95,24 @@ class ProfitProtection:
             Total unrealized P&L from active positions
         """
         try:
-            active_positions = self.position_repo.get_active_positions()
+            active_positions = (
+                snapshot.active_positions() if snapshot is not None
+                else self.position_repo.get_active_positions()
+            )
             return sum(pos.unrealized_pnl for pos in active_positions)
         except Exception as e:
             logger.error(f"Error getting current positions P&L: {e}")
             return 0.0
     
-    def get_total_daily_pnl(self) -> Dict[str, float]:
+    def get_total_daily_pnl(self, snapshot: Optional['BrokerSnapshot'] = None) -> Dict[str, float]:
         """
         Get total daily P&L breakdown
         
         Returns:
             Dict with protected_profit, current_pnl, and total_pnl
         """
-        protected_profit = self.get_protected_profit()
-        current_pnl = self.get_current_positions_pnl()
+        protected_profit = self.get_protected_profit(snapshot=snapshot)
+        current_pnl = self.get_current_positions_pnl(snapshot)
         total_pnl = protected_profit + current_pnl
         
         return {
@@ -113,23 +121,34 @@ class ProfitProtection:
             "total_pnl": total_pnl
         }
     
-    def detect_and_process_trade_completions(self) -> List[Dict[str, Any]]:
+    def detect_and_process_trade_completions(
+        self, snapshot: Optional['BrokerSnapshot'] = None
+    ) -> List[Dict[str, Any]]:
         """
         Detect position closures and process profit protection
         
+        Args:
+            snapshot: Broker snapshot of the current risk-monitor cycle; detection is
+                skipped for a snapshot without positions (positions not fetched this cycle)
+        
         Returns:
             List of completed trades with their realized P&L
         """
         completed_trades = []
         
         try:
-            # Check if authenticated before making API calls
-            if not self.kite_client.is_authenticated():
-                # Not authenticated yet - skip trade completion detection
-                return completed_trades
-            
-            # Get current positions from Zerodha
-            current_positions_data = self.kite_client.get_positions()
+            if snapshot is not None:
+                if not snapshot.authenticated or not snapshot.has_positions:
+                    return completed_trades
+                current_positions_data = snapshot.positions
+            else:
+                # Check if authenticated before making API calls
+                if not self.kite_client.is_authenticated():
+                    # Not authenticated yet - skip trade completion detection
+                    return completed_trades
+                
+                # Get current positions from Zerodha
+                current_positions_data = self.kite_client.get_positions()
             
             # Create a map of current positions
             current_positions_map = {}
@@ -138,9 +157,11 @@ class ProfitProtection:
                 current_positions_map[key] = pos_data
             
             # Check for closed positions
+            closures = 0
             for key, prev_position in self.previous_positions.items():
                 if key not in current_positions_map:
                     # Position was closed
+                    closures += 1
                     completed_trade = self._process_position_closure(prev_position)
                     if completed_trade:
                         completed_trades.append(completed_trade)
@@ -149,12 +170,17 @@ class ProfitProtection:
                     current_qty = abs(current_positions_map[key].get('quantity', 0))
                     if current_qty == 0 and prev_position.quantity > 0:
                         # Position fully closed
+                        closures += 1
                         completed_trade = self._process_position_closure(prev_position)
                         if completed_trade:
                             completed_trades.append(completed_trade)
             
+            # Closures write trades and deactivate positions
+            if closures and snapshot is not None:
+                snapshot.invalidate()
+            
             # Update previous positions
-            self._update_previous_positions()
+            self._update_previous_positions(snapshot)
             
         except Exception as e:
             logger.error(f"Error detecting trade completions: {e}")
@@ -257,7 +283,10 @@ class ProfitProtection:
             
             return {
                 "trade_id": trade.id,
+                "position_id": position.id,
                 "symbol": position.trading_symbol,
+                "exit_price": exit_price,
+                "exit_time": exit_time.isoformat(),
                 "realized_pnl": realized_pnl,
                 "is_profit": realized_pnl > 0,
                 "protected": realized_pnl > 0
@@ -301,10 +330,13 @@ class ProfitProtection:
             logger.error(f"Error updating protected profit: {e}")
             raise
     
-    def _update_previous_positions(self):
+    def _update_previous_positions(self, snapshot: Optional['BrokerSnapshot'] = None):
         """Update the previous positions cache"""
         try:
-            active_positions = self.position_repo.get_active_positions()
+            active_positions = (
+                snapshot.active_positions() if snapshot is not None
+                else self.position_repo.get_active_positions()
+            )
             self.previous_positions = {}
             for pos in active_positions:
                 key = f"{pos.exchange}:{pos.trading_symbol}"
@@ -3,12 +3,15 @@ Quantity Management
 Handles dynamic position quantity changes and risk recalculation
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
 from datetime import datetime
 from src.utils.logger import get_logger
 from src.database.repository import PositionRepository, TradeRepository
 from src.database.models import Position
 
+if TYPE_CHECKING:
+    from src.risk_management.broker_snapshot import BrokerSnapshot
+
 logger = get_logger("risk")
 
 
@@ -24,15 +27,21 @@ class QuantityManager:
         self.trade_repo = trade_repo
         self.quantity_history: Dict[int, List[Dict[str, Any]]] = {}  # position_id -> history
     
-    def detect_quantity_changes(self) -> List[Dict[str, Any]]:
+    def detect_quantity_changes(self, snapshot: Optional['BrokerSnapshot'] = None) -> List[Dict[str, Any]]:
         """
         Detect quantity changes in positions
         
+        Args:
+            snapshot: Broker snapshot of the current risk-monitor cycle (shares the position read)
+        
         Returns:
             List of positions with quantity changes
         """
         try:
-            active_positions = self.position_repo.get_active_positions()
+            active_positions = (
+                snapshot.active_positions() if snapshot is not None
+                else self.position_repo.get_active_positions()
+            )
             changes = []
             
             for position in active_positions:
@@ -18,7 +18,9 @@ from src.api.websocket_client import WebSocketClient
 from src.api.position_sync import PositionSync
 from src.utils.backup_manager import BackupManager
 from src.risk_management.quantity_manager import QuantityManager
+from src.risk_management.broker_snapshot import BrokerSnapshot
 from src.utils.broker_context import BrokerContext
+from src.utils.status_stream import publish_status
 
 logger = get_logger("risk")
 
@@ -51,6 +53,8 @@ class RiskMonitor:
         self.kite_client = None
         if position_sync and hasattr(position_sync, 'kite_client'):
             self.kite_client = position_sync.kite_client
+        elif getattr(profit_protection, 'kite_client', None) is not None:
+            self.kite_client = profit_protection.kite_client
         
         self.monitoring_interval = monitoring_interval
         self.monitoring_active = False
@@ -67,8 +71,8 @@ class RiskMonitor:
         
         # Initialize quantity manager
         from src.database.repository import TradeRepository
-        trade_repo = TradeRepository(position_repo.db_manager)
-        self.quantity_manager = QuantityManager(position_repo, trade_repo)
+        self.trade_repo = TradeRepository(position_repo.db_manager)
+        self.quantity_manager = QuantityManager(position_repo, self.trade_repo)
     
     def start_monitoring(self):
         """Start the risk monitoring loop in a separate thread"""
@@ -208,12 +212,28 @@ class RiskMonitor:
                     time.sleep(self.monitoring_interval)
                     continue
                 
-                # Sync positions from API periodically
+                # One broker snapshot per cycle, shared by every risk component below.
+                # Positions are fetched from Kite only on cycles that sync them.
                 ist_now = get_current_ist_time()
-                if (ist_now.replace(tzinfo=None) - self.last_sync_time).total_seconds() >= self.sync_interval:
-                    if self.position_sync:
+                sync_due = (ist_now.replace(tzinfo=None) - self.last_sync_time).total_seconds() >= self.sync_interval
+                position_book = self.position_sync.position_book if self.position_sync else None
+                snapshot = BrokerSnapshot.capture(
+                    self.kite_client, self.position_repo, self.trade_repo,
+                    fetch_positions=sync_due, position_book=position_book
+                )
+                
+                # Write tick prices of the position book that are due (timer flush)
+                if position_book is not None:
+                    try:
+                        position_book.flush_if_due()
+                    except Exception as e:
+                        logger.error(f"Error flushing position prices: {e}")
+                
+                # Sync positions from API periodically
+                if sync_due:
+                    if self.position_sync and snapshot.has_positions:
                         try:
-                            self.position_sync.sync_positions_from_api()
+                            self.position_sync.sync_positions_from_api(snapshot)
                         except ValueError as e:
                             if "BrokerID not set" in str(e):
                                 logger.debug("Skipping position sync - BrokerID not set")
@@ -224,7 +244,7 @@ class RiskMonitor:
                     
                     # Detect and handle quantity changes - only if authenticated
                     try:
-                        quantity_changes = self.quantity_manager.detect_quantity_changes()
+                        quantity_changes = self.quantity_manager.detect_quantity_changes(snapshot)
                         if quantity_changes:
                             logger.info(f"Detected {len(quantity_changes)} quantity changes")
                             for change in quantity_changes:
@@ -258,9 +278,11 @@ class RiskMonitor:
                 
                 # Detect and process trade completions (profit protection) - only if authenticated
                 try:
-                    completed_trades = self.profit_protection.detect_and_process_trade_completions()
+                    completed_trades = self.profit_protection.detect_and_process_trade_completions(snapshot)
                     if completed_trades:
                         logger.info(f"Detected {len(completed_trades)} completed trades")
+                        for trade in completed_trades:
+                            publish_status("trade", trade, broker_id=BrokerContext.get_broker_id())
                         # Resubscribe to positions if WebSocket is active
                         if self.websocket_client and self.websocket_client.is_connected:
                             self.websocket_client.subscribe_to_positions()
@@ -274,20 +296,26 @@ class RiskMonitor:
                 
                 # Get protected profit for loss calculation - only if authenticated
                 try:
-                    protected_profit = self.profit_protection.get_protected_profit()
+                    protected_profit = self.profit_protection.get_protected_profit(snapshot=snapshot)
                     
                     # Check daily loss limit (applies only to current positions, not protected profit)
-                    loss_status = self.loss_protection.check_loss_limit(protected_profit)
+                    loss_status = self.loss_protection.check_loss_limit(protected_profit, snapshot)
                     
                     # Check trailing stop loss (only if loss limit not hit)
                     if not loss_status.get("loss_limit_hit", False):
-                        trailing_sl_status = self.trailing_sl.check_and_update_trailing_sl()
+                        trailing_sl_status = self.trailing_sl.check_and_update_trailing_sl(snapshot)
+                        if trailing_sl_status.get("triggered"):
+                            # Positions were exited
+                            snapshot.invalidate()
                         
                         # Update daily stats
-                        self._update_daily_stats(protected_profit, loss_status, trailing_sl_status)
+                        self._update_daily_stats(protected_profit, loss_status, trailing_sl_status, snapshot)
+                        self._publish_status(loss_status, trailing_sl_status, snapshot)
                     else:
-                        # Loss limit hit, update stats accordingly
-                        self._update_daily_stats(protected_profit, loss_status, None)
+                        # Loss limit hit (positions exited), update stats accordingly
+                        snapshot.invalidate()
+                        self._update_daily_stats(protected_profit, loss_status, None, snapshot)
+                        self._publish_status(loss_status, None, snapshot)
                 except ValueError as e:
                     if "BrokerID not set" in str(e):
                         logger.debug("Skipping P&L calculations - BrokerID not set (not authenticated)")
@@ -336,12 +364,13 @@ class RiskMonitor:
         self,
         protected_profit: float,
         loss_status: dict,
-        trailing_sl_status: Optional[dict]
+        trailing_sl_status: Optional[dict],
+        snapshot: Optional[BrokerSnapshot] = None
     ):
         """Update daily statistics"""
         try:
             # Get P&L breakdown from profit protection
-            pnl_breakdown = self.profit_protection.get_total_daily_pnl()
+            pnl_breakdown = self.profit_protection.get_total_daily_pnl(snapshot)
             
             # Get daily loss used (only from current positions, not protected profit)
             daily_loss = loss_status.get("daily_loss", 0.0)
@@ -364,6 +393,39 @@ class RiskMonitor:
         except Exception as e:
             logger.error(f"Error updating daily stats: {e}")
     
+    def _publish_status(
+        self,
+        loss_status: dict,
+        trailing_sl_status: Optional[dict],
+        snapshot: BrokerSnapshot
+    ):
+        """Push this cycle's risk state and position P&L to the dashboard status stream (only changes are sent)"""
+        try:
+            broker_id = BrokerContext.get_broker_id()
+            pnl_breakdown = self.profit_protection.get_total_daily_pnl(snapshot)
+            publish_status("risk", {
+                "loss_protection": loss_status,
+                "trailing_sl": trailing_sl_status,
+                "trading_blocked": self.trading_block_manager.is_blocked(),
+                "protected_profit": pnl_breakdown["protected_profit"],
+                "current_pnl": pnl_breakdown["current_pnl"],
+                "total_daily_pnl": pnl_breakdown["total_pnl"]
+            }, broker_id=broker_id, state=True)
+            publish_status("positions", [
+                {
+                    "id": position.id,
+                    "trading_symbol": position.trading_symbol,
+                    "exchange": position.exchange,
+                    "quantity": position.quantity,
+                    "entry_price": position.entry_price,
+                    "current_price": position.current_price,
+                    "unrealized_pnl": position.unrealized_pnl
+                }
+                for position in snapshot.active_positions()
+            ], broker_id=broker_id, state=True)
+        except Exception as e:
+            logger.debug(f"Error publishing risk status: {e}")
+    
     def _ensure_broker_id(self):
         """Ensure BrokerID is set from authenticated user's profile or cache"""
         # First check if already set in this thread
@@ -15,6 +15,7 @@ from src.database.repository import (
 
 if TYPE_CHECKING:
     from src.utils.notifications import NotificationService
+    from src.risk_management.broker_snapshot import BrokerSnapshot
 
 logger = get_logger("risk")
 
@@ -46,20 +47,27 @@ class TrailingStopLoss:
         self.activation_notification_sent = False
         self.notification_service: Optional['NotificationService'] = None
     
-    def calculate_total_daily_profit(self) -> float:
+    def calculate_total_daily_profit(self, snapshot: Optional['BrokerSnapshot'] = None) -> float:
         """
         Calculate total daily profit including protected profit and current positions P&L
         
+        Args:
+            snapshot: Broker snapshot of the current risk-monitor cycle (shares the repository reads)
+        
         Returns:
             Total daily profit (positive value) or 0 if loss
         """
         try:
             # Get protected profit from completed trades
             today = datetime.now().date()
-            protected_profit = self.trade_repo.get_protected_profit(today)
+            if snapshot is not None:
+                protected_profit = snapshot.protected_profit(today)
+                active_positions = snapshot.active_positions()
+            else:
+                protected_profit = self.trade_repo.get_protected_profit(today)
+                active_positions = self.position_repo.get_active_positions()
             
             # Get unrealized P&L from active positions
-            active_positions = self.position_repo.get_active_positions()
             unrealized_pnl = sum(pos.unrealized_pnl for pos in active_positions)
             
             # Total profit = protected profit + unrealized P&L
@@ -76,14 +84,14 @@ class TrailingStopLoss:
         today = datetime.now().date()
         return self.trade_repo.get_protected_profit(today)
     
-    def check_and_update_trailing_sl(self) -> Dict[str, Any]:
+    def check_and_update_trailing_sl(self, snapshot: Optional['BrokerSnapshot'] = None) -> Dict[str, Any]:
         """
         Check profit and update trailing SL accordingly
         
         Returns:
             Dict with trailing SL status information
         """
-        total_profit = self.calculate_total_daily_profit()
+        total_profit = self.calculate_total_daily_profit(snapshot)
         
         status = {
             "total_profit": total_profit,
@@ -0,0 +1,354 @@
+"""
+Indicator Engines for RSIStrategy
+
+RSIStrategy.calculate_rsi, calculate_price_strength and calculate_volume_strength
+recompute the whole series on every call. Two alternatives are provided here:
+
+- IncrementalIndicatorEngine: streaming engine for live trading. Keeps the Wilder
+  gain/loss averages, the Price Strength EMA state and a fixed-size WMA window,
+  so each new candle costs O(1) regardless of how much history has been processed.
+- IndicatorFrame: batch mode for backtests. Computes every per-candle input that
+  generate_signal reads once, as NumPy arrays, for a complete DataFrame.
+  IndicatorCache lets frames with different parameters share work on the same data.
+
+Output values match the pandas implementation (same NaN semantics).
+"""
+
+import math
+from collections import deque
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def weighted_moving_average(values, period: int) -> np.ndarray:
+    """
+    Vectorized WMA with TradingView weighting (oldest weight 1, newest weight ``period``).
+
+    Equivalent to ``rolling(period, min_periods=period).apply(...)`` with a Python
+    weighted-sum function: the first ``period - 1`` values and every window that
+    contains a NaN come out as NaN, all other values are ``sum(w * x) / sum(w)``.
+    Runs as a single NumPy convolution instead of one Python call per window.
+
+    Args:
+        values: Series / array of input values in chronological order
+        period: WMA length
+
+    Returns:
+        NumPy array of the same length as values
+    """
+    x = np.asarray(values, dtype=float)
+    result = np.full(x.shape, np.nan)
+    if period < 1 or len(x) < period:
+        return result
+
+    weights = np.arange(1, period + 1, dtype=float)
+    # np.convolve flips the kernel, so reverse the weights to keep newest = heaviest.
+    # A NaN anywhere in a window propagates to that window's output.
+    result[period - 1:] = np.convolve(x, weights[::-1], mode="valid") / weights.sum()
+    return result
+
+
+class _EwmState:
+    """
+    Mirror of pandas ``ewm(..., adjust=False).mean()`` for a single stream.
+
+    pandas converts span/alpha to a centre of mass and back, and carries the
+    previous value forward across NaN observations (ignore_na=False). Doing the
+    same arithmetic keeps the streamed values identical to the batch series.
+    """
+
+    def __init__(self, com: float):
+        self.alpha = 1.0 / (1.0 + com)
+        self.old_wt_factor = 1.0 - self.alpha
+        self.weighted = math.nan
+        self.old_wt = 1.0
+
+    @classmethod
+    def from_span(cls, span: int) -> "_EwmState":
+        return cls((span - 1) / 2.0)
+
+    @classmethod
+    def from_alpha(cls, alpha: float) -> "_EwmState":
+        return cls(1.0 / alpha - 1.0)
+
+    def reset(self) -> None:
+        self.weighted = math.nan
+        self.old_wt = 1.0
+
+    def update(self, value: float) -> float:
+        is_observation = not math.isnan(value)
+        if not math.isnan(self.weighted):
+            self.old_wt *= self.old_wt_factor
+            if is_observation:
+                if self.weighted != value:
+                    self.weighted = (self.old_wt * self.weighted + self.alpha * value) / (self.old_wt + self.alpha)
+                self.old_wt = 1.0
+        elif is_observation:
+            self.weighted = value
+        return self.weighted
+
+
+class IncrementalIndicatorEngine:
+    """
+    Stateful RSI(rsi_period) → EMA(price_strength_ema) / WMA(volume_strength_wma) engine.
+
+    Feed closes in chronological order with ``update``/``extend``; values for every
+    processed candle are kept in ``rsi``, ``price_strength`` and ``volume_strength``
+    (positionally aligned with the candles fed in) so callers can index them the
+    same way they would index the pandas series.
+    """
+
+    def __init__(self, rsi_period: int = 9, price_strength_ema: int = 3, volume_strength_wma: int = 21):
+        self.rsi_period = rsi_period
+        self.price_strength_ema = price_strength_ema
+        self.volume_strength_wma = volume_strength_wma
+
+        # WMA weights: oldest gets 1, newest gets volume_strength_wma (same as calculate_volume_strength)
+        self._wma_weights = np.arange(1, volume_strength_wma + 1, dtype=float)
+        self._wma_weight_sum = float(self._wma_weights.sum())
+
+        self._gain_ewm = _EwmState.from_alpha(1.0 / rsi_period)
+        self._loss_ewm = _EwmState.from_alpha(1.0 / rsi_period)
+        self._ps_ewm = _EwmState.from_span(price_strength_ema)
+        self._wma_window: deque = deque(maxlen=volume_strength_wma)
+        self._wma_nan_count = 0
+        self._prev_close: Optional[float] = None
+        self._last_key: Optional[Tuple] = None
+
+        self.rsi: List[float] = []
+        self.price_strength: List[float] = []
+        self.volume_strength: List[float] = []
+
+    @classmethod
+    def from_strategy(cls, strategy) -> "IncrementalIndicatorEngine":
+        """Create an engine using the indicator periods configured on an RSIStrategy."""
+        return cls(
+            rsi_period=strategy.rsi_period,
+            price_strength_ema=strategy.price_strength_ema,
+            volume_strength_wma=strategy.volume_strength_wma,
+        )
+
+    def __len__(self) -> int:
+        return len(self.rsi)
+
+    def reset(self) -> None:
+        """Drop all state and history."""
+        self._gain_ewm.reset()
+        self._loss_ewm.reset()
+        self._ps_ewm.reset()
+        self._wma_window.clear()
+        self._wma_nan_count = 0
+        self._prev_close = None
+        self._last_key = None
+        self.rsi.clear()
+        self.price_strength.clear()
+        self.volume_strength.clear()
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        """
+        Process one new candle close.
+
+        Returns:
+            (rsi, price_strength, volume_strength) for the new candle (NaN while warming up)
+        """
+        close = float(close)
+
+        # Same gain/loss split as calculate_rsi: first candle (and NaN deltas) count as 0
+        if self._prev_close is None:
+            delta = math.nan
+        else:
+            delta = close - self._prev_close
+        self._prev_close = close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+
+        avg_gain = self._gain_ewm.update(gain)
+        avg_loss = self._loss_ewm.update(loss)
+        if avg_loss == 0 or math.isnan(avg_loss):
+            rsi = math.nan
+        else:
+            rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+
+        price_strength = self._ps_ewm.update(rsi)
+        volume_strength = self._update_wma(rsi)
+
+        self.rsi.append(rsi)
+        self.price_strength.append(price_strength)
+        self.volume_strength.append(volume_strength)
+        return rsi, price_strength, volume_strength
+
+    def _update_wma(self, value: float) -> float:
+        """Push a value into the WMA window; any NaN inside the window yields NaN (rolling min_periods=period)."""
+        window = self._wma_window
+        if len(window) == window.maxlen and math.isnan(window[0]):
+            self._wma_nan_count -= 1
+        window.append(value)
+        if math.isnan(value):
+            self._wma_nan_count += 1
+
+        if len(window) < window.maxlen or self._wma_nan_count > 0:
+            return math.nan
+        return float(np.dot(self._wma_weights, window)) / self._wma_weight_sum
+
+    def extend(self, closes: Iterable[float]) -> None:
+        """Process several closes in order."""
+        for close in closes:
+            self.update(close)
+
+    def sync(self, df: pd.DataFrame) -> None:
+        """
+        Bring the engine in line with ``df['close']``.
+
+        Rows appended since the last sync are processed incrementally. If an
+        earlier row was inserted or changed (e.g. a back-filled candle), the
+        engine is rebuilt from the full frame.
+        """
+        self.sync_arrays(df.index, df['close'].to_numpy(dtype=float))
+
+    def sync_arrays(self, timestamps, closes: np.ndarray) -> None:
+        """
+        Same as ``sync`` for parallel timestamp / close arrays, e.g. the zero-copy
+        views of a CandleRingBuffer (``buffer.timestamps``, ``buffer.close``).
+        """
+        n = len(self)
+        if n:
+            stale = n > len(closes)
+            if not stale:
+                key = (timestamps[n - 1], float(closes[n - 1]))
+                stale = key != self._last_key
+            if stale:
+                self.reset()
+                n = 0
+
+        if n < len(closes):
+            self.extend(closes[n:])
+            self._last_key = (timestamps[-1], float(closes[-1]))
+
+    def values_at(self, idx: int) -> Tuple[float, float, float]:
+        """Return (rsi, price_strength, volume_strength) at a processed candle position."""
+        return self.rsi[idx], self.price_strength[idx], self.volume_strength[idx]
+
+
+class IndicatorCache:
+    """
+    Indicator series computed for one OHLCV DataFrame, keyed by indicator and parameters.
+
+    Pass the same cache to several IndicatorFrames over the same DataFrame (e.g. a
+    parameter sweep) so RSI is computed once per RSI period, PS / VS once per
+    (RSI period, EMA / WMA length), and ATR / VWAP once.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._values: dict = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple, compute: Callable):
+        """Return the cached value for key, computing and storing it on first use."""
+        if key in self._values:
+            self.hits += 1
+            return self._values[key]
+        self.misses += 1
+        value = compute()
+        self._values[key] = value
+        return value
+
+
+class IndicatorFrame:
+    """
+    Precomputed per-candle indicator arrays for a complete OHLCV DataFrame.
+
+    Everything RSIStrategy.generate_signal reads for a candle - RSI, Price Strength,
+    Volume Strength, ATR and its rolling average and the candle type - is computed
+    once here, so a backtest loop only indexes into arrays. Positions match df rows.
+    """
+
+    # Values of candle_type
+    BULLISH = 1
+    BEARISH = -1
+    NEUTRAL = 0
+
+    def __init__(
+        self,
+        strategy,
+        df: pd.DataFrame,
+        atr_avg_lookback: int = 20,
+        cache: Optional[IndicatorCache] = None
+    ):
+        if cache is None:
+            cache = IndicatorCache(df)
+        elif cache.df is not df:
+            raise ValueError("IndicatorCache belongs to a different DataFrame")
+
+        self.index = df.index
+        self.open = df['open'].to_numpy(dtype=float)
+        self.high = df['high'].to_numpy(dtype=float)
+        self.low = df['low'].to_numpy(dtype=float)
+        self.close = df['close'].to_numpy(dtype=float)
+        if 'volume' in df:
+            self.volume = df['volume'].to_numpy(dtype=float)
+        else:
+            self.volume = np.zeros(len(df))
+
+        rsi_period = strategy.rsi_period
+        rsi_series = cache.get(
+            ('rsi', rsi_period),
+            lambda: strategy.calculate_rsi(df['close'], period=rsi_period)
+        )
+        self.rsi = rsi_series.to_numpy(dtype=float)
+        self.price_strength = cache.get(
+            ('price_strength', rsi_period, strategy.price_strength_ema),
+            lambda: strategy.calculate_price_strength(df, rsi_series=rsi_series).to_numpy(dtype=float)
+        )
+        self.volume_strength = cache.get(
+            ('volume_strength', rsi_period, strategy.volume_strength_wma),
+            lambda: strategy.calculate_volume_strength(df, rsi_series=rsi_series).to_numpy(dtype=float)
+        )
+
+        # ATR and the average ATR over the last atr_avg_lookback + 1 candles
+        # (same window as RSIStrategy.check_atr_volatility_filter, truncated at the start)
+        atr_period = getattr(strategy, 'atr_period', 14)
+        atr_series = cache.get(('atr', atr_period), lambda: strategy.calculate_atr(df, atr_period))
+        self.atr = atr_series.to_numpy(dtype=float)
+        self.atr_avg = cache.get(
+            ('atr_avg', atr_period, atr_avg_lookback),
+            lambda: atr_series.rolling(window=atr_avg_lookback + 1, min_periods=1).mean().to_numpy(dtype=float)
+        )
+
+        self.candle_type = np.where(
+            self.close > self.open, self.BULLISH, np.where(self.close < self.open, self.BEARISH, self.NEUTRAL)
+        ).astype(np.int8)
+
+        self._positions: Optional[dict] = None
+
+    @classmethod
+    def from_strategy(cls, strategy, df: pd.DataFrame, cache: Optional[IndicatorCache] = None) -> "IndicatorFrame":
+        return cls(strategy, df, cache=cache)
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def ohlc_at(self, idx: int) -> Tuple[float, float, float, float]:
+        """Return (open, high, low, close) of the candle at position idx."""
+        return float(self.open[idx]), float(self.high[idx]), float(self.low[idx]), float(self.close[idx])
+
+    def candle_type_at(self, idx: int) -> str:
+        """Return 'bullish', 'bearish' or 'neutral' for the candle at position idx."""
+        value = self.candle_type[idx]
+        if value == self.BULLISH:
+            return "bullish"
+        if value == self.BEARISH:
+            return "bearish"
+        return "neutral"
+
+    def position_of(self, timestamp) -> Optional[int]:
+        """Position of the first candle with this timestamp (None if not present)."""
+        if self._positions is None:
+            positions = {}
+            for position, ts in enumerate(self.index):
+                positions.setdefault(ts, position)
+            self._positions = positions
+        return self._positions.get(timestamp)
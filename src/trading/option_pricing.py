@@ -0,0 +1,255 @@
+"""
+Black-Scholes Option Pricing
+
+Estimated option premiums and deltas for index options when no market quote
+is available. Every function takes scalars or NumPy arrays (broadcast
+against each other), so a backtest can price all candles of a trade in one
+call while the live agents price a single quote with the same code.
+
+Implied volatility and the risk-free rate come from the "option_pricing"
+section of config.json when present:
+
+    "option_pricing": {
+        "implied_volatility": {"NIFTY": 0.14, "BANKNIFTY": 0.17, "SENSEX": 0.14},
+        "risk_free_rate": 0.065
+    }
+"""
+
+from datetime import date, datetime, time
+from functools import lru_cache
+from typing import Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.config.config_snapshot import get_config_snapshot
+from src.utils.date_utils import IST
+from src.utils.logger import get_logger
+
+logger = get_logger("trading")
+
+ArrayLike = Union[float, np.ndarray]
+
+# Annualised implied volatility per segment (used when config.json does not set one)
+DEFAULT_IMPLIED_VOLATILITY = {
+    "NIFTY": 0.14,
+    "BANKNIFTY": 0.17,
+    "SENSEX": 0.14,
+}
+FALLBACK_IMPLIED_VOLATILITY = 0.15
+DEFAULT_RISK_FREE_RATE = 0.065
+
+# Index options expire at the close of the expiry day
+EXPIRY_TIME = time(15, 30)
+SECONDS_PER_YEAR = 365.0 * 24 * 60 * 60
+# Price at least one minute of time value so expired contracts converge to intrinsic
+MIN_YEARS_TO_EXPIRY = 60.0 / SECONDS_PER_YEAR
+# Unknown expiry: assume mid-week of a weekly contract
+DEFAULT_DAYS_TO_EXPIRY = 4
+
+# Exchange tick size, the lowest premium an option trades at
+MIN_PREMIUM = 0.05
+
+# Implied volatility search range and convergence (annualised volatility)
+IV_BOUNDS = (0.01, 3.0)
+IV_TOLERANCE = 1e-6
+IV_MAX_ITERATIONS = 50
+
+# Abramowitz & Stegun 26.2.17 (absolute error below 7.5e-8)
+_CDF_P = 0.2316419
+_CDF_B = (0.319381530, -0.356563782, 1.781477937, -1.821255978, 1.330274429)
+_INV_SQRT_2PI = 1.0 / np.sqrt(2.0 * np.pi)
+
+
+def norm_cdf(x: ArrayLike) -> np.ndarray:
+    """Standard normal CDF, vectorized"""
+    x = np.asarray(x, dtype=float)
+    z = np.abs(x)
+    t = 1.0 / (1.0 + _CDF_P * z)
+    poly = t * (_CDF_B[0] + t * (_CDF_B[1] + t * (_CDF_B[2] + t * (_CDF_B[3] + t * _CDF_B[4]))))
+    upper_tail = _INV_SQRT_2PI * np.exp(-0.5 * z * z) * poly
+    return np.where(x >= 0, 1.0 - upper_tail, upper_tail)
+
+
+def _is_call(option_type) -> np.ndarray:
+    return np.char.upper(np.asarray(option_type, dtype=str)) == "CE"
+
+
+def _d1_d2(spot: np.ndarray, strike: np.ndarray, years: np.ndarray, iv: np.ndarray, rate: float) -> Tuple[np.ndarray, np.ndarray]:
+    vol_sqrt_t = iv * np.sqrt(years)
+    d1 = (np.log(spot / strike) + (rate + 0.5 * iv * iv) * years) / vol_sqrt_t
+    return d1, d1 - vol_sqrt_t
+
+
+def _as_arrays(spot, strike, years, iv) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    return (
+        np.asarray(spot, dtype=float),
+        np.asarray(strike, dtype=float),
+        np.maximum(np.asarray(years, dtype=float), MIN_YEARS_TO_EXPIRY),
+        np.asarray(iv, dtype=float),
+    )
+
+
+def black_scholes_price(
+    spot: ArrayLike,
+    strike: ArrayLike,
+    years: ArrayLike,
+    iv: ArrayLike,
+    option_type,
+    rate: float = DEFAULT_RISK_FREE_RATE
+) -> np.ndarray:
+    """
+    European option price (no dividends)
+
+    Args:
+        spot: Underlying price(s)
+        strike: Strike price(s)
+        years: Time to expiry in years (floored at MIN_YEARS_TO_EXPIRY)
+        iv: Annualised implied volatility (e.g. 0.14)
+        option_type: "CE" / "PE", or an array of them
+        rate: Annual risk-free rate (continuous compounding)
+
+    Returns:
+        NumPy array of prices, broadcast over the inputs
+    """
+    return _price(*_as_arrays(spot, strike, years, iv), _is_call(option_type), rate)
+
+
+def _price(spot: np.ndarray, strike: np.ndarray, years: np.ndarray, iv: np.ndarray, is_call: np.ndarray, rate: float) -> np.ndarray:
+    d1, d2 = _d1_d2(spot, strike, years, iv, rate)
+    discounted_strike = strike * np.exp(-rate * years)
+    call = spot * norm_cdf(d1) - discounted_strike * norm_cdf(d2)
+    put = discounted_strike * norm_cdf(-d2) - spot * norm_cdf(-d1)
+    return np.where(is_call, call, put)
+
+
+def black_scholes_delta(
+    spot: ArrayLike,
+    strike: ArrayLike,
+    years: ArrayLike,
+    iv: ArrayLike,
+    option_type,
+    rate: float = DEFAULT_RISK_FREE_RATE
+) -> np.ndarray:
+    """Option delta: 0..1 for CE, -1..0 for PE (same arguments as black_scholes_price)"""
+    d1, _ = _d1_d2(*_as_arrays(spot, strike, years, iv), rate)
+    call_delta = norm_cdf(d1)
+    return np.where(_is_call(option_type), call_delta, call_delta - 1.0)
+
+
+def implied_volatility(
+    price: ArrayLike,
+    spot: ArrayLike,
+    strike: ArrayLike,
+    years: ArrayLike,
+    option_type,
+    rate: float = DEFAULT_RISK_FREE_RATE
+) -> np.ndarray:
+    """
+    Implied volatility of option prices, solved for all of them at once.
+
+    Newton steps on vega inside a [low, high] bracket that shrinks every
+    iteration; a step that leaves the bracket is replaced by bisection, so
+    deep ITM / OTM contracts with almost no vega still converge.
+
+    Returns:
+        NumPy array of volatilities, NaN where the price is outside what
+        IV_BOUNDS can produce (e.g. below intrinsic value)
+    """
+    price, spot, strike, years, is_call = np.broadcast_arrays(
+        np.asarray(price, dtype=float),
+        np.asarray(spot, dtype=float),
+        np.asarray(strike, dtype=float),
+        np.maximum(np.asarray(years, dtype=float), MIN_YEARS_TO_EXPIRY),
+        _is_call(option_type)
+    )
+    low = np.full(price.shape, IV_BOUNDS[0])
+    high = np.full(price.shape, IV_BOUNDS[1])
+    valid = (
+        (_price(spot, strike, years, low, is_call, rate) <= price) &
+        (price <= _price(spot, strike, years, high, is_call, rate))
+    )
+
+    # Brenner-Subrahmanyam starting point (exact for ATM), clipped into the bracket
+    sigma = np.clip(np.sqrt(2.0 * np.pi / years) * price / spot, low, high)
+    for _ in range(IV_MAX_ITERATIONS):
+        error = _price(spot, strike, years, sigma, is_call, rate) - price
+        high = np.where(error > 0, sigma, high)
+        low = np.where(error <= 0, sigma, low)
+        d1, _ = _d1_d2(spot, strike, years, sigma, rate)
+        vega = spot * _INV_SQRT_2PI * np.exp(-0.5 * d1 * d1) * np.sqrt(years)
+        with np.errstate(divide='ignore', over='ignore', invalid='ignore'):
+            newton = sigma - error / vega
+        next_sigma = np.where((newton > low) & (newton < high), newton, 0.5 * (low + high))
+        converged = np.abs(next_sigma - sigma) < IV_TOLERANCE
+        sigma = next_sigma
+        if np.all(converged | ~valid):
+            break
+    return np.where(valid, sigma, np.nan)
+
+
+@lru_cache(maxsize=64)
+def _parse_expiry(expiry: str) -> Optional[date]:
+    """Expiry date from YYYY-MM-DD, None (warned once per value) if malformed"""
+    try:
+        return datetime.strptime(expiry, "%Y-%m-%d").date()
+    except ValueError:
+        logger.warning(f"Invalid expiry {expiry!r} (expected YYYY-MM-DD); assuming {DEFAULT_DAYS_TO_EXPIRY} days to expiry")
+        return None
+
+
+def years_to_expiry(timestamps, expiry: Union[str, date, None]) -> ArrayLike:
+    """
+    Time from each timestamp to the expiry-day close, in years.
+
+    Args:
+        timestamps: datetime, DatetimeIndex or datetime64 array (naive = IST)
+        expiry: Expiry date (YYYY-MM-DD string or date); None or a malformed string
+            assumes DEFAULT_DAYS_TO_EXPIRY
+
+    Returns:
+        float for a single datetime, otherwise a NumPy array (floored at MIN_YEARS_TO_EXPIRY)
+    """
+    scalar = isinstance(timestamps, datetime)
+    index = pd.DatetimeIndex([timestamps] if scalar else timestamps)
+    if isinstance(expiry, str):
+        expiry = _parse_expiry(expiry)
+    if expiry is None:
+        years = np.full(len(index), DEFAULT_DAYS_TO_EXPIRY / 365.0)
+    else:
+        if index.tz is not None:
+            index = index.tz_convert(IST).tz_localize(None)
+        expiry_close = np.datetime64(datetime.combine(expiry, EXPIRY_TIME), 'ns')
+        seconds = (expiry_close - index.values.astype('datetime64[ns]')) / np.timedelta64(1, 's')
+        years = np.maximum(seconds / SECONDS_PER_YEAR, MIN_YEARS_TO_EXPIRY)
+    return float(years[0]) if scalar else years
+
+
+def pricing_params(segment: str) -> Tuple[float, float]:
+    """(implied volatility, risk-free rate) for a segment, from config.json or the defaults"""
+    section = get_config_snapshot().section("option_pricing")
+    configured_iv = section.get("implied_volatility", {})
+    segment = segment.upper()
+    iv = configured_iv.get(segment) if hasattr(configured_iv, "get") else configured_iv
+    if iv is None:
+        iv = DEFAULT_IMPLIED_VOLATILITY.get(segment, FALLBACK_IMPLIED_VOLATILITY)
+    return float(iv), float(section.get("risk_free_rate", DEFAULT_RISK_FREE_RATE))
+
+
+def estimate_option_premium(segment: str, spot: ArrayLike, strike: ArrayLike, option_type, years: ArrayLike) -> ArrayLike:
+    """
+    Estimated premium(s) at the segment's implied volatility, rounded to paise.
+
+    Never below MIN_PREMIUM. Returns a float when every input is a scalar,
+    otherwise a NumPy array.
+    """
+    iv, rate = pricing_params(segment)
+    premium = np.round(np.maximum(black_scholes_price(spot, strike, years, iv, option_type, rate), MIN_PREMIUM), 2)
+    return float(premium) if premium.ndim == 0 else premium
+
+
+def estimate_option_delta(segment: str, spot: ArrayLike, strike: ArrayLike, option_type, years: ArrayLike) -> ArrayLike:
+    """Delta(s) at the segment's implied volatility (float for scalar inputs)"""
+    iv, rate = pricing_params(segment)
+    delta = black_scholes_delta(spot, strike, years, iv, option_type, rate)
+    return float(delta) if delta.ndim == 0 else delta
@@ -3,11 +3,12 @@ RSI Divergence + Trend Reversal Trading Agent
 Implements the RSI-based intraday option buying strategy
 """
 
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
 from enum import Enum
 import pandas as pd
 import numpy as np
+from src.trading.indicators import IncrementalIndicatorEngine, IndicatorFrame, weighted_moving_average
 from src.utils.logger import get_logger
 
 logger = get_logger("trading")
@@ -106,94 +107,92 @@ class RSIStrategy:
     def _load_vwap_config(self):
         """Load VWAP entry conditions and PS/VS difference conditions from config.json"""
         try:
-            from src.config.config_manager import ConfigManager
-            import json
-            config_manager = ConfigManager()
-            config_path = config_manager.config_dir / "config.json"
-            if config_path.exists():
-                with open(config_path, 'r') as f:
-                    config_data = json.load(f)
-                    vwap_config = config_data.get("vwap_entry_conditions", {})
-                    self.vwap_enabled = vwap_config.get("enabled", True)
-                    self.vwap_price_above = vwap_config.get("price_above_vwap", True)
-                    self.vwap_max_diff_pct = vwap_config.get("max_price_vwap_diff_pct", 1.0)
-                    self.vwap_tolerance_pct = vwap_config.get("vwap_tolerance_pct", 0.2)
-                    
-                    # Load PS/VS difference conditions
-                    strength_diff_config = config_data.get("strength_diff_conditions", {})
-                    self.strength_diff_enabled = strength_diff_config.get("enabled", True)
-                    self.min_ps_vs_diff_pct = strength_diff_config.get("min_ps_vs_diff_pct", 2.0)
-                    self.max_ps_vs_diff_pct = strength_diff_config.get("max_ps_vs_diff_pct", 5.0)
-                    
-                    # Load multi-timeframe confirmation settings
-                    mtf_config = config_data.get("multi_timeframe_confirmation", {})
-                    self.mtf_enabled = mtf_config.get("enabled", True)
-                    self.mtf_require_alignment = mtf_config.get("require_alignment", True)
-                    self.mtf_momentum_threshold = mtf_config.get("momentum_threshold", 0.5)
-                    
-                    # Load divergence detection settings
-                    divergence_config = config_data.get("divergence_detection", {})
-                    self.divergence_enabled = divergence_config.get("enabled", True)
-                    self.divergence_threshold = divergence_config.get("threshold", 2.0)
-                    
-                    # Load volume confirmation settings
-                    volume_config = config_data.get("volume_confirmation", {})
-                    self.volume_confirmation_enabled = volume_config.get("enabled", True)
-                    self.volume_spike_threshold = volume_config.get("spike_threshold", 1.5)
-                    
-                    # Load dynamic threshold settings
-                    dynamic_config = config_data.get("dynamic_threshold", {})
-                    self.dynamic_threshold_enabled = dynamic_config.get("enabled", True)
-                    self.tight_range = dynamic_config.get("tight_range", [2.0, 3.0])
-                    self.wide_range = dynamic_config.get("wide_range", [3.0, 20.0])
-                    
-                    # Load time session filter settings
-                    time_config = config_data.get("time_session_filter", {})
-                    self.time_filter_enabled = time_config.get("enabled", True)
-                    self.avoid_first_minutes = time_config.get("avoid_first_minutes", 15)
-                    self.avoid_last_minutes = time_config.get("avoid_last_minutes", 15)
-                    buy_time_config = time_config.get("buy_regime", {})
-                    self.buy_start_hour = buy_time_config.get("start_hour", 10)
-                    self.buy_start_minute = buy_time_config.get("start_minute", 0)
-                    self.buy_end_hour = buy_time_config.get("end_hour", 14)
-                    self.buy_end_minute = buy_time_config.get("end_minute", 30)
-                    sell_time_config = time_config.get("sell_regime", {})
-                    self.sell_start_hour = sell_time_config.get("start_hour", 9)
-                    self.sell_start_minute = sell_time_config.get("start_minute", 30)
-                    self.sell_end_hour = sell_time_config.get("end_hour", 15)
-                    self.sell_end_minute = sell_time_config.get("end_minute", 15)
-                    
-                    # Load ATR volatility filter settings
-                    atr_config = config_data.get("atr_volatility_filter", {})
-                    self.atr_filter_enabled = atr_config.get("enabled", True)
-                    self.atr_period = atr_config.get("atr_period", 14)
-                    buy_atr_config = atr_config.get("buy_regime", {})
-                    buy_min = buy_atr_config.get("min_atr_multiplier")
-                    self.buy_min_atr_multiplier = buy_min if buy_min is not None else 1.0
-                    self.buy_max_atr_multiplier = buy_atr_config.get("max_atr_multiplier")  # Can be None (no upper limit)
-                    sell_atr_config = atr_config.get("sell_regime", {})
-                    sell_min = sell_atr_config.get("min_atr_multiplier")
-                    self.sell_min_atr_multiplier = sell_min if sell_min is not None else 0.8
-                    sell_max = sell_atr_config.get("max_atr_multiplier")
-                    self.sell_max_atr_multiplier = sell_max if sell_max is not None else 1.5
-                    
-                    # Load RSI extreme filter settings
-                    rsi_extreme_config = config_data.get("rsi_extreme_filter", {})
-                    self.rsi_extreme_filter_enabled = rsi_extreme_config.get("enabled", True)
-                    buy_rsi_config = rsi_extreme_config.get("buy_regime", {})
-                    buy_ce_max = buy_rsi_config.get("ce_max_rsi")
-                    self.buy_ce_max_rsi = buy_ce_max if buy_ce_max is not None else 75
-                    buy_pe_min = buy_rsi_config.get("pe_min_rsi")
-                    self.buy_pe_min_rsi = buy_pe_min if buy_pe_min is not None else 25
-                    sell_rsi_config = rsi_extreme_config.get("sell_regime", {})
-                    sell_ce_min = sell_rsi_config.get("ce_min_rsi")
-                    self.sell_ce_min_rsi = sell_ce_min if sell_ce_min is not None else 60
-                    sell_pe_max = sell_rsi_config.get("pe_max_rsi")
-                    self.sell_pe_max_rsi = sell_pe_max if sell_pe_max is not None else 40
-                    dynamic_config = config_data.get("dynamic_threshold", {})
-                    self.dynamic_threshold_enabled = dynamic_config.get("enabled", True)
-                    self.dynamic_tight_range = dynamic_config.get("tight_range", [2.0, 3.0])
-                    self.dynamic_wide_range = dynamic_config.get("wide_range", [3.0, 5.0])
+            from src.config.config_snapshot import get_config_snapshot
+            snapshot = get_config_snapshot()
+            if snapshot.exists:
+                # Read-only filter sections straight from the snapshot (no per-strategy copy of the config)
+                filters = snapshot.filters()
+                vwap_config = filters["vwap_entry_conditions"]
+                self.vwap_enabled = vwap_config.get("enabled", True)
+                self.vwap_price_above = vwap_config.get("price_above_vwap", True)
+                self.vwap_max_diff_pct = vwap_config.get("max_price_vwap_diff_pct", 1.0)
+                self.vwap_tolerance_pct = vwap_config.get("vwap_tolerance_pct", 0.2)
+                
+                # Load PS/VS difference conditions
+                strength_diff_config = filters["strength_diff_conditions"]
+                self.strength_diff_enabled = strength_diff_config.get("enabled", True)
+                self.min_ps_vs_diff_pct = strength_diff_config.get("min_ps_vs_diff_pct", 2.0)
+                self.max_ps_vs_diff_pct = strength_diff_config.get("max_ps_vs_diff_pct", 5.0)
+                
+                # Load multi-timeframe confirmation settings
+                mtf_config = filters["multi_timeframe_confirmation"]
+                self.mtf_enabled = mtf_config.get("enabled", True)
+                self.mtf_require_alignment = mtf_config.get("require_alignment", True)
+                self.mtf_momentum_threshold = mtf_config.get("momentum_threshold", 0.5)
+                
+                # Load divergence detection settings
+                divergence_config = filters["divergence_detection"]
+                self.divergence_enabled = divergence_config.get("enabled", True)
+                self.divergence_threshold = divergence_config.get("threshold", 2.0)
+                
+                # Load volume confirmation settings
+                volume_config = filters["volume_confirmation"]
+                self.volume_confirmation_enabled = volume_config.get("enabled", True)
+                self.volume_spike_threshold = volume_config.get("spike_threshold", 1.5)
+                
+                # Load dynamic threshold settings
+                dynamic_config = filters["dynamic_threshold"]
+                self.dynamic_threshold_enabled = dynamic_config.get("enabled", True)
+                self.tight_range = dynamic_config.get("tight_range", [2.0, 3.0])
+                self.wide_range = dynamic_config.get("wide_range", [3.0, 20.0])
+                
+                # Load time session filter settings
+                time_config = filters["time_session_filter"]
+                self.time_filter_enabled = time_config.get("enabled", True)
+                self.avoid_first_minutes = time_config.get("avoid_first_minutes", 15)
+                self.avoid_last_minutes = time_config.get("avoid_last_minutes", 15)
+                buy_time_config = time_config.get("buy_regime", {})
+                self.buy_start_hour = buy_time_config.get("start_hour", 10)
+                self.buy_start_minute = buy_time_config.get("start_minute", 0)
+                self.buy_end_hour = buy_time_config.get("end_hour", 14)
+                self.buy_end_minute = buy_time_config.get("end_minute", 30)
+                sell_time_config = time_config.get("sell_regime", {})
+                self.sell_start_hour = sell_time_config.get("start_hour", 9)
+                self.sell_start_minute = sell_time_config.get("start_minute", 30)
+                self.sell_end_hour = sell_time_config.get("end_hour", 15)
+                self.sell_end_minute = sell_time_config.get("end_minute", 15)
+                
+                # Load ATR volatility filter settings
+                atr_config = filters["atr_volatility_filter"]
+                self.atr_filter_enabled = atr_config.get("enabled", True)
+                self.atr_period = atr_config.get("atr_period", 14)
+                buy_atr_config = atr_config.get("buy_regime", {})
+                buy_min = buy_atr_config.get("min_atr_multiplier")
+                self.buy_min_atr_multiplier = buy_min if buy_min is not None else 1.0
+                self.buy_max_atr_multiplier = buy_atr_config.get("max_atr_multiplier")  # Can be None (no upper limit)
+                sell_atr_config = atr_config.get("sell_regime", {})
+                sell_min = sell_atr_config.get("min_atr_multiplier")
+                self.sell_min_atr_multiplier = sell_min if sell_min is not None else 0.8
+                sell_max = sell_atr_config.get("max_atr_multiplier")
+                self.sell_max_atr_multiplier = sell_max if sell_max is not None else 1.5
+                
+                # Load RSI extreme filter settings
+                rsi_extreme_config = filters["rsi_extreme_filter"]
+                self.rsi_extreme_filter_enabled = rsi_extreme_config.get("enabled", True)
+                buy_rsi_config = rsi_extreme_config.get("buy_regime", {})
+                buy_ce_max = buy_rsi_config.get("ce_max_rsi")
+                self.buy_ce_max_rsi = buy_ce_max if buy_ce_max is not None else 75
+                buy_pe_min = buy_rsi_config.get("pe_min_rsi")
+                self.buy_pe_min_rsi = buy_pe_min if buy_pe_min is not None else 25
+                sell_rsi_config = rsi_extreme_config.get("sell_regime", {})
+                sell_ce_min = sell_rsi_config.get("ce_min_rsi")
+                self.sell_ce_min_rsi = sell_ce_min if sell_ce_min is not None else 60
+                sell_pe_max = sell_rsi_config.get("pe_max_rsi")
+                self.sell_pe_max_rsi = sell_pe_max if sell_pe_max is not None else 40
+                dynamic_config = filters["dynamic_threshold"]
+                self.dynamic_threshold_enabled = dynamic_config.get("enabled", True)
+                self.dynamic_tight_range = dynamic_config.get("tight_range", [2.0, 3.0])
+                self.dynamic_wide_range = dynamic_config.get("wide_range", [3.0, 5.0])
             else:
                 # Default values
                 self.vwap_enabled = True
@@ -353,7 +352,7 @@ class RSIStrategy:
         
         return rsi
     
-    def calculate_price_strength(self, df: pd.DataFrame) -> pd.Series:
+    def calculate_price_strength(self, df: pd.DataFrame, rsi_series: Optional[pd.Series] = None) -> pd.Series:
         """
         Calculate Price Strength (Blue line)
         Price Strength = EMA(price_strength_ema) of RSI(9)
@@ -366,11 +365,16 @@ class RSIStrategy:
         1. Calculate RSI(9) from close prices
         2. Apply EMA(price_strength_ema) on RSI to get Price Strength
         
+        Args:
+            df: DataFrame with OHLCV data
+            rsi_series: Precomputed RSI(rsi_period) of df['close'] (optional, avoids recomputing RSI)
+        
         Returns:
             Price Strength EMA series (price_strength_ema-period EMA of RSI)
         """
         # First calculate RSI(9)
-        rsi_series = self.calculate_rsi(df['close'], period=self.rsi_period)
+        if rsi_series is None:
+            rsi_series = self.calculate_rsi(df['close'], period=self.rsi_period)
         
         # Apply EMA(price_strength_ema) on RSI
         # TradingView EMA uses smoothing factor = 2 / (period + 1)
@@ -382,7 +386,7 @@ class RSIStrategy:
         # First valid value should be the first RSI value (after RSI calculation is valid)
         return ema_result
     
-    def calculate_volume_strength(self, df: pd.DataFrame) -> pd.Series:
+    def calculate_volume_strength(self, df: pd.DataFrame, rsi_series: Optional[pd.Series] = None) -> pd.Series:
         """
         Calculate Volume Strength (Red line)
         Volume Strength = WMA(volume_strength_wma) of RSI(9)
@@ -396,65 +400,23 @@ class RSIStrategy:
         1. Calculate RSI(9) from close prices
         2. Apply WMA(volume_strength_wma) on RSI to get Volume Strength
         
+        Args:
+            df: DataFrame with OHLCV data
+            rsi_series: Precomputed RSI(rsi_period) of df['close'] (optional, avoids recomputing RSI)
+        
         Returns:
             Volume Strength WMA series (volume_strength_wma-period WMA of RSI)
         """
-        period = self.volume_strength_wma
-        
         # First calculate RSI(9)
-        rsi_series = self.calculate_rsi(df['close'], period=self.rsi_period)
-        
-        # WMA weights: most recent gets highest weight (period), oldest gets weight (1)
-        # pandas rolling() gives values in chronological order [oldest, ..., newest]
-        # So we need weights [1, 2, 3, ..., period] to apply to [oldest, ..., newest]
-        # This gives: 1*oldest + 2*second_oldest + ... + period*newest
-        # Which matches TradingView's WMA where newest value gets highest weight
-        weights = np.arange(1, period + 1)  # [1, 2, 3, ..., 21] for period=21
-        
-        def wma_func(x):
-            """
-            Calculate WMA for a window of values.
-            x is array in chronological order [oldest, ..., newest]
-            weights are [1, 2, 3, ..., period] applied to [oldest, ..., newest]
-            """
-            if len(x) < period:
-                return np.nan
-            
-            # Convert to numpy array
-            x = np.array(x)
-            
-            # Check if all values are NaN
-            if np.all(np.isnan(x)):
-                return np.nan
-            
-            # Handle NaN values: forward fill from first valid value
-            # This ensures we don't get NaN in the middle of valid data
-            valid_mask = ~np.isnan(x)
-            if not np.any(valid_mask):
-                return np.nan
-            
-            # Forward fill NaN values (use last valid value)
-            first_valid_idx = np.where(valid_mask)[0][0]
-            for i in range(len(x)):
-                if np.isnan(x[i]):
-                    if i > first_valid_idx:
-                        x[i] = x[i-1]  # Use previous value
-                    else:
-                        x[i] = x[first_valid_idx]  # Use first valid value
-            
-            # Calculate WMA: weights applied to chronological order
-            # x[0] = oldest (weight 1), x[period-1] = newest (weight period)
-            # TradingView WMA: (n*P1 + (n-1)*P2 + ... + 1*Pn) / sum
-            # Where P1 is newest, Pn is oldest
-            # Our x is [oldest, ..., newest], so we apply weights [1, 2, ..., period]
-            # This gives: 1*oldest + 2*... + period*newest = period*newest + ... + 1*oldest ✓
-            wma_value = np.sum(weights * x) / np.sum(weights)
-            return wma_value
+        if rsi_series is None:
+            rsi_series = self.calculate_rsi(df['close'], period=self.rsi_period)
         
-        # Apply WMA using rolling window
-        wma_result = rsi_series.rolling(window=period, min_periods=period).apply(wma_func, raw=True)
+        # WMA weights [1, 2, ..., period] applied to [oldest, ..., newest] (newest gets highest weight),
+        # computed as a single convolution. A window is NaN until it holds `period` valid RSI values,
+        # same as rolling(window=period, min_periods=period).
+        wma_values = weighted_moving_average(rsi_series.to_numpy(dtype=float), self.volume_strength_wma)
         
-        return wma_result
+        return pd.Series(wma_values, index=rsi_series.index)
     
     def is_bearish_candle(self, row: pd.Series) -> bool:
         """Check if candle is bearish (red)"""
@@ -550,13 +512,19 @@ class RSIStrategy:
             else:
                 return False, f"Outside optimal session: {self.sell_start_hour:02d}:{self.sell_start_minute:02d}-{self.sell_end_hour:02d}:{self.sell_end_minute:02d}"
     
-    def check_atr_volatility_filter(self, df: pd.DataFrame, current_idx: int) -> Tuple[bool, str, Optional[float], Optional[float]]:
+    def check_atr_volatility_filter(
+        self,
+        df: pd.DataFrame,
+        current_idx: int,
+        indicators: Optional[Any] = None
+    ) -> Tuple[bool, str, Optional[float], Optional[float]]:
         """
         Check if ATR volatility meets requirements for entry.
         
         Args:
             df: DataFrame with OHLC data
             current_idx: Current index in DataFrame
+            indicators: Optional IndicatorFrame with precomputed ATR arrays for df
             
         Returns:
             Tuple of (passed, reason, current_atr, avg_atr)
@@ -567,13 +535,17 @@ class RSIStrategy:
         if current_idx < self.atr_period:
             return True, f"Insufficient data for ATR (need {self.atr_period} candles)", None, None
         
-        # Calculate ATR
-        atr_series = self.calculate_atr(df, self.atr_period)
-        current_atr = atr_series.iloc[current_idx]
-        
-        # Calculate average ATR (using last 20 periods for smoother average)
-        lookback = min(20, current_idx)
-        avg_atr = atr_series.iloc[current_idx - lookback:current_idx + 1].mean()
+        if isinstance(indicators, IndicatorFrame):
+            current_atr = indicators.atr[current_idx]
+            avg_atr = indicators.atr_avg[current_idx]
+        else:
+            # Calculate ATR
+            atr_series = self.calculate_atr(df, self.atr_period)
+            current_atr = atr_series.iloc[current_idx]
+            
+            # Calculate average ATR (using last 20 periods for smoother average)
+            lookback = min(20, current_idx)
+            avg_atr = atr_series.iloc[current_idx - lookback:current_idx + 1].mean()
         
         if pd.isna(current_atr) or pd.isna(avg_atr) or avg_atr == 0:
             return True, "ATR calculation unavailable", current_atr, avg_atr
@@ -727,8 +699,8 @@ class RSIStrategy:
         Check Price Strength vs Volume Strength crossover conditions
         
         Args:
-            price_strength: Price Strength EMA series (3 EMA of price, blue line)
-            volume_strength: Volume Strength WMA series (21 WMA of RSI, red line)
+            price_strength: Price Strength EMA series or array (3 EMA of price, blue line)
+            volume_strength: Volume Strength WMA series or array (21 WMA of RSI, red line)
             current_idx: Current index in dataframe
         
         Returns:
@@ -739,11 +711,17 @@ class RSIStrategy:
         if current_idx < 1:
             return False, False
         
+        # Positional access works for both pandas Series and indicator engine arrays
+        if isinstance(price_strength, pd.Series):
+            price_strength = price_strength.to_numpy()
+        if isinstance(volume_strength, pd.Series):
+            volume_strength = volume_strength.to_numpy()
+        
         # Get current and previous values
-        curr_price_strength = price_strength.iloc[current_idx]
-        prev_price_strength = price_strength.iloc[current_idx - 1]
-        curr_volume_strength = volume_strength.iloc[current_idx]
-        prev_volume_strength = volume_strength.iloc[current_idx - 1]
+        curr_price_strength = price_strength[current_idx]
+        prev_price_strength = price_strength[current_idx - 1]
+        curr_volume_strength = volume_strength[current_idx]
+        prev_volume_strength = volume_strength[current_idx - 1]
         
         # Skip if any values are NaN
         if (pd.isna(curr_price_strength) or pd.isna(prev_price_strength) or 
@@ -778,8 +756,9 @@ class RSIStrategy:
             if len(df_1min) < max(self.rsi_period, self.volume_strength_wma):
                 return None, None
             
-            price_strength_1min = self.calculate_price_strength(df_1min)
-            volume_strength_1min = self.calculate_volume_strength(df_1min)
+            rsi_1min = self.calculate_rsi(df_1min['close'], period=self.rsi_period)
+            price_strength_1min = self.calculate_price_strength(df_1min, rsi_series=rsi_1min)
+            volume_strength_1min = self.calculate_volume_strength(df_1min, rsi_series=rsi_1min)
             
             return price_strength_1min, volume_strength_1min
         except Exception as e:
@@ -1014,7 +993,8 @@ class RSIStrategy:
         current_idx: int,
         allow_reentry: bool = False,
         reentry_candle_type: Optional[str] = None,
-        df_1min: Optional[pd.DataFrame] = None
+        df_1min: Optional[pd.DataFrame] = None,
+        indicators: Optional[Union[IncrementalIndicatorEngine, IndicatorFrame]] = None
     ) -> Tuple[TradeSignal, Optional[OptionType], str, Dict[str, Any]]:
         """
         Generate trading signal based on revised RSI strategy with Price Strength vs Volume Strength
@@ -1024,6 +1004,11 @@ class RSIStrategy:
             current_idx: Current index in dataframe
             allow_reentry: If True, allow re-entry on matching candle type after SL hit
             reentry_candle_type: 'bearish' or 'bullish' - required candle type for re-entry
+            df_1min: Optional 1-minute DataFrame for multi-timeframe confirmation
+            indicators: Optional IncrementalIndicatorEngine already advanced to at least
+                current_idx + 1 candles of df, or an IndicatorFrame built from df. When
+                given, RSI/PS/VS are read from it instead of being recomputed over the
+                whole DataFrame; an IndicatorFrame also supplies candle OHLC and ATR.
             
         Returns:
             (signal, option_type, reason, details)
@@ -1049,11 +1034,20 @@ class RSIStrategy:
             details["rsi_status"] = f"Insufficient data: need 9 candles, have {current_idx}"
             return TradeSignal.HOLD, None, "Insufficient data for RSI calculation", details
         
-        # Calculate RSI first to get the value for logging
-        rsi_series = self.calculate_rsi(df['close'], period=self.rsi_period)
+        # RSI, Price Strength (EMA(price_strength_ema) of RSI(rsi_period)) and Volume Strength
+        # (WMA(volume_strength_wma) of RSI(rsi_period)) as positional arrays aligned with df
+        if indicators is not None:
+            rsi_series = indicators.rsi
+            price_strength = indicators.price_strength
+            volume_strength = indicators.volume_strength
+        else:
+            rsi_values = self.calculate_rsi(df['close'], period=self.rsi_period)
+            rsi_series = rsi_values.to_numpy()
+            price_strength = self.calculate_price_strength(df, rsi_series=rsi_values).to_numpy()
+            volume_strength = self.calculate_volume_strength(df, rsi_series=rsi_values).to_numpy()
         
         # Get RSI value for current candle
-        current_rsi = rsi_series.iloc[current_idx] if current_idx < len(rsi_series) else None
+        current_rsi = rsi_series[current_idx] if current_idx < len(rsi_series) else None
         if current_rsi is None or pd.isna(current_rsi):
             details["rsi_value"] = None
             details["rsi_status"] = "RSI calculation returned NaN (insufficient price movement or division by zero)"
@@ -1061,11 +1055,6 @@ class RSIStrategy:
             details["rsi_value"] = float(current_rsi)
             details["rsi_status"] = "RSI calculated successfully"
         
-        # Calculate Price Strength (EMA(price_strength_ema) of RSI(rsi_period)) and Volume Strength (WMA(volume_strength_wma) of RSI(rsi_period))
-        # These methods internally calculate RSI again, but that's okay for now
-        price_strength = self.calculate_price_strength(df)
-        volume_strength = self.calculate_volume_strength(df)
-        
         # VWAP is now checked at the strike level in execution layer, not here
         # Keeping VWAP calculation disabled for signal generation
         vwap_series = None
@@ -1076,9 +1065,9 @@ class RSIStrategy:
             return TradeSignal.HOLD, None, "Insufficient data for Volume Strength WMA", details
         
         # Check if Price Strength and Volume Strength are valid
-        if pd.isna(price_strength.iloc[current_idx]) or pd.isna(volume_strength.iloc[current_idx]):
-            ps_val = price_strength.iloc[current_idx] if current_idx < len(price_strength) else None
-            vs_val = volume_strength.iloc[current_idx] if current_idx < len(volume_strength) else None
+        if pd.isna(price_strength[current_idx]) or pd.isna(volume_strength[current_idx]):
+            ps_val = price_strength[current_idx] if current_idx < len(price_strength) else None
+            vs_val = volume_strength[current_idx] if current_idx < len(volume_strength) else None
             add_check("Strength indicators valid", False, f"PS={ps_val}, VS={vs_val}")
             logger.warning(
                 f"Price/Volume Strength not calculated at index {current_idx}: "
@@ -1086,8 +1075,8 @@ class RSIStrategy:
             )
             return TradeSignal.HOLD, None, "Price/Volume Strength not calculated", details
         
-        curr_price_strength = float(price_strength.iloc[current_idx])
-        curr_volume_strength = float(volume_strength.iloc[current_idx])
+        curr_price_strength = float(price_strength[current_idx])
+        curr_volume_strength = float(volume_strength[current_idx])
         details["price_strength"] = curr_price_strength
         details["volume_strength"] = curr_volume_strength
         
@@ -1095,9 +1084,9 @@ class RSIStrategy:
         rsi_val = details.get("rsi_value", current_rsi)
         if rsi_val is not None and not pd.isna(rsi_val):
             # Get previous values for comparison
-            prev_ps = float(price_strength.iloc[current_idx - 1]) if current_idx > 0 else None
-            prev_vs = float(volume_strength.iloc[current_idx - 1]) if current_idx > 0 else None
-            prev_rsi = float(self.calculate_rsi(df['close'], period=self.rsi_period).iloc[current_idx - 1]) if current_idx > 0 else None
+            prev_ps = float(price_strength[current_idx - 1]) if current_idx > 0 else None
+            prev_vs = float(volume_strength[current_idx - 1]) if current_idx > 0 else None
+            prev_rsi = float(rsi_series[current_idx - 1]) if current_idx > 0 else None
             
             logger.info(
                 f"📊 Indicator Values at index {current_idx}: "
@@ -1135,12 +1124,12 @@ class RSIStrategy:
 
         # Before running crossover logic, make sure Strength values are valid (not NaN)
         # We need values for: current_idx (entry candle), current_idx-1 (crossover candle), current_idx-2 (before crossover)
-        curr_ps_raw = price_strength.iloc[current_idx]
-        curr_vs_raw = volume_strength.iloc[current_idx]
-        crossover_ps_raw = price_strength.iloc[current_idx - 1]  # Crossover candle
-        crossover_vs_raw = volume_strength.iloc[current_idx - 1]  # Crossover candle
-        before_crossover_ps_raw = price_strength.iloc[current_idx - 2]  # Before crossover
-        before_crossover_vs_raw = volume_strength.iloc[current_idx - 2]  # Before crossover
+        curr_ps_raw = price_strength[current_idx]
+        curr_vs_raw = volume_strength[current_idx]
+        crossover_ps_raw = price_strength[current_idx - 1]  # Crossover candle
+        crossover_vs_raw = volume_strength[current_idx - 1]  # Crossover candle
+        before_crossover_ps_raw = price_strength[current_idx - 2]  # Before crossover
+        before_crossover_vs_raw = volume_strength[current_idx - 2]  # Before crossover
 
         if (
             pd.isna(curr_ps_raw)
@@ -1194,16 +1183,19 @@ class RSIStrategy:
         
         # Check the CROSSOVER candle (current_idx - 1) for the correct color
         # Entry happens on CURRENT candle (current_idx) after crossover candle completes
-        crossover_candle = df.iloc[current_idx - 1]  # Crossover candle
-        entry_candle = df.iloc[current_idx]  # Entry candle
-        is_bearish = self.is_bearish_candle(crossover_candle)  # Check crossover candle color
-        is_bullish = self.is_bullish_candle(crossover_candle)  # Check crossover candle color
-        
         # Store OHLC data for logging (from crossover candle - where crossover happened)
-        crossover_open = float(crossover_candle.get('open', 0))
-        crossover_high = float(crossover_candle.get('high', 0))
-        crossover_low = float(crossover_candle.get('low', 0))
-        crossover_close = float(crossover_candle.get('close', 0))
+        if isinstance(indicators, IndicatorFrame):
+            crossover_open, crossover_high, crossover_low, crossover_close = indicators.ohlc_at(current_idx - 1)
+        else:
+            crossover_candle = df.iloc[current_idx - 1]  # Crossover candle
+            crossover_open = float(crossover_candle.get('open', 0))
+            crossover_high = float(crossover_candle.get('high', 0))
+            crossover_low = float(crossover_candle.get('low', 0))
+            crossover_close = float(crossover_candle.get('close', 0))
+        crossover_candle_time = df.index[current_idx - 1]  # Crossover candle
+        entry_candle_time = df.index[current_idx]  # Entry candle
+        is_bearish = crossover_close < crossover_open  # Check crossover candle color
+        is_bullish = crossover_close > crossover_open  # Check crossover candle color
         
         details["candle_ohlc"] = {
             "open": crossover_open,
@@ -1211,7 +1203,7 @@ class RSIStrategy:
             "low": crossover_low,
             "close": crossover_close
         }
-        details["candle_timestamp"] = crossover_candle.name if hasattr(crossover_candle, 'name') else None
+        details["candle_timestamp"] = crossover_candle_time
         
         if is_bullish:
             details["candle_type"] = "bullish"
@@ -1230,7 +1222,6 @@ class RSIStrategy:
                 f"O={crossover_open:.2f}, H={crossover_high:.2f}, L={crossover_low:.2f}, C={crossover_close:.2f}, "
                 f"Close-Open={crossover_close - crossover_open:.2f}"
             )
-            entry_candle_time = entry_candle.name if hasattr(entry_candle, 'name') else None
             entry_candle_time_str = str(entry_candle_time) if entry_candle_time else "N/A"
             before_candle_time = df.index[current_idx - 2] if current_idx >= 2 and hasattr(df.index, '__getitem__') else None
             before_candle_time_str = str(before_candle_time) if before_candle_time is not None else "N/A"
@@ -1280,7 +1271,7 @@ class RSIStrategy:
                     f"(Bearish crossover requires PS to start above VS and cross down)"
                 )
         # Format crossover candle timestamp for check messages
-        crossover_candle_time_str = str(crossover_candle.name) if hasattr(crossover_candle, 'name') else "N/A"
+        crossover_candle_time_str = str(crossover_candle_time)
         before_candle_time_str = str(df.index[current_idx - 2]) if current_idx >= 2 and hasattr(df.index, '__getitem__') else "N/A"
         
         add_check(
@@ -1514,7 +1505,7 @@ class RSIStrategy:
                 return TradeSignal.HOLD, None, f"Time filter failed: {time_reason}", details
             
             # 2. ATR Volatility Filter
-            atr_passed, atr_reason, current_atr, avg_atr = self.check_atr_volatility_filter(df, current_idx)
+            atr_passed, atr_reason, current_atr, avg_atr = self.check_atr_volatility_filter(df, current_idx, indicators=indicators)
             add_check("PE: ATR volatility filter", atr_passed, atr_reason)
             if not atr_passed:
                 logger.info(f"PE entry blocked by ATR filter: {atr_reason}")
@@ -1662,7 +1653,7 @@ class RSIStrategy:
                 return TradeSignal.HOLD, None, f"Time filter failed: {time_reason}", details
             
             # 2. ATR Volatility Filter
-            atr_passed, atr_reason, current_atr, avg_atr = self.check_atr_volatility_filter(df, current_idx)
+            atr_passed, atr_reason, current_atr, avg_atr = self.check_atr_volatility_filter(df, current_idx, indicators=indicators)
             add_check("CE: ATR volatility filter", atr_passed, atr_reason)
             if not atr_passed:
                 logger.info(f"CE entry blocked by ATR filter: {atr_reason}")
@@ -2374,13 +2365,14 @@ class RSITradingAgent:
             DataFrame with columns: Timestamp, Open, High, Low, Close, Volume, 
             RSI, PS, VS, PS_VS_Diff, Candle_Type, Crossover_Type
         """
-        # Calculate indicators
-        rsi_series = self.calculate_rsi(df['close'], period=self.rsi_period)
-        price_strength = self.calculate_price_strength(df)
-        volume_strength = self.calculate_volume_strength(df)
+        # Calculate indicators once as arrays (RSI shared by PS and VS)
+        frame = IndicatorFrame.from_strategy(self.strategy, df)
+        rsi_values = frame.rsi
+        ps_values = frame.price_strength
+        vs_values = frame.volume_strength
         
         # Determine valid range (skip NaN values)
-        min_valid_idx = max(self.rsi_period, self.volume_strength_wma)
+        min_valid_idx = max(self.strategy.rsi_period, self.strategy.volume_strength_wma)
         if start_idx is None:
             start_idx = min_valid_idx
         if end_idx is None:
@@ -2395,35 +2387,27 @@ class RSITradingAgent:
         
         for idx in range(start_idx, end_idx):
             timestamp = df.index[idx] if hasattr(df.index, '__getitem__') else idx
-            candle = df.iloc[idx]
             
             # Get indicator values
-            rsi_val = rsi_series.iloc[idx] if idx < len(rsi_series) else None
-            ps_val = price_strength.iloc[idx] if idx < len(price_strength) else None
-            vs_val = volume_strength.iloc[idx] if idx < len(volume_strength) else None
+            rsi_val = rsi_values[idx]
+            ps_val = ps_values[idx]
+            vs_val = vs_values[idx]
             
             # Skip if indicators are not valid
             if pd.isna(rsi_val) or pd.isna(ps_val) or pd.isna(vs_val):
                 continue
             
             # Calculate PS-VS difference
-            ps_vs_diff = float(ps_val) - float(vs_val)
+            ps_vs_diff = float(ps_val - vs_val)
             
             # Determine candle type
-            is_bullish = self.is_bullish_candle(candle)
-            is_bearish = self.is_bearish_candle(candle)
-            if is_bullish:
-                candle_type = "Bullish"
-            elif is_bearish:
-                candle_type = "Bearish"
-            else:
-                candle_type = "Neutral"
+            candle_type = frame.candle_type_at(idx).capitalize()
             
             # Detect crossover type
             crossover_type = "None"
             if idx > 0:
-                prev_ps = price_strength.iloc[idx - 1] if idx - 1 < len(price_strength) else None
-                prev_vs = volume_strength.iloc[idx - 1] if idx - 1 < len(volume_strength) else None
+                prev_ps = ps_values[idx - 1]
+                prev_vs = vs_values[idx - 1]
                 
                 if not pd.isna(prev_ps) and not pd.isna(prev_vs):
                     prev_ps = float(prev_ps)
@@ -2439,13 +2423,14 @@ class RSITradingAgent:
                         crossover_type = "CE (PS↑VS)"
             
             # Build row data
+            candle_open, candle_high, candle_low, candle_close = frame.ohlc_at(idx)
             row = {
                 "Timestamp": timestamp,
-                "Open": float(candle['open']),
-                "High": float(candle['high']),
-                "Low": float(candle['low']),
-                "Close": float(candle['close']),
-                "Volume": float(candle['volume']) if 'volume' in candle else 0.0,
+                "Open": candle_open,
+                "High": candle_high,
+                "Low": candle_low,
+                "Close": candle_close,
+                "Volume": float(frame.volume[idx]),
                 "RSI": float(rsi_val),
                 "PS": float(ps_val),
                 "VS": float(vs_val),
@@ -5,12 +5,25 @@ Provides API endpoints for backtesting functionality
 
 from flask import Blueprint, request, jsonify, render_template
 from datetime import datetime, timedelta, date
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+from concurrent.futures import as_completed
+from concurrent.futures.process import BrokenProcessPool
 from src.utils.logger import get_logger
 from src.api.kite_client import KiteClient
-from src.backtesting.data_fetcher import HistoricalDataFetcher
+from src.api.instrument_store import get_instrument_store
+from src.backtesting.candle_source import DATA_SOURCES, create_data_fetcher
 from src.backtesting.backtest_engine import BacktestEngine
+from src.backtesting.parameter_sweep import ParameterSweep, RANK_KEYS, SWEEP_DEFAULTS, expand_grid
+from src.backtesting.parallel_runner import (
+    BacktestTask,
+    ParallelBacktestRunner,
+    build_tasks,
+    kite_session_spec,
+    merge_chunk_results
+)
+import threading
 import traceback
+import uuid
 
 logger = get_logger("ui")
 
@@ -19,12 +32,215 @@ backtest_bp = Blueprint('backtest', __name__, url_prefix='/backtest')
 # Store kite_client globally for route handlers
 _kite_client = None
 
+# Backtest jobs (job_id -> status / result), polled via /backtest/jobs/<job_id>
+_jobs: Dict[str, Dict[str, Any]] = {}
+_jobs_lock = threading.Lock()
+_MAX_JOBS = 20
+
+# Upper bound on segments x parameter combinations for one /backtest/sweep request
+_MAX_SWEEP_RUNS = 500
+
+# Process pool shared by all backtest jobs
+_runner = ParallelBacktestRunner()
+
 
 def get_kite_client():
     """Get the kite client instance"""
     return _kite_client
 
 
+def _empty_segment_result(from_date: datetime, to_date: datetime, initial_capital: float, error: str) -> Dict[str, Any]:
+    """Result placeholder for a segment whose backtest failed"""
+    return {
+        "trades": [],
+        "summary": {
+            "total_trades": 0,
+            "winning_trades": 0,
+            "losing_trades": 0,
+            "total_profit": 0.0,
+            "total_loss": 0.0,
+            "net_pnl": 0.0,
+            "max_drawdown": 0.0,
+            "max_profit": 0.0,
+            "win_rate": 0.0,
+            "profit_factor": 0.0,
+            "start_date": from_date.isoformat(),
+            "end_date": to_date.isoformat(),
+            "initial_capital": initial_capital,
+            "final_capital": initial_capital,
+            "return_pct": 0.0,
+            "error": error
+        }
+    }
+
+
+def _combine_segment_results(
+    segments: List[str],
+    all_results: Dict[str, Dict],
+    from_date: datetime,
+    to_date: datetime,
+    initial_capital: float
+) -> Dict[str, Any]:
+    """Combine per-segment result dicts into combined trades / summary"""
+    combined_trades = []
+    combined_summary = {
+        "total_trades": 0,
+        "winning_trades": 0,
+        "losing_trades": 0,
+        "total_profit": 0.0,
+        "total_loss": 0.0,
+        "net_pnl": 0.0,
+        "max_drawdown": 0.0,
+        "max_profit": 0.0,
+        "initial_capital": initial_capital,
+        "final_capital": 0.0  # Will accumulate final capital from all segments
+    }
+    
+    for segment in segments:
+        result_dict = all_results.get(segment)
+        if result_dict is None:
+            continue
+        
+        # Combine trades (add segment info)
+        for trade in result_dict.get('trades', []):
+            trade['segment'] = segment
+            combined_trades.append(trade)
+        
+        # Combine summary metrics
+        summary = result_dict.get('summary', {})
+        combined_summary['total_trades'] += summary.get('total_trades', 0)
+        combined_summary['winning_trades'] += summary.get('winning_trades', 0)
+        combined_summary['losing_trades'] += summary.get('losing_trades', 0)
+        combined_summary['total_profit'] += summary.get('total_profit', 0.0)
+        combined_summary['total_loss'] += summary.get('total_loss', 0.0)
+        combined_summary['net_pnl'] += summary.get('net_pnl', 0.0)
+        # For combined capital, we need to track each segment's capital separately
+        # final_capital should be the sum of all segment final capitals
+        segment_final_capital = summary.get('final_capital', initial_capital)
+        combined_summary['final_capital'] += segment_final_capital
+        
+        if summary.get('max_drawdown', 0.0) > combined_summary['max_drawdown']:
+            combined_summary['max_drawdown'] = summary.get('max_drawdown', 0.0)
+        
+        if summary.get('max_profit', 0.0) > combined_summary['max_profit']:
+            combined_summary['max_profit'] = summary.get('max_profit', 0.0)
+    
+    # Calculate combined metrics
+    if combined_summary['total_trades'] > 0:
+        combined_summary['win_rate'] = (combined_summary['winning_trades'] / combined_summary['total_trades']) * 100
+    else:
+        combined_summary['win_rate'] = 0.0
+    
+    if combined_summary['total_loss'] > 0:
+        combined_summary['profit_factor'] = combined_summary['total_profit'] / combined_summary['total_loss']
+    elif combined_summary['total_profit'] > 0:
+        combined_summary['profit_factor'] = None  # Use None instead of inf for JSON compatibility
+    else:
+        combined_summary['profit_factor'] = 0.0
+    
+    # Calculate return percentage based on total initial capital
+    total_initial_capital = initial_capital * len(segments)
+    if total_initial_capital > 0:
+        combined_summary['return_pct'] = ((combined_summary['final_capital'] - total_initial_capital) / total_initial_capital) * 100
+    else:
+        combined_summary['return_pct'] = 0.0
+    combined_summary['start_date'] = from_date.isoformat()
+    combined_summary['end_date'] = to_date.isoformat()
+    
+    # Sort trades by entry time (if any trades exist)
+    if combined_trades:
+        try:
+            combined_trades.sort(key=lambda x: x.get('entry_time') or '')
+        except Exception as e:
+            logger.warning(f"Error sorting trades: {e}")
+    
+    return {
+        "trades": combined_trades,
+        "summary": combined_summary,
+        "segment_results": all_results
+    }
+
+
+def _create_job(segments: List[str], total_tasks: int) -> str:
+    """Register a new backtest job and return its id"""
+    job_id = uuid.uuid4().hex
+    with _jobs_lock:
+        # Drop the oldest finished jobs so results don't accumulate forever
+        finished = [jid for jid, job in _jobs.items() if job['status'] in ('completed', 'failed')]
+        for jid in finished[:max(0, len(_jobs) - _MAX_JOBS + 1)]:
+            del _jobs[jid]
+        _jobs[job_id] = {
+            "job_id": job_id,
+            "status": "queued",
+            "segments": segments,
+            "total_tasks": total_tasks,
+            "completed_tasks": 0,
+            "created_at": datetime.now().isoformat(),
+            "finished_at": None,
+            "result": None,
+            "error": None
+        }
+    return job_id
+
+
+def _update_job(job_id: str, **fields):
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job is not None:
+            job.update(fields)
+
+
+def _run_backtest_job(
+    job_id: str,
+    tasks: List[BacktestTask],
+    segments: List[str],
+    from_date: datetime,
+    to_date: datetime,
+    initial_capital: float,
+    kite_spec: Optional[Dict[str, str]]
+):
+    """Job thread: fan tasks out to the process pool, then merge per segment and combine"""
+    try:
+        _update_job(job_id, status="running")
+        futures = _runner.submit(tasks, kite_spec)
+        
+        chunk_results: Dict[str, List[Tuple[int, Dict]]] = {segment: [] for segment in segments}
+        segment_errors: Dict[str, str] = {}
+        completed = 0
+        task_by_future = dict(zip(futures, tasks))
+        for future in as_completed(futures):
+            task = task_by_future[future]
+            try:
+                chunk_results[task.segment].append((task.chunk_index, future.result()))
+            except BrokenProcessPool:
+                raise
+            except Exception as task_error:
+                logger.error(f"Error running backtest for segment {task.segment} (chunk {task.chunk_index}): {task_error}")
+                segment_errors[task.segment] = str(task_error)
+            completed += 1
+            _update_job(job_id, completed_tasks=completed)
+        
+        all_results = {}
+        for segment in segments:
+            if segment in segment_errors:
+                # Continue with other segments instead of failing completely
+                all_results[segment] = _empty_segment_result(from_date, to_date, initial_capital, segment_errors[segment])
+                continue
+            ordered = [result for _, result in sorted(chunk_results[segment], key=lambda item: item[0])]
+            all_results[segment] = merge_chunk_results(ordered, from_date, to_date, initial_capital)
+            logger.info(f"Backtest completed for {segment}: {all_results[segment]['summary'].get('total_trades', 0)} trades")
+        
+        combined_result = _combine_segment_results(segments, all_results, from_date, to_date, initial_capital)
+        logger.info(f"All backtests completed: {combined_result['summary']['total_trades']} total trades across {len(segments)} segments")
+        _update_job(job_id, status="completed", result=combined_result, finished_at=datetime.now().isoformat())
+    except Exception as e:
+        if isinstance(e, BrokenProcessPool):
+            # A worker died; start a fresh pool for the next job
+            _runner.shutdown(wait=False)
+        logger.error(f"Backtest job {job_id} failed: {e}", exc_info=True)
+        _update_job(job_id, status="failed", error=str(e), error_type=type(e).__name__, finished_at=datetime.now().isoformat())
+
+
 @backtest_bp.route('/expiries', methods=['GET'])
 def get_expiries():
     """Get latest expiry dates for all segments"""
@@ -48,44 +264,18 @@ def get_expiries():
         expiries = {}
         today = date.today()
         
-        # Helper function to get date from expiry (handles both datetime and date objects)
-        def get_expiry_date(expiry_obj):
-            if isinstance(expiry_obj, date):
-                return expiry_obj
-            elif hasattr(expiry_obj, 'date'):
-                return expiry_obj.date()
-            else:
-                return expiry_obj
-        
-        # Cache instruments by exchange
-        instruments_cache = {}
+        store = get_instrument_store()
         
         for segment, base_name in segment_map.items():
             # Get correct exchange for segment
             exchange = get_exchange_for_segment(segment)
             
-            # Get instruments from the correct exchange (cache by exchange)
-            if exchange not in instruments_cache:
-                instruments_cache[exchange] = kite_client.kite.instruments(exchange)
-            
-            instruments = instruments_cache[exchange]
+            # Option expiries (CE / PE) of this segment from the shared instrument index
+            unique_expiries = store.get_index(kite_client, exchange).expiries(base_name, ('CE', 'PE'), from_date=today)
             
-            # Filter for options (CE or PE) of this segment
-            segment_options = [
-                inst for inst in instruments
-                if inst['name'] == base_name and
-                inst['instrument_type'] in ['CE', 'PE'] and
-                get_expiry_date(inst['expiry']) >= today
-            ]
-            
-            if segment_options:
-                # Get unique expiry dates
-                unique_expiries = sorted(set(get_expiry_date(inst['expiry']) for inst in segment_options))
-                # Get the latest (nearest) expiry
-                latest_expiry = unique_expiries[0] if unique_expiries else None
-                expiries[segment] = latest_expiry.strftime("%Y-%m-%d") if latest_expiry else None
-            else:
-                expiries[segment] = None
+            # Get the latest (nearest) expiry
+            latest_expiry = unique_expiries[0] if unique_expiries else None
+            expiries[segment] = latest_expiry.strftime("%Y-%m-%d") if latest_expiry else None
         
         return jsonify(expiries)
     except Exception as e:
@@ -94,6 +284,44 @@ def get_expiries():
     return _kite_client
 
 
+def _run_sweep_job(
+    job_id: str,
+    segments: List[str],
+    from_date: datetime,
+    to_date: datetime,
+    grid: Dict[str, List[Any]],
+    initial_capital: float,
+    segment_expiries: Dict[str, Optional[str]],
+    rank_by: str,
+    data_source: str = "market",
+    backfill: bool = False
+):
+    """Job thread: fetch data once per segment / interval and run the sweep on the process pool"""
+    try:
+        _update_job(job_id, status="running")
+        engine = BacktestEngine(create_data_fetcher(data_source, kite_client=get_kite_client(), backfill=backfill))
+        sweep = ParameterSweep(engine, runner=_runner)
+        result = sweep.run(
+            segments=segments,
+            from_date=from_date,
+            to_date=to_date,
+            grid=grid,
+            initial_capital=initial_capital,
+            segment_expiries=segment_expiries,
+            rank_by=rank_by,
+            progress_callback=lambda completed, total: _update_job(job_id, completed_tasks=completed)
+        )
+        result["start_date"] = from_date.isoformat()
+        result["end_date"] = to_date.isoformat()
+        logger.info(f"Parameter sweep {job_id} completed: {result['combinations']} runs")
+        _update_job(job_id, status="completed", result=result, finished_at=datetime.now().isoformat())
+    except Exception as e:
+        if isinstance(e, BrokenProcessPool):
+            _runner.shutdown(wait=False)
+        logger.error(f"Parameter sweep {job_id} failed: {e}", exc_info=True)
+        _update_job(job_id, status="failed", error=str(e), error_type=type(e).__name__, finished_at=datetime.now().isoformat())
+
+
 @backtest_bp.route('/')
 def backtest_page():
     """Backtesting page"""
@@ -102,7 +330,7 @@ def backtest_page():
 
 @backtest_bp.route('/run', methods=['POST'])
 def run_backtest():
-    """Run backtest"""
+    """Start a backtest job (poll /backtest/jobs/<job_id> for the result)"""
     try:
         kite_client = get_kite_client()
         data = request.get_json()
@@ -171,151 +399,67 @@ def run_backtest():
             if segment not in valid_segments:
                 return jsonify({"error": f"Invalid segment: {segment}. Must be one of: {', '.join(valid_segments)}"}), 400
         
-        # Initialize backtesting components
-        # Yahoo Finance doesn't require Kite client, but we pass it for potential future use
-        data_fetcher = HistoricalDataFetcher(kite_client=kite_client)
-        backtest_engine = BacktestEngine(data_fetcher)
-        
-        # Run backtests for each segment
-        all_results = {}
-        combined_trades = []
-        combined_summary = {
-            "total_trades": 0,
-            "winning_trades": 0,
-            "losing_trades": 0,
-            "total_profit": 0.0,
-            "total_loss": 0.0,
-            "net_pnl": 0.0,
-            "max_drawdown": 0.0,
-            "max_profit": 0.0,
-            "initial_capital": initial_capital,
-            "final_capital": 0.0  # Will accumulate final capital from all segments
-        }
-        
-        for segment in segments:
-            try:
-                # Get expiry for this segment (prefer segment-specific, fallback to legacy)
-                segment_expiry = segment_expiries.get(segment) if segment_expiries else None
-                if not segment_expiry and legacy_expiry:
-                    segment_expiry = legacy_expiry
-                
-                logger.info(f"Running backtest: {segment} from {from_date.date()} to {to_date.date()} with expiry {segment_expiry}")
-                
-                result = backtest_engine.run_backtest(
-                    segment=segment,
-                    from_date=from_date,
-                    to_date=to_date,
-                    time_interval=time_interval,
-                    rsi_period=rsi_period,
-                    price_strength_ema=price_strength_ema,
-                    volume_strength_wma=volume_strength_wma,
-                    initial_capital=initial_capital,
-                    expiry=segment_expiry,
-                    stop_loss=stop_loss,
-                    trade_regime=trade_regime
-                )
-                
-                if result is None:
-                    logger.error(f"Backtest returned None for segment: {segment}")
-                    continue
-                
-                # Convert result to dictionary
-                result_dict = result.to_dict()
-                all_results[segment] = result_dict
-                
-                # Combine trades (add segment info)
-                for trade in result_dict.get('trades', []):
-                    trade['segment'] = segment
-                    combined_trades.append(trade)
-                
-                # Combine summary metrics
-                summary = result_dict.get('summary', {})
-                combined_summary['total_trades'] += summary.get('total_trades', 0)
-                combined_summary['winning_trades'] += summary.get('winning_trades', 0)
-                combined_summary['losing_trades'] += summary.get('losing_trades', 0)
-                combined_summary['total_profit'] += summary.get('total_profit', 0.0)
-                combined_summary['total_loss'] += summary.get('total_loss', 0.0)
-                combined_summary['net_pnl'] += summary.get('net_pnl', 0.0)
-                # For combined capital, we need to track each segment's capital separately
-                # final_capital should be the sum of all segment final capitals
-                segment_final_capital = summary.get('final_capital', initial_capital)
-                combined_summary['final_capital'] += segment_final_capital
-                
-                if summary.get('max_drawdown', 0.0) > combined_summary['max_drawdown']:
-                    combined_summary['max_drawdown'] = summary.get('max_drawdown', 0.0)
-                
-                if summary.get('max_profit', 0.0) > combined_summary['max_profit']:
-                    combined_summary['max_profit'] = summary.get('max_profit', 0.0)
-                
-                logger.info(f"Backtest completed for {segment}: {result.total_trades} trades")
-            except Exception as segment_error:
-                logger.error(f"Error running backtest for segment {segment}: {segment_error}", exc_info=True)
-                # Continue with other segments instead of failing completely
-                all_results[segment] = {
-                    "trades": [],
-                    "summary": {
-                        "total_trades": 0,
-                        "winning_trades": 0,
-                        "losing_trades": 0,
-                        "total_profit": 0.0,
-                        "total_loss": 0.0,
-                        "net_pnl": 0.0,
-                        "max_drawdown": 0.0,
-                        "max_profit": 0.0,
-                        "win_rate": 0.0,
-                        "profit_factor": 0.0,
-                        "start_date": from_date.isoformat(),
-                        "end_date": to_date.isoformat(),
-                        "initial_capital": initial_capital,
-                        "final_capital": initial_capital,
-                        "return_pct": 0.0,
-                        "error": str(segment_error)
-                    }
-                }
-        
-        # Calculate combined metrics
-        if combined_summary['total_trades'] > 0:
-            combined_summary['win_rate'] = (combined_summary['winning_trades'] / combined_summary['total_trades']) * 100
-        else:
-            combined_summary['win_rate'] = 0.0
-        
-        if combined_summary['total_loss'] > 0:
-            combined_summary['profit_factor'] = combined_summary['total_profit'] / combined_summary['total_loss']
-        elif combined_summary['total_profit'] > 0:
-            combined_summary['profit_factor'] = None  # Use None instead of inf for JSON compatibility
-        else:
-            combined_summary['profit_factor'] = 0.0
-        
-        # Calculate return percentage based on total initial capital
-        total_initial_capital = initial_capital * len(segments)
-        if total_initial_capital > 0:
-            combined_summary['return_pct'] = ((combined_summary['final_capital'] - total_initial_capital) / total_initial_capital) * 100
-        else:
-            combined_summary['return_pct'] = 0.0
-        combined_summary['start_date'] = from_date.isoformat()
-        combined_summary['end_date'] = to_date.isoformat()
-        
-        # Sort trades by entry time (if any trades exist)
-        if combined_trades:
+        # Optional date chunking (days per chunk) for long ranges
+        chunk_days = data.get('chunk_days')
+        if chunk_days is not None:
             try:
-                combined_trades.sort(key=lambda x: x.get('entry_time') or '')
-            except Exception as e:
-                logger.warning(f"Error sorting trades: {e}")
-        
-        # Create combined result
-        combined_result = {
-            "trades": combined_trades,
-            "summary": combined_summary,
-            "segment_results": all_results
-        }
-        
-        logger.info(f"All backtests completed: {combined_summary['total_trades']} total trades across {len(segments)} segments")
+                chunk_days = int(chunk_days)
+            except (TypeError, ValueError):
+                return jsonify({"error": f"Invalid chunk_days: {chunk_days}"}), 400
+            if chunk_days < 1:
+                return jsonify({"error": "chunk_days must be at least 1"}), 400
+        
+        # Data source: "market" (Yahoo / Kite) or "candles" (candles stored by the live agents)
+        data_source = data.get('data_source', 'market')
+        if data_source not in DATA_SOURCES:
+            return jsonify({"error": f"Invalid data_source: {data_source}. Must be one of: {', '.join(DATA_SOURCES)}"}), 400
+        backfill = bool(data.get('backfill_gaps', False))
+        
+        # Get expiry per segment (prefer segment-specific, fallback to legacy)
+        segment_params = {}
+        for segment in segments:
+            segment_expiry = segment_expiries.get(segment) if segment_expiries else None
+            if not segment_expiry and legacy_expiry:
+                segment_expiry = legacy_expiry
+            segment_params[segment] = {"expiry": segment_expiry}
+        
+        tasks = build_tasks(
+            segments=segments,
+            from_date=from_date,
+            to_date=to_date,
+            params={
+                "time_interval": time_interval,
+                "rsi_period": rsi_period,
+                "price_strength_ema": price_strength_ema,
+                "volume_strength_wma": volume_strength_wma,
+                "initial_capital": initial_capital,
+                "stop_loss": stop_loss,
+                "trade_regime": trade_regime
+            },
+            chunk_days=chunk_days,
+            segment_params=segment_params,
+            data_source=data_source,
+            backfill=backfill
+        )
+        
+        # Run segments / chunks in the process pool; the request returns immediately with a job id
+        job_id = _create_job(segments, len(tasks))
+        job_thread = threading.Thread(
+            target=_run_backtest_job,
+            args=(job_id, tasks, segments, from_date, to_date, initial_capital, kite_session_spec(kite_client)),
+            name=f"BacktestJob-{job_id}",
+            daemon=True
+        )
+        job_thread.start()
+        
+        logger.info(f"Backtest job {job_id} queued: {len(tasks)} task(s) for {', '.join(segments)} from {from_date.date()} to {to_date.date()}")
         
         return jsonify({
             "success": True,
-            "result": combined_result,
+            "job_id": job_id,
+            "status": "queued",
             "segments_tested": segments
-        })
+        }), 202
         
     except ImportError as e:
         logger.error(f"Import error: {e}", exc_info=True)
@@ -332,6 +476,134 @@ def run_backtest():
         }), 500
 
 
+@backtest_bp.route('/sweep', methods=['POST'])
+def run_sweep():
+    """
+    Start a parameter sweep (grid search) job.
+    
+    Body: segments, from_date, to_date, grid ({parameter: [values]} for time_interval,
+    rsi_period, price_strength_ema, volume_strength_wma, stop_loss, trade_regime),
+    optional initial_capital, segment_expiries / expiry, rank_by, data_source
+    ("market" or "candles") and backfill_gaps.
+    Poll /backtest/jobs/<job_id>; the result holds the ranked results table.
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "No data provided"}), 400
+        
+        for field in ['segments', 'from_date', 'to_date', 'grid']:
+            if field not in data:
+                return jsonify({"error": f"Missing required field: {field}"}), 400
+        
+        segments = data.get('segments', [])
+        if isinstance(segments, str):
+            segments = [segments]
+        elif not isinstance(segments, list) or len(segments) == 0:
+            return jsonify({"error": "At least one segment must be selected"}), 400
+        valid_segments = ['NIFTY', 'SENSEX', 'BANKNIFTY']
+        for segment in segments:
+            if segment not in valid_segments:
+                return jsonify({"error": f"Invalid segment: {segment}. Must be one of: {', '.join(valid_segments)}"}), 400
+        
+        try:
+            from_date = datetime.strptime(data['from_date'], "%Y-%m-%d")
+            to_date = datetime.strptime(data['to_date'], "%Y-%m-%d")
+        except ValueError as e:
+            return jsonify({"error": f"Invalid date format: {str(e)}"}), 400
+        if from_date > to_date:
+            return jsonify({"error": "from_date cannot be after to_date"}), 400
+        if (to_date - from_date).days > 365:
+            return jsonify({"error": "Date range cannot exceed 365 days"}), 400
+        
+        grid = data.get('grid')
+        if not isinstance(grid, dict) or len(grid) == 0:
+            return jsonify({"error": f"grid must be an object of parameter lists ({', '.join(SWEEP_DEFAULTS)})"}), 400
+        try:
+            combinations = expand_grid(grid)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        valid_intervals = ['3minute', '5minute', '15minute', '30minute', '1hour']
+        for combination in combinations:
+            if combination['time_interval'] not in valid_intervals:
+                return jsonify({"error": f"Invalid time interval: {combination['time_interval']}. Must be one of: {', '.join(valid_intervals)}"}), 400
+            if combination['trade_regime'] not in ['Buy', 'Sell']:
+                return jsonify({"error": f"Invalid trade_regime: {combination['trade_regime']}. Must be 'Buy' or 'Sell'"}), 400
+        
+        total_runs = len(combinations) * len(segments)
+        if total_runs > _MAX_SWEEP_RUNS:
+            return jsonify({"error": f"Sweep has {total_runs} runs; maximum is {_MAX_SWEEP_RUNS}"}), 400
+        
+        rank_by = data.get('rank_by', 'net_pnl')
+        if rank_by not in RANK_KEYS:
+            return jsonify({"error": f"Invalid rank_by: {rank_by}. Must be one of: {', '.join(RANK_KEYS)}"}), 400
+        
+        data_source = data.get('data_source', 'market')
+        if data_source not in DATA_SOURCES:
+            return jsonify({"error": f"Invalid data_source: {data_source}. Must be one of: {', '.join(DATA_SOURCES)}"}), 400
+        backfill = bool(data.get('backfill_gaps', False))
+        
+        initial_capital = float(data.get('initial_capital', 100000))
+        segment_expiries = data.get('segment_expiries', {}) or {}
+        legacy_expiry = data.get('expiry')
+        expiries = {segment: segment_expiries.get(segment) or legacy_expiry for segment in segments}
+        
+        job_id = _create_job(segments, total_runs)
+        job_thread = threading.Thread(
+            target=_run_sweep_job,
+            args=(job_id, segments, from_date, to_date, grid, initial_capital, expiries, rank_by, data_source, backfill),
+            name=f"BacktestSweep-{job_id}",
+            daemon=True
+        )
+        job_thread.start()
+        
+        logger.info(f"Parameter sweep {job_id} queued: {total_runs} runs for {', '.join(segments)} from {from_date.date()} to {to_date.date()}")
+        
+        return jsonify({
+            "success": True,
+            "job_id": job_id,
+            "status": "queued",
+            "combinations": total_runs
+        }), 202
+    except Exception as e:
+        logger.error(f"Error starting parameter sweep: {e}", exc_info=True)
+        return jsonify({
+            "error": str(e),
+            "error_type": type(e).__name__
+        }), 500
+
+
+@backtest_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Poll a backtest job started by /backtest/run or /backtest/sweep"""
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        job = dict(job) if job is not None else None
+    if job is None:
+        return jsonify({"error": f"Unknown backtest job: {job_id}"}), 404
+    
+    response = {
+        "job_id": job_id,
+        "status": job['status'],
+        "progress": {
+            "completed": job['completed_tasks'],
+            "total": job['total_tasks']
+        },
+        "segments_tested": job['segments'],
+        "created_at": job['created_at'],
+        "finished_at": job['finished_at']
+    }
+    if job['status'] == 'completed':
+        response["success"] = True
+        response["result"] = job['result']
+    elif job['status'] == 'failed':
+        response["success"] = False
+        response["error"] = job['error']
+        response["error_type"] = job.get('error_type')
+    return jsonify(response)
+
+
 @backtest_bp.route('/status', methods=['GET'])
 def get_status():
     """Get backtesting system status"""
@@ -352,7 +624,8 @@ def get_status():
             "authenticated": authenticated,
             "yfinance_available": yfinance_available,
             "status": "ready" if yfinance_available else "yfinance_not_installed",
-            "data_source": "Yahoo Finance"
+            "data_source": "Yahoo Finance",
+            "data_sources": list(DATA_SOURCES)
         })
     except Exception as e:
         logger.error(f"Error getting status: {e}")
@@ -3,7 +3,7 @@ Flask-based Dashboard UI
 Beautiful and modern web interface for real-time monitoring
 """
 
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request, stream_with_context
 from flask_cors import CORS
 from datetime import datetime
 from typing import Optional
@@ -321,6 +321,34 @@ class Dashboard:
                     }
                 }), 500
         
+        @self.app.route('/api/stream')
+        def status_stream():
+            """
+            Server-Sent Events stream of status updates pushed by the risk monitor and
+            the live agents (risk, positions, trade, live_status, live_position,
+            live_trade, ps_vs). Optional ?topics=a,b limits the event types; a client
+            reconnecting with Last-Event-ID receives the events it missed.
+            """
+            from src.utils.status_stream import get_status_broadcaster
+            
+            self._ensure_broker_id()
+            broker_id = BrokerContext.get_broker_id()
+            topics = [t for t in request.args.get('topics', '').split(',') if t] or None
+            try:
+                last_event_id = int(request.headers.get('Last-Event-ID', ''))
+            except ValueError:
+                last_event_id = None
+            
+            stream = get_status_broadcaster().stream(broker_id, last_event_id, topics)
+            return Response(
+                stream_with_context(stream),
+                mimetype='text/event-stream',
+                headers={
+                    'Cache-Control': 'no-cache',
+                    'X-Accel-Buffering': 'no'  # Don't buffer behind nginx
+                }
+            )
+        
         @self.app.route('/api/connectivity', methods=['GET'])
         def check_connectivity():
             """Check system connectivity status"""
@@ -543,189 +571,42 @@ class Dashboard:
                         all_orders = self.kite_client.get_orders()
                         logger.info(f"Fetched {len(all_orders)} orders from Zerodha orderbook")
                         
-                        # Filter for non-equity orders that are COMPLETE (exclude NSE, BSE equity)
-                        non_equity_orders = []
-                        for order in all_orders:
-                            # Check if it's an equity trade (NSE, BSE)
-                            exchange = order.get('exchange', '').upper()
-                            
-                            # Exclude equity trades (NSE, BSE)
-                            if self._is_equity_trade(exchange):
-                                continue
-                            
-                            # Only include COMPLETE orders
-                            status = order.get('status', '').upper()
-                            if status != 'COMPLETE':
-                                continue
-                            
-                            # Check if order has filled quantity
-                            filled_qty = order.get('filled_quantity', 0)
-                            if filled_qty == 0:
-                                continue
-                            
-                            non_equity_orders.append(order)
-                        
-                        # Sort by timestamp (most recent first)
-                        non_equity_orders.sort(
-                            key=lambda x: x.get('order_timestamp', ''),
-                            reverse=True
-                        )
+                        # Match BUY and SELL orders FIFO per symbol and day; the matcher is
+                        # shared with OrderSync and only applies orders it has not seen yet
+                        from src.api.order_matcher import get_order_matcher
+                        matcher = get_order_matcher(BrokerContext.get_broker_id())
+                        matcher.update(all_orders)
                         
-                        # Convert orders to trade format
-                        from src.utils.date_utils import IST
-                        from pytz import UTC
-                        
-                        # Consolidate orders into trades (match BUY and SELL)
-                        # Group by trading symbol and match orders chronologically
-                        orders_by_symbol = {}
-                        for order in non_equity_orders:
-                            symbol = order.get('tradingsymbol', '')
-                            if symbol not in orders_by_symbol:
-                                orders_by_symbol[symbol] = []
-                            orders_by_symbol[symbol].append(order)
+                        # Filter by date if specified
+                        trade_date = None
+                        if date_str and not all_trades_param:
+                            try:
+                                trade_date = datetime.fromisoformat(date_str).date()
+                            except ValueError:
+                                pass
                         
-                        # Process each symbol to create consolidated trades
                         trades_data = []
-                        for symbol, symbol_orders in orders_by_symbol.items():
-                            # Filter by date if specified
-                            if date_str and not all_trades_param:
-                                try:
-                                    trade_date = datetime.fromisoformat(date_str).date()
-                                    symbol_orders = [
-                                        o for o in symbol_orders
-                                        if self._parse_order_timestamp(o.get('order_timestamp', '')).date() == trade_date
-                                    ]
-                                except:
-                                    pass
-                            
-                            # Sort by timestamp
-                            symbol_orders.sort(key=lambda x: self._parse_order_timestamp(x.get('order_timestamp', '')))
-                            
-                            # Use FIFO to match BUY and SELL orders
-                            pending_buys = []  # List of (order, remaining_qty)
-                            pending_sells = []  # List of (order, remaining_qty)
-                            
-                            for order in symbol_orders:
-                                try:
-                                    # Parse order timestamp
-                                    raw_timestamp = order.get('order_timestamp', '')
-                                    order_time = self._parse_order_timestamp(raw_timestamp)
-                                    
-                                    # Log for debugging (first few orders only) - show both UTC and IST interpretations
-                                    if len(trades_data) < 3:
-                                        from pytz import UTC
-                                        if raw_timestamp:
-                                            try:
-                                                if isinstance(raw_timestamp, datetime):
-                                                    test_dt = raw_timestamp
-                                                else:
-                                                    test_dt = datetime.strptime(str(raw_timestamp), '%Y-%m-%d %H:%M:%S')
-                                                
-                                                # Test both interpretations
-                                                as_utc = test_dt.replace(tzinfo=UTC).astimezone(IST)
-                                                as_ist = IST.localize(test_dt)
-                                                
-                                                logger.info(
-                                                    f"Order {order.get('order_id', '')} timestamp debug: "
-                                                    f"raw={raw_timestamp}, "
-                                                    f"if_UTC_then_IST={as_utc.strftime('%Y-%m-%d %H:%M:%S')}, "
-                                                    f"if_IST_then_IST={as_ist.strftime('%Y-%m-%d %H:%M:%S')}, "
-                                                    f"using={order_time.strftime('%Y-%m-%d %H:%M:%S')}"
-                                                )
-                                            except:
-                                                pass
-                                    
-                                    transaction_type = order.get('transaction_type', '').upper()
-                                    filled_qty = order.get('filled_quantity', 0)
-                                    avg_price = float(order.get('average_price', 0))
-                                    
-                                    if transaction_type == 'BUY':
-                                        remaining_qty = filled_qty
-                                        # Match with pending SELL orders (short covering)
-                                        while remaining_qty > 0 and pending_sells:
-                                            sell_order, sell_remaining = pending_sells[0]
-                                            sell_price = float(sell_order.get('average_price', 0))
-                                            sell_time = self._parse_order_timestamp(sell_order.get('order_timestamp', ''))
-                                            
-                                            match_qty = min(remaining_qty, sell_remaining)
-                                            
-                                            # Calculate P&L for this match
-                                            # For SELL first then BUY: P&L = (sell_price - buy_price) * qty
-                                            pnl = (sell_price - avg_price) * match_qty
-                                            
-                                            trades_data.append({
-                                                "id": f"trade_{sell_order.get('order_id', '')}_{order.get('order_id', '')}",
-                                                "trading_symbol": symbol,
-                                                "exchange": order.get('exchange', ''),
-                                                "entry_time": sell_time.isoformat() if sell_time else None,
-                                                "exit_time": order_time.isoformat() if order_time else None,
-                                                "entry_price": sell_price,
-                                                "exit_price": avg_price,
-                                                "quantity": -abs(match_qty),  # Negative for SELL
-                                                "transaction_type": "SELL",
-                                                "realized_pnl": pnl,
-                                                "is_profit": pnl > 0,
-                                                "exit_type": "orderbook",
-                                                "source": "orderbook",
-                                                "is_open": False  # Mark as closed trade
-                                            })
-                                            
-                                            remaining_qty -= match_qty
-                                            sell_remaining -= match_qty
-                                            
-                                            if sell_remaining == 0:
-                                                pending_sells.pop(0)
-                                            else:
-                                                pending_sells[0] = (sell_order, sell_remaining)
-                                        
-                                        if remaining_qty > 0:
-                                            pending_buys.append((order, remaining_qty))
-                                    
-                                    elif transaction_type == 'SELL':
-                                        remaining_qty = filled_qty
-                                        # Match with pending BUY orders (long exit)
-                                        while remaining_qty > 0 and pending_buys:
-                                            buy_order, buy_remaining = pending_buys[0]
-                                            buy_price = float(buy_order.get('average_price', 0))
-                                            buy_time = self._parse_order_timestamp(buy_order.get('order_timestamp', ''))
-                                            
-                                            match_qty = min(remaining_qty, buy_remaining)
-                                            
-                                            # Calculate P&L for this match
-                                            # For BUY first then SELL: P&L = (sell_price - buy_price) * qty
-                                            pnl = (avg_price - buy_price) * match_qty
-                                            
-                                            trades_data.append({
-                                                "id": f"trade_{buy_order.get('order_id', '')}_{order.get('order_id', '')}",
-                                                "trading_symbol": symbol,
-                                                "exchange": order.get('exchange', ''),
-                                                "entry_time": buy_time.isoformat() if buy_time else None,
-                                                "exit_time": order_time.isoformat() if order_time else None,
-                                                "entry_price": buy_price,
-                                                "exit_price": avg_price,
-                                                "quantity": abs(match_qty),  # Positive for BUY
-                                                "transaction_type": "BUY",
-                                                "realized_pnl": pnl,
-                                                "is_profit": pnl > 0,
-                                                "exit_type": "orderbook",
-                                                "source": "orderbook",
-                                                "is_open": False  # Mark as closed trade
-                                            })
-                                            
-                                            remaining_qty -= match_qty
-                                            buy_remaining -= match_qty
-                                            
-                                            if buy_remaining == 0:
-                                                pending_buys.pop(0)
-                                            else:
-                                                pending_buys[0] = (buy_order, buy_remaining)
-                                        
-                                        if remaining_qty > 0:
-                                            pending_sells.append((order, remaining_qty))
-                                
-                                except Exception as e:
-                                    logger.error(f"Error processing order {order.get('order_id', 'unknown')}: {e}", exc_info=True)
-                                    continue
+                        for match in matcher.trades(trade_date):
+                            # Exclude equity trades (NSE, BSE)
+                            if self._is_equity_trade(match.exchange):
+                                continue
+                            pnl = match.realized_pnl
+                            trades_data.append({
+                                "id": match.trade_id,
+                                "trading_symbol": match.trading_symbol,
+                                "exchange": match.exchange,
+                                "entry_time": match.entry_time.isoformat(),
+                                "exit_time": match.exit_time.isoformat(),
+                                "entry_price": match.entry_price,
+                                "exit_price": match.exit_price,
+                                "quantity": match.quantity,  # Positive for BUY, negative for SELL
+                                "transaction_type": match.transaction_type,
+                                "realized_pnl": pnl,
+                                "is_profit": pnl > 0,
+                                "exit_type": "orderbook",
+                                "source": "orderbook",
+                                "is_open": False  # Mark as closed trade
+                            })
                         
                         # Calculate summary from consolidated trades
                         total_profit = sum(t.get('realized_pnl', 0) for t in trades_data if t.get('realized_pnl', 0) > 0)
@@ -2091,52 +1972,17 @@ class Dashboard:
         Note: Zerodha order timestamps are already in IST (Indian Standard Time).
         The API returns timestamps that are timezone-naive but represent IST time.
         We should localize them directly to IST, NOT convert from UTC.
+        Falls back to the current time if the value cannot be parsed.
         """
+        from src.api.order_matcher import parse_order_timestamp
         from src.utils.date_utils import IST
-        from pytz import UTC
         
-        if not timestamp_value:
+        order_time = parse_order_timestamp(timestamp_value)
+        if order_time is None:
+            if timestamp_value:
+                logger.warning(f"Could not parse timestamp: {timestamp_value}")
             return datetime.now(IST)
-        
-        # If it's already a datetime object, just convert timezone
-        if isinstance(timestamp_value, datetime):
-            if timestamp_value.tzinfo is None:
-                # Zerodha timestamps are timezone-naive but already in IST
-                # Localize directly to IST (don't convert from UTC)
-                return IST.localize(timestamp_value)
-            else:
-                # Already timezone-aware, convert to IST
-                return timestamp_value.astimezone(IST)
-        
-        # If it's a string, parse it
-        if isinstance(timestamp_value, str):
-            try:
-                # Try multiple formats
-                order_time = None
-                for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M:%S.%f', '%d-%m-%Y %H:%M:%S']:
-                    try:
-                        order_time = datetime.strptime(timestamp_value, fmt)
-                        break
-                    except ValueError:
-                        continue
-                
-                if order_time:
-                    if order_time.tzinfo is None:
-                        # Zerodha timestamps are timezone-naive but already in IST
-                        # Localize directly to IST (don't convert from UTC)
-                        return IST.localize(order_time)
-                    else:
-                        # Already timezone-aware, convert to IST
-                        return order_time.astimezone(IST)
-                else:
-                    logger.warning(f"Could not parse timestamp: {timestamp_value}")
-                    return datetime.now(IST)
-            except Exception as e:
-                logger.warning(f"Error parsing timestamp {timestamp_value}: {e}")
-                return datetime.now(IST)
-        
-        # Fallback
-        return datetime.now(IST)
+        return order_time
     
     def _calculate_trades_summary(self, trades, inactive_positions, active_positions=None):
         """
@@ -16,7 +16,11 @@ import json
 from src.api.kite_client import KiteClient
 from src.live_trader.agents import LiveSegmentAgent, LiveAgentParams
 from src.live_trader.execution import PaperExecutionClient, LiveExecutionClient, LOG_DIR
-from src.utils.logger import get_logger
+from src.live_trader.index_feed import DEFAULT_BAR_INTERVALS, IndexTickFeed
+from src.database.models import DatabaseManager
+from src.database.repository import CandleRepository
+from src.utils.logger import get_log_pipeline, get_logger
+from src.utils.status_stream import publish_status
 from src.config.config_manager import ConfigManager
 
 logger = get_logger("live_trader")
@@ -130,6 +134,7 @@ class LiveAgentManager:
         self._params: Dict[str, Any] = {}
         self._agents: Dict[str, LiveSegmentAgent] = {}  # Key: "{segment}_{mode}"
         self._modes: list[str] = []  # List of active modes (PAPER, LIVE, or both)
+        self._feed: Optional[IndexTickFeed] = None  # Websocket index feed shared by all agents
 
     def start(self, segments: list[str], params: Dict[str, Any]) -> None:
         """Start live trading for given segments with parameters. Supports multiple modes in parallel."""
@@ -204,8 +209,20 @@ class LiveAgentManager:
                 
                 logger.info(f"Started {mode} agent for {segment}")
 
+        # Stream the indices over the websocket: bars are built from ticks and agents
+        # are woken on every bar close (if the feed cannot connect they keep polling)
+        time_interval = params.get("time_interval", "5minute")
+        self._feed = IndexTickFeed(
+            _kite_client,
+            segments,
+            intervals=list(DEFAULT_BAR_INTERVALS) + [time_interval],
+            candle_repo=CandleRepository(DatabaseManager()),
+        )
+        self._feed.start()
+
         modes_str = " + ".join(modes)
         logger.info(f"Live Trader started in {modes_str} mode(s) for segments={segments} with params={params}")
+        self._publish_status()
 
     def stop(self) -> None:
         """Stop all live agents."""
@@ -216,10 +233,26 @@ class LiveAgentManager:
                 agent.stop()
             except Exception:
                 pass
+        if self._feed is not None:
+            try:
+                self._feed.stop()
+            except Exception as e:
+                logger.warning(f"Error stopping index feed: {e}")
+            self._feed = None
         self._agents = {}
         self._running = False
         self._segments = []
         self._params = {}
+        self._publish_status()
+
+    def _publish_status(self) -> None:
+        """Push the running state to status stream clients (only when it changed)."""
+        publish_status("live_status", {
+            "running": self._running,
+            "segments": self._segments,
+            "modes": self._modes,
+            "active_agents": len(self._agents),
+        }, state=True)
 
     def get_status(self) -> Dict[str, Any]:
         """Return a minimal status snapshot for the UI."""
@@ -229,6 +262,8 @@ class LiveAgentManager:
             "modes": self._modes,
             "params": self._params,
             "active_agents": len(self._agents),
+            "index_feed": self._feed.stats() if self._feed is not None else None,
+            "logging": get_log_pipeline().stats(),
         }
 
 
@@ -552,6 +587,40 @@ def download_live_trades():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@live_trader_bp.route("/open-positions/download", methods=["GET"])
+def download_open_positions():
+    """
+    Download the open positions of a day as CSV (exported from the open-position journal).
+    
+    Query params:
+    - date: Optional date string (YYYY-MM-DD), defaults to today
+    """
+    try:
+        from src.live_trader.position_journal import get_position_journal
+        date_str = request.args.get("date")
+        if not date_str:
+            date_str = datetime.now().strftime("%Y-%m-%d")
+        try:
+            datetime.strptime(date_str, "%Y-%m-%d")
+        except ValueError:
+            return jsonify({"success": False, "error": "Invalid date. Use YYYY-MM-DD"}), 400
+        
+        file_path = get_position_journal().export_csv(date_str)
+        
+        if file_path is None:
+            return jsonify({"success": False, "error": f"No open positions found for date {date_str}"}), 404
+        
+        return send_file(
+            str(file_path),
+            as_attachment=True,
+            download_name=f"open_positions_{date_str}.csv",
+            mimetype="text/csv"
+        )
+    except Exception as e:
+        logger.error(f"Error downloading open positions: {e}", exc_info=True)
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 @live_trader_bp.route("/trades/daily-pnl", methods=["GET"])
 def get_daily_pnl():
     """
@@ -1095,141 +1164,54 @@ def get_ps_vs_data():
         except ValueError:
             num_hours = 10
         
-        # Get PS/VS data file path
-        from src.live_trader.execution import LOG_DIR
-        from src.utils.date_utils import get_current_ist_time
-        ps_vs_dir = LOG_DIR / "ps_vs_data"
+        from src.live_trader.ps_vs_store import get_ps_vs_store
+        from src.utils.date_utils import get_current_ist_time, is_market_open
+        store = get_ps_vs_store()
         
-        # Use IST time to match the timestamp format used when saving files
+        # Use IST time to match the timestamps of the stored points
         ist_now = get_current_ist_time()
         today = ist_now.strftime("%Y-%m-%d")
-        today_file_path = ps_vs_dir / f"ps_vs_{segment}_{today}.json"
-        
-        # Check if today's file exists and has data
-        use_today = False
-        file_path = None
         
-        if today_file_path.exists():
-            try:
-                with open(today_file_path, 'r', encoding='utf-8') as f:
-                    today_data = json.load(f)
-                if today_data and len(today_data) > 0:
-                    use_today = True
-                    file_path = today_file_path
-                    data_date = today
-                    logger.debug(f"Using today's ({today}) PS/VS data for {segment}: {len(today_data)} points")
-            except (json.JSONDecodeError, IOError) as e:
-                logger.warning(f"Today's file exists but couldn't read it: {e}")
-        
-        # If today's data is not available, find the most recent available file
+        # Today's data if there is any, else the most recent day with data
+        use_today = store.count(segment, today) > 0
+        data_date = today if use_today else None
         if not use_today:
-            # First, try to find the most recent file (this will get the latest date available, e.g., 26th Dec)
-            pattern = f"ps_vs_{segment}_*.json"
-            matching_files = sorted(ps_vs_dir.glob(pattern), key=lambda p: p.stat().st_mtime, reverse=True)
-            
-            if matching_files:
-                # Use the most recent file (should be the latest date, e.g., 26th Dec)
-                file_path = matching_files[0]
-                # Extract date from filename
-                try:
-                    data_date = file_path.stem.split('_')[-1]  # Extract date from filename
-                    logger.debug(f"Using most recent file: {file_path.name} (date: {data_date})")
-                except Exception as e:
-                    logger.warning(f"Could not extract date from filename {file_path.name}: {e}")
-                    # Try to get date from file modification time as fallback
-                    try:
-                        mtime = file_path.stat().st_mtime
-                        data_date = datetime.fromtimestamp(mtime).strftime("%Y-%m-%d")
-                    except:
-                        pass
-            else:
-                # No files found - try previous trading day as fallback
-                prev_date = ist_now.date() - timedelta(days=1)
-                while prev_date.weekday() >= 5:  # Skip weekends (Saturday=5, Sunday=6)
-                    prev_date -= timedelta(days=1)
-                
-                prev_date_str = prev_date.strftime("%Y-%m-%d")
-                prev_file_path = ps_vs_dir / f"ps_vs_{segment}_{prev_date_str}.json"
-                
-                if prev_file_path.exists():
-                    try:
-                        with open(prev_file_path, 'r', encoding='utf-8') as f:
-                            prev_data = json.load(f)
-                        if prev_data and len(prev_data) > 0:
-                            file_path = prev_file_path
-                            data_date = prev_date_str
-                            logger.debug(f"Using previous trading day's ({prev_date_str}) PS/VS data for {segment}: {len(prev_data)} points")
-                    except (json.JSONDecodeError, IOError) as e:
-                        logger.warning(f"Previous day's file exists but couldn't read it: {e}")
+            for day in store.days(segment):
+                if day != today and store.count(segment, day) > 0:
+                    data_date = day
+                    break
         
-        if not file_path or not file_path.exists():
+        if data_date is None:
             return jsonify({
                 "success": True,
                 "data": [],
                 "message": f"No PS/VS data found for {segment}"
             })
         
-        # Load data
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # If using today's data, check if market is closed
-            # If market is closed, show full day's data; otherwise filter by hours (user preference)
-            # If using previous day's data, show all data (full trading day)
-            market_closed = False
-            if use_today:
-                # Check if market is closed - if so, show full day's data
-                from src.utils.date_utils import is_market_open, get_market_hours
-                market_closed = not is_market_open()
-                
-                if market_closed:
-                    # Market is closed - show full day's data
-                    filtered_data = data
-                    logger.debug(f"Market closed - showing full day's PS/VS data: {len(filtered_data)} points")
-                else:
-                    # Market is open - filter to last N hours (use IST to match timestamp format)
-                    cutoff_time = ist_now - timedelta(hours=num_hours)
-                    # Make cutoff_time timezone-naive for comparison if timestamps are naive
-                    if cutoff_time.tzinfo is not None:
-                        cutoff_time = cutoff_time.replace(tzinfo=None)
-                    
-                    filtered_data = []
-                    for d in data:
-                        try:
-                            d_timestamp = datetime.fromisoformat(d["timestamp"])
-                            # Make timezone-naive if needed for comparison
-                            if d_timestamp.tzinfo is not None:
-                                d_timestamp = d_timestamp.replace(tzinfo=None)
-                            if d_timestamp >= cutoff_time:
-                                filtered_data.append(d)
-                        except (ValueError, KeyError) as e:
-                            logger.warning(f"Skipping invalid data point in PS/VS file: {e}")
-                            continue
-                    
-                    logger.debug(f"Market open - filtered today's data to last {num_hours} hours: {len(filtered_data)} points")
-            else:
-                # For previous day's data, return all data (full trading day)
-                filtered_data = data
-                logger.debug(f"Returning full previous trading day data: {len(filtered_data)} points")
-            
-            # Determine if we're showing filtered or full data for response
-            hours_info = None if (not use_today or market_closed) else num_hours  # None means full day
-            
-            return jsonify({
-                "success": True,
-                "data": filtered_data,
-                "segment": segment,
-                "total_points": len(filtered_data),
-                "hours": hours_info,  # None = full day, number = filtered by hours
-                "date": today if use_today else data_date
-            })
-        except (json.JSONDecodeError, IOError) as e:
-            logger.error(f"Error reading PS/VS data file: {e}", exc_info=True)
-            return jsonify({
-                "success": False,
-                "error": f"Error reading PS/VS data file: {str(e)}"
-            }), 500
+        # During market hours only the last N hours of today are read; after market
+        # close (or for a previous day) the full day is returned
+        market_closed = False
+        if use_today:
+            market_closed = not is_market_open()
+        if use_today and not market_closed:
+            cutoff_time = (ist_now - timedelta(hours=num_hours)).replace(tzinfo=None)
+            filtered_data = store.query(segment, data_date, start=cutoff_time)
+            logger.debug(f"Market open - read today's data for the last {num_hours} hours: {len(filtered_data)} points")
+        else:
+            filtered_data = store.query(segment, data_date)
+            logger.debug(f"Returning full day PS/VS data for {data_date}: {len(filtered_data)} points")
+        
+        # Determine if we're showing filtered or full data for response
+        hours_info = None if (not use_today or market_closed) else num_hours  # None means full day
+        
+        return jsonify({
+            "success": True,
+            "data": filtered_data,
+            "segment": segment,
+            "total_points": len(filtered_data),
+            "hours": hours_info,  # None = full day, number = filtered by hours
+            "date": data_date
+        })
             
     except Exception as e:
         logger.error(f"Error fetching PS/VS data: {e}", exc_info=True)
@@ -7,6 +7,9 @@ let dailyFullUpdateInterval; // Interval for daily full update check
 let connectivityInterval; // Interval for connectivity checks
 let authStatusInterval; // Interval for auth status checks
 let userProfileInterval; // Interval for user profile updates
+let statusStream = null; // EventSource for /api/stream (server-pushed status)
+let statusStreamConnected = false;
+let tradesData = null; // Last /api/trades result ({trades, summary}), patched by stream events
 let pnlCalendarData = {};
 let pnlFilters = {
     segment: 'all',
@@ -382,6 +385,9 @@ function startUpdates() {
     // Initial update
     updateAll();
     
+    // Risk status and completed trades are pushed by the server; polling below is the fallback
+    startStatusStream();
+    
     // Set up intervals - REDUCED FREQUENCY to prevent "Too many requests"
     updateInterval = setInterval(() => {
         if (isAuthenticated) {
@@ -444,6 +450,8 @@ function startUpdates() {
 function stopUpdates() {
     console.log('[Updates] Stopping all updates');
     
+    stopStatusStream();
+    
     // Clear all intervals
     if (cumulativePnlInterval) {
         clearInterval(cumulativePnlInterval);
@@ -477,6 +485,52 @@ function stopUpdates() {
     // Note: We can't easily track all setInterval calls, but the main ones are cleared above
 }
 
+// Subscribe to the server's status stream (Server-Sent Events)
+function startStatusStream() {
+    if (statusStream || typeof EventSource === 'undefined') {
+        return;
+    }
+    statusStream = new EventSource('/api/stream?topics=risk,positions,trade');
+    statusStream.onopen = () => {
+        statusStreamConnected = true;
+        console.log('[Stream] Connected - status is pushed by the server');
+    };
+    statusStream.onerror = () => {
+        // EventSource reconnects by itself (sending Last-Event-ID); poll until it does
+        statusStreamConnected = false;
+    };
+    statusStream.addEventListener('risk', (event) => {
+        try {
+            renderStatus(JSON.parse(event.data));
+        } catch (error) {
+            console.error('[Stream] Bad risk event:', error);
+        }
+    });
+    statusStream.addEventListener('positions', (event) => {
+        try {
+            applyPositions(JSON.parse(event.data));
+        } catch (error) {
+            console.error('[Stream] Bad positions event:', error);
+        }
+    });
+    statusStream.addEventListener('trade', (event) => {
+        try {
+            applyTrade(JSON.parse(event.data));
+        } catch (error) {
+            console.error('[Stream] Bad trade event:', error);
+        }
+        updateCumulativePnl(false);
+    });
+}
+
+function stopStatusStream() {
+    if (statusStream) {
+        statusStream.close();
+        statusStream = null;
+    }
+    statusStreamConnected = false;
+}
+
 // Removed updatePositionsAndPnl and updateCurrentPnl - no longer needed
 // Daily Loss Used is updated via updateStatus() which is called in updateAll()
 
@@ -549,6 +603,9 @@ async function updateAll() {
     if (!isAuthenticated) {
         return; // Don't fetch if not authenticated
     }
+    if (statusStreamConnected) {
+        return; // Status, positions and completed trades are pushed by the server
+    }
     try {
         await Promise.all([
             updateStatus(),
@@ -1041,23 +1098,28 @@ async function updateStatus() {
             return;
         }
         
-        // Update Daily Loss Used widget (only widget remaining)
-        const lossProtection = data.loss_protection || {};
-        const dailyLoss = lossProtection.daily_loss || 0;
-        const lossLimit = lossProtection.daily_loss_limit || 5000;
-        updateValue('dailyLossUsed', formatCurrency(dailyLoss), 'loss-card');
-        document.getElementById('lossUsed').textContent = formatCurrency(dailyLoss);
-        document.getElementById('lossLimit').textContent = formatCurrency(lossLimit);
-        
-        // Update progress bar
-        const lossPercentage = Math.min((dailyLoss / lossLimit) * 100, 100);
-        document.getElementById('lossProgress').style.width = lossPercentage + '%';
+        renderStatus(data);
         
     } catch (error) {
         console.error('Error updating status:', error);
     }
 }
 
+// Render a status payload (from /api/status or a pushed 'risk' event)
+function renderStatus(data) {
+    // Update Daily Loss Used widget (only widget remaining)
+    const lossProtection = data.loss_protection || {};
+    const dailyLoss = lossProtection.daily_loss || 0;
+    const lossLimit = lossProtection.daily_loss_limit || 5000;
+    updateValue('dailyLossUsed', formatCurrency(dailyLoss), 'loss-card');
+    document.getElementById('lossUsed').textContent = formatCurrency(dailyLoss);
+    document.getElementById('lossLimit').textContent = formatCurrency(lossLimit);
+    
+    // Update progress bar
+    const lossPercentage = Math.min((dailyLoss / lossLimit) * 100, 100);
+    document.getElementById('lossProgress').style.width = lossPercentage + '%';
+}
+
 // Update P&L status indicator
 function updatePnlStatus(status, message) {
     // Log P&L status with timestamp for debugging
@@ -1176,65 +1238,14 @@ async function updateTrades() {
             return;
         }
         
-        const tbody = document.getElementById('tradesBody');
-        const trades = data.trades || data; // Support both new format (with summary) and old format
-        
-        if (trades.length === 0) {
-            tbody.innerHTML = '<tr><td colspan="8" class="empty-state">No trades found</td></tr>';
-            // Clear summary if no trades
-            updateTradeSummary({});
-            return;
-        }
-        
-        // Update summary if available
-        if (data.summary) {
-            updateTradeSummary(data.summary);
-        }
-        
-        // Check if we have any open positions to determine if we need to hide exit columns
-        const hasOpenPositions = trades.some(trade => trade.is_open === true);
-        
-        tbody.innerHTML = trades.map(trade => {
-            // Get transaction type (BUY or SELL) - use transaction_type from backend, fallback to quantity sign
-            const transactionType = trade.transaction_type || (trade.quantity > 0 ? 'BUY' : 'SELL');
-            const typeClass = transactionType === 'BUY' ? 'positive' : 'negative';
-            const buyTooltip = "BUY: Buy options (SL = entry_premium - stop_loss points)";
-            const sellTooltip = "SELL: Sell options (SL = entry_premium + stop_loss% of premium)";
-            const typeBadge = transactionType === 'BUY' 
-                ? `<span style="color: #10b981; font-weight: 600; font-size: 12px; cursor: help;" title="${buyTooltip}">BUY</span>` 
-                : `<span style="color: #ef4444; font-weight: 600; font-size: 12px; cursor: help;" title="${sellTooltip}">SELL</span>`;
-            
-            // Format times in IST
-            const entryTime = formatDateTimeIST(trade.entry_time);
-            const isOpen = trade.is_open === true;
-            const exitTime = isOpen ? '-' : formatDateTimeIST(trade.exit_time);
-            const exitPrice = isOpen ? '-' : `₹${(trade.exit_price || 0).toFixed(2)}`;
-            
-            // Display quantity with proper sign (negative for SELL, positive for BUY)
-            // For SELL trades, quantity should be negative (e.g., -150)
-            const quantity = trade.quantity || 0;
-            const quantityDisplay = quantity !== 0 ? (quantity > 0 ? `+${quantity}` : `${quantity}`) : '0';
-            
-            // For open positions, use unrealized P&L; for closed, use realized P&L
-            const pnl = trade.realized_pnl || 0;
-            
-            return `
-            <tr>
-                <td>${trade.trading_symbol || '-'}</td>
-                <td>${entryTime}</td>
-                <td>${exitTime}</td>
-                <td>₹${(trade.entry_price || 0).toFixed(2)}</td>
-                <td>${exitPrice}</td>
-                <td class="${typeClass}" style="font-weight: 600;">${quantityDisplay}</td>
-                <td class="${pnl >= 0 ? 'positive' : 'negative'}">
-                    ${formatCurrency(pnl)}
-                </td>
-                <td>${typeBadge}</td>
-            </tr>
-            `;
-        }).join('');
+        tradesData = {
+            trades: data.trades || data, // Support both new format (with summary) and old format
+            summary: data.summary
+        };
+        renderTrades();
     } catch (error) {
         console.error('Error updating trades:', error);
+        tradesData = null;
         const tbody = document.getElementById('tradesBody');
         if (tbody) {
             tbody.innerHTML = '<tr><td colspan="8" class="empty-state">Error loading trades</td></tr>';
@@ -1243,6 +1254,134 @@ async function updateTrades() {
     }
 }
 
+// Render the trades table and summary from tradesData
+function renderTrades() {
+    const tbody = document.getElementById('tradesBody');
+    const trades = tradesData.trades;
+    
+    if (trades.length === 0) {
+        tbody.innerHTML = '<tr><td colspan="8" class="empty-state">No trades found</td></tr>';
+        // Clear summary if no trades
+        updateTradeSummary({});
+        return;
+    }
+    
+    // Update summary if available
+    if (tradesData.summary) {
+        updateTradeSummary(tradesData.summary);
+    }
+    
+    tbody.innerHTML = trades.map(trade => {
+        // Get transaction type (BUY or SELL) - use transaction_type from backend, fallback to quantity sign
+        const transactionType = trade.transaction_type || (trade.quantity > 0 ? 'BUY' : 'SELL');
+        const typeClass = transactionType === 'BUY' ? 'positive' : 'negative';
+        const buyTooltip = "BUY: Buy options (SL = entry_premium - stop_loss points)";
+        const sellTooltip = "SELL: Sell options (SL = entry_premium + stop_loss% of premium)";
+        const typeBadge = transactionType === 'BUY' 
+            ? `<span style="color: #10b981; font-weight: 600; font-size: 12px; cursor: help;" title="${buyTooltip}">BUY</span>` 
+            : `<span style="color: #ef4444; font-weight: 600; font-size: 12px; cursor: help;" title="${sellTooltip}">SELL</span>`;
+        
+        // Format times in IST
+        const entryTime = formatDateTimeIST(trade.entry_time);
+        const isOpen = trade.is_open === true;
+        const exitTime = isOpen ? '-' : formatDateTimeIST(trade.exit_time);
+        const exitPrice = isOpen ? '-' : `₹${(trade.exit_price || 0).toFixed(2)}`;
+        
+        // Display quantity with proper sign (negative for SELL, positive for BUY)
+        // For SELL trades, quantity should be negative (e.g., -150)
+        const quantity = trade.quantity || 0;
+        const quantityDisplay = quantity !== 0 ? (quantity > 0 ? `+${quantity}` : `${quantity}`) : '0';
+        
+        // For open positions, use unrealized P&L; for closed, use realized P&L
+        const pnl = trade.realized_pnl || 0;
+        
+        return `
+        <tr>
+            <td>${trade.trading_symbol || '-'}</td>
+            <td>${entryTime}</td>
+            <td>${exitTime}</td>
+            <td>₹${(trade.entry_price || 0).toFixed(2)}</td>
+            <td>${exitPrice}</td>
+            <td class="${typeClass}" style="font-weight: 600;">${quantityDisplay}</td>
+            <td class="${pnl >= 0 ? 'positive' : 'negative'}">
+                ${formatCurrency(pnl)}
+            </td>
+            <td>${typeBadge}</td>
+        </tr>
+        `;
+    }).join('');
+}
+
+// Open positions are part of the trades table only when it lists today's (or all) trades
+function tradesTableShowsToday() {
+    const dateFilter = document.getElementById('tradeDateFilter');
+    return document.getElementById('showAllTrades').checked || !dateFilter || !dateFilter.value ||
+        dateFilter.value === new Date().toISOString().split('T')[0];
+}
+
+// Summary of the trades table, computed like /api/trades does
+function summarizeTrades(trades) {
+    const pnls = trades.map(trade => trade.realized_pnl || 0);
+    const totalProfit = pnls.filter(pnl => pnl > 0).reduce((sum, pnl) => sum + pnl, 0);
+    const totalLoss = pnls.filter(pnl => pnl < 0).reduce((sum, pnl) => sum - pnl, 0);
+    // Closed trades count as 2 (entry + exit), open positions as 1
+    const totalTrades = trades.reduce((count, trade) => count + (trade.is_open !== true && trade.entry_time && trade.exit_time ? 2 : 1), 0);
+    return {
+        total_trades: totalTrades,
+        profitable_trades: pnls.filter(pnl => pnl > 0).length,
+        loss_trades: pnls.filter(pnl => pnl < 0).length,
+        total_profit: totalProfit,
+        total_loss: totalLoss,
+        total_pnl: totalProfit - totalLoss,
+        win_rate: totalProfit > 0 ? (totalProfit - totalLoss) / totalProfit * 100 : 0
+    };
+}
+
+// Apply a pushed 'positions' event (active positions with their unrealized P&L) to the open trades
+function applyPositions(positions) {
+    if (!tradesData || !tradesTableShowsToday()) {
+        return;
+    }
+    // The trades table leaves out equity positions
+    const byId = new Map(positions
+        .filter(position => !['NSE', 'BSE'].includes((position.exchange || '').toUpperCase()))
+        .map(position => [`active_pos_${position.id}`, position]));
+    const openTrades = tradesData.trades.filter(trade => trade.is_open === true);
+    if (openTrades.length !== byId.size || openTrades.some(trade => !byId.has(trade.id))) {
+        updateTrades(); // A position was opened or closed: fetch the table again
+        return;
+    }
+    openTrades.forEach(trade => {
+        const position = byId.get(trade.id);
+        trade.quantity = position.quantity;
+        trade.realized_pnl = position.unrealized_pnl || 0;
+        trade.is_profit = trade.realized_pnl > 0;
+    });
+    tradesData.summary = summarizeTrades(tradesData.trades);
+    renderTrades();
+}
+
+// Apply a pushed 'trade' event (a position that closed) to the trades table
+function applyTrade(trade) {
+    if (!tradesData || !tradesTableShowsToday()) {
+        return;
+    }
+    const row = tradesData.trades.find(t => t.id === `active_pos_${trade.position_id}`);
+    if (!row) {
+        updateTrades();
+        return;
+    }
+    Object.assign(row, {
+        exit_time: trade.exit_time,
+        exit_price: trade.exit_price,
+        realized_pnl: trade.realized_pnl,
+        is_profit: trade.is_profit,
+        is_open: false
+    });
+    tradesData.summary = summarizeTrades(tradesData.trades);
+    renderTrades();
+}
+
 // Update trade summary
 function updateTradeSummary(summary) {
     if (!summary || Object.keys(summary).length === 0) {
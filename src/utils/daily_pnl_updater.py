@@ -76,39 +76,33 @@ class DailyPnlUpdater:
     
     def calculate_unrealized_pnl_from_csv(self, target_date: date) -> Dict[str, Any]:
         """
-        Calculate unrealized P&L from open positions CSV file.
+        Calculate unrealized P&L from the open positions journal (open_positions rows).
         
         Returns:
             Dict with total_unrealized_pnl and position details
         """
-        date_str = target_date.strftime("%Y-%m-%d")
-        csv_file = LOG_DIR / f"open_positions_{date_str}.csv"
+        from src.live_trader.position_journal import get_position_journal
+        journal = get_position_journal()
         
         total_unrealized = 0.0
         positions = []
         
-        # Also check previous day's file (positions carried over)
+        # Also check previous day's rows (positions carried over)
         prev_date = target_date - timedelta(days=1)
-        prev_csv = LOG_DIR / f"open_positions_{prev_date.strftime('%Y-%m-%d')}.csv"
-        
-        files_to_check = [csv_file, prev_csv] if prev_csv.exists() else [csv_file]
-        
-        for file_path in files_to_check:
-            if file_path.exists():
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        reader = csv.DictReader(f)
-                        for row in reader:
-                            if row.get('status', '').upper() == 'OPEN':
-                                pnl_value = float(row.get('current_pnl_value', 0) or 0)
-                                total_unrealized += pnl_value
-                                positions.append({
-                                    'symbol': row.get('option_symbol', 'N/A'),
-                                    'mode': row.get('mode', 'N/A'),
-                                    'pnl': pnl_value
-                                })
-                except Exception as e:
-                    logger.warning(f"Error reading open positions CSV {file_path.name}: {e}")
+        
+        for day in (target_date, prev_date):
+            try:
+                for row in journal.rows(day):
+                    if str(row.get('status', '')).upper() == 'OPEN':
+                        pnl_value = float(row.get('current_pnl_value', 0) or 0)
+                        total_unrealized += pnl_value
+                        positions.append({
+                            'symbol': row.get('option_symbol', 'N/A'),
+                            'mode': row.get('mode', 'N/A'),
+                            'pnl': pnl_value
+                        })
+            except Exception as e:
+                logger.warning(f"Error reading open positions for {day}: {e}")
         
         return {
             'total_unrealized_pnl': total_unrealized,
@@ -18,22 +18,9 @@ def get_market_hours() -> Tuple[time, time]:
         Defaults to 9:30 AM and 3:30 PM if not configured
     """
     try:
-        from src.config.config_manager import ConfigManager
-        import json
-        config_manager = ConfigManager()
-        config_path = config_manager.config_dir / "config.json"
-        if config_path.exists():
-            with open(config_path, 'r') as f:
-                config_data = json.load(f)
-                market_hours = config_data.get("market_hours", {})
-                open_time_str = market_hours.get("open_time", "09:30")
-                close_time_str = market_hours.get("close_time", "15:30")
-                
-                # Parse time string (format: "HH:MM")
-                open_hour, open_minute = map(int, open_time_str.split(":"))
-                close_hour, close_minute = map(int, close_time_str.split(":"))
-                
-                return time(open_hour, open_minute), time(close_hour, close_minute)
+        # Parsed once per config.json change, not on every call
+        from src.config.config_snapshot import get_config_snapshot
+        return get_config_snapshot().market_hours
     except Exception as e:
         from src.utils.logger import get_logger
         logger = get_logger("date_utils")
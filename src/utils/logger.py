@@ -2,14 +2,22 @@
 Comprehensive Logging System
 Supports structured logging with different log levels, file rotation, and audit logging
 All timestamps are displayed in IST (Indian Standard Time) regardless of server timezone
+
+Loggers do not write to their file/console handlers on the calling thread:
+records go through a bounded in-memory queue that one background listener
+drains (see LogQueuePipeline), so slow disk or console I/O cannot stall tick
+processing or order placement.
 """
 
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
+import threading
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional, Sequence
 import colorlog
 from pytz import timezone
 
@@ -41,16 +49,168 @@ class ISTColoredFormatter(colorlog.ColoredFormatter):
         return dt.strftime('%Y-%m-%d %H:%M:%S')
 
 
+# Queue policies when the log queue is full
+QUEUE_POLICY_DROP = "drop"    # drop records below WARNING right away, wait up to block_timeout for the rest
+QUEUE_POLICY_BLOCK = "block"  # wait up to block_timeout for every record (backpressure), then drop
+QUEUE_POLICIES = (QUEUE_POLICY_DROP, QUEUE_POLICY_BLOCK)
+
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_BLOCK_TIMEOUT = 1.0
+
+
+class LogQueuePipeline:
+    """
+    Bounded queue of log records drained by a single background listener.
+
+    Every logger created here has one _PipelineQueueHandler that enqueues
+    (target handlers, record); the listener thread hands each record to its
+    target handlers. Records that do not fit in the queue are dropped
+    according to the policy and counted in stats().
+    """
+
+    def __init__(self, max_size: int = DEFAULT_QUEUE_SIZE, policy: str = QUEUE_POLICY_DROP,
+                 block_timeout: float = DEFAULT_BLOCK_TIMEOUT):
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid = os.getpid()
+        self._queue: queue.Queue = queue.Queue(max_size)
+        self.configure(max_size, policy, block_timeout)
+        self.enqueued = 0
+        self.written = 0
+        self.dropped: Dict[str, int] = {}
+        self.max_depth = 0
+
+    def configure(self, max_size: Optional[int] = None, policy: Optional[str] = None,
+                  block_timeout: Optional[float] = None) -> None:
+        if policy is not None:
+            if policy not in QUEUE_POLICIES:
+                raise ValueError(f"Unknown log queue policy {policy!r}, expected one of {QUEUE_POLICIES}")
+            self.policy = policy
+        if max_size is not None:
+            with self._queue.mutex:
+                self._queue.maxsize = max_size
+        if block_timeout is not None:
+            self.block_timeout = block_timeout
+
+    def _ensure_listener(self) -> None:
+        if self._pid != os.getpid():
+            # Forked child (e.g. a backtest worker): the parent's listener thread does not exist here
+            self._pid = os.getpid()
+            self._queue = queue.Queue(self._queue.maxsize)
+            self._thread = None
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name="log-listener", daemon=True)
+                    self._thread.start()
+
+    def put(self, targets: Sequence[logging.Handler], record: logging.LogRecord) -> bool:
+        """Queue a record for its handlers; False if it was dropped"""
+        self._ensure_listener()
+        item = (targets, record)
+        try:
+            if self.policy == QUEUE_POLICY_DROP and record.levelno < logging.WARNING:
+                self._queue.put_nowait(item)
+            else:
+                self._queue.put(item, timeout=self.block_timeout)
+        except queue.Full:
+            level = record.levelname
+            self.dropped[level] = self.dropped.get(level, 0) + 1
+            return False
+        self.enqueued += 1
+        depth = self._queue.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+        return True
+
+    def _run(self) -> None:
+        q = self._queue
+        while True:
+            item = q.get()
+            try:
+                if item is None:
+                    return
+                targets, record = item
+                for handler in targets:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+                self.written += 1
+            except Exception:
+                # Never let a bad record kill the listener
+                pass
+            finally:
+                q.task_done()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued record has been written; False on timeout"""
+        if self._thread is None or self._pid != os.getpid():
+            return True
+        q = self._queue
+        with q.all_tasks_done:
+            return q.all_tasks_done.wait_for(lambda: q.unfinished_tasks == 0, timeout)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Write out the queue and stop the listener (it restarts on the next record)"""
+        thread = self._thread
+        if thread is None or not thread.is_alive() or self._pid != os.getpid():
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "policy": self.policy,
+            "queue_size": self._queue.maxsize,
+            "depth": self._queue.qsize(),
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": sum(self.dropped.values()),
+            "dropped_by_level": dict(self.dropped),
+        }
+
+
+class _PipelineQueueHandler(logging.handlers.QueueHandler):
+    """Enqueues records for the real handlers of one logger"""
+
+    def __init__(self, pipeline: LogQueuePipeline, targets: List[logging.Handler]):
+        super().__init__(None)
+        self.pipeline = pipeline
+        self.targets = tuple(targets)
+        self.setLevel(min(handler.level for handler in targets))
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self.pipeline.put(self.targets, record)
+
+
+_pipeline = LogQueuePipeline()
+atexit.register(_pipeline.stop)
+
+
+def get_log_pipeline() -> LogQueuePipeline:
+    """The process-wide log queue (for stats and tests)"""
+    return _pipeline
+
+
+def _attach_queued(logger: logging.Logger, handlers: List[logging.Handler]) -> None:
+    logger.addHandler(_PipelineQueueHandler(_pipeline, handlers))
+
+
 class Logger:
     """Centralized logging system"""
     
-    def __init__(self, log_dir: Optional[Path] = None, log_level: str = "INFO"):
+    def __init__(self, log_dir: Optional[Path] = None, log_level: str = "INFO",
+                 queue_size: Optional[int] = None, queue_policy: Optional[str] = None):
         if log_dir is None:
             log_dir = Path(__file__).parent.parent.parent / "logs"
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok=True)
         
         self.log_level = getattr(logging, log_level.upper(), logging.INFO)
+        _pipeline.configure(max_size=queue_size, policy=queue_policy)
         self._setup_loggers()
     
     def _setup_loggers(self):
@@ -104,7 +264,7 @@ class Logger:
         backup_count: int = 10,
         use_color: bool = True
     ) -> logging.Logger:
-        """Create a logger with file rotation and console output"""
+        """Create a logger with file rotation and console output (written by the log listener)"""
         logger = logging.getLogger(name)
         logger.setLevel(self.log_level)
         
@@ -127,7 +287,6 @@ class Logger:
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
         
         # Console handler with colors
         console_handler = logging.StreamHandler()
@@ -152,7 +311,7 @@ class Logger:
             )
         
         console_handler.setFormatter(console_formatter)
-        logger.addHandler(console_handler)
+        _attach_queued(logger, [file_handler, console_handler])
         
         return logger
     
@@ -191,10 +350,11 @@ def get_logger(name: str = "app") -> logging.Logger:
     return _logger_instance.get_logger(name)
 
 
-def initialize_logger(log_dir: Optional[Path] = None, log_level: str = "INFO"):
-    """Initialize the global logger"""
+def initialize_logger(log_dir: Optional[Path] = None, log_level: str = "INFO",
+                      queue_size: Optional[int] = None, queue_policy: Optional[str] = None):
+    """Initialize the global logger (queue_policy: "drop" or "block" when the log queue is full)"""
     global _logger_instance
-    _logger_instance = Logger(log_dir, log_level)
+    _logger_instance = Logger(log_dir, log_level, queue_size, queue_policy)
 
 
 def get_segment_logger(segment: str, mode: str, log_dir: Optional[Path] = None) -> logging.Logger:
@@ -247,26 +407,22 @@ def get_segment_logger(segment: str, mode: str, log_dir: Optional[Path] = None)
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
     
     # Console handler (optional - can be disabled if too verbose)
-    # Only add console handler if not already present
-    has_console = any(isinstance(h, logging.StreamHandler) for h in logger.handlers)
-    if not has_console:
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        console_formatter = ISTColoredFormatter(
-            '%(log_color)s[%(asctime)s] %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S',
-            log_colors={
-                'DEBUG': 'cyan',
-                'INFO': 'green',
-                'WARNING': 'yellow',
-                'ERROR': 'red',
-                'CRITICAL': 'red,bg_white',
-            }
-        )
-        console_handler.setFormatter(console_formatter)
-        logger.addHandler(console_handler)
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    console_formatter = ISTColoredFormatter(
+        '%(log_color)s[%(asctime)s] %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S',
+        log_colors={
+            'DEBUG': 'cyan',
+            'INFO': 'green',
+            'WARNING': 'yellow',
+            'ERROR': 'red',
+            'CRITICAL': 'red,bg_white',
+        }
+    )
+    console_handler.setFormatter(console_formatter)
+    _attach_queued(logger, [file_handler, console_handler])
     
     return logger
@@ -3,11 +3,14 @@ Utility module for fetching option premiums from Kite API
 Uses the same format and logic as get_premium_by_symbol.py
 """
 
-from typing import Optional, Tuple, Dict, List
+from bisect import bisect_left
+from typing import Optional, Tuple, Dict, List, Sequence
 from datetime import datetime, timedelta, date
 import calendar
 import pandas as pd
 from src.utils.logger import get_logger
+from src.api.instrument_store import get_instrument_store
+from src.utils.date_utils import IST
 
 logger = get_logger("premium_fetcher")
 
@@ -312,11 +315,8 @@ def fetch_premium_by_tradingsymbol(
             logger.debug("Kite client not authenticated")
             return None
         
-        # Get all NFO instruments
-        instruments = kite_client.kite.instruments(exchange)
-        
-        # Find the instrument by tradingsymbol
-        instrument = find_instrument_by_tradingsymbol(tradingsymbol, instruments, exchange)
+        # Find the instrument by tradingsymbol (shared, indexed instrument dump)
+        instrument = get_instrument_store().get_index(kite_client, exchange).by_tradingsymbol(tradingsymbol)
         
         if not instrument:
             logger.debug(f"Trading symbol '{tradingsymbol}' not found in {exchange} exchange")
@@ -449,3 +449,92 @@ def fetch_premium_by_params(
         interval
     )
 
+
+class PremiumSeries:
+    """
+    One option contract's candle closes for a day, sorted by time
+    
+    Looking up a premium is a binary search for the candle closest to the
+    timestamp (the earlier one on a tie), so a backtest fetches the series
+    once per contract and day instead of one small window per lookup.
+    """
+    
+    def __init__(self, times: Sequence[float], closes: Sequence[float]):
+        self.times = list(times)  # Candle start, epoch seconds
+        self.closes = list(closes)
+    
+    @classmethod
+    def from_candles(cls, candles: List[Dict]) -> "PremiumSeries":
+        """Build from Kite historical_data candles (naive dates are IST)"""
+        points = sorted(
+            (_epoch_seconds(candle['date']), float(candle['close']))
+            for candle in candles
+            if candle.get('date') is not None and candle.get('close') is not None
+        )
+        return cls([t for t, _ in points], [close for _, close in points])
+    
+    def __len__(self) -> int:
+        return len(self.times)
+    
+    def premium_at(self, timestamp: datetime, max_gap: timedelta = timedelta(minutes=10)) -> Optional[float]:
+        """Close of the candle closest to timestamp, or None if none is within max_gap"""
+        if not self.times:
+            return None
+        target = _epoch_seconds(timestamp)
+        i = bisect_left(self.times, target)
+        # Candidates: the last candle before target and the first at/after it
+        best = None
+        for j in (i - 1, i):
+            if 0 <= j < len(self.times):
+                if best is None or abs(self.times[j] - target) < abs(self.times[best] - target):
+                    best = j
+        if abs(self.times[best] - target) > max_gap.total_seconds():
+            return None
+        return self.closes[best]
+
+
+def _epoch_seconds(value) -> float:
+    """Epoch seconds of a datetime/pandas timestamp, treating naive values as IST"""
+    if isinstance(value, str):
+        value = pd.Timestamp(value).to_pydatetime()
+    elif isinstance(value, pd.Timestamp):
+        value = value.to_pydatetime()
+    if value.tzinfo is None:
+        value = IST.localize(value)
+    return value.timestamp()
+
+
+def fetch_premium_series(
+    kite_client,
+    instrument_token: int,
+    day: date,
+    interval: str = "5minute"
+) -> Optional[PremiumSeries]:
+    """
+    Fetch an option's candles for a whole trading day in one historical_data call
+    
+    Args:
+        kite_client: Authenticated KiteClient instance
+        instrument_token: Option instrument token
+        day: Trading day (IST)
+        interval: Kite interval string (default: "5minute")
+        
+    Returns:
+        PremiumSeries (empty if Kite has no candles for the day), or None on error
+    """
+    try:
+        # Kite API expects timezone-naive datetimes
+        from_date = datetime(day.year, day.month, day.day)
+        to_date = from_date + timedelta(days=1) - timedelta(seconds=1)
+        candles = kite_client.kite.historical_data(
+            instrument_token,
+            from_date,
+            to_date,
+            interval,
+            continuous=False,
+            oi=False
+        )
+        return PremiumSeries.from_candles(candles or [])
+    except Exception as e:
+        logger.debug(f"Error fetching premium series for {instrument_token} on {day}: {e}")
+        return None
@@ -41,9 +41,10 @@ def diagnose_signals_for_date(
         "data_quality_issues": []
     }
     
-    # Calculate indicators
-    price_strength = strategy.calculate_price_strength(df)
-    volume_strength = strategy.calculate_volume_strength(df)
+    # Calculate indicators (RSI once, shared by PS and vectorized VS)
+    rsi_series = strategy.calculate_rsi(df['close'], period=strategy.rsi_period)
+    price_strength = strategy.calculate_price_strength(df, rsi_series=rsi_series)
+    volume_strength = strategy.calculate_volume_strength(df, rsi_series=rsi_series)
     
     # Check data quality
     if df['volume'].isna().any():
@@ -0,0 +1,196 @@
+"""
+Status Stream
+In-process broadcaster of dashboard updates (risk state, position P&L, trades,
+PS/VS points, live trader status), served to browsers as Server-Sent Events
+"""
+
+import json
+import threading
+from collections import deque
+from itertools import islice
+from typing import Any, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from src.utils.logger import get_logger
+
+logger = get_logger("app")
+
+# Events kept for clients that reconnect with Last-Event-ID
+BUFFER_SIZE = 2000
+# Seconds between keep-alive comments on an idle connection
+HEARTBEAT_SECONDS = 15.0
+# Milliseconds the browser waits before reconnecting
+RETRY_MILLISECONDS = 3000
+
+
+class StatusEvent(NamedTuple):
+    """One published update; payload is its data serialized to JSON once"""
+    id: int
+    type: str
+    key: str
+    broker_id: Optional[str]
+    payload: str
+
+
+class StatusBroadcaster:
+    """
+    Fan-out of status updates to any number of SSE clients.
+
+    Publishers (RiskMonitor, the live agents, the PS/VS store) call publish();
+    each event is serialized once and appended to a bounded buffer that every
+    connected client reads from, so more browser tabs add no database or Kite
+    load. State topics (state=True, e.g. "risk") keep their latest value per
+    key, are skipped when the value did not change, and make up the snapshot a
+    new client starts from; other events (trades, PS/VS points) are only
+    delivered to clients connected at the time, or reconnecting within the buffer.
+    """
+
+    def __init__(self, buffer_size: int = BUFFER_SIZE):
+        self._events: Deque[StatusEvent] = deque(maxlen=buffer_size)
+        self._latest: Dict[Tuple[str, str, Optional[str]], StatusEvent] = {}
+        self._last_id = 0
+        self._cond = threading.Condition()
+        self.published = 0
+        self.unchanged = 0
+
+    @property
+    def last_id(self) -> int:
+        with self._cond:
+            return self._last_id
+
+    def publish(
+        self,
+        event_type: str,
+        data: Any,
+        key: str = "",
+        broker_id: Optional[str] = None,
+        state: bool = False
+    ) -> Optional[int]:
+        """
+        Publish an update; returns its event id, or None if a state topic did not change.
+
+        broker_id limits the event to that broker's dashboards (None: everyone).
+        """
+        payload = json.dumps(data, default=str, sort_keys=True)
+        topic = (event_type, key, broker_id)
+        with self._cond:
+            if state:
+                latest = self._latest.get(topic)
+                if latest is not None and latest.payload == payload:
+                    self.unchanged += 1
+                    return None
+            self._last_id += 1
+            event = StatusEvent(self._last_id, event_type, key, broker_id, payload)
+            self._events.append(event)
+            if state:
+                self._latest[topic] = event
+            self.published += 1
+            self._cond.notify_all()
+            return event.id
+
+    def snapshot(self) -> List[StatusEvent]:
+        """Latest event of every state topic, oldest first"""
+        with self._cond:
+            return sorted(self._latest.values(), key=lambda event: event.id)
+
+    def events_after(self, last_id: int, timeout: float) -> Optional[List[StatusEvent]]:
+        """
+        Events newer than last_id, waiting up to timeout seconds for the first one.
+
+        Returns [] on timeout and None if events after last_id have already left
+        the buffer (the client has to start over from snapshot()).
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._last_id > last_id, timeout):
+                return []
+            oldest = self._events[0].id
+            if last_id + 1 < oldest:
+                return None
+            return list(islice(self._events, last_id + 1 - oldest, None))
+
+    def stream(
+        self,
+        broker_id: Optional[str] = None,
+        last_event_id: Optional[int] = None,
+        topics: Optional[Iterable[str]] = None,
+        heartbeat: float = HEARTBEAT_SECONDS
+    ) -> Iterator[str]:
+        """
+        SSE text for one client: the snapshot (or the events missed since
+        last_event_id), then every new event as it is published.
+        """
+        topics = set(topics) if topics else None
+
+        def visible(event: StatusEvent) -> bool:
+            return ((event.broker_id is None or event.broker_id == broker_id)
+                    and (topics is None or event.type in topics))
+
+        yield f"retry: {RETRY_MILLISECONDS}\n\n"
+        missed = None
+        if last_event_id is not None and last_event_id <= self.last_id:
+            missed = self.events_after(last_event_id, timeout=0)
+        if missed is None:
+            # New client, or it was away too long: current state first
+            cursor = self.last_id
+            missed = [event for event in self.snapshot() if event.id <= cursor]
+        else:
+            cursor = missed[-1].id if missed else last_event_id
+        for event in missed:
+            if visible(event):
+                yield format_sse(event)
+
+        while True:
+            events = self.events_after(cursor, heartbeat)
+            if events is None:
+                # Fell behind the buffer: resend the current state
+                cursor = self.last_id
+                events = [event for event in self.snapshot() if event.id <= cursor]
+            elif events:
+                cursor = events[-1].id
+            else:
+                yield ": keep-alive\n\n"
+                continue
+            for event in events:
+                if visible(event):
+                    yield format_sse(event)
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "last_id": self._last_id,
+                "buffered": len(self._events),
+                "state_topics": len(self._latest),
+                "published": self.published,
+                "unchanged": self.unchanged,
+            }
+
+
+def format_sse(event: StatusEvent) -> str:
+    """Server-Sent Events frame of one event"""
+    return f"id: {event.id}\nevent: {event.type}\ndata: {event.payload}\n\n"
+
+
+_broadcaster: Optional[StatusBroadcaster] = None
+_broadcaster_lock = threading.Lock()
+
+
+def get_status_broadcaster() -> StatusBroadcaster:
+    """Process-wide status broadcaster"""
+    global _broadcaster
+    with _broadcaster_lock:
+        if _broadcaster is None:
+            _broadcaster = StatusBroadcaster()
+        return _broadcaster
+
+
+def publish_status(
+    event_type: str,
+    data: Any,
+    key: str = "",
+    broker_id: Optional[str] = None,
+    state: bool = False
+) -> Optional[int]:
+    """Publish to the process-wide broadcaster; never raises into the publisher"""
+    try:
+        return get_status_broadcaster().publish(event_type, data, key, broker_id, state)
+    except Exception as e:
+        logger.debug(f"Could not publish {event_type} status event: {e}")
+        return None
@@ -0,0 +1,31 @@
+"""
+Synthetic market data shared by the backtesting tests
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class SyntheticFetcher:
+    """Deterministic 5-minute candles for every weekday in the requested range, except holidays"""
+
+    kite_client = None
+
+    def __init__(self, holidays=()):
+        self.holidays = set(holidays)
+        self.calls = []
+
+    def fetch_segment_data(self, segment, from_date, to_date, interval="5minute", expiry=None):
+        self.calls.append((segment, interval))
+        index = []
+        for day in pd.bdate_range(from_date.date(), to_date.date()):
+            if day.date() in self.holidays:
+                continue
+            index.extend(pd.date_range(day + pd.Timedelta(hours=9, minutes=15), day + pd.Timedelta(hours=15, minutes=25), freq="5min"))
+        index = pd.DatetimeIndex(index)
+        rng = np.random.default_rng(42)
+        close = 24000 + np.cumsum(rng.normal(0, 15, len(index)))
+        open_ = close + rng.normal(0, 5, len(index))
+        high = np.maximum(open_, close) + abs(rng.normal(0, 5, len(index)))
+        low = np.minimum(open_, close) - abs(rng.normal(0, 5, len(index)))
+        return pd.DataFrame({"open": open_, "high": high, "low": low, "close": close, "volume": 0.0}, index=index)
@@ -0,0 +1,106 @@
+"""
+Test the per-cycle broker snapshot shared by the risk components
+"""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import Mock
+from src.risk_management.broker_snapshot import BrokerSnapshot
+from src.risk_management.profit_protection import ProfitProtection
+from src.risk_management.loss_protection import DailyLossProtection
+from src.risk_management.trailing_stop_loss import TrailingStopLoss
+from src.risk_management.quantity_manager import QuantityManager
+from src.api.position_sync import PositionSync
+from src.database.repository import (
+    PositionRepository, TradeRepository, DailyStatsRepository
+)
+from src.api.kite_client import KiteClient
+
+
+def _position(token, symbol, quantity=50, pnl=-100.0):
+    return SimpleNamespace(
+        id=int(token), instrument_token=token, trading_symbol=symbol, exchange="NFO",
+        quantity=quantity, entry_price=100.0, current_price=98.0, lot_size=1, unrealized_pnl=pnl
+    )
+
+
+@pytest.fixture
+def kite_client():
+    client = Mock(spec=KiteClient)
+    client.is_authenticated.return_value = True
+    client.get_positions.return_value = [
+        {"exchange": "NFO", "tradingsymbol": "NIFTYCE", "instrument_token": 1, "quantity": 50}
+    ]
+    client.get_orders.return_value = []
+    return client
+
+
+@pytest.fixture
+def repos():
+    position_repo = Mock(spec=PositionRepository)
+    position_repo.get_active_positions.return_value = [_position("1", "NIFTYCE"), _position("2", "NIFTYPE")]
+    trade_repo = Mock(spec=TradeRepository)
+    trade_repo.get_protected_profit.return_value = 1000.0
+    return position_repo, trade_repo, Mock(spec=DailyStatsRepository)
+
+
+def test_capture_fetches_positions_once(kite_client, repos):
+    """Positions come from one get_positions call; orders are fetched on first use only"""
+    position_repo, trade_repo, _ = repos
+    snapshot = BrokerSnapshot.capture(kite_client, position_repo, trade_repo)
+    assert snapshot.has_positions
+    snapshot.orders()
+    snapshot.orders()
+    assert kite_client.get_positions.call_count == 1
+    assert kite_client.get_orders.call_count == 1
+    assert snapshot.api_calls == 2
+
+    idle = BrokerSnapshot.capture(kite_client, position_repo, trade_repo, fetch_positions=False)
+    assert not idle.has_positions
+    assert kite_client.get_positions.call_count == 1
+
+
+def test_position_sync_uses_snapshot(kite_client, repos):
+    """Sync reads positions and the order book from the snapshot, once per cycle"""
+    position_repo, trade_repo, _ = repos
+    session = Mock()
+    session.merge.side_effect = lambda position: position
+    position_repo.db_manager = Mock()
+    position_repo.db_manager.get_session.return_value = session
+    position_repo.create_or_update_position.return_value = _position("1", "NIFTYCE")
+    kite_client.get_positions.return_value = []  # both positions closed at the broker
+
+    snapshot = BrokerSnapshot.capture(kite_client, position_repo, trade_repo)
+    PositionSync(kite_client, position_repo).sync_positions_from_api(snapshot)
+
+    assert session.commit.call_count == 2
+    assert kite_client.get_positions.call_count == 1
+    assert kite_client.get_orders.call_count == 1
+    # Once for the sync, once to reload the position book afterwards
+    assert position_repo.get_active_positions.call_count == 2
+
+
+def test_risk_components_share_reads(kite_client, repos, mock_config_manager):
+    """Loss, trailing SL, quantity and profit protection read positions and protected profit once"""
+    position_repo, trade_repo, daily_stats_repo = repos
+    profit_protection = ProfitProtection(position_repo, trade_repo, daily_stats_repo, kite_client)
+    loss_protection = DailyLossProtection(mock_config_manager, kite_client, position_repo, daily_stats_repo, trade_repo)
+    trailing_sl = TrailingStopLoss(mock_config_manager, kite_client, position_repo, daily_stats_repo, trade_repo)
+    quantity_manager = QuantityManager(position_repo, trade_repo)
+    position_repo.get_active_positions.reset_mock()
+
+    snapshot = BrokerSnapshot.capture(kite_client, position_repo, trade_repo, fetch_positions=False)
+    assert profit_protection.detect_and_process_trade_completions(snapshot) == []
+    quantity_manager.detect_quantity_changes(snapshot)
+    protected_profit = profit_protection.get_protected_profit(snapshot=snapshot)
+    assert loss_protection.check_loss_limit(protected_profit, snapshot)["daily_loss"] == 200.0
+    assert trailing_sl.check_and_update_trailing_sl(snapshot)["total_profit"] == 800.0
+    assert profit_protection.get_total_daily_pnl(snapshot)["total_pnl"] == 800.0
+
+    assert position_repo.get_active_positions.call_count == 1
+    assert trade_repo.get_protected_profit.call_count == 1
+    kite_client.get_positions.assert_not_called()
+
+    snapshot.invalidate()
+    loss_protection.calculate_daily_loss(snapshot=snapshot)
+    assert position_repo.get_active_positions.call_count == 2
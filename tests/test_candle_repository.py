@@ -0,0 +1,124 @@
+"""
+Tests for CandleRepository bulk upsert and the candles unique-index migration
+"""
+
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from src.database.models import DatabaseManager
+from src.database.repository import CandleRepository
+
+
+def _candle(minute, close, is_synthetic=False, segment="nifty"):
+    return {
+        "segment": segment,
+        "timestamp": datetime(2024, 1, 1, 9, 15) + timedelta(minutes=minute),
+        "interval": "5minute",
+        "open": close,
+        "high": close + 1,
+        "low": close - 1,
+        "close": close,
+        "volume": 0.0,
+        "is_synthetic": is_synthetic,
+    }
+
+
+class TestCandleUpsert(unittest.TestCase):
+    """save_candles_batch / save_candle upsert semantics"""
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.db_manager = DatabaseManager(str(self.tmp_dir / "candles.db"))
+        self.repo = CandleRepository(self.db_manager)
+
+    def tearDown(self):
+        self.db_manager.engine.dispose()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _closes(self):
+        candles = self.repo.get_candles("NIFTY", datetime(2024, 1, 1), datetime(2024, 1, 2), "5minute")
+        return [(c.close, c.is_synthetic) for c in candles]
+
+    def test_insert_then_update(self):
+        self.assertEqual(self.repo.save_candles_batch([_candle(0, 100.0), _candle(5, 101.0)]), 2)
+        self.assertEqual(self.repo.save_candles_batch([_candle(5, 105.0), _candle(10, 110.0)]), 2)
+        self.assertEqual(self._closes(), [(100.0, False), (105.0, False), (110.0, False)])
+        self.assertEqual(self.repo.save_candles_batch([]), 0)
+
+    def test_synthetic_does_not_replace_real(self):
+        self.repo.save_candles_batch([_candle(0, 100.0)])
+        self.repo.save_candles_batch([_candle(0, 99.0, is_synthetic=True)])
+        self.repo.save_candle("NIFTY", _candle(0, 0)["timestamp"], "5minute", 98.0, 98.0, 98.0, 98.0, is_synthetic=True)
+        self.assertEqual(self._closes(), [(100.0, False)])
+
+    def test_real_and_synthetic_replace_synthetic(self):
+        self.repo.save_candles_batch([_candle(0, 99.0, is_synthetic=True)])
+        self.repo.save_candles_batch([_candle(0, 98.0, is_synthetic=True)])
+        self.assertEqual(self._closes(), [(98.0, True)])
+        candle = self.repo.save_candle("NIFTY", _candle(0, 0)["timestamp"], "5minute", 100.0, 101.0, 99.0, 100.0)
+        self.assertEqual((candle.close, candle.is_synthetic), (100.0, False))
+        self.assertEqual(self._closes(), [(100.0, False)])
+
+    def test_duplicates_within_batch(self):
+        self.repo.save_candles_batch([_candle(0, 100.0), _candle(0, 99.0, is_synthetic=True), _candle(0, 101.0)])
+        self.assertEqual(self._closes(), [(101.0, False)])
+
+
+class TestCandleIndexMigration(unittest.TestCase):
+    """Existing databases with the non-unique index are deduplicated and migrated"""
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.db_path = str(self.tmp_dir / "legacy.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_migration_keeps_real_candle(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("""
+            CREATE TABLE candles (
+                id INTEGER PRIMARY KEY, segment VARCHAR NOT NULL, timestamp DATETIME NOT NULL,
+                interval VARCHAR NOT NULL, open FLOAT NOT NULL, high FLOAT NOT NULL, low FLOAT NOT NULL,
+                close FLOAT NOT NULL, volume FLOAT, is_synthetic BOOLEAN, created_at DATETIME, updated_at DATETIME
+            )
+        """)
+        conn.execute("CREATE INDEX idx_candle_segment_timestamp ON candles(segment, timestamp, interval)")
+        rows = [
+            ("NIFTY", "2024-01-01 09:15:00.000000", "5minute", 100.0, 0),
+            ("NIFTY", "2024-01-01 09:15:00.000000", "5minute", 99.0, 1),
+            ("NIFTY", "2024-01-01 09:20:00.000000", "5minute", 101.0, 1),
+            ("NIFTY", "2024-01-01 09:20:00.000000", "5minute", 102.0, 1),
+        ]
+        conn.executemany(
+            "INSERT INTO candles (segment, timestamp, interval, open, high, low, close, volume, is_synthetic) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, 0, ?)",
+            [(s, t, i, c, c, c, c, syn) for s, t, i, c, syn in rows]
+        )
+        conn.commit()
+        conn.close()
+
+        db_manager = DatabaseManager(self.db_path)
+        try:
+            repo = CandleRepository(db_manager)
+            candles = repo.get_candles("NIFTY", datetime(2024, 1, 1), datetime(2024, 1, 2), "5minute")
+            # Real candle kept over the synthetic one; newest of two synthetic ones kept
+            self.assertEqual([c.close for c in candles], [100.0, 102.0])
+            self.assertEqual(repo.save_candles_batch([_candle(5, 103.0)]), 1)
+        finally:
+            db_manager.engine.dispose()
+
+        conn = sqlite3.connect(self.db_path)
+        unique = conn.execute(
+            "SELECT \"unique\" FROM pragma_index_list('candles') WHERE name='idx_candle_segment_timestamp'"
+        ).fetchone()[0]
+        conn.close()
+        self.assertEqual(unique, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+"""
+Tests for the candles-table backtest data source
+"""
+
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+import numpy as np
+
+from src.backtesting.backtest_engine import BacktestEngine
+from src.backtesting.candle_source import CandleDataSource, CandleGap, create_data_fetcher
+from src.backtesting.data_fetcher import HistoricalDataFetcher
+from src.backtesting.ohlcv_cache import OhlcvCache
+from src.database.models import DatabaseManager
+from src.database.repository import CandleRepository
+from src.utils.date_utils import IST
+from tests.synthetic_data import SyntheticFetcher
+
+NOW = IST.localize(datetime(2024, 1, 20, 12, 0))
+
+
+def _rows(df, segment="NIFTY", interval="5minute"):
+    return [
+        {"segment": segment, "timestamp": ts.to_pydatetime(), "interval": interval, "open": row.open,
+         "high": row.high, "low": row.low, "close": row.close, "volume": row.volume}
+        for ts, row in zip(df.index, df.itertuples())
+    ]
+
+
+class TestCandleDataSource(unittest.TestCase):
+    """Reads, gap detection, backfill and an offline backtest on stored candles"""
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.db_manager = DatabaseManager(str(self.tmp_dir / "candles.db"))
+        self.repo = CandleRepository(self.db_manager)
+        self.market = SyntheticFetcher()
+        self.clock = patch("src.backtesting.candle_source.get_current_ist_time", return_value=NOW)
+        self.clock.start()
+
+    def tearDown(self):
+        self.clock.stop()
+        self.db_manager.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _store(self, from_date, to_date, drop=()):
+        df = self.market.fetch_segment_data("NIFTY", from_date, to_date)
+        df = df.drop(index=[df.index[i] for i in drop])
+        self.repo.save_candles_batch(_rows(df))
+        return df
+
+    def test_candle_arrays(self):
+        df = self._store(datetime(2024, 1, 1), datetime(2024, 1, 2))
+        arrays = self.repo.get_candle_arrays("nifty", datetime(2024, 1, 2), datetime(2024, 1, 2, 23, 59), "5minute")
+        self.assertEqual(len(arrays["timestamp"]), 75)
+        self.assertEqual(arrays["timestamp"].dtype, np.dtype("datetime64[ns]"))
+        np.testing.assert_array_equal(arrays["close"], df["close"].to_numpy()[75:])
+        self.assertEqual(len(self.repo.get_candle_arrays("NIFTY", datetime(2024, 2, 1), datetime(2024, 2, 2), "5minute")["close"]), 0)
+
+    def test_gaps(self):
+        self._store(datetime(2024, 1, 1), datetime(2024, 1, 3), drop=(10, 11, 12, 80))
+        source = CandleDataSource(self.repo)
+        df = source.fetch_segment_data("NIFTY", datetime(2024, 1, 1), datetime(2024, 1, 4))
+        self.assertEqual(len(df), 3 * 75 - 4)
+        self.assertIsNone(df.index.tz)
+        self.assertEqual(source.last_gaps, [
+            CandleGap(datetime(2024, 1, 1, 10, 5), datetime(2024, 1, 1, 10, 15), 3),
+            CandleGap(datetime(2024, 1, 2, 9, 40), datetime(2024, 1, 2, 9, 40), 1),
+            CandleGap(datetime(2024, 1, 4, 9, 15), datetime(2024, 1, 4, 15, 25), 75),
+        ])
+        # Today only counts completed candles
+        gaps = source.find_gaps("NIFTY", datetime(2024, 1, 19), datetime(2024, 1, 20), "5minute")
+        self.assertEqual(gaps, [CandleGap(datetime(2024, 1, 19, 9, 15), datetime(2024, 1, 19, 15, 25), 75)])
+
+    def test_backfill_only_adds_missing_candles(self):
+        stored = self._store(datetime(2024, 1, 1), datetime(2024, 1, 1), drop=(10, 11))
+        self.repo.save_candle("NIFTY", stored.index[0].to_pydatetime(), "5minute", 1.0, 1.0, 1.0, 1.0)
+        source = CandleDataSource(self.repo, fallback=self.market, backfill=True)
+
+        df = source.fetch_segment_data("NIFTY", datetime(2024, 1, 1), datetime(2024, 1, 2))
+        self.assertEqual(source.candles_backfilled, 2 + 75)
+        self.assertEqual(source.last_gaps, [])
+        self.assertEqual(df["close"].iloc[0], 1.0)  # The agent's candle is kept
+        self.assertEqual(len(df), 150)
+
+    def test_holiday_is_not_a_gap(self):
+        holiday = datetime(2024, 1, 3).date()
+        self._store(datetime(2024, 1, 1), datetime(2024, 1, 5), drop=range(150, 225))
+        source = CandleDataSource(self.repo, fallback=SyntheticFetcher(holidays=[holiday]), backfill=True)
+        source.fetch_segment_data("NIFTY", datetime(2024, 1, 1), datetime(2024, 1, 5))
+        self.assertEqual(source.last_gaps, [])
+        self.assertEqual(source.candles_backfilled, 0)
+        self.assertEqual(len(source.fallback.calls), 1)  # 2nd to 4th in one call
+
+        # Remembered: not downloaded again
+        source.fetch_segment_data("NIFTY", datetime(2024, 1, 1), datetime(2024, 1, 5))
+        self.assertEqual(len(source.fallback.calls), 1)
+
+    def test_holiday_from_ohlcv_cache(self):
+        self._store(datetime(2024, 1, 1), datetime(2024, 1, 2))
+        ohlcv_cache = OhlcvCache(self.tmp_dir / "ohlcv")
+        empty = pd.DataFrame({col: [] for col in ("open", "high", "low", "close", "volume")}, index=pd.DatetimeIndex([]))
+        ohlcv_cache.save_day("yahoo", "NIFTY", "5minute", datetime(2024, 1, 3).date(), empty)
+        source = CandleDataSource(self.repo, ohlcv_cache=ohlcv_cache)
+        gaps = source.find_gaps("NIFTY", datetime(2024, 1, 1), datetime(2024, 1, 4), "5minute")
+        self.assertEqual([gap.start.date() for gap in gaps], [datetime(2024, 1, 4).date()])
+
+    def test_backfill_without_data_is_logged(self):
+        self._store(datetime(2024, 1, 1), datetime(2024, 1, 1))
+        source = CandleDataSource(self.repo, fallback=SyntheticFetcher(holidays=[datetime(2024, 1, d).date() for d in range(1, 6)]),
+                                  backfill=True)
+        with patch("src.backtesting.candle_source.logger") as logger:
+            source.fetch_segment_data("NIFTY", datetime(2024, 1, 1), datetime(2024, 1, 2))
+        self.assertIn("returned no data", logger.warning.call_args_list[0].args[0])
+        self.assertEqual(len(source.last_gaps), 1)  # Not known to be closed
+
+    def test_backtest_on_stored_candles_matches_market_data(self):
+        from_date, to_date = datetime(2024, 1, 4), datetime(2024, 1, 10)
+        self._store(datetime(2024, 1, 1), to_date)
+
+        expected = BacktestEngine(SyntheticFetcher())
+        expected._kite_authenticated = False
+        offline = BacktestEngine(CandleDataSource(self.repo))
+        self.assertIsNone(offline.data_fetcher.kite_client)
+        offline._kite_authenticated = False
+        self.assertEqual(
+            offline.run_backtest("NIFTY", from_date, to_date).to_dict(),
+            expected.run_backtest("NIFTY", from_date, to_date).to_dict()
+        )
+
+    def test_create_data_fetcher(self):
+        self.assertIsInstance(create_data_fetcher("market"), HistoricalDataFetcher)
+        with patch("src.backtesting.candle_source.DatabaseManager", return_value=self.db_manager):
+            source = create_data_fetcher("candles", backfill=True)
+        self.assertIsInstance(source, CandleDataSource)
+        self.assertTrue(source.backfill)
+        with self.assertRaises(ValueError):
+            create_data_fetcher("parquet")
+
+
+if __name__ == '__main__':
+    unittest.main()
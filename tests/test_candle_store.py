@@ -0,0 +1,137 @@
+"""
+Tests for the live candle ring buffer and its write-behind persistence
+"""
+
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.database.models import DatabaseManager
+from src.database.repository import CandleRepository
+from src.live_trader.candle_store import CandleRingBuffer, CandleWriteBehind, get_candle_buffer
+from src.trading.indicators import IncrementalIndicatorEngine
+
+START = datetime(2024, 1, 1, 9, 15)
+
+
+def _ts(i):
+    return START + timedelta(minutes=5 * i)
+
+
+def _fill(buffer, count, first=0):
+    for i in range(first, first + count):
+        buffer.append(_ts(i), 100 + i, 101 + i, 99 + i, 100.5 + i, 10 * i)
+
+
+class TestCandleRingBuffer(unittest.TestCase):
+    """Append, lookup, eviction and views"""
+
+    def test_append_and_lookup(self):
+        buffer = CandleRingBuffer(capacity=8)
+        _fill(buffer, 5)
+        self.assertEqual(len(buffer), 5)
+        self.assertIn(_ts(3), buffer)
+        self.assertIn(pd.Timestamp(_ts(3)), buffer)
+        self.assertEqual(buffer.index_of(_ts(3)), 3)
+        record = buffer.get(_ts(3))
+        self.assertEqual((record.timestamp, record.open, record.close, record.volume), (pd.Timestamp(_ts(3)), 103.0, 103.5, 30.0))
+        self.assertIsNone(buffer.get(_ts(9)))
+        self.assertEqual([r.timestamp for r in buffer.latest(2)], [pd.Timestamp(_ts(3)), pd.Timestamp(_ts(4))])
+
+    def test_eviction_keeps_contiguous_views(self):
+        buffer = CandleRingBuffer(capacity=4)
+        _fill(buffer, 11)
+        self.assertEqual(len(buffer), 4)
+        np.testing.assert_array_equal(buffer.open, [107.0, 108.0, 109.0, 110.0])
+        np.testing.assert_array_equal(buffer.timestamps, [pd.Timestamp(_ts(i)).value for i in range(7, 11)])
+        self.assertNotIn(_ts(6), buffer)
+        self.assertEqual(buffer.index_of(_ts(10)), 3)
+        # Views share memory with the buffer and cannot be written to
+        self.assertFalse(buffer.close.flags.writeable)
+        self.assertTrue(np.shares_memory(buffer.close, buffer._values))
+
+    def test_update_and_synthetic_rule(self):
+        buffer = CandleRingBuffer(capacity=4)
+        buffer.append(_ts(0), 100, 100, 100, 100, is_synthetic=True)
+        buffer.append(_ts(0), 100, 102, 99, 101)
+        buffer.append(_ts(0), 50, 50, 50, 50, is_synthetic=True)
+        self.assertEqual(len(buffer), 1)
+        record = buffer.get(_ts(0))
+        self.assertEqual((record.close, record.is_synthetic), (101.0, False))
+
+    def test_out_of_order_insert(self):
+        buffer = CandleRingBuffer(capacity=8)
+        _fill(buffer, 3)
+        _fill(buffer, 2, first=4)
+        buffer.append(_ts(3), 1, 2, 0, 1.5)
+        np.testing.assert_array_equal(buffer.close, [100.5, 101.5, 102.5, 1.5, 104.5, 105.5])
+        self.assertEqual(buffer.index_of(_ts(4)), 4)
+        buffer.append(_ts(5), 7, 7, 7, 7)
+        self.assertEqual(buffer.get(_ts(5)).close, 7.0)
+
+    def test_frame_round_trip(self):
+        buffer = CandleRingBuffer(capacity=8)
+        _fill(buffer, 3)
+        frame = buffer.frame()
+        self.assertIs(buffer.frame(), frame)
+        self.assertEqual(list(frame.columns), ["open", "high", "low", "close", "volume"])
+        self.assertEqual(frame.index[1], pd.Timestamp(_ts(1)))
+
+        reloaded = CandleRingBuffer(capacity=8)
+        reloaded.load_frame(frame.iloc[::-1])
+        pd.testing.assert_frame_equal(reloaded.frame(), frame)
+
+        reloaded.merge_frame(pd.DataFrame({"open": [1.0], "high": [1.0], "low": [1.0], "close": [1.0]}, index=[_ts(1)]))
+        self.assertEqual(reloaded.get(_ts(1)).close, 1.0)
+        self.assertIsNot(reloaded.frame(), frame)
+
+    def test_shared_per_segment_and_interval(self):
+        self.assertIs(get_candle_buffer("nifty", "5minute"), get_candle_buffer("NIFTY", "5minute"))
+        self.assertIsNot(get_candle_buffer("NIFTY", "5minute"), get_candle_buffer("NIFTY", "3minute"))
+
+    def test_indicator_engine_consumes_views(self):
+        buffer = CandleRingBuffer(capacity=64)
+        rng = np.random.default_rng(1)
+        for i, close in enumerate(24000 + np.cumsum(rng.normal(0, 10, 40))):
+            buffer.append(_ts(i), close, close + 2, close - 2, close)
+        from_views = IncrementalIndicatorEngine(9, 3, 21)
+        from_views.sync_arrays(buffer.timestamps, buffer.close)
+        from_frame = IncrementalIndicatorEngine(9, 3, 21)
+        from_frame.sync(buffer.frame())
+        np.testing.assert_array_equal(from_views.volume_strength, from_frame.volume_strength)
+
+
+class TestCandleWriteBehind(unittest.TestCase):
+    """Queued candles reach the database in one batch"""
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.db_manager = DatabaseManager(str(self.tmp_dir / "candles.db"))
+        self.repo = CandleRepository(self.db_manager)
+
+    def tearDown(self):
+        self.db_manager.engine.dispose()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_flush(self):
+        writer = CandleWriteBehind(self.repo, "NIFTY", "5minute", flush_interval=0.05)
+        writer.add(_ts(0), {"open": 1, "high": 2, "low": 0, "close": 1.5})
+        writer.add(_ts(0), {"open": 1, "high": 1, "low": 1, "close": 1}, is_synthetic=True)
+        writer.add(_ts(1), {"open": 2, "high": 3, "low": 1, "close": 2.5, "volume": 5})
+        self.assertEqual(writer.pending, 2)
+        self.assertEqual(self.repo.get_latest_candles("NIFTY", "5minute"), [])
+
+        writer.start()
+        writer.stop()
+        self.assertEqual(writer.pending, 0)
+        candles = self.repo.get_latest_candles("NIFTY", "5minute")
+        self.assertEqual([(c.close, c.is_synthetic) for c in candles], [(1.5, False), (2.5, False)])
+
+
+if __name__ == '__main__':
+    unittest.main()
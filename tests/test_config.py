@@ -51,6 +51,21 @@ def test_user_config_validation():
         )
 
 
+def test_user_config_log_queue():
+    """Log queue size and overflow policy are optional and validated"""
+    config = UserConfig(api_key="test_key", api_secret="test_secret")
+    assert config.log_queue_size is None and config.log_queue_policy is None
+    
+    config = UserConfig(api_key="test_key", api_secret="test_secret", log_queue_size=500, log_queue_policy="Block")
+    assert config.log_queue_size == 500
+    assert config.log_queue_policy == "block"
+    
+    with pytest.raises(ValueError):
+        UserConfig(api_key="test_key", api_secret="test_secret", log_queue_policy="discard")
+    with pytest.raises(ValueError):
+        UserConfig(api_key="test_key", api_secret="test_secret", log_queue_size=0)
+
+
 def test_admin_config_validation():
     """Test AdminConfig validation"""
     # Valid config
@@ -0,0 +1,93 @@
+"""
+Tests for the cached config.json snapshot
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import time
+from pathlib import Path
+from unittest.mock import patch
+
+from src.config.config_snapshot import ConfigSnapshot, ConfigSnapshotCache, DEFAULT_EXPIRY_CONFIG
+from src.trading.rsi_agent import RSIStrategy, Segment
+
+
+class TestConfigSnapshotCache(unittest.TestCase):
+    """Parsing once, reloading on mtime change and fallbacks"""
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.path = self.tmp_dir / "config.json"
+        self.now = 0.0
+        self.cache = ConfigSnapshotCache(self.path, check_interval=1.0, clock=lambda: self.now)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _write(self, data, mtime_ns):
+        self.path.write_text(json.dumps(data) if isinstance(data, dict) else data, encoding="utf-8")
+        os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def test_missing_file_uses_defaults(self):
+        snapshot = self.cache.get()
+        self.assertFalse(snapshot.exists)
+        self.assertEqual(snapshot.market_hours, (time(9, 30), time(15, 30)))
+        self.assertEqual(snapshot.expiry_config(), DEFAULT_EXPIRY_CONFIG)
+
+    def test_parsed_once_and_reloaded_on_change(self):
+        self._write({"market_hours": {"open_time": "09:15", "close_time": "15:30"},
+                     "dynamic_threshold": {"tight_range": [2.0, 3.0]}}, 1_000_000_000)
+        snapshot = self.cache.get()
+        self.assertEqual(snapshot.market_hours, (time(9, 15), time(15, 30)))
+        self.assertEqual(snapshot.expiry_config(), {})
+        self.assertEqual(snapshot.filters()["dynamic_threshold"]["tight_range"], (2.0, 3.0))
+        with self.assertRaises(TypeError):
+            snapshot.section("market_hours")["open_time"] = "10:00"
+
+        self._write({"market_hours": {"open_time": "10:00"}}, 2_000_000_000)
+        self.now = 0.5
+        self.assertIs(self.cache.get(), snapshot)  # mtime not looked at again yet
+        self.now = 1.5
+        self.assertEqual(self.cache.get().market_hours, (time(10, 0), time(15, 30)))
+        self.assertIs(self.cache.get(force_check=True), self.cache.get())
+        self.assertEqual(self.cache.loads, 2)
+
+    def test_invalid_json_keeps_previous_snapshot(self):
+        self._write({"market_hours": {"open_time": "09:20"}}, 1_000_000_000)
+        snapshot = self.cache.get()
+        self._write("{not json", 2_000_000_000)
+        self.assertIs(self.cache.get(force_check=True), snapshot)
+        self.assertEqual(snapshot.to_dict(), {"market_hours": {"open_time": "09:20"}})
+
+        # The invalid file is not parsed (or warned about) again until it changes
+        loads = self.cache.loads
+        with patch("src.config.config_snapshot.open", side_effect=AssertionError("re-parsed"), create=True):
+            self.assertIs(self.cache.get(force_check=True), snapshot)
+        self._write({"market_hours": {"open_time": "09:25"}}, 3_000_000_000)
+        self.assertEqual(self.cache.get(force_check=True).market_hours[0], time(9, 25))
+        self.assertEqual(self.cache.loads, loads + 1)
+
+
+class TestStrategyFilters(unittest.TestCase):
+    """RSIStrategy reads its entry filters from the snapshot without copying the config"""
+
+    def test_filters_from_snapshot(self):
+        snapshot = ConfigSnapshot({
+            "dynamic_threshold": {"tight_range": [1.5, 2.5]},
+            "atr_volatility_filter": {"buy_regime": {"min_atr_multiplier": 1.2}},
+            "rsi_extreme_filter": {"sell_regime": {"pe_max_rsi": 35}},
+        }, exists=True)
+        with patch("src.config.config_snapshot.get_config_snapshot", return_value=snapshot), \
+                patch.object(ConfigSnapshot, "to_dict", side_effect=AssertionError("config copied")):
+            strategy = RSIStrategy(Segment.NIFTY)
+        self.assertEqual(tuple(strategy.dynamic_tight_range), (1.5, 2.5))
+        self.assertEqual(strategy.buy_min_atr_multiplier, 1.2)
+        self.assertEqual(strategy.sell_pe_max_rsi, 35)
+        self.assertEqual(strategy.vwap_tolerance_pct, 0.2)  # Section missing from the file
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+Tests for the shared DatabaseManager engine and versioned migrations
+"""
+
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlalchemy import text
+
+from src.database.models import DatabaseManager, SchemaVersion
+
+
+class TestDatabaseManager(unittest.TestCase):
+    """Managers of one file share an engine; schema work happens once per process"""
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.db_path = str(self.tmp_dir / "risk.db")
+
+    def tearDown(self):
+        DatabaseManager(self.db_path).close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_engine_is_shared(self):
+        first = DatabaseManager(self.db_path)
+        second = DatabaseManager(str(self.tmp_dir / "." / "risk.db"))
+        self.assertIs(first.engine, second.engine)
+        self.assertIsNot(first.engine, DatabaseManager(str(self.tmp_dir / "other.db")).engine)
+
+    def test_connections_use_wal(self):
+        with DatabaseManager(self.db_path).engine.connect() as conn:
+            self.assertEqual(conn.execute(text("PRAGMA journal_mode")).scalar(), "wal")
+            self.assertEqual(conn.execute(text("PRAGMA busy_timeout")).scalar(), 10000)
+
+    def test_migrations_are_recorded_and_not_rerun(self):
+        manager = DatabaseManager(self.db_path)
+        self.assertEqual(manager.schema_version(), 4)
+
+        with patch.object(DatabaseManager, "_create_tables") as create_tables:
+            DatabaseManager(self.db_path)
+        create_tables.assert_not_called()
+
+        # A new process (fresh engine) skips migrations already in schema_version
+        manager.close()
+        with patch.object(DatabaseManager, "_migrate_broker_id") as migrate:
+            manager._run_migrations()
+        migrate.assert_not_called()
+
+    def test_failed_migration_is_retried(self):
+        with patch.object(DatabaseManager, "_migrate_broker_id", return_value=False):
+            manager = DatabaseManager(self.db_path)
+        self.assertEqual(manager.schema_version(), 1)
+        manager._run_migrations()
+        self.assertEqual(manager.schema_version(), 4)
+
+    def test_sessions_from_threads(self):
+        manager = DatabaseManager(self.db_path)
+        errors = []
+
+        def read():
+            session = manager.get_session()
+            try:
+                session.query(SchemaVersion).count()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                session.close()
+
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+        # Other processes see the WAL database as usual
+        conn = sqlite3.connect(self.db_path)
+        try:
+            self.assertEqual(conn.execute("SELECT MAX(version) FROM schema_version").fetchone()[0], 4)
+        finally:
+            conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+Tests for the incremental RSI / Price Strength / Volume Strength engine
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+from src.trading.rsi_agent import RSIStrategy, RSITradingAgent, Segment
+from src.trading.indicators import IncrementalIndicatorEngine, IndicatorFrame, weighted_moving_average
+
+
+def _make_candles(n: int = 600, seed: int = 7) -> pd.DataFrame:
+    """Random-walk candles with a strictly rising start and a flat stretch (NaN RSI edge cases)"""
+    rng = np.random.default_rng(seed)
+    close = np.concatenate([
+        np.arange(100.0, 125.0),
+        100 + np.cumsum(rng.normal(0, 4, n)),
+        np.full(25, 80.0),
+        80 + np.cumsum(rng.normal(0, 1, n // 2)),
+    ])
+    index = pd.date_range("2024-01-01 09:15", periods=len(close), freq="5min")
+    return pd.DataFrame(
+        {"open": close, "high": close + 1, "low": close - 1, "close": close, "volume": 0.0},
+        index=index,
+    )
+
+
+class TestIncrementalIndicatorEngine(unittest.TestCase):
+    """Parity of the streaming engine against the pandas implementation in RSIStrategy"""
+
+    def setUp(self):
+        self.strategy = RSIStrategy(Segment.NIFTY, rsi_period=9, price_strength_ema=3, volume_strength_wma=21)
+        self.df = _make_candles()
+
+    def assert_parity(self, engine, df):
+        expected = {
+            "rsi": self.strategy.calculate_rsi(df["close"], period=self.strategy.rsi_period),
+            "price_strength": self.strategy.calculate_price_strength(df),
+            "volume_strength": self.strategy.calculate_volume_strength(df),
+        }
+        for name, series in expected.items():
+            np.testing.assert_allclose(
+                np.asarray(getattr(engine, name), dtype=float),
+                series.to_numpy(dtype=float),
+                rtol=1e-10,
+                atol=1e-10,
+                equal_nan=True,
+                err_msg=name,
+            )
+
+    def test_update_matches_pandas(self):
+        """Candle-by-candle updates reproduce the full-frame pandas series"""
+        engine = IncrementalIndicatorEngine.from_strategy(self.strategy)
+        for close in self.df["close"]:
+            engine.update(close)
+        self.assertEqual(len(engine), len(self.df))
+        self.assert_parity(engine, self.df)
+
+    def test_custom_periods_match_pandas(self):
+        """Non-default indicator periods stay in parity"""
+        self.strategy = RSIStrategy(Segment.BANKNIFTY, rsi_period=14, price_strength_ema=5, volume_strength_wma=9)
+        engine = IncrementalIndicatorEngine.from_strategy(self.strategy)
+        engine.extend(self.df["close"])
+        self.assert_parity(engine, self.df)
+
+    def test_sync_appends_and_rebuilds(self):
+        """sync() appends new rows incrementally and rebuilds when earlier history changes"""
+        engine = IncrementalIndicatorEngine.from_strategy(self.strategy)
+        engine.sync(self.df.iloc[:300])
+        engine.sync(self.df.iloc[:450])
+        self.assert_parity(engine, self.df.iloc[:450])
+
+        # Back-filled candle inserted before the last synced row
+        df = self.df.iloc[:450].drop(self.df.index[200])
+        engine.sync(df)
+        df = pd.concat([df, self.df.iloc[[200]]]).sort_index()
+        engine.sync(df)
+        self.assert_parity(engine, df)
+
+    def test_generate_signal_same_with_engine(self):
+        """generate_signal returns the same result with and without the engine"""
+        engine = IncrementalIndicatorEngine.from_strategy(self.strategy)
+        engine.sync(self.df)
+        for idx in range(30, len(self.df), 37):
+            signal, option_type, reason, details = self.strategy.generate_signal(self.df, idx)
+            signal_e, option_type_e, reason_e, details_e = self.strategy.generate_signal(
+                self.df, idx, indicators=engine
+            )
+            self.assertEqual(signal, signal_e)
+            self.assertEqual(option_type, option_type_e)
+            self.assertEqual(details["checks"], details_e["checks"])
+
+
+class TestIndicatorFrame(unittest.TestCase):
+    """Batch indicator arrays used by the backtest loop"""
+
+    def setUp(self):
+        self.strategy = RSIStrategy(Segment.NIFTY, rsi_period=9, price_strength_ema=3, volume_strength_wma=21)
+        close = _make_candles()["close"]
+        rng = np.random.default_rng(11)
+        self.df = pd.DataFrame(
+            {
+                "open": close + rng.normal(0, 1, len(close)),
+                "high": close + 2,
+                "low": close - 2,
+                "close": close,
+                "volume": 0.0,
+            },
+            index=close.index,
+        )
+        self.frame = IndicatorFrame.from_strategy(self.strategy, self.df)
+
+    def test_arrays_match_pandas(self):
+        """RSI / PS / VS / ATR arrays equal the RSIStrategy series"""
+        expected = {
+            "rsi": self.strategy.calculate_rsi(self.df["close"], period=self.strategy.rsi_period),
+            "price_strength": self.strategy.calculate_price_strength(self.df),
+            "volume_strength": self.strategy.calculate_volume_strength(self.df),
+            "atr": self.strategy.calculate_atr(self.df, self.strategy.atr_period),
+        }
+        for name, series in expected.items():
+            np.testing.assert_allclose(
+                getattr(self.frame, name), series.to_numpy(dtype=float), rtol=1e-10, equal_nan=True, err_msg=name
+            )
+
+    def test_atr_filter_same_with_frame(self):
+        """check_atr_volatility_filter gives the same answer from the precomputed ATR average"""
+        for idx in range(0, len(self.df), 29):
+            passed, reason, atr, avg_atr = self.strategy.check_atr_volatility_filter(self.df, idx)
+            passed_f, reason_f, atr_f, avg_atr_f = self.strategy.check_atr_volatility_filter(
+                self.df, idx, indicators=self.frame
+            )
+            self.assertEqual((passed, reason), (passed_f, reason_f))
+            if avg_atr is not None:
+                self.assertAlmostEqual(atr, atr_f, places=9)
+                self.assertAlmostEqual(avg_atr, avg_atr_f, places=9)
+
+    def test_generate_signal_same_with_frame(self):
+        """generate_signal returns the same result with and without the frame"""
+        for idx in range(30, len(self.df), 23):
+            signal, option_type, reason, details = self.strategy.generate_signal(self.df, idx)
+            signal_f, option_type_f, reason_f, details_f = self.strategy.generate_signal(
+                self.df, idx, indicators=self.frame
+            )
+            self.assertEqual(signal, signal_f)
+            self.assertEqual(option_type, option_type_f)
+            self.assertEqual(reason, reason_f)
+
+    def test_position_of(self):
+        """Timestamps map to their first row; unknown timestamps map to None"""
+        self.assertEqual(self.frame.position_of(self.df.index[123]), 123)
+        self.assertIsNone(self.frame.position_of(pd.Timestamp("1999-01-01")))
+        self.assertEqual(self.frame.ohlc_at(5)[3], float(self.df["close"].iloc[5]))
+
+    def test_export_for_comparison(self):
+        """The TradingView export reads only arrays the frame still has"""
+        export = RSITradingAgent(self.strategy).export_indicators_for_comparison(self.df)
+        ps, vs = self.frame.price_strength, self.frame.volume_strength
+        valid = ~(np.isnan(self.frame.rsi) | np.isnan(ps) | np.isnan(vs))
+        self.assertEqual(len(export), int(valid[21:].sum()))
+        rows = export.set_index("Timestamp")
+        positions = [self.frame.position_of(ts) for ts in rows.index]
+        np.testing.assert_allclose(rows["PS_VS_Diff"], ps[positions] - vs[positions])
+        self.assertTrue(set(rows["Crossover_Type"]) >= {"None", "CE (PS↑VS)", "PE (PS↓VS)"})
+
+
+class TestWeightedMovingAverage(unittest.TestCase):
+    """Vectorized WMA against the rolling().apply reference"""
+
+    def test_matches_rolling_apply(self):
+        """Same values and NaN positions as rolling(period, min_periods=period).apply"""
+        rng = np.random.default_rng(3)
+        values = pd.Series(50 + np.cumsum(rng.normal(0, 1, 500)))
+        values.iloc[:8] = np.nan
+        values.iloc[200] = np.nan
+        weights = np.arange(1, 22)
+        expected = values.rolling(window=21, min_periods=21).apply(
+            lambda x: np.sum(weights * x) / np.sum(weights), raw=True
+        )
+        np.testing.assert_allclose(
+            weighted_moving_average(values, 21), expected.to_numpy(), rtol=1e-12, equal_nan=True
+        )
+
+    def test_short_input_is_all_nan(self):
+        """Fewer values than the period yields only NaN"""
+        result = weighted_moving_average([1.0, 2.0, 3.0], 5)
+        self.assertEqual(len(result), 3)
+        self.assertTrue(np.isnan(result).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Tests for the process-wide instrument master cache
+"""
+
+import shutil
+import tempfile
+import unittest
+from datetime import date, datetime
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from src.api.instrument_store import InstrumentIndex, InstrumentStore
+
+
+def _instruments():
+    expiry = date(2025, 12, 30)
+    rows = []
+    token = 1000
+    for name, exchange_segment in (("NIFTY", "NFO-OPT"), ("BANKNIFTY", "NFO-OPT")):
+        for strike in (24000.0, 23900.0, 24100.0):
+            for option_type in ("CE", "PE"):
+                token += 1
+                rows.append({
+                    "instrument_token": token,
+                    "tradingsymbol": f"{name}25D30{int(strike)}{option_type}",
+                    "name": name,
+                    "expiry": expiry,
+                    "strike": strike,
+                    "tick_size": 0.05,
+                    "instrument_type": option_type,
+                    "segment": exchange_segment,
+                    "exchange": "NFO",
+                })
+    rows.append({
+        "instrument_token": 9999, "tradingsymbol": "NIFTY26JANFUT", "name": "NIFTY", "expiry": date(2026, 1, 27),
+        "strike": 0.0, "tick_size": 0.05, "instrument_type": "FUT", "segment": "NFO-FUT", "exchange": "NFO",
+    })
+    rows.append({
+        "instrument_token": 2001, "tradingsymbol": "NIFTY25D2324000CE", "name": "NIFTY", "expiry": date(2025, 12, 23),
+        "strike": 24000.0, "tick_size": 0.05, "instrument_type": "CE", "segment": "NFO-OPT", "exchange": "NFO",
+    })
+    return rows
+
+
+class TestInstrumentIndex(unittest.TestCase):
+    """Indexed lookups"""
+
+    def setUp(self):
+        self.index = InstrumentIndex("NFO", date(2025, 12, 22), _instruments())
+
+    def test_lookups(self):
+        self.assertEqual(self.index.by_tradingsymbol("NIFTY25D3024000PE")["instrument_type"], "PE")
+        self.assertEqual(self.index.by_token(9999)["tradingsymbol"], "NIFTY26JANFUT")
+        option = self.index.find_option("NIFTY", "2025-12-30", 24000, "ce")
+        self.assertEqual(option["tradingsymbol"], "NIFTY25D3024000CE")
+        self.assertIsNone(self.index.find_option("NIFTY", date(2025, 12, 30), 25000, "CE"))
+
+    def test_option_chain_sorted_by_strike(self):
+        chain = self.index.options("NIFTY", datetime(2025, 12, 30), "CE")
+        self.assertEqual([inst["strike"] for inst in chain], [23900.0, 24000.0, 24100.0])
+        self.assertEqual(len(self.index.options("NIFTY")), 7)
+
+    def test_expiries(self):
+        self.assertEqual(self.index.expiries("NIFTY"), [date(2025, 12, 23), date(2025, 12, 30)])
+        self.assertEqual(self.index.expiries("NIFTY", from_date=date(2025, 12, 24)), [date(2025, 12, 30)])
+
+
+class TestInstrumentStore(unittest.TestCase):
+    """Download once per day, disk persistence"""
+
+    def setUp(self):
+        self.cache_dir = Path(tempfile.mkdtemp())
+        self.kite_client = Mock()
+        self.kite_client.kite.instruments.return_value = _instruments()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    @patch("src.api.instrument_store.get_current_ist_time")
+    def test_downloads_once_per_day_and_persists(self, mock_now):
+        mock_now.return_value = datetime(2025, 12, 22, 9, 0)
+        store = InstrumentStore(self.cache_dir)
+        store.get_index(self.kite_client, "NFO")
+        store.get_index(self.kite_client, "NFO")
+        self.assertEqual(self.kite_client.kite.instruments.call_count, 1)
+        self.assertTrue((self.cache_dir / "NFO_2025-12-22.pkl").exists())
+
+        # Restart on the same day: loaded from disk
+        restarted = InstrumentStore(self.cache_dir)
+        index = restarted.get_index(self.kite_client, "NFO")
+        self.assertEqual(self.kite_client.kite.instruments.call_count, 1)
+        self.assertIsNotNone(index.by_tradingsymbol("BANKNIFTY25D3024100CE"))
+
+        # Next day: downloaded again and the old dump removed
+        mock_now.return_value = datetime(2025, 12, 23, 9, 0)
+        restarted.get_index(self.kite_client, "NFO")
+        self.assertEqual(self.kite_client.kite.instruments.call_count, 2)
+        self.assertEqual([p.name for p in self.cache_dir.glob("NFO_*.pkl")], ["NFO_2025-12-23.pkl"])
+
+
+if __name__ == '__main__':
+    unittest.main()
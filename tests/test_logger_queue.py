@@ -0,0 +1,98 @@
+"""
+Tests for the queued logging pipeline
+"""
+
+import logging
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from src.utils.logger import LogQueuePipeline, _PipelineQueueHandler, get_segment_logger
+
+
+class _BlockingHandler(logging.Handler):
+    """Collects messages; blocks until released, like a stalled disk"""
+
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.unblock = threading.Event()
+        self.messages = []
+
+    def emit(self, record):
+        self.unblock.wait(5)
+        self.messages.append(record.getMessage())
+
+
+class TestLogQueuePipeline(unittest.TestCase):
+    """Records are written off the calling thread; overflow follows the policy"""
+
+    def _logger(self, pipeline, handler, name):
+        logger = logging.getLogger(name)
+        logger.handlers = []
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        logger.addHandler(_PipelineQueueHandler(pipeline, [handler]))
+        self.addCleanup(logger.handlers.clear)
+        return logger
+
+    def test_drop_policy_keeps_warnings(self):
+        pipeline = LogQueuePipeline(max_size=2, policy="drop", block_timeout=5)
+        handler = _BlockingHandler()
+        logger = self._logger(pipeline, handler, "test_queue_drop")
+
+        for i in range(10):
+            logger.info("info %d", i)  # never waits, even with the listener stalled
+        self.assertGreater(pipeline.stats()["dropped_by_level"]["INFO"], 0)
+
+        threading.Timer(0.2, handler.unblock.set).start()
+        logger.warning("important")  # waits for room instead of being dropped
+        self.assertTrue(pipeline.flush())
+        self.assertEqual(handler.messages[-1], "important")
+        stats = pipeline.stats()
+        self.assertEqual(stats["written"] + stats["dropped"], 11)
+        self.assertNotIn("WARNING", stats["dropped_by_level"])
+        pipeline.stop()
+
+    def test_block_policy_times_out(self):
+        pipeline = LogQueuePipeline(max_size=1, policy="block", block_timeout=0.05)
+        handler = _BlockingHandler()
+        logger = self._logger(pipeline, handler, "test_queue_block")
+        for i in range(4):
+            logger.info("info %d", i)
+        self.assertGreater(pipeline.stats()["dropped"], 0)
+        handler.unblock.set()
+        self.assertTrue(pipeline.flush())
+        pipeline.stop()
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            LogQueuePipeline(policy="spill")
+
+
+class TestSegmentLogger(unittest.TestCase):
+    """Segment loggers still end up in their daily file"""
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        logger = logging.getLogger("paper_testseg")
+        for handler in logger.handlers:
+            for target in handler.targets:
+                target.close()
+        logger.handlers.clear()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_written_by_listener(self):
+        logger = get_segment_logger("testseg", "paper", log_dir=self.tmp_dir)
+        self.assertIs(get_segment_logger("testseg", "paper", log_dir=self.tmp_dir), logger)
+        logger.info("entry check passed")
+        self.assertTrue(logger.handlers[0].pipeline.flush())
+        log_file = next(self.tmp_dir.glob("PAPER_TESTSEG_*.log"))
+        self.assertIn("INFO - entry check passed", log_file.read_text(encoding="utf-8"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,181 @@
+"""
+Tests for the shared market data hub (rate budgets, request coalescing, snapshot fan-out)
+"""
+
+import threading
+import time
+import unittest
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import pandas as pd
+
+from src.api.market_data_hub import MarketDataHub, RateLimitBudget, RequestCoalescer
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def _candles():
+    index = pd.date_range("2024-01-01 09:15", periods=6, freq="5min")
+    return pd.DataFrame({"open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 0.0}, index=index)
+
+
+class TestRateLimitBudget(unittest.TestCase):
+    """Token bucket per endpoint"""
+
+    def test_requests_are_spaced(self):
+        clock = _FakeClock()
+        budget = RateLimitBudget(rate=2.0, clock=clock, sleep=clock.sleep)
+        for _ in range(3):
+            self.assertTrue(budget.acquire())
+        self.assertAlmostEqual(clock.now, 1.0)
+        self.assertEqual(budget.granted, 3)
+        self.assertFalse(budget.acquire(timeout=0.1))
+        clock.now += 0.5
+        self.assertTrue(budget.acquire(timeout=0.1))
+
+
+class TestRequestCoalescer(unittest.TestCase):
+    """Concurrent identical requests share one call"""
+
+    def test_single_flight(self):
+        coalescer = RequestCoalescer()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            release.wait(2)
+            return "quote"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(coalescer.do("k", fetch))) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        while coalescer.coalesced < 2:
+            time.sleep(0.005)
+        release.set()
+        for thread in threads:
+            thread.join(2)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["quote"] * 3)
+
+    def test_error_is_shared_and_not_cached(self):
+        coalescer = RequestCoalescer()
+        with self.assertRaises(RuntimeError):
+            coalescer.do("k", Mock(side_effect=RuntimeError("rate limited")))
+        self.assertEqual(coalescer.do("k", lambda: 5), 5)
+
+
+@patch("src.api.market_data_hub.get_rate_budget", return_value=Mock())
+class TestMarketDataHub(unittest.TestCase):
+    """One Kite call per snapshot / candle window for all agents of a segment"""
+
+    def setUp(self):
+        self.clock = _FakeClock()
+        self.hub = MarketDataHub(Mock(), "nifty", candle_ttl_seconds=10, clock=self.clock)
+
+    @patch("src.api.live_data.fetch_recent_index_candles")
+    def test_recent_candles_cached_and_copied(self, mock_fetch, _budget):
+        mock_fetch.return_value = _candles()
+        first = self.hub.recent_candles("5minute", lookback_minutes=50)
+        first.index = first.index.tz_localize("Asia/Kolkata")
+        second = self.hub.recent_candles("5minute", lookback_minutes=50)
+        self.assertIsNone(second.index.tz)
+        self.assertEqual(mock_fetch.call_count, 1)
+
+        self.clock.now += 11
+        self.hub.recent_candles("5minute", lookback_minutes=50)
+        self.assertEqual(mock_fetch.call_count, 2)
+        self.assertEqual(self.hub.requests["historical"], 2)
+        self.assertEqual(self.hub.cache_hits, 1)
+
+    @patch("src.api.market_data_hub.is_market_open", return_value=True)
+    @patch("src.api.live_data.fetch_live_index_ltp", return_value=24000.5)
+    def test_snapshot_fan_out(self, mock_ltp, _open, _budget):
+        received = {"PAPER": [], "LIVE": []}
+        both = threading.Event()
+
+        def subscriber(name):
+            def callback(snapshot):
+                received[name].append(snapshot)
+                if received["PAPER"] and received["LIVE"]:
+                    both.set()
+            return callback
+
+        self.hub.subscribe("PAPER", subscriber("PAPER"), 60)
+        # The first poll happens immediately; wait for it before the second agent joins
+        for _ in range(200):
+            if self.hub.snapshot is not None:
+                break
+            time.sleep(0.005)
+        self.hub.subscribe("LIVE", subscriber("LIVE"), 60)
+        self.assertTrue(both.wait(2))
+
+        self.assertEqual(mock_ltp.call_count, 1)
+        self.assertIs(received["PAPER"][0], received["LIVE"][0])
+        self.assertEqual(received["LIVE"][0].ltp, 24000.5)
+        self.assertEqual(self.hub.ltp(max_age=5), 24000.5)
+        self.assertEqual(mock_ltp.call_count, 1)
+
+        self.hub.unsubscribe("PAPER")
+        self.hub.unsubscribe("LIVE")
+        self.hub.stop()
+        self.assertEqual(self.hub.subscribers, [])
+
+    @patch("src.api.market_data_hub.is_market_open", return_value=True)
+    @patch("src.api.live_data.fetch_live_index_ltp")
+    def test_subscribe_during_refresh_after_last_unsubscribe(self, mock_ltp, _open, _budget):
+        in_refresh, release = threading.Event(), threading.Event()
+
+        def ltp(kite_client, segment):
+            if mock_ltp.call_count == 2:
+                in_refresh.set()
+                release.wait(2)
+            return float(mock_ltp.call_count)
+        mock_ltp.side_effect = ltp
+
+        self.hub.subscribe("PAPER", lambda snapshot: None, 0.01)
+        self.assertTrue(in_refresh.wait(2))
+        self.hub.unsubscribe("PAPER")
+        received = []
+        polled = threading.Event()
+
+        def callback(snapshot):
+            received.append(snapshot.ltp)
+            if len(received) >= 3:
+                polled.set()
+
+        self.hub.subscribe("LIVE", callback, 0.01)
+        release.set()
+
+        # Catch-up, the refresh in flight, then further polls from the same thread
+        self.assertTrue(polled.wait(2))
+        self.assertEqual(received[:2], [1.0, 2.0])
+        self.assertIsNotNone(self.hub._thread)
+        self.hub.unsubscribe("LIVE")
+        self.hub.stop()
+
+    @patch("src.api.live_data.fetch_live_index_ltp", return_value=1.0)
+    def test_streamed_ltp_replaces_quote_poll(self, mock_ltp, _budget):
+        self.hub.push_ltp(24010.0, datetime(2024, 1, 1, 9, 30))
+        self.assertEqual(self.hub.refresh().ltp, 24010.0)
+        self.clock.now += 6
+        with patch("src.api.market_data_hub.is_market_open", return_value=True):
+            self.assertEqual(self.hub.refresh().ltp, 1.0)
+        self.assertEqual(mock_ltp.call_count, 1)
+        self.assertEqual(self.hub.streamed_snapshots, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
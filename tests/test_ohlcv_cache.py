@@ -0,0 +1,146 @@
+"""
+Tests for the day-partitioned on-disk OHLCV cache behind HistoricalDataFetcher
+"""
+
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pandas as pd
+
+from src.backtesting.data_fetcher import HistoricalDataFetcher
+from src.backtesting.ohlcv_cache import OhlcvCache
+from src.utils.date_utils import IST
+
+NOW = IST.localize(datetime(2026, 3, 20, 12, 0))
+
+
+def _candles(from_date, to_date, tz=None):
+    """5-minute candles on weekdays between two dates (inclusive)"""
+    index = []
+    for day in pd.bdate_range(from_date.date(), to_date.date()):
+        index.extend(pd.date_range(day + pd.Timedelta(hours=9, minutes=15), day + pd.Timedelta(hours=15, minutes=25), freq="5min"))
+    index = pd.DatetimeIndex(index, name="date")
+    if tz:
+        index = index.tz_localize(tz)
+    close = [100.0 + i for i in range(len(index))]
+    return pd.DataFrame({"open": close, "high": close, "low": close, "close": close, "volume": 0}, index=index)
+
+
+class TestOhlcvCache(unittest.TestCase):
+    """Only missing days are fetched; cached days come back unchanged"""
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.cache = OhlcvCache(self.tmp_dir)
+        self.fetch = Mock(side_effect=lambda f, t: _candles(f, t, tz=IST))
+        self.clock = patch("src.backtesting.ohlcv_cache.get_current_ist_time", return_value=NOW)
+        self.clock.start()
+
+    def tearDown(self):
+        self.clock.stop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _get(self, from_day, to_day):
+        return self.cache.get("kite", "nifty", "5minute", datetime(2026, 3, from_day), datetime(2026, 3, to_day), self.fetch)
+
+    def test_repeated_range_is_served_from_disk(self):
+        first = self._get(2, 13)
+        self.assertEqual(self.fetch.call_count, 1)
+        self.assertEqual(len(first), 10 * 75)
+
+        second = OhlcvCache(self.tmp_dir).get("kite", "NIFTY", "5minute", datetime(2026, 3, 2), datetime(2026, 3, 13), self.fetch)
+        self.assertEqual(self.fetch.call_count, 1)
+        pd.testing.assert_frame_equal(second, first)
+        self.assertEqual(str(second.index.tz), "Asia/Kolkata")
+
+    def test_overlapping_range_fetches_missing_days_only(self):
+        self._get(5, 10)
+        self._get(2, 13)
+        self.assertEqual([(c.args[0].day, c.args[1].day) for c in self.fetch.call_args_list],
+                         [(5, 10), (2, 4), (11, 13)])
+        self.assertEqual(self.cache.stats(), {"days_hit": 6, "days_fetched": 12, "fetches": 3})
+
+        # Weekend days were stored empty, so nothing is fetched again
+        self.assertEqual(len(self._get(2, 13)), 10 * 75)
+        self.assertEqual(self.fetch.call_count, 3)
+
+    def test_today_and_failed_fetches_are_not_cached(self):
+        self._get(19, 20)
+        self._get(19, 20)
+        self.assertEqual([(c.args[0].day, c.args[1].day) for c in self.fetch.call_args_list], [(19, 20), (20, 20)])
+
+        self.fetch.side_effect = lambda f, t: pd.DataFrame()
+        self.assertTrue(self._get(16, 17).empty)
+        self.assertTrue(self._get(16, 17).empty)
+        self.assertEqual(self.fetch.call_count, 4)
+
+    def test_only_closed_days_cached_empty(self):
+        # The source has no candles before the 4th (history limit) and none on the 10th (holiday)
+        def partial(f, t):
+            df = _candles(f, t, tz=IST)
+            return df[(df.index.day >= 4) & (df.index.day != 10)]
+        self.fetch.side_effect = partial
+        self.assertEqual(len(self._get(2, 13)), 7 * 75)
+
+        cached = {day: self.cache.load_day("kite", "NIFTY", "5minute", datetime(2026, 3, day).date()) for day in range(2, 14)}
+        self.assertIsNone(cached[2])  # Before the first candle: not known to be closed
+        self.assertIsNone(cached[3])
+        self.assertTrue(cached[7].empty and cached[8].empty)  # Weekend
+        self.assertTrue(cached[10].empty)  # Holiday between trading days
+        self.assertEqual(len(cached[11]), 75)
+
+        # The early days are fetched again; alone, an empty weekday is not known to be closed
+        self.fetch.reset_mock()
+        self._get(2, 13)
+        self.fetch.assert_called_once_with(datetime(2026, 3, 2), datetime(2026, 3, 3))
+        self.fetch.side_effect = lambda f, t: pd.DataFrame()
+        self._get(17, 17)
+        self.assertIsNone(self.cache.load_day("kite", "NIFTY", "5minute", datetime(2026, 3, 17).date()))
+
+
+class TestYahooPeriod(unittest.TestCase):
+    """The intraday period reaches back to the first requested day"""
+
+    def test_period_counts_back_from_today(self):
+        ticker = Mock()
+        ticker.history.return_value = _candles(datetime(2026, 3, 9), datetime(2026, 3, 13))
+        fetcher = HistoricalDataFetcher(ohlcv_cache=Mock())
+        with patch("src.backtesting.data_fetcher.yf") as yf, \
+                patch("src.backtesting.data_fetcher.get_current_ist_time", return_value=NOW):
+            yf.Ticker.return_value = ticker
+            fetcher._download_segment_data("^NSEI", "NIFTY", datetime(2026, 3, 16), datetime(2026, 3, 17), "5minute")
+            fetcher._download_segment_data("^NSEI", "NIFTY", datetime(2026, 3, 10), datetime(2026, 3, 13), "5minute")
+        self.assertEqual([c.kwargs["period"] for c in ticker.history.call_args_list], ["7d", "60d"])
+
+
+class TestFetcherUsesCache(unittest.TestCase):
+    """A second Kite backtest over the same days makes no historical_data call"""
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.kite_client = Mock()
+        self.kite_client.is_authenticated.return_value = True
+        self.kite_client.kite.historical_data.side_effect = (
+            lambda token, f, t, interval, **kwargs: _candles(f, t).reset_index().to_dict("records")
+        )
+        self.fetcher = HistoricalDataFetcher(self.kite_client, ohlcv_cache=OhlcvCache(self.tmp_dir))
+        self.fetcher.instrument_cache["NIFTY_NIFTY_None"] = 256265
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_kite_data_cached(self):
+        first = self.fetcher.fetch_segment_data_from_kite("NIFTY", datetime(2026, 3, 2), datetime(2026, 3, 6))
+        self.assertEqual(len(first), 5 * 75)
+        self.assertEqual(first.index[-1], IST.localize(datetime(2026, 3, 6, 15, 25)))
+        second = self.fetcher.fetch_segment_data_from_kite("NIFTY", datetime(2026, 3, 2), datetime(2026, 3, 6))
+        pd.testing.assert_frame_equal(second, first)
+        self.assertEqual(self.kite_client.kite.historical_data.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Tests for the local option-chain Greeks service behind delta-based strike selection
+"""
+
+import unittest
+from datetime import date, datetime
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+from src.api.option_chain import OptionChainService
+from src.live_trader.instruments import select_strike_by_delta
+from src.trading.option_pricing import black_scholes_delta, black_scholes_price, years_to_expiry
+from src.utils.date_utils import IST
+
+NOW = IST.localize(datetime(2026, 3, 10, 11, 0))
+EXPIRY = "2026-03-12"
+IV = 0.15
+
+
+def _contracts(option_type):
+    return [
+        {"instrument_token": 1000 + strike // 50, "tradingsymbol": f"NIFTY26MAR{strike}{option_type}", "name": "NIFTY",
+         "strike": float(strike), "instrument_type": option_type, "expiry": date(2026, 3, 12), "exchange": "NFO"}
+        for strike in range(22000, 26001, 50)
+    ]
+
+
+class TestOptionChainService(unittest.TestCase):
+    """One small quote per chain, local deltas and a short TTL"""
+
+    def setUp(self):
+        self.spot = 24010.0
+        self.now = 0.0
+        self.kite_client = Mock()
+        self.kite_client.kite.quote.side_effect = self._quote
+        index = Mock()
+        index.options.side_effect = lambda name, expiry, option_type: _contracts(option_type)
+        store = Mock()
+        store.get_index.return_value = index
+        for target, value in (
+            ("src.api.option_chain.get_instrument_store", store),
+            ("src.api.option_chain.get_rate_budget", Mock()),
+            ("src.api.option_chain.get_current_ist_time", NOW),
+        ):
+            patcher = patch(target, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.service = OptionChainService(strikes_around_atm=5, ttl_seconds=5.0, clock=lambda: self.now)
+        self.years = years_to_expiry(NOW, EXPIRY)
+
+    def _quote(self, symbols):
+        quotes = {}
+        for symbol in symbols:
+            if symbol == "NSE:NIFTY 50":
+                quotes[symbol] = {"last_price": self.spot}
+                continue
+            strike, option_type = float(symbol[-7:-2]), symbol[-2:]
+            premium = round(float(black_scholes_price(self.spot, strike, self.years, IV, option_type)), 2)
+            quotes[symbol] = {"last_price": premium, "volume": 10, "oi": 100}
+        return quotes
+
+    def test_window_around_atm_in_one_quote(self):
+        chain = self.service.get_chain(self.kite_client, "NIFTY", "CE", EXPIRY, spot_price=24000.0)
+        symbols = self.kite_client.kite.quote.call_args.args[0]
+        self.assertEqual(len(symbols), 1 + 11)
+        self.assertEqual([row["strike"] for row in chain], list(range(23750, 24251, 50)))
+
+        strikes = np.array([row["strike"] for row in chain], dtype=float)
+        expected = black_scholes_delta(self.spot, strikes, self.years, IV, "CE")
+        np.testing.assert_allclose([row["delta"] for row in chain], expected, atol=2e-3)
+        self.assertAlmostEqual(chain[5]["greeks"]["iv"], IV, places=2)
+        self.assertEqual(chain[0]["tradingsymbol"], "NIFTY26MAR23750CE")
+
+    def test_chain_reused_within_ttl(self):
+        self.service.get_chain(self.kite_client, "NIFTY", "PE", EXPIRY, spot_price=24000.0)
+        self.service.get_chain(self.kite_client, "NIFTY", "PE", EXPIRY, spot_price=24010.0)
+        self.assertEqual(self.service.stats()["quote_calls"], 1)
+
+        self.service.get_chain(self.kite_client, "NIFTY", "PE", EXPIRY, spot_price=24100.0)  # ATM moved
+        self.now = 10.0
+        self.service.get_chain(self.kite_client, "NIFTY", "PE", EXPIRY, spot_price=24100.0)  # Expired
+        self.assertEqual(self.service.stats(), {"quote_calls": 3, "cache_hits": 1, "chains": 1})
+
+    def test_select_strike_by_delta(self):
+        with patch("src.live_trader.instruments.get_option_chain_service", return_value=self.service):
+            result = select_strike_by_delta(
+                self.kite_client, "NIFTY", "PE", EXPIRY, min_delta=0.3, max_delta=0.4,
+                spot_price=24000.0, prefer_closest_to_atm=False
+            )
+        self.assertTrue(-0.4 <= result["delta"] <= -0.3)
+        self.assertLess(result["strike"], 24000)
+        self.assertEqual(self.kite_client.kite.quote.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+"""
+Tests for per-contract, per-day option premium series in backtests
+"""
+
+import unittest
+from datetime import date, datetime, timedelta
+from unittest.mock import Mock, patch
+
+from src.backtesting.backtest_engine import PREMIUM_RETRY_SECONDS, BacktestEngine
+from src.utils.date_utils import IST
+from src.utils.premium_fetcher import PremiumSeries
+
+
+def _candles(day, closes, start=(9, 15)):
+    first = datetime(day.year, day.month, day.day, *start)
+    return [
+        {"date": IST.localize(first + timedelta(minutes=5 * i)), "open": c, "high": c, "low": c, "close": c, "volume": 0}
+        for i, c in enumerate(closes)
+    ]
+
+
+class TestPremiumSeries(unittest.TestCase):
+    """Binary search for the closest candle within the window"""
+
+    def setUp(self):
+        self.series = PremiumSeries.from_candles(list(reversed(_candles(date(2026, 3, 11), [100.0, 101.0, 102.0]))))
+
+    def test_closest_candle(self):
+        self.assertEqual(len(self.series), 3)
+        self.assertEqual(self.series.premium_at(datetime(2026, 3, 11, 9, 20)), 101.0)  # Naive is IST
+        self.assertEqual(self.series.premium_at(IST.localize(datetime(2026, 3, 11, 9, 21))), 101.0)
+        self.assertEqual(self.series.premium_at(datetime(2026, 3, 11, 9, 17, 30)), 100.0)  # Tie: earlier candle
+        self.assertEqual(self.series.premium_at(datetime(2026, 3, 11, 9, 35)), 102.0)
+
+    def test_outside_window(self):
+        self.assertIsNone(self.series.premium_at(datetime(2026, 3, 11, 9, 36)))
+        self.assertIsNone(self.series.premium_at(datetime(2026, 3, 11, 9, 0)))
+        self.assertIsNone(PremiumSeries([], []).premium_at(datetime(2026, 3, 11, 9, 20)))
+
+
+class TestEnginePremiumLookups(unittest.TestCase):
+    """One historical_data call per contract and day, however many lookups"""
+
+    def setUp(self):
+        self.kite_client = Mock()
+        self.kite_client.is_authenticated.return_value = True
+        self.kite_client.kite.historical_data.side_effect = (
+            lambda token, from_date, to_date, interval, **kwargs:
+                _candles(from_date.date(), [100.0 + i for i in range(75)]) if token == 111 else []
+        )
+        fetcher = Mock()
+        fetcher.kite_client = self.kite_client
+        self.engine = BacktestEngine(fetcher)
+
+        index = Mock()
+        index.by_tradingsymbol.side_effect = lambda symbol: (
+            {"instrument_token": 111, "tradingsymbol": symbol, "instrument_type": "CE", "exchange": "NFO",
+             "strike": 24000.0, "expiry": date(2026, 3, 12)} if "24000CE" in symbol else
+            {"instrument_token": 222, "tradingsymbol": symbol, "instrument_type": "PE", "exchange": "NFO",
+             "strike": 24000.0, "expiry": date(2026, 3, 12)}
+        )
+        store = Mock()
+        store.get_index.return_value = index
+        patcher = patch("src.backtesting.backtest_engine.get_instrument_store", return_value=store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_lookups_share_one_series_per_contract_day(self):
+        for day in (11, 12):
+            for minute in range(0, 60, 5):
+                premium, source = self.engine._estimate_option_premium(
+                    24010.0, 24000, "CE", "NIFTY", timestamp=datetime(2026, 3, day, 10, minute), expiry="2026-03-12"
+                )
+                self.assertEqual(source, "Kite API")
+                self.assertEqual(premium, 100.0 + 9 + minute // 5)
+
+        self.assertEqual(self.engine.premium_series_fetches, 2)
+        self.assertEqual(self.kite_client.kite.historical_data.call_count, 2)
+
+        # Mid-candle timestamps use the candle that contains them
+        result = self.engine._fetch_option_premium_from_kite(24000, "CE", "NIFTY", "2026-03-12", datetime(2026, 3, 11, 10, 3, 59))
+        self.assertEqual(result[0], 109.0)
+        self.assertEqual(result[1]["instrument_token"], 111)
+
+    def test_failed_fetch_is_retried_later(self):
+        calls = {"n": 0}
+
+        def flaky(token, from_date, to_date, interval, **kwargs):
+            calls["n"] += 1
+            if calls["n"] == 1:
+                raise Exception("Too many requests")
+            return _candles(from_date.date(), [100.0 + i for i in range(75)])
+
+        self.kite_client.kite.historical_data.side_effect = flaky
+        args = (24010.0, 24000, "CE", "NIFTY")
+        kwargs = {"timestamp": datetime(2026, 3, 11, 10, 0), "expiry": "2026-03-12"}
+        with patch("src.backtesting.backtest_engine.time.monotonic", return_value=1000.0):
+            self.assertEqual(self.engine._estimate_option_premium(*args, **kwargs)[1], "Estimated")
+            self.assertEqual(self.engine._estimate_option_premium(*args, **kwargs)[1], "Estimated")
+        self.assertEqual(calls["n"], 1)  # Not retried within PREMIUM_RETRY_SECONDS
+
+        with patch("src.backtesting.backtest_engine.time.monotonic", return_value=1000.0 + PREMIUM_RETRY_SECONDS):
+            self.assertEqual(self.engine._estimate_option_premium(*args, **kwargs), (109.0, "Kite API"))
+            self.assertEqual(self.engine._estimate_option_premium(*args, **kwargs), (109.0, "Kite API"))
+        self.assertEqual(calls["n"], 2)
+
+    def test_missing_data_is_fetched_once_and_estimated(self):
+        for minute in (0, 5, 10):
+            _, source = self.engine._estimate_option_premium(
+                24010.0, 24000, "PE", "NIFTY", timestamp=datetime(2026, 3, 11, 10, minute), expiry="2026-03-12"
+            )
+            self.assertEqual(source, "Estimated")
+        self.assertEqual(self.kite_client.kite.historical_data.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
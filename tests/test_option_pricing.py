@@ -0,0 +1,124 @@
+"""
+Tests for the vectorized Black-Scholes premium and delta estimator
+"""
+
+import math
+import unittest
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+
+from src.backtesting.backtest_engine import BacktestEngine
+from src.config.config_snapshot import ConfigSnapshot
+from src.trading.option_pricing import (
+    MIN_PREMIUM, black_scholes_delta, black_scholes_price, estimate_option_premium, implied_volatility, norm_cdf,
+    pricing_params, years_to_expiry
+)
+from src.utils.date_utils import IST
+
+
+class TestBlackScholes(unittest.TestCase):
+    """Textbook values, parity and array pricing"""
+
+    def test_norm_cdf(self):
+        x = np.linspace(-6, 6, 241)
+        expected = [0.5 * math.erfc(-v / math.sqrt(2)) for v in x]
+        np.testing.assert_allclose(norm_cdf(x), expected, atol=1e-7)
+        np.testing.assert_allclose(norm_cdf(x) + norm_cdf(-x), 1.0, atol=1e-8)
+
+    def test_known_values(self):
+        # Hull, Options Futures and Other Derivatives: S=42, K=40, r=10%, vol=20%, T=0.5
+        self.assertAlmostEqual(float(black_scholes_price(42, 40, 0.5, 0.2, "CE", 0.1)), 4.76, places=2)
+        self.assertAlmostEqual(float(black_scholes_price(42, 40, 0.5, 0.2, "PE", 0.1)), 0.81, places=2)
+        self.assertAlmostEqual(float(black_scholes_delta(42, 40, 0.5, 0.2, "CE", 0.1)), 0.7791, places=4)
+
+    def test_put_call_parity_and_delta(self):
+        strikes = np.arange(23000, 25001, 50)
+        call = black_scholes_price(24000.0, strikes, 5 / 365, 0.14, "CE")
+        put = black_scholes_price(24000.0, strikes, 5 / 365, 0.14, "PE")
+        np.testing.assert_allclose(call - put, 24000.0 - strikes * np.exp(-0.065 * 5 / 365), atol=1e-6)
+
+        call_delta = black_scholes_delta(24000.0, strikes, 5 / 365, 0.14, "CE")
+        put_delta = black_scholes_delta(24000.0, strikes, 5 / 365, 0.14, "PE")
+        self.assertTrue(np.all(np.diff(call_delta) < 0))
+        self.assertTrue(np.all((call_delta > 0) & (call_delta < 1)))
+        np.testing.assert_allclose(call_delta - put_delta, 1.0)
+
+    def test_array_matches_scalar(self):
+        spots = np.array([23800.0, 24000.0, 24210.5])
+        types = np.array(["CE", "PE", "ce"])
+        vector = black_scholes_price(spots, 24000, 3 / 365, 0.14, types)
+        for i in range(3):
+            self.assertEqual(vector[i], black_scholes_price(spots[i], 24000, 3 / 365, 0.14, types[i]))
+
+    def test_implied_volatility_round_trip(self):
+        strikes = np.arange(23000, 25001, 100)
+        true_iv = 0.12 + np.abs(strikes - 24000) / 1e5  # Smile
+        for option_type in ("CE", "PE"):
+            prices = black_scholes_price(24000.0, strikes, 3 / 365, true_iv, option_type)
+            np.testing.assert_allclose(implied_volatility(prices, 24000.0, strikes, 3 / 365, option_type), true_iv, atol=1e-5)
+        # Below intrinsic value: no volatility explains the price
+        self.assertTrue(np.isnan(implied_volatility(500.0, 24000.0, 23000, 3 / 365, "CE")))
+
+    def test_expiry_converges_to_intrinsic(self):
+        self.assertAlmostEqual(float(black_scholes_price(24100.0, 24000, 0.0, 0.14, "CE")), 100.0, places=2)
+        self.assertEqual(float(black_scholes_price(23000.0, 24000, 0.0, 0.14, "CE")), 0.0)
+
+
+class TestEstimator(unittest.TestCase):
+    """Time to expiry, configured volatility and the tick floor"""
+
+    def setUp(self):
+        self.snapshot = ConfigSnapshot({}, exists=True)
+        patcher = patch("src.trading.option_pricing.get_config_snapshot", side_effect=lambda: self.snapshot)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_years_to_expiry(self):
+        self.assertAlmostEqual(years_to_expiry(datetime(2026, 3, 12, 14, 30), "2026-03-12") * 365 * 24, 1.0)
+        aware = IST.localize(datetime(2026, 3, 11, 15, 30))
+        self.assertAlmostEqual(years_to_expiry(aware, "2026-03-12") * 365, 1.0)
+        index = pd.date_range("2026-03-12 15:25", periods=3, freq="5min")
+        years = years_to_expiry(index, "2026-03-12")
+        self.assertAlmostEqual(years[0] * 365 * 24 * 60, 5.0)
+        self.assertEqual(years[1], years[2])  # Floored after the close
+        self.assertAlmostEqual(years_to_expiry(datetime(2026, 3, 12), None) * 365, 4.0)
+
+    def test_malformed_expiry_uses_default(self):
+        self.assertAlmostEqual(years_to_expiry(datetime(2026, 3, 12), "30-12-2025") * 365, 4.0)
+        index = pd.date_range("2026-03-12 09:15", periods=3, freq="5min")
+        np.testing.assert_allclose(years_to_expiry(index, "2025/12/30") * 365, 4.0)
+
+    def test_configured_volatility(self):
+        self.assertEqual(pricing_params("banknifty"), (0.17, 0.065))
+        low = estimate_option_premium("NIFTY", 24000.0, 24000, "CE", 4 / 365)
+        self.snapshot = ConfigSnapshot({"option_pricing": {"implied_volatility": {"NIFTY": 0.2}, "risk_free_rate": 0.07}}, exists=True)
+        self.assertEqual(pricing_params("NIFTY"), (0.2, 0.07))
+        self.assertGreater(estimate_option_premium("NIFTY", 24000.0, 24000, "CE", 4 / 365), low)
+
+    def test_floor_and_rounding(self):
+        self.assertEqual(estimate_option_premium("NIFTY", 23000.0, 24000, "CE", 1 / 365), MIN_PREMIUM)
+        premiums = estimate_option_premium("NIFTY", np.array([24000.0, 24100.0]), 24000, "CE", 4 / 365)
+        np.testing.assert_array_equal(premiums, np.round(premiums, 2))
+        self.assertIsInstance(estimate_option_premium("NIFTY", 24000.0, 24000, "PE", 4 / 365), float)
+
+    def test_backtest_estimate(self):
+        fetcher = Mock()
+        fetcher.kite_client = None
+        engine = BacktestEngine(fetcher)
+        timestamp = datetime(2026, 3, 11, 10, 0)
+        premium, source = engine._estimate_option_premium(24010.0, 24000, "CE", "NIFTY", 1, timestamp=timestamp, expiry="2026-03-12")
+        self.assertEqual(source, "Estimated")
+        self.assertEqual(premium, estimate_option_premium("NIFTY", 24010.0, 24000, "CE", years_to_expiry(timestamp, "2026-03-12")))
+        # Unknown expiry: days_to_expiry, 0 meaning the default weekly assumption
+        self.assertEqual(engine._estimate_option_premium(24010.0, 24000, "PE", "NIFTY", 0)[0],
+                         estimate_option_premium("NIFTY", 24010.0, 24000, "PE", 4 / 365))
+        # A malformed expiry from a request falls back to the same assumption
+        self.assertEqual(engine._estimate_option_premium(24010.0, 24000, "PE", "NIFTY", 1, timestamp=timestamp, expiry="30-12-2025")[0],
+                         estimate_option_premium("NIFTY", 24010.0, 24000, "PE", 4 / 365))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+Tests for the incremental orderbook matcher and OrderSync on top of it
+"""
+
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from src.api.kite_client import KiteClient
+from src.api.order_matcher import OrderMatcher
+from src.api.order_sync import OrderSync
+from src.database.models import DatabaseManager
+from src.database.repository import PositionRepository, TradeRepository
+from src.utils.broker_context import BrokerContext
+
+
+def _order(order_id, side, qty, price, time, symbol="NIFTYCE", status="COMPLETE"):
+    return {
+        "order_id": order_id, "tradingsymbol": symbol, "exchange": "NFO", "instrument_token": 111,
+        "transaction_type": side, "filled_quantity": qty, "average_price": price,
+        "status": status, "order_timestamp": f"2026-03-11 {time}"
+    }
+
+
+def _summary(trades):
+    return [(t.trade_id, t.quantity, t.entry_price, t.exit_price) for t in trades]
+
+
+class TestOrderMatcher(unittest.TestCase):
+    """New orders are matched FIFO against open lots without re-running the day"""
+
+    def test_incremental_matches_full_run(self):
+        orders = [
+            _order("1", "BUY", 100, 10.0, "09:20:00"),
+            _order("2", "SELL", 50, 12.0, "09:30:00"),
+            _order("3", "SELL", 100, 11.0, "09:40:00"),   # closes 50, opens a 50 short
+            _order("4", "BUY", 50, 9.0, "09:50:00"),      # covers the short
+            _order("5", "BUY", 75, 20.0, "10:00:00", symbol="NIFTYPE"),
+        ]
+        full = OrderMatcher()
+        full.update(orders)
+
+        incremental = OrderMatcher()
+        for i in range(len(orders)):
+            incremental.update(orders[:i + 1])  # Kite returns the whole orderbook each time
+        self.assertEqual(incremental.stats()["orders_applied"], 5)
+        self.assertEqual(incremental.stats()["rebuilds"], 0)
+        self.assertEqual(_summary(incremental.trades()), _summary(full.trades()))
+        self.assertEqual(_summary(full.trades(date(2026, 3, 11))), [
+            ("trade_1_2", 50, 10.0, 12.0),
+            ("trade_1_3", 50, 10.0, 11.0),
+            ("trade_3_4", -50, 11.0, 9.0),
+        ])
+        self.assertEqual([t.realized_pnl for t in full.trades()], [100.0, 50.0, 100.0])
+        self.assertEqual(full.update(orders), 0)
+        self.assertEqual(full.trades(date(2026, 3, 12)), [])
+
+    def test_late_and_changed_orders_rematch_symbol(self):
+        matcher = OrderMatcher()
+        matcher.update([
+            _order("2", "SELL", 50, 12.0, "09:30:00", status="OPEN"),
+            _order("3", "BUY", 50, 11.0, "09:40:00"),
+        ])
+        self.assertEqual(matcher.trades(), [])
+
+        # An earlier BUY shows up and the SELL completes: FIFO pairs 1 -> 2, 3 stays open
+        matcher.update([
+            _order("1", "BUY", 50, 10.0, "09:20:00"),
+            _order("2", "SELL", 50, 12.0, "09:30:00"),
+            _order("3", "BUY", 50, 11.0, "09:40:00"),
+        ])
+        self.assertEqual(_summary(matcher.trades()), [("trade_1_2", 50, 10.0, 12.0)])
+
+        # A partial fill that grows replaces the earlier quantity
+        matcher.update([_order("4", "SELL", 20, 13.0, "09:45:00", status="REJECTED")])
+        matcher.update([_order("4", "SELL", 50, 13.0, "09:45:00")])
+        self.assertEqual(_summary(matcher.trades())[-1], ("trade_3_4", 50, 11.0, 13.0))
+        self.assertGreater(matcher.stats()["rebuilds"], 0)
+
+
+class TestOrderSyncWithMatcher(unittest.TestCase):
+    """OrderSync stores each matched trade once"""
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.db_manager = DatabaseManager(str(self.tmp_dir / "orders.db"))
+        self.trade_repo = TradeRepository(self.db_manager)
+        self.context = BrokerContext("MT0001")
+        self.context.__enter__()
+        self.kite_client = Mock(spec=KiteClient)
+        self.kite_client.is_authenticated.return_value = True
+        self.kite_client.get_orders.return_value = [
+            _order("1", "BUY", 50, 10.0, "09:20:00"),
+            _order("2", "SELL", 50, 12.0, "09:30:00"),
+        ]
+        self.order_sync = OrderSync(self.kite_client, self.trade_repo, PositionRepository(self.db_manager))
+
+    def tearDown(self):
+        self.context.__exit__(None, None, None)
+        self.db_manager.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_trades_created_once(self):
+        created = self.order_sync.sync_orders_to_trades(date(2026, 3, 11))
+        self.assertEqual([(t["quantity"], t["realized_pnl"]) for t in created], [(50, 100.0)])
+        self.assertEqual(self.order_sync.sync_orders_to_trades(date(2026, 3, 11)), [])
+
+        # A fresh process (empty matcher) finds the stored trade and does not duplicate it
+        fresh = OrderSync(self.kite_client, self.trade_repo, self.order_sync.position_repo)
+        with patch("src.api.order_sync.get_order_matcher", return_value=OrderMatcher()):
+            self.assertEqual(fresh.sync_orders_to_trades(date(2026, 3, 11)), [])
+        self.assertEqual(len(self.trade_repo.get_all_trades()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+"""
+Tests for parallel backtest jobs (task splitting, chunk merging, /backtest/run polling)
+"""
+
+import time
+import unittest
+from concurrent.futures import Future
+from datetime import datetime
+from unittest.mock import patch
+
+from flask import Flask
+
+from src.backtesting.parallel_runner import build_tasks, merge_chunk_results, split_date_range
+from src.ui import backtest_panel
+
+
+def _result(trades, final_capital, initial_capital=100000.0, max_drawdown=0.0):
+    pnls = [trade['pnl'] for trade in trades]
+    return {
+        "trades": trades,
+        "summary": {
+            "total_trades": len(trades),
+            "winning_trades": sum(1 for pnl in pnls if pnl > 0),
+            "losing_trades": sum(1 for pnl in pnls if pnl <= 0),
+            "total_profit": sum(pnl for pnl in pnls if pnl > 0),
+            "total_loss": sum(-pnl for pnl in pnls if pnl <= 0),
+            "net_pnl": sum(pnls),
+            "max_drawdown": max_drawdown,
+            "max_profit": max([0.0] + pnls),
+            "initial_capital": initial_capital,
+            "final_capital": final_capital
+        }
+    }
+
+
+class TestTaskSplitting(unittest.TestCase):
+    """Date chunking and task creation"""
+
+    def test_no_chunking(self):
+        """Without chunk_days the whole range is one chunk"""
+        from_date, to_date = datetime(2024, 1, 1), datetime(2024, 3, 1)
+        self.assertEqual(split_date_range(from_date, to_date, None), [(from_date, to_date)])
+
+    def test_chunks_split_at_day_boundaries(self):
+        """Chunks tile the range without overlap and the last one keeps to_date"""
+        chunks = split_date_range(datetime(2024, 1, 1), datetime(2024, 1, 10), 4)
+        self.assertEqual(chunks, [
+            (datetime(2024, 1, 1), datetime(2024, 1, 4, 23, 59, 59)),
+            (datetime(2024, 1, 5), datetime(2024, 1, 8, 23, 59, 59)),
+            (datetime(2024, 1, 9), datetime(2024, 1, 10)),
+        ])
+
+    def test_build_tasks_per_segment_and_chunk(self):
+        """One task per segment and chunk, with per-segment overrides"""
+        tasks = build_tasks(
+            ["NIFTY", "BANKNIFTY"],
+            datetime(2024, 1, 1),
+            datetime(2024, 1, 10),
+            {"time_interval": "5minute"},
+            chunk_days=5,
+            segment_params={"NIFTY": {"expiry": "2024-01-25"}}
+        )
+        self.assertEqual(len(tasks), 4)
+        self.assertEqual([task.chunk_index for task in tasks], [0, 1, 0, 1])
+        self.assertEqual(tasks[0].params, {"time_interval": "5minute", "expiry": "2024-01-25"})
+        self.assertEqual(tasks[2].params, {"time_interval": "5minute"})
+
+
+class TestMergeChunkResults(unittest.TestCase):
+    """Merging chunk results of one segment"""
+
+    def test_merge(self):
+        """Counts and P&L add up, capital chains and drawdown is the worst chunk"""
+        first = _result([{"entry_time": "2024-01-02T10:00:00", "pnl": 100.0}], 100100.0, max_drawdown=1.0)
+        second = _result([{"entry_time": "2024-01-09T10:00:00", "pnl": -40.0}], 99960.0, max_drawdown=2.5)
+        merged = merge_chunk_results([first, second], datetime(2024, 1, 1), datetime(2024, 1, 10), 100000.0)
+        summary = merged["summary"]
+        self.assertEqual(summary["total_trades"], 2)
+        self.assertEqual(summary["winning_trades"], 1)
+        self.assertAlmostEqual(summary["net_pnl"], 60.0)
+        self.assertAlmostEqual(summary["final_capital"], 100060.0)
+        self.assertAlmostEqual(summary["return_pct"], 0.06)
+        self.assertEqual(summary["max_drawdown"], 2.5)
+        self.assertAlmostEqual(summary["profit_factor"], 2.5)
+        self.assertEqual([trade["pnl"] for trade in merged["trades"]], [100.0, -40.0])
+
+
+class _ImmediateRunner:
+    """Stands in for the process pool: runs tasks synchronously"""
+
+    def __init__(self, results):
+        self.results = results
+        self.tasks = []
+
+    def submit(self, tasks, kite_spec=None):
+        futures = []
+        for task in tasks:
+            self.tasks.append(task)
+            future = Future()
+            result = self.results[(task.segment, task.chunk_index)]
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+            futures.append(future)
+        return futures
+
+    def shutdown(self, wait=True):
+        pass
+
+
+class TestBacktestJobs(unittest.TestCase):
+    """/backtest/run returns a job id; /backtest/jobs/<id> returns the combined result"""
+
+    def setUp(self):
+        app = Flask(__name__)
+        app.register_blueprint(backtest_panel.backtest_bp)
+        self.client = app.test_client()
+
+    def _wait(self, job_id):
+        for _ in range(100):
+            response = self.client.get(f"/backtest/jobs/{job_id}")
+            if response.get_json()["status"] in ("completed", "failed"):
+                return response.get_json()
+            time.sleep(0.02)
+        self.fail("backtest job did not finish")
+
+    def test_run_returns_job_and_combines_segments(self):
+        runner = _ImmediateRunner({
+            ("NIFTY", 0): _result([{"entry_time": "2024-01-02T10:00:00", "pnl": 50.0}], 100050.0),
+            ("NIFTY", 1): _result([{"entry_time": "2024-01-04T10:00:00", "pnl": 25.0}], 100025.0),
+            ("BANKNIFTY", 0): _result([{"entry_time": "2024-01-03T10:00:00", "pnl": -30.0}], 99970.0),
+            ("BANKNIFTY", 1): RuntimeError("no data"),
+        })
+        with patch.object(backtest_panel, "_runner", runner):
+            response = self.client.post("/backtest/run", json={
+                "segments": ["NIFTY", "BANKNIFTY"],
+                "from_date": "2024-01-01",
+                "to_date": "2024-01-04",
+                "chunk_days": 2
+            })
+            self.assertEqual(response.status_code, 202)
+            job = self._wait(response.get_json()["job_id"])
+
+        self.assertEqual(len(runner.tasks), 4)
+        self.assertEqual(job["status"], "completed")
+        self.assertEqual(job["progress"], {"completed": 4, "total": 4})
+        result = job["result"]
+        # NIFTY chunks merged; BANKNIFTY failed in one chunk and reports the error
+        self.assertEqual(result["summary"]["total_trades"], 2)
+        self.assertAlmostEqual(result["summary"]["net_pnl"], 75.0)
+        self.assertEqual(result["segment_results"]["BANKNIFTY"]["summary"]["error"], "no data")
+        self.assertEqual([trade["segment"] for trade in result["trades"]], ["NIFTY", "NIFTY"])
+
+    def test_unknown_job(self):
+        self.assertEqual(self.client.get("/backtest/jobs/missing").status_code, 404)
+
+    def test_invalid_chunk_days(self):
+        response = self.client.post("/backtest/run", json={
+            "segments": ["NIFTY"], "from_date": "2024-01-01", "to_date": "2024-01-04", "chunk_days": 0
+        })
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Tests for the backtest parameter sweep (grid expansion, ranking, shared data / indicator cache)
+"""
+
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from src.backtesting.backtest_engine import BacktestEngine
+from src.backtesting.parameter_sweep import ParameterSweep, expand_grid, rank_results
+from src.trading.indicators import IndicatorCache
+from tests.synthetic_data import SyntheticFetcher
+
+
+class TestGridAndRanking(unittest.TestCase):
+    """Grid expansion and result ranking"""
+
+    def test_expand_grid_fills_defaults(self):
+        combinations = expand_grid({"rsi_period": [9, 14], "trade_regime": ["Buy", "Sell"]})
+        self.assertEqual(len(combinations), 4)
+        self.assertTrue(all(c["volume_strength_wma"] == 21 and c["time_interval"] == "5minute" for c in combinations))
+
+    def test_expand_grid_rejects_unknown_parameter(self):
+        with self.assertRaises(ValueError):
+            expand_grid({"rsi_periods": [9]})
+
+    def test_rank_results(self):
+        rows = [
+            {"net_pnl": 10.0, "max_drawdown": 5.0, "win_rate": 50.0, "error": None},
+            {"net_pnl": 30.0, "max_drawdown": 2.0, "win_rate": 40.0, "error": None},
+            {"net_pnl": None, "max_drawdown": None, "win_rate": None, "error": "no data"},
+            {"net_pnl": 30.0, "max_drawdown": 1.0, "win_rate": 40.0, "error": None},
+        ]
+        ranked = rank_results(rows)
+        self.assertEqual([(row["net_pnl"], row["max_drawdown"]) for row in ranked][:3], [(30.0, 1.0), (30.0, 2.0), (10.0, 5.0)])
+        self.assertEqual(ranked[-1]["error"], "no data")
+        self.assertEqual([row["rank"] for row in ranked], [1, 2, 3, 4])
+        self.assertEqual(rank_results(rows, "max_drawdown")[0]["max_drawdown"], 1.0)
+
+
+class TestParameterSweep(unittest.TestCase):
+    """In-process sweep against individual run_backtest calls"""
+
+    def setUp(self):
+        self.fetcher = SyntheticFetcher()
+        self.engine = BacktestEngine(self.fetcher)
+        self.engine._kite_authenticated = False
+        self.from_date = datetime(2024, 1, 1)
+        self.to_date = datetime(2024, 1, 10)
+
+    def test_sweep_matches_individual_runs(self):
+        """Data is fetched once and every row equals a standalone backtest"""
+        grid = {"rsi_period": [9, 14], "volume_strength_wma": [14, 21], "trade_regime": ["Buy", "Sell"]}
+        with patch("src.backtesting.parameter_sweep.IndicatorCache", wraps=IndicatorCache) as cache_cls:
+            result = ParameterSweep(self.engine).run(["NIFTY"], self.from_date, self.to_date, grid)
+
+        self.assertEqual(self.fetcher.calls, [("NIFTY", "5minute")])
+        # One shared cache per RSI period
+        self.assertEqual(cache_cls.call_count, 2)
+        self.assertEqual(result["combinations"], 8)
+        self.assertEqual(len(result["results"]), 8)
+        net_pnls = [row["net_pnl"] for row in result["results"]]
+        self.assertEqual(net_pnls, sorted(net_pnls, reverse=True))
+
+        for row in result["results"][::3]:
+            params = {k: row[k] for k in ("time_interval", "rsi_period", "price_strength_ema", "volume_strength_wma", "stop_loss", "trade_regime")}
+            engine = BacktestEngine(SyntheticFetcher())
+            engine._kite_authenticated = False
+            summary = engine.run_backtest("NIFTY", self.from_date, self.to_date, **params).to_dict()["summary"]
+            self.assertEqual(row["total_trades"], summary["total_trades"])
+            self.assertAlmostEqual(row["net_pnl"], summary["net_pnl"])
+            self.assertAlmostEqual(row["max_drawdown"], summary["max_drawdown"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Tests for the daily P&L rollup behind get_cumulative_pnl_metrics
+"""
+
+import shutil
+import tempfile
+import unittest
+from datetime import date, datetime
+from pathlib import Path
+from unittest.mock import patch
+
+from src.database.models import DailyPnlRollup, DailyStats, DatabaseManager
+from src.database.repository import DailyStatsRepository, TradeRepository
+from src.utils.broker_context import BrokerContext
+from src.utils.date_utils import IST
+
+# Wednesday; the week started on 2026-03-09
+NOW = IST.localize(datetime(2026, 3, 11, 14, 0))
+
+
+class TestDailyPnlRollup(unittest.TestCase):
+    """Trades keep the rollup current; metrics read day/week/month/year/all-time from it"""
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.db_manager = DatabaseManager(str(self.tmp_dir / "pnl.db"))
+        self.trade_repo = TradeRepository(self.db_manager)
+        self.stats_repo = DailyStatsRepository(self.db_manager)
+        self.context = BrokerContext("AB1234")
+        self.context.__enter__()
+        self.clock = patch("src.utils.date_utils.get_current_ist_time", return_value=NOW)
+        self.clock.start()
+
+        for exit_time, exit_price in [
+            (datetime(2026, 3, 11, 5, 0), 102.0),   # today: +100
+            (datetime(2026, 3, 11, 6, 0), 101.0),   # today: +50
+            (datetime(2026, 3, 10, 5, 0), 99.0),    # this week: -50
+            (datetime(2026, 3, 2, 5, 0), 104.0),    # this month: +200
+            (datetime(2026, 1, 15, 5, 0), 106.0),   # this year: +300
+            (datetime(2025, 6, 1, 5, 0), 120.0),    # last year: +1000
+        ]:
+            self._trade(exit_time, exit_price)
+
+        session = self.db_manager.get_session()
+        session.add(DailyStats(broker_id="AB1234", date=datetime(2026, 3, 11), total_unrealized_pnl=25.0))
+        session.commit()
+        session.close()
+
+    def tearDown(self):
+        self.clock.stop()
+        self.context.__exit__(None, None, None)
+        self.db_manager.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _trade(self, exit_time, exit_price, quantity=50):
+        return self.trade_repo.create_trade(
+            "111", "NIFTYCE", "NFO", exit_time, exit_time, 100.0, exit_price, quantity, "manual"
+        )
+
+    def _rollup(self):
+        session = self.db_manager.get_session()
+        try:
+            return {
+                (row.broker_id, row.date): (row.realized_pnl, row.trade_count)
+                for row in session.query(DailyPnlRollup)
+            }
+        finally:
+            session.close()
+
+    def test_create_trade_updates_rollup(self):
+        rollup = self._rollup()
+        self.assertEqual(len(rollup), 5)
+        self.assertEqual(rollup[("AB1234", date(2026, 3, 11))], (150.0, 2))
+
+    def test_cumulative_metrics(self):
+        self.assertEqual(self.stats_repo.get_cumulative_pnl_metrics(), {
+            'all_time': 1625.0,
+            'year': 625.0,
+            'month': 325.0,
+            'week': 125.0,
+            'day': 175.0
+        })
+
+    def test_other_brokers_are_excluded(self):
+        with BrokerContext("ZZ9999"):
+            self._trade(datetime(2026, 3, 11, 7, 0), 200.0)
+        self.assertEqual(self.stats_repo.get_cumulative_pnl_metrics()['all_time'], 1625.0)
+
+    def test_deletes_and_purge_update_rollup(self):
+        self.trade_repo.delete_trades_by_date(date(2026, 3, 2))
+        self.assertEqual(self.trade_repo.purge_day_minus_one_trades("AB1234"), 1)
+        rollup = self._rollup()
+        self.assertNotIn(("AB1234", date(2026, 3, 2)), rollup)
+        self.assertNotIn(("AB1234", date(2026, 3, 10)), rollup)
+        self.assertEqual(self.stats_repo.get_cumulative_pnl_metrics()['month'], 175.0)
+
+    def test_rebuild_matches_incremental(self):
+        incremental = self._rollup()
+        session = self.db_manager.get_session()
+        session.query(DailyPnlRollup).delete()
+        session.commit()
+        session.close()
+        self.assertEqual(self.db_manager.rebuild_pnl_rollup(), 5)
+        self.assertEqual(self._rollup(), incremental)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Tests for the in-memory position book and its batched write-behind
+"""
+
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from src.api.position_book import PositionBook
+from src.database.models import DatabaseManager
+from src.database.repository import PositionRepository
+from src.utils.broker_context import BrokerContext
+
+
+class TestPositionBook(unittest.TestCase):
+    """Ticks update memory; dirty prices reach the positions table in one batch"""
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.db_manager = DatabaseManager(str(self.tmp_dir / "positions.db"))
+        self.repo = PositionRepository(self.db_manager)
+        self.context = BrokerContext("AB1234")
+        self.context.__enter__()
+        self.ce = self.repo.create_or_update_position("111", "NIFTYCE", "NFO", 100.0, 50, current_price=100.0)
+        self.pe = self.repo.create_or_update_position("222", "NIFTYPE", "NFO", 80.0, -50, current_price=80.0)
+        self.book = PositionBook(self.repo, flush_interval=60.0, material_pnl_change=500.0)
+        self.book.reload()
+
+    def tearDown(self):
+        self.context.__exit__(None, None, None)
+        self.db_manager.engine.dispose()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _stored(self):
+        return {p.instrument_token: (p.current_price, p.unrealized_pnl) for p in self.repo.get_active_positions()}
+
+    def test_ticks_are_batched(self):
+        self.assertEqual(self.book.apply_ticks({111: 102.0, 222: 79.0, 999: 5.0}), 2)
+        self.assertEqual(self.book.entry(111).unrealized_pnl, 100.0)
+        self.assertEqual(self.book.entry(222).unrealized_pnl, 50.0)
+        self.assertEqual(self.book.total_unrealized_pnl(), 150.0)
+
+        # Small moves wait for the timer
+        self.assertEqual(self.book.flush_if_due(), 0)
+        self.assertEqual(self._stored()["111"], (100.0, 0.0))
+
+        self.assertEqual(self.book.flush(), 2)
+        self.assertEqual(self._stored(), {"111": (102.0, 100.0), "222": (79.0, 50.0)})
+        self.assertEqual(self.book.flush(), 0)
+        self.assertEqual(self.book.stats()["flushes"], 1)
+
+    def test_material_change_flushes_from_another_thread(self):
+        # Tick threads have no BrokerID of their own; the book writes with the one it was loaded with
+        def on_ticks():
+            self.book.apply_ticks({111: 111.0})  # +Rs.550
+            self.book.flush_if_due()
+
+        thread = threading.Thread(target=on_ticks)
+        thread.start()
+        thread.join()
+        self.assertEqual(self._stored()["111"], (111.0, 550.0))
+
+    def test_closed_positions_are_not_written(self):
+        self.book.apply_ticks({111: 105.0})
+        self.repo.deactivate_position(self.ce.id)
+        self.assertEqual(self.book.flush(), 0)
+
+    def test_apply_to_overlays_latest_prices(self):
+        self.book.apply_ticks({222: 70.0})
+        positions = self.book.apply_to(self.repo.get_active_positions())
+        pe = next(p for p in positions if p.instrument_token == "222")
+        self.assertEqual((pe.current_price, pe.unrealized_pnl), (70.0, 500.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Tests for the open-position journal
+"""
+
+import csv
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+from src.live_trader import position_journal
+from src.live_trader.execution import OpenPositionRecord
+from src.live_trader.position_journal import OpenPositionJournal
+
+TODAY = "2024-01-01"
+
+
+def _record(strike=24000.0, option_type="CE", status="OPEN", pnl=0.0):
+    return OpenPositionRecord(
+        segment="NIFTY", mode="PAPER", status=status, signal_type=f"BUY_{option_type}",
+        option_symbol=f"NIFTY24JAN{int(strike)}{option_type}", option_type=option_type,
+        strike_price=strike, expiry="2024-01-04", entry_time=datetime(2024, 1, 1, 9, 30),
+        entry_price=100.0, current_price=100.0 + pnl, current_lots=1, current_quantity=50,
+        stop_loss_points=50.0, initial_sl_price=50.0, current_sl_price=50.0, trailing_stop_points=50.0,
+        current_pnl_points=pnl, current_pnl_value=pnl * 50, current_return_pct=pnl, pyramiding_count=0,
+        update_time=datetime(2024, 1, 1, 9, 30),
+    )
+
+
+@patch("src.live_trader.position_journal._day_str", side_effect=lambda day: TODAY if day is None else str(day)[:10])
+class TestOpenPositionJournal(unittest.TestCase):
+    """CSV row semantics, restart replay, compaction and export"""
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.journal = OpenPositionJournal(self.tmp_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_update_replaces_open_row(self, _day):
+        self.journal.record(_record(pnl=1.0))
+        self.journal.record(_record(pnl=2.0))
+        self.journal.record(_record(option_type="PE"))
+        self.journal.record(_record(status="CLOSED", pnl=3.0))
+        # A new entry at the same strike after the exit is a new row
+        self.journal.record(_record(pnl=4.0))
+
+        rows = self.journal.rows()
+        self.assertEqual([(r["option_type"], r["status"], r["current_pnl_points"]) for r in rows],
+                         [("CE", "CLOSED", 3.0), ("PE", "OPEN", 0.0), ("CE", "OPEN", 4.0)])
+        self.assertEqual(rows[0]["exit_time"], "")
+
+        reopened = OpenPositionJournal(self.tmp_dir)
+        self.assertEqual(reopened.rows(), rows)
+
+    def test_compaction(self, _day):
+        with patch.object(position_journal, "COMPACT_SLACK", 10):
+            for i in range(25):
+                self.journal.record(_record(pnl=float(i)))
+        journal_path = self.journal.journal_path()
+        with open(journal_path, encoding="utf-8") as f:
+            self.assertLess(len(f.readlines()), 11)
+        self.assertEqual(OpenPositionJournal(self.tmp_dir).rows()[0]["current_pnl_points"], 24.0)
+
+    def test_export_and_legacy_import(self, _day):
+        self.assertIsNone(self.journal.export_csv())
+        self.journal.record(_record(pnl=1.0))
+        path = self.journal.export_csv()
+        with open(path, newline="", encoding="utf-8") as f:
+            exported = list(csv.DictReader(f))
+        self.assertEqual((exported[0]["status"], exported[0]["current_pnl_points"]), ("OPEN", "1.0"))
+
+        # A day with only a legacy CSV is imported into a journal
+        legacy_dir = self.tmp_dir / "legacy"
+        legacy_dir.mkdir()
+        shutil.copy(path, legacy_dir / path.name)
+        imported = OpenPositionJournal(legacy_dir)
+        imported.record(_record(pnl=5.0))
+        rows = imported.rows()
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["current_pnl_points"], 5.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -135,6 +135,7 @@ def test_profit_locking_on_trade_close(mock_repos, mock_kite_client):
     assert result["is_profit"] == True
     assert result["protected"] == True
     assert result["realized_pnl"] == 2500.0
+    assert result["position_id"] == 1
     
     # Verify trade was created
     trade_repo.create_trade.assert_called_once()
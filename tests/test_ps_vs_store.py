@@ -0,0 +1,85 @@
+"""
+Tests for the append-only PS/VS store
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from src.live_trader.ps_vs_store import PsVsStore
+
+START = datetime(2024, 1, 1, 9, 15)
+
+
+def _point(minute, ps, vs, crossover=None):
+    return {
+        "timestamp": (START + timedelta(minutes=minute)).isoformat(),
+        "price_strength": ps,
+        "volume_strength": vs,
+        "price": 24000.0,
+        "rsi": 50.0,
+        "crossover": crossover,
+        "filters": None,
+    }
+
+
+class TestPsVsStore(unittest.TestCase):
+    """Appends, replacement of re-saved points and range queries"""
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.store = PsVsStore(self.tmp_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_append_and_range_query(self):
+        for minute in range(0, 60, 5):
+            self.store.append("nifty", _point(minute, minute, 30))
+        self.assertEqual(self.store.count("NIFTY", "2024-01-01"), 12)
+
+        points = self.store.query("NIFTY", "2024-01-01", start=START + timedelta(minutes=40))
+        self.assertEqual([p["price_strength"] for p in points], [40, 45, 50, 55])
+        points = self.store.query("NIFTY", START.date(), start=START + timedelta(minutes=9), end=START + timedelta(minutes=20))
+        self.assertEqual([p["price_strength"] for p in points], [10, 15, 20])
+        self.assertEqual(self.store.days("NIFTY"), ["2024-01-01"])
+
+    def test_resaved_point_replaces_previous_version(self):
+        self.store.append("NIFTY", _point(0, 10, 20))
+        self.store.append("NIFTY", _point(5, 11, 20))
+        self.store.append("NIFTY", _point(5, 25, 20))
+        self.assertEqual([p["price_strength"] for p in self.store.query("NIFTY", "2024-01-01")], [10, 25])
+        # The previous point of a re-saved timestamp is the one before it, not its old version
+        self.assertEqual(self.store.previous_strengths("NIFTY", START + timedelta(minutes=5)), (10, 20))
+
+        # A new store instance (restart) rebuilds the same view from the file
+        reopened = PsVsStore(self.tmp_dir)
+        self.assertEqual([p["price_strength"] for p in reopened.query("NIFTY", "2024-01-01")], [10, 25])
+
+    def test_crossover_points(self):
+        self.store.append("NIFTY", _point(0, 10, 20))
+        self.store.append("NIFTY", _point(10, 30, 20))
+        crossover_at = START + timedelta(minutes=5)
+        self.assertFalse(self.store.has_crossover("NIFTY", crossover_at, "CE"))
+        self.store.append("NIFTY", _point(5, 10, 20, crossover="CE"), crossover_point=True)
+        self.assertTrue(self.store.has_crossover("NIFTY", crossover_at, "CE"))
+        self.assertEqual(self.store.strengths_at("NIFTY", crossover_at + timedelta(minutes=1)), (10, 20))
+
+        points = self.store.query("NIFTY", "2024-01-01")
+        self.assertEqual([(p["timestamp"][11:16], p["crossover"]) for p in points],
+                         [("09:15", None), ("09:20", "CE"), ("09:25", None)])
+        self.assertNotIn("crossover_point", points[1])
+
+    def test_legacy_json_is_converted(self):
+        legacy = self.tmp_dir / "ps_vs_NIFTY_2024-01-01.json"
+        legacy.write_text(json.dumps([_point(0, 1, 2), _point(5, 3, 4)]), encoding="utf-8")
+        self.assertEqual([p["price_strength"] for p in self.store.query("NIFTY", "2024-01-01")], [1, 3])
+        self.store.append("NIFTY", _point(10, 5, 6))
+        self.assertEqual(self.store.count("NIFTY", "2024-01-01"), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
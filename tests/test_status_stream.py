@@ -0,0 +1,95 @@
+"""
+Tests for the Server-Sent Events status broadcaster and /api/stream
+"""
+
+import json
+import threading
+import unittest
+from itertools import islice
+
+from src.utils.status_stream import StatusBroadcaster, format_sse
+
+
+def _events(frames):
+    """(id, type, data) of the event frames among SSE text chunks"""
+    events = []
+    for frame in frames:
+        if not frame.startswith("id: "):
+            continue
+        fields = dict(line.split(": ", 1) for line in frame.strip().split("\n"))
+        events.append((int(fields["id"]), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class TestStatusBroadcaster(unittest.TestCase):
+    """Events are serialized once, deduplicated per state topic and replayed from the buffer"""
+
+    def test_unchanged_state_is_not_republished(self):
+        broadcaster = StatusBroadcaster()
+        self.assertEqual(broadcaster.publish("risk", {"daily_loss": 10}, state=True), 1)
+        self.assertIsNone(broadcaster.publish("risk", {"daily_loss": 10}, state=True))
+        self.assertEqual(broadcaster.publish("risk", {"daily_loss": 20}, state=True), 2)
+        self.assertEqual(broadcaster.publish("trade", {"id": 1}), 3)
+        self.assertEqual(broadcaster.publish("trade", {"id": 1}), 4)  # Not a state topic
+
+        self.assertEqual([event.id for event in broadcaster.snapshot()], [2])
+        self.assertEqual(broadcaster.stats()["unchanged"], 1)
+        self.assertEqual(format_sse(broadcaster.snapshot()[0]),
+                         'id: 2\nevent: risk\ndata: {"daily_loss": 20}\n\n')
+
+    def test_events_after(self):
+        broadcaster = StatusBroadcaster(buffer_size=3)
+        self.assertEqual(broadcaster.events_after(0, timeout=0), [])
+        for i in range(5):
+            broadcaster.publish("ps_vs", {"i": i})
+        self.assertEqual([event.id for event in broadcaster.events_after(2, timeout=0)], [3, 4, 5])
+        self.assertIsNone(broadcaster.events_after(1, timeout=0))  # Event 2 left the buffer
+
+        # A waiting reader wakes up on publish
+        result = []
+        reader = threading.Thread(target=lambda: result.extend(broadcaster.events_after(5, timeout=5)))
+        reader.start()
+        broadcaster.publish("ps_vs", {"i": 5})
+        reader.join(5)
+        self.assertEqual([event.id for event in result], [6])
+
+    def test_stream_sends_snapshot_then_live_events_for_its_broker(self):
+        broadcaster = StatusBroadcaster()
+        broadcaster.publish("risk", {"daily_loss": 1}, broker_id="AB1234", state=True)
+        broadcaster.publish("risk", {"daily_loss": 2}, broker_id="ZZ9999", state=True)
+        broadcaster.publish("trade", {"id": 1}, broker_id="AB1234")  # Before connecting: not replayed
+        broadcaster.publish("live_status", {"running": True}, state=True)
+
+        stream = broadcaster.stream("AB1234", heartbeat=0)
+        self.assertTrue(next(stream).startswith("retry: "))
+        self.assertEqual(_events(islice(stream, 2)), [
+            (1, "risk", {"daily_loss": 1}),
+            (4, "live_status", {"running": True}),
+        ])
+
+        broadcaster.publish("trade", {"id": 2}, broker_id="ZZ9999")
+        broadcaster.publish("trade", {"id": 3}, broker_id="AB1234")
+        self.assertEqual(_events([next(stream)]), [(6, "trade", {"id": 3})])
+        self.assertEqual(next(stream), ": keep-alive\n\n")
+
+    def test_stream_resumes_from_last_event_id(self):
+        broadcaster = StatusBroadcaster()
+        for i in range(3):
+            broadcaster.publish("ps_vs", {"i": i})
+        broadcaster.publish("live_trade", {"i": 3})
+
+        stream = broadcaster.stream(last_event_id=2, topics=["ps_vs"], heartbeat=0)
+        next(stream)
+        self.assertEqual(_events([next(stream)]), [(3, "ps_vs", {"i": 2})])
+        self.assertEqual(next(stream), ": keep-alive\n\n")
+
+        # An id from before a server restart falls back to the snapshot
+        restarted = StatusBroadcaster()
+        restarted.publish("live_status", {"running": False}, state=True)
+        stream = restarted.stream(last_event_id=500, heartbeat=0)
+        next(stream)
+        self.assertEqual(_events([next(stream)]), [(1, "live_status", {"running": False})])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Tests for tick-to-bar aggregation and the streaming index feed
+"""
+
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from src.api.live_data import INDEX_INSTRUMENT_TOKENS
+from src.api.websocket_client import WebSocketClient
+from src.live_trader.candle_store import get_candle_buffer
+from src.live_trader.index_feed import IndexTickFeed
+from src.live_trader.tick_aggregator import TickBarAggregator, bar_start, load_tick_file, replay_ticks
+
+TICK_FILE = Path(__file__).parent / "fixtures" / "index_ticks.jsonl"
+NIFTY = INDEX_INSTRUMENT_TOKENS["NIFTY"]
+BANKNIFTY = INDEX_INSTRUMENT_TOKENS["BANKNIFTY"]
+
+
+def _at(hhmmss):
+    return datetime.fromisoformat(f"2024-01-01T{hhmmss}")
+
+
+def _ohlc(bar):
+    return (bar.start.strftime("%H:%M"), bar.open, bar.high, bar.low, bar.close)
+
+
+class TestBarAlignment(unittest.TestCase):
+    """Buckets are counted from the 09:15 session open, like Kite candles"""
+
+    def test_bar_start(self):
+        self.assertEqual(bar_start(_at("09:17:59"), 3), _at("09:15:00"))
+        self.assertEqual(bar_start(_at("10:00:00"), 3), _at("10:00:00"))
+        self.assertEqual(bar_start(_at("09:29:59"), 15), _at("09:15:00"))
+        self.assertEqual(bar_start(_at("09:30:00"), 15), _at("09:30:00"))
+
+
+class TestTickBarAggregator(unittest.TestCase):
+    """Replay of the recorded tick file"""
+
+    def test_replay_recorded_ticks(self):
+        bars = replay_ticks(load_tick_file(TICK_FILE), TickBarAggregator())
+
+        def closed(token, interval):
+            return [_ohlc(b) for b in bars if b.instrument_token == token and b.interval == interval]
+
+        self.assertEqual(closed(NIFTY, "1minute"), [
+            ("09:15", 24000.0, 24004.5, 23998.0, 24001.0),
+            ("09:16", 24002.0, 24010.0, 24002.0, 24007.5),
+            ("09:17", 24007.0, 24007.0, 23995.0, 23995.0),
+            ("09:18", 23996.0, 23996.0, 23996.0, 23996.0),
+            ("09:19", 24012.0, 24012.0, 24012.0, 24012.0),
+            ("09:20", 24015.0, 24015.0, 24011.0, 24011.0),
+        ])
+        self.assertEqual(closed(NIFTY, "3minute"), [
+            ("09:15", 24000.0, 24010.0, 23995.0, 23995.0),
+            ("09:18", 23996.0, 24015.0, 23996.0, 24011.0),
+        ])
+        self.assertEqual(closed(NIFTY, "5minute")[0], ("09:15", 24000.0, 24012.0, 23995.0, 24012.0))
+        self.assertEqual(closed(BANKNIFTY, "5minute")[0], ("09:15", 51000.0, 51020.0, 51000.0, 51020.0))
+
+    def test_close_due_and_late_ticks(self):
+        received = []
+        aggregator = TickBarAggregator(["1minute"], on_bar=received.append)
+        aggregator.add_tick(NIFTY, 100.0, _at("09:15:10"))
+        self.assertEqual(aggregator.close_due(_at("09:15:59")), [])
+        self.assertEqual([_ohlc(b) for b in aggregator.close_due(_at("09:16:00"))], [("09:15", 100.0, 100.0, 100.0, 100.0)])
+        self.assertEqual(len(received), 1)
+
+        aggregator.add_tick(NIFTY, 101.0, _at("09:16:05"))
+        aggregator.add_tick(NIFTY, 99.0, _at("09:15:58"))
+        self.assertEqual(aggregator.late_ticks, 1)
+        self.assertEqual(aggregator.current(NIFTY, "1minute").low, 101.0)
+
+    def test_unknown_interval(self):
+        with self.assertRaises(ValueError):
+            TickBarAggregator(["day"])
+
+
+class TestIndexTickFeed(unittest.TestCase):
+    """Closed bars reach the shared candle buffer and the segment hub"""
+
+    def setUp(self):
+        self.buffer = get_candle_buffer("SENSEX", "1minute")
+        self.buffer.clear()
+
+    def tearDown(self):
+        self.buffer.clear()
+
+    @patch("src.live_trader.index_feed.get_market_data_hub")
+    def test_ticks_to_buffer_and_snapshot(self, mock_hub):
+        token = INDEX_INSTRUMENT_TOKENS["SENSEX"]
+        feed = IndexTickFeed(Mock(), ["sensex"], intervals=["1minute", "3minute"], websocket_client=Mock())
+        feed._started_at = _at("09:14:30")
+
+        feed.on_ticks([
+            {"instrument_token": token, "last_price": 72000.0, "exchange_timestamp": _at("09:15:01")},
+            {"instrument_token": token, "last_price": 72010.0, "exchange_timestamp": _at("09:15:30")},
+            {"instrument_token": 1, "last_price": 5.0, "exchange_timestamp": _at("09:15:31")},
+        ])
+        self.assertEqual(len(self.buffer), 0)
+        mock_hub.return_value.push_ltp.assert_called_with(72010.0, _at("09:15:30"))
+
+        feed.on_ticks([{"instrument_token": token, "last_price": 71990.0, "exchange_timestamp": _at("09:16:00")}])
+        record = self.buffer.get(_at("09:15:00"))
+        self.assertEqual((record.open, record.high, record.low, record.close), (72000.0, 72010.0, 72000.0, 72010.0))
+        snapshot = mock_hub.return_value.publish.call_args[0][0]
+        self.assertEqual((snapshot.segment, snapshot.ltp), ("SENSEX", 72010.0))
+        self.assertEqual(feed.stats()["bars_stored"], 1)
+
+    @patch("src.api.websocket_client.KiteTicker")
+    def test_stop_does_not_reconnect(self, mock_ticker_cls):
+        ticker = mock_ticker_cls.return_value
+        websocket_client = WebSocketClient(Mock(api_key="key", access_token="token"))
+        # KiteTicker reports its own close through on_close
+        ticker.close.side_effect = lambda: ticker.on_close(ticker, 1000, "closed")
+        feed = IndexTickFeed(websocket_client.kite_client, ["sensex"], intervals=["1minute"], websocket_client=websocket_client)
+        with patch.object(websocket_client, "_attempt_reconnect") as reconnect:
+            self.assertTrue(feed.start())
+            feed.stop()
+            reconnect.assert_not_called()
+            self.assertEqual(mock_ticker_cls.call_count, 1)
+
+            # A close the client did not ask for still reconnects
+            websocket_client.connect()
+            ticker.on_close(ticker, 1006, "connection lost")
+            reconnect.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()